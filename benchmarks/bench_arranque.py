@@ -0,0 +1,48 @@
+import argparse
+import os
+import subprocess
+import sys
+
+# Tiempo de importación de los módulos de entrada frente a su presupuesto: el
+# tiempo acumulado que da python -X importtime (mejor de varias ejecuciones en
+# intérpretes nuevos). Importar NumPy cuesta por sí solo del orden de 100 ms, así
+# que superar el presupuesto suele indicar que algún módulo opcional ha vuelto a
+# importarse al arrancar. Termina con error si algún módulo lo supera.
+# Uso (desde la raíz del proyecto): python -m benchmarks.bench_arranque [--ejecuciones K]
+
+PRESUPUESTOS_MS = {"src.celeste.simulador": 40, "src.celeste.main": 50}
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def tiempo_importacion_ms(modulo: str, ejecuciones: int) -> float:
+    """Tiempo acumulado de importar el módulo según python -X importtime (mejor de las ejecuciones)."""
+    tiempos = []
+    for _ in range(ejecuciones):
+        salida = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {modulo}"],
+                                cwd=RAIZ, capture_output=True, text=True, check=True)
+        for linea in salida.stderr.splitlines():
+            # import time: propio | acumulado | módulo (con sangría según la profundidad)
+            _, acumulado, nombre = linea.split("|")
+            if nombre.strip() == modulo:
+                tiempos.append(int(acumulado) / 1000)
+    return min(tiempos)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.bench_arranque",
+                                     description="Tiempo de importación frente a su presupuesto.")
+    parser.add_argument("--ejecuciones", type=int, default=5, help="ejecuciones por módulo (se toma la mejor)")
+    args = parser.parse_args(argv)
+
+    excedidos = 0
+    print(f"{'módulo':<24} {'tiempo (ms)':>12} {'presupuesto (ms)':>17}")
+    for modulo, presupuesto in PRESUPUESTOS_MS.items():
+        tiempo = tiempo_importacion_ms(modulo, args.ejecuciones)
+        excedido = tiempo >= presupuesto
+        excedidos += excedido
+        print(f"{modulo:<24} {tiempo:>12.1f} {presupuesto:>17}" + ("  EXCEDIDO" if excedido else ""))
+    return 1 if excedidos else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
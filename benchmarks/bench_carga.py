@@ -0,0 +1,85 @@
+import csv
+import os
+import sys
+import tempfile
+import time
+import numpy as np
+from src.celeste.simulador import Simulador
+from src.celeste.vector3d import Vector3D
+from src.celeste.instantanea import leer_instantanea
+
+# Velocidad de carga de catálogos (cuerpos/s): la lectura fila a fila anterior
+# (csv.reader + un _insertar_cuerpo por cuerpo) frente a Simulador.cargar, que lee
+# por bloques de columnas (o instantáneas binarias) y agrega con agregar_cuerpos.
+# También se muestra el tamaño de cada archivo y la lectura de las columnas de una
+# instantánea sin crear los cuerpos (leer_instantanea), que es solo E/S.
+# Uso (desde la raíz del proyecto): python -m benchmarks.bench_carga [N]
+
+N = 200_000
+
+
+def crear_catalogo(n: int, directorio: str):
+    """Escribe el mismo catálogo aleatorio de n cuerpos en todos los formatos."""
+    rng = np.random.default_rng(0)
+    sim = Simulador(motor="numpy", imprimir_pasos=False)
+    sim.agregar_cuerpos([f"C{i}" for i in range(n)], rng.uniform(1e20, 1e25, n),
+                        rng.normal(scale=1e11, size=(n, 3)), rng.normal(scale=1e4, size=(n, 3)))
+    rutas = {}
+    for extension in ("csv", "json", "npy", "cel", "celz"):
+        rutas[extension] = os.path.join(directorio, f"catalogo.{extension}")
+        sim.guardar(rutas[extension])
+    return rutas
+
+
+def cargar_fila_a_fila(sim: Simulador, archivo: str):
+    """Lectura CSV anterior: tres objetos y una inserción por cuerpo."""
+    with open(archivo, 'r', newline='') as f:
+        reader = csv.reader(f, delimiter=';')
+        next(reader)
+        for row in reader:
+            sim._insertar_cuerpo(row[0], float(row[1]),
+                                 Vector3D(float(row[2]), float(row[3]), float(row[4])),
+                                 Vector3D(float(row[5]), float(row[6]), float(row[7])))
+
+
+def medir(motor: str, cargar) -> float:
+    """Devuelve la duración de una carga en un simulador vacío."""
+    sim = Simulador(motor=motor, imprimir_pasos=False)
+    inicio = time.perf_counter()
+    cargar(sim)
+    return time.perf_counter() - inicio
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else N
+    with tempfile.TemporaryDirectory() as directorio:
+        rutas = crear_catalogo(n, directorio)
+        casos = [
+            ("CSV fila a fila (anterior)", lambda sim: cargar_fila_a_fila(sim, rutas["csv"])),
+            ("CSV por bloques", lambda sim: sim.cargar(rutas["csv"])),
+            ("JSON", lambda sim: sim.cargar(rutas["json"])),
+            ("NPY por bloques", lambda sim: sim.cargar(rutas["npy"])),
+            ("Instantánea .cel", lambda sim: sim.cargar(rutas["cel"])),
+            ("Instantánea .celz", lambda sim: sim.cargar(rutas["celz"])),
+        ]
+        print(f"N = {n}")
+        print("| Formato | Tamaño (MB) |")
+        print("|---|---|")
+        for extension, ruta in rutas.items():
+            print(f"| .{extension} | {os.path.getsize(ruta) / 1e6:.1f} |")
+        for extension in ("cel", "celz"):
+            inicio = time.perf_counter()
+            leer_instantanea(rutas[extension])
+            duracion = time.perf_counter() - inicio
+            print(f"leer_instantanea(.{extension}): {duracion:.3f} s, "
+                  f"{os.path.getsize(rutas[extension]) / duracion / 1e9:.2f} GB/s del archivo")
+        print("| Carga | Motor | Tiempo (s) | Cuerpos/s |")
+        print("|---|---|---|---|")
+        for nombre, cargar in casos:
+            for motor in Simulador.MOTORES:
+                duracion = medir(motor, cargar)
+                print(f"| {nombre} | {motor} | {duracion:.2f} | {n / duracion:.3g} |")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+import os
+import sys
+import time
+from src.celeste.simulador import Simulador
+from src.celeste.vector3d import Vector3D
+from src.celeste.conjuntos import Conjunto, PerturbacionVelocidades
+
+# Escalado del ejecutor de conjuntos con el número de procesos: MIEMBROS copias
+# perturbadas del sistema solar interior integradas durante un año con leapfrog.
+# Uso (desde la raíz del proyecto): python -m benchmarks.bench_conjuntos [miembros]
+
+ANIO = 365.25 * 86400.0
+MIEMBROS = 64
+
+
+def sistema_interior() -> Simulador:
+    sim = Simulador(integrador="leapfrog", imprimir_pasos=False)
+    sim._insertar_cuerpo("Sol", 1.989e30, Vector3D(0, 0, 0), Vector3D(0, 0, 0))
+    sim._insertar_cuerpo("Mercurio", 3.301e23, Vector3D(5.791e10, 0, 0), Vector3D(0, 4.736e4, 0))
+    sim._insertar_cuerpo("Venus", 4.867e24, Vector3D(1.082e11, 0, 0), Vector3D(0, 3.502e4, 0))
+    sim._insertar_cuerpo("Tierra", 5.972e24, Vector3D(1.496e11, 0, 0), Vector3D(0, 2.978e4, 0))
+    sim._insertar_cuerpo("Marte", 6.39e23, Vector3D(2.279e11, 0, 0), Vector3D(0, 2.407e4, 0))
+    return sim
+
+
+def medir(procesos: int, miembros: int) -> float:
+    """Devuelve los segundos que tarda el conjunto completo con el número de procesos dado."""
+    conjunto = Conjunto(sistema_interior(), [PerturbacionVelocidades(1e-4)], dt=ANIO / 365,
+                        tiempo_total=ANIO, procesos=procesos)
+    inicio = time.perf_counter()
+    for _ in conjunto.ejecutar(miembros):
+        pass
+    return time.perf_counter() - inicio
+
+
+def main():
+    miembros = int(sys.argv[1]) if len(sys.argv) > 1 else MIEMBROS
+    nucleos = os.cpu_count() or 1
+    procesos = sorted({1, *(p for p in (2, 4, 8, 16, 32, 64) if p <= nucleos), nucleos})
+    print(f"{miembros} miembros, {nucleos} núcleos")
+    print("| Procesos | Tiempo (s) | Aceleración | Eficiencia |")
+    print("|---|---|---|---|")
+    base = None
+    for p in procesos:
+        duracion = medir(p, miembros)
+        base = base or duracion
+        print(f"| {p} | {duracion:.3f} | {base / duracion:.2f} | {base / duracion / p:.0%} |")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+import sys
+import time
+import numpy as np
+from src.celeste.encuentros import MonitorEncuentros
+from src.celeste.simulador import Simulador
+
+# Coste por paso de la detección de encuentros (esferas de Hill) en un anillo de
+# planetesimales alrededor de una estrella: el MonitorEncuentros, con su lista de
+# Verlet (incluidas las reconstrucciones), frente a medir todos los pares en cada
+# paso por bloques. Los cuerpos avanzan en línea recta con su velocidad orbital,
+# porque solo se mide el índice y no las fuerzas.
+# Uso (desde la raíz del proyecto): python -m benchmarks.bench_encuentros [N ...]
+
+TAMANOS = (1000, 10000, 100000)
+PASOS = 50
+DT = 3600.0
+BLOQUE = 256
+# Más allá de este N la búsqueda de todos los pares se cronometra en BLOQUES_MUESTRA
+# bloques de filas y se extrapola, y no se comprueba el número de encuentros
+N_MAXIMO_TODOS = 20000
+BLOQUES_MUESTRA = 8
+
+
+def anillo(n: int) -> Simulador:
+    """Estrella de 1 masa solar y n planetesimales de 1e22-1e24 kg entre 0.9 y 1.1 UA."""
+    rng = np.random.default_rng(0)
+    sim = Simulador(motor="numpy", imprimir_pasos=False)
+    r = rng.uniform(1.35e11, 1.65e11, n)
+    angulo = rng.uniform(0, 2 * np.pi, n)
+    v = np.sqrt(sim.G * 1.989e30 / r)
+    posiciones = np.column_stack([r * np.cos(angulo), r * np.sin(angulo), rng.normal(scale=2e9, size=n)])
+    velocidades = np.column_stack([-v * np.sin(angulo), v * np.cos(angulo), np.zeros(n)])
+    sim.agregar_cuerpos(["Sol"] + [f"P{i}" for i in range(n)], np.concatenate([[1.989e30], 10 ** rng.uniform(22, 24, n)]),
+                        np.vstack([np.zeros(3), posiciones]), np.vstack([np.zeros(3), velocidades]))
+    return sim
+
+
+def todos_los_pares(masas, posiciones, filas=None) -> int:
+    """Número de pares en encuentro midiendo todos los pares por bloques (solo las primeras filas si se da)."""
+    radios = np.linalg.norm(posiciones - posiciones[0], axis=1) * np.cbrt(masas / (3.0 * masas[0]))
+    radios[0] = 0.0
+    total = 0
+    for inicio in range(0, filas or len(masas), BLOQUE):
+        fin = min(inicio + BLOQUE, len(masas))
+        d = posiciones[None, :, :] - posiciones[inicio:fin, None, :]
+        cerca = (d * d).sum(axis=2) < np.maximum(radios[inicio:fin, None], radios[None, :]) ** 2
+        total += int(cerca.sum())
+    # Cada cuerpo con radio está a distancia 0 de sí mismo
+    return (total - int((radios > 0).sum())) // 2
+
+
+def main():
+    tamanos = [int(n) for n in sys.argv[1:]] or TAMANOS
+    print("| N | Todos los pares (ms/paso) | Lista de Verlet (ms/paso) | Reconstrucciones | Pares en la lista | Encuentros |")
+    print("|---|---|---|---|---|---|")
+    for n in tamanos:
+        sim = anillo(n)
+        almacen = sim._almacen
+        muestra = n <= N_MAXIMO_TODOS
+        pasos_todos, filas = (PASOS, None) if muestra else (1, BLOQUES_MUESTRA * BLOQUE)
+        inicio = time.perf_counter()
+        for _ in range(pasos_todos):
+            todos_los_pares(almacen.masas, almacen.posiciones, filas)
+        por_paso_todos = (time.perf_counter() - inicio) / pasos_todos * (len(almacen.masas) / (filas or len(almacen.masas)))
+
+        monitor = MonitorEncuentros()
+        duracion = 0.0
+        posiciones = almacen.posiciones
+        for paso in range(PASOS):
+            posiciones += almacen.velocidades * DT
+            inicio = time.perf_counter()
+            monitor.actualizar(sim, paso * DT, paso)
+            duracion += time.perf_counter() - inicio
+        encuentros = todos_los_pares(almacen.masas, posiciones) if muestra else "sin comprobar"
+        print(f"| {n} | {1000 * por_paso_todos:.1f}{'' if muestra else ' (extrapolado)'} | {1000 * duracion / PASOS:.2f} "
+              f"| {monitor.reconstrucciones} | {monitor.pares_lista} | {len(monitor.activos)} (todos los pares: {encuentros}) |",
+              flush=True)
+
+
+if __name__ == '__main__':
+    main()
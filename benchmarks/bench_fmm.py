@@ -0,0 +1,55 @@
+import sys
+import time
+import numpy as np
+from src.celeste.barnes_hut import SolverBarnesHut
+from src.celeste.fmm import SolverFMM
+from src.celeste.nucleos import SolverDirecto, errores_relativos
+
+# Curvas de precisión frente a velocidad: FMM con varios órdenes y valores de
+# theta, Barnes–Hut con varios theta y la suma directa, sobre la misma nube de N
+# cuerpos. El error es el relativo de la aceleración frente a la suma directa
+# sobre una muestra de cuerpos (percentil 99 y mediana).
+# Uso (desde la raíz del proyecto): python -m benchmarks.bench_fmm [N ...]
+
+G = 6.67430e-11
+TAMANOS = (1000, 10000, 100000)
+MUESTRA = 1000
+# Más allá de este N la suma directa completa no se cronometra (solo la muestra)
+N_MAXIMO_DIRECTO = 30000
+THETAS_BH = (0.8, 0.6, 0.5, 0.4, 0.3)
+CONFIGURACIONES_FMM = ((2, 0.6), (4, 0.6), (4, 0.5), (6, 0.5), (6, 0.4), (8, 0.4))
+
+
+def medir(solver, masas, posiciones):
+    """Devuelve el tiempo de una evaluación y el informe de error frente a la suma directa."""
+    inicio = time.perf_counter()
+    aceleraciones = solver.aceleraciones(masas, posiciones, G)
+    duracion = time.perf_counter() - inicio
+    return duracion, errores_relativos(aceleraciones, masas, posiciones, G, MUESTRA)
+
+
+def main():
+    tamanos = [int(n) for n in sys.argv[1:]] or TAMANOS
+    print("| N | Solver | Parámetros | Tiempo (s) | Error p99 | Error mediana |")
+    print("|---|---|---|---|---|---|")
+    for n in tamanos:
+        rng = np.random.default_rng(0)
+        masas = rng.uniform(1e20, 1e24, n)
+        posiciones = rng.normal(scale=1e11, size=(n, 3))
+        if n <= N_MAXIMO_DIRECTO:
+            inicio = time.perf_counter()
+            SolverDirecto().aceleraciones(masas, posiciones, G)
+            print(f"| {n} | directo | | {time.perf_counter() - inicio:.3f} | 0 | 0 |")
+        for theta in THETAS_BH:
+            duracion, errores = medir(SolverBarnesHut(theta), masas, posiciones)
+            print(f"| {n} | barnes_hut | theta={theta} | {duracion:.3f} "
+                  f"| {errores['p99']:.1e} | {errores['mediana']:.1e} |", flush=True)
+        for orden, theta in CONFIGURACIONES_FMM:
+            solver = SolverFMM(orden=orden, theta=theta)
+            duracion, errores = medir(solver, masas, posiciones)
+            print(f"| {n} | fmm | orden={orden}, theta={theta} | {duracion:.3f} "
+                  f"| {errores['p99']:.1e} | {errores['mediana']:.1e} |", flush=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+import time
+from src.celeste.simulador import Simulador
+from src.celeste.vector3d import Vector3D
+
+# Compara la deriva de energía frente al tiempo de cálculo de cada integrador
+# en el sistema Sol-Tierra del README, integrado durante ANIOS años.
+# Uso (desde la raíz del proyecto): python -m benchmarks.bench_integradores
+
+ANIO = 365.25 * 86400.0
+ANIOS = 10
+INTEGRADORES = ("euler", "leapfrog", "yoshida4", "rk4")
+PASOS_POR_ANIO = (12, 52, 365, 3650)
+
+
+def sol_tierra(integrador: str) -> Simulador:
+    sim = Simulador(integrador=integrador, imprimir_pasos=False)
+    sim._insertar_cuerpo("Sol", 1.989e30, Vector3D(0, 0, 0), Vector3D(0, 0, 0))
+    sim._insertar_cuerpo("Tierra", 5.972e24, Vector3D(1.5e11, 0, 0), Vector3D(0, 2.978e4, 0))
+    return sim
+
+
+def energia(sim: Simulador) -> float:
+    return sim._calcular_energia_cinetica_total() + sim._calcular_energia_potencial_total()
+
+
+def medir(integrador: str, pasos_por_anio: int):
+    """Devuelve (error relativo máximo de energía, segundos de cálculo) de una ejecución."""
+    dt = ANIO / pasos_por_anio
+    pasos = ANIOS * pasos_por_anio
+
+    # Tiempo: ejecución sin diagnósticos
+    sim = sol_tierra(integrador)
+    inicio = time.perf_counter()
+    for _ in range(pasos):
+        sim.integrador.paso(sim, dt)
+    duracion = time.perf_counter() - inicio
+
+    # Error de energía: misma ejecución midiendo la energía tras cada paso
+    sim = sol_tierra(integrador)
+    e0 = energia(sim)
+    error_max = 0.0
+    for _ in range(pasos):
+        sim.integrador.paso(sim, dt)
+        error_max = max(error_max, abs((energia(sim) - e0) / e0))
+    return error_max, duracion
+
+
+def main():
+    print(f"Sol-Tierra, {ANIOS} años")
+    print("| Integrador | Pasos/año | dt (h) | Error de energía | Tiempo (s) |")
+    print("|---|---|---|---|---|")
+    for integrador in INTEGRADORES:
+        for pasos in PASOS_POR_ANIO:
+            error, duracion = medir(integrador, pasos)
+            dt_horas = ANIO / pasos / 3600.0
+            print(f"| {integrador} | {pasos} | {dt_horas:.1f} | {error:.2e} | {duracion:.4f} |")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+import os
+import sys
+import time
+import numpy as np
+from src.celeste.nucleos import SolverDirecto
+from src.celeste.paralelo import SolverParalelo
+
+# Escalado fuerte del solver paralelo: mismo sistema de N cuerpos, de 1 a 64 hilos.
+# Se compara con la suma directa simétrica de un solo hilo (SolverDirecto).
+# Uso (desde la raíz del proyecto): python -m benchmarks.bench_paralelo [N] [repeticiones]
+
+G = 6.67430e-11
+N = 20000
+REPETICIONES = 3
+HILOS = (1, 2, 4, 8, 16, 32, 64)
+
+
+def medir(solver, masas, posiciones, repeticiones: int) -> float:
+    """Devuelve el mejor tiempo de una evaluación de fuerzas y potencial."""
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        solver.aceleraciones_y_potencial(masas, posiciones, G)
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else N
+    repeticiones = int(sys.argv[2]) if len(sys.argv) > 2 else REPETICIONES
+    rng = np.random.default_rng(0)
+    masas = rng.uniform(1e20, 1e24, n)
+    posiciones = rng.normal(scale=1e11, size=(n, 3))
+
+    directo = medir(SolverDirecto(), masas, posiciones, repeticiones)
+    print(f"N = {n}, {os.cpu_count()} núcleos. SolverDirecto (1 hilo, simétrico): {directo:.3f} s")
+    print("| Hilos | Tiempo (s) | Aceleración | Eficiencia | Frente a SolverDirecto |")
+    print("|---|---|---|---|---|")
+    base = None
+    for hilos in HILOS:
+        solver = SolverParalelo(hilos=hilos)
+        duracion = medir(solver, masas, posiciones, repeticiones)
+        solver.cerrar()
+        base = base or duracion
+        print(f"| {hilos} | {duracion:.3f} | {base / duracion:.2f} | {base / duracion / hilos:.0%} "
+              f"| {directo / duracion:.2f} |")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+import sys
+import timeit
+from src.celeste.vector3d import Vector3D
+from src.celeste.cuerpo import CuerpoCeleste
+from src.celeste.simulador import Simulador
+
+# Micro-benchmarks de Vector3D y de las actualizaciones de CuerpoCeleste:
+# tiempo por operación (ns/op), Vector3D creados por operación y memoria por Vector3D.
+# Uso (desde la raíz del proyecto): python -m benchmarks.bench_vector3d
+
+REPETICIONES = 100_000
+
+
+def _preparar():
+    a = Vector3D(1.0, 2.0, 3.0)
+    b = Vector3D(4.0, 5.0, 6.0)
+    cuerpo = CuerpoCeleste("C", 2.0, Vector3D(0.0, 0.0, 0.0), Vector3D(1.0, 1.0, 1.0))
+    return a, b, cuerpo
+
+
+def casos():
+    """Devuelve (nombre, función sin argumentos) de cada operación medida."""
+    a, b, cuerpo = _preparar()
+    f = Vector3D(0.5, 0.5, 0.5)
+    lista = [
+        ("a + b", lambda: a + b),
+        ("a - b", lambda: a - b),
+        ("a * k", lambda: a * 2.0),
+        ("a / k", lambda: a / 2.0),
+        ("a + b * k", lambda: a + b * 2.0),
+        ("a.magnitude()", lambda: a.magnitude()),
+        ("cuerpo.mover(dt)", lambda: cuerpo.mover(1e-9)),
+        ("cuerpo.aplicar_fuerza(F, dt)", lambda: cuerpo.aplicar_fuerza(f, 1e-9)),
+    ]
+    if hasattr(Vector3D, "iadd_escalado"):
+        c = Vector3D(0.0, 0.0, 0.0)
+        def iadd():
+            nonlocal c
+            c += b
+        lista += [
+            ("c += b", iadd),
+            ("c.iadd_escalado(b, k)", lambda: c.iadd_escalado(b, 1e-9)),
+            ("a.sumar_escalado(b, k)", lambda: a.sumar_escalado(b, 2.0)),
+        ]
+    return lista
+
+
+def ns_por_operacion(funcion) -> float:
+    return min(timeit.repeat(funcion, number=REPETICIONES, repeat=7)) / REPETICIONES * 1e9
+
+
+def vectores_por_operacion(funcion, repeticiones: int = 1000) -> float:
+    """Número medio de Vector3D creados por operación (incluidos los temporales)."""
+    contador = [0]
+    init_original = Vector3D.__init__
+    def init_contado(self, *args):
+        contador[0] += 1
+        init_original(self, *args)
+    Vector3D.__init__ = init_contado
+    try:
+        for _ in range(repeticiones):
+            funcion()
+    finally:
+        Vector3D.__init__ = init_original
+    return contador[0] / repeticiones
+
+
+def bytes_por_vector() -> int:
+    """Memoria de un Vector3D (objeto más su __dict__, si lo tiene)."""
+    v = Vector3D(1.0, 2.0, 3.0)
+    return sys.getsizeof(v) + (sys.getsizeof(v.__dict__) if hasattr(v, "__dict__") else 0)
+
+
+def fuerzas_ns_por_par(n: int = 200) -> float:
+    sim = Simulador(imprimir_pasos=False)
+    for i in range(n):
+        sim._insertar_cuerpo(f"C{i}", 1e20, Vector3D(i * 1e7, (i * 7 % 13) * 1e7, (i * 3 % 5) * 1e7),
+                             Vector3D(0.0, 0.0, 0.0))
+    def pasada():
+        sim._cache_fuerzas = None
+        sim.calcular_fuerzas()
+    pares = n * (n - 1) / 2
+    return min(timeit.repeat(pasada, number=1, repeat=5)) / pares * 1e9
+
+
+def main():
+    print(f"Memoria por Vector3D: {bytes_por_vector()} bytes")
+    print("| Operación | ns/op | Vector3D/op |")
+    print("|---|---|---|")
+    for nombre, funcion in casos():
+        print(f"| `{nombre}` | {ns_por_operacion(funcion):.0f} | {vectores_por_operacion(funcion):.0f} |")
+    print(f"| `calcular_fuerzas` (N=200, por par) | {fuerzas_ns_por_par():.0f} | - |")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,150 @@
+import math
+import random
+from src.celeste.simulador import Simulador
+
+# Generadores de escenarios reproducibles para los benchmarks: con la misma
+# semilla y el mismo N se obtienen exactamente los mismos cuerpos. Todos los
+# sistemas se devuelven en el sistema del centro de masas (momento total nulo).
+# Las opciones se pasan a Simulador (motor, solver, integrador...).
+
+G = Simulador.G
+MASA_SOL = 1.989e30
+UA = 1.496e11
+PARSEC = 3.0857e16
+
+# (nombre, masa en kg, semieje mayor en m)
+PLANETAS = (
+    ("Mercurio", 3.301e23, 5.791e10),
+    ("Venus", 4.867e24, 1.082e11),
+    ("Tierra", 5.972e24, 1.496e11),
+    ("Marte", 6.417e23, 2.279e11),
+    ("Jupiter", 1.898e27, 7.785e11),
+    ("Saturno", 5.683e26, 1.432e12),
+    ("Urano", 8.681e25, 2.867e12),
+    ("Neptuno", 1.024e26, 4.515e12),
+)
+
+
+def _simulador(ids, masas, posiciones, velocidades, opciones) -> Simulador:
+    """Crea el simulador con los cuerpos dados, pasados al sistema del centro de masas."""
+    masa_total = sum(masas)
+    for columna in (posiciones, velocidades):
+        centro = [sum(m * fila[k] for m, fila in zip(masas, columna)) / masa_total for k in range(3)]
+        columna[:] = [[fila[k] - centro[k] for k in range(3)] for fila in columna]
+    opciones.setdefault("imprimir_pasos", False)
+    sim = Simulador(**opciones)
+    sim.agregar_cuerpos(ids, masas, posiciones, velocidades)
+    return sim
+
+
+def _direccion(rng: random.Random):
+    """Vector unitario con dirección aleatoria uniforme en la esfera."""
+    z = rng.uniform(-1.0, 1.0)
+    fi = rng.uniform(0.0, 2.0 * math.pi)
+    s = math.sqrt(1.0 - z * z)
+    return s * math.cos(fi), s * math.sin(fi), z
+
+
+def esfera_plummer(n: int, semilla: int = 0, masa_total: float = 1e6 * MASA_SOL,
+                   radio: float = PARSEC, **opciones) -> Simulador:
+    """
+    Cúmulo esférico de n cuerpos de igual masa en equilibrio con el perfil de Plummer
+    de radio de escala radio (muestreo de Aarseth, Hénon y Wielen, 1974), truncado a 10 radios.
+    """
+    rng = random.Random(f"plummer:{semilla}")
+    posiciones, velocidades = [], []
+    for _ in range(n):
+        while True:
+            x = rng.random()
+            if x > 0:
+                r = radio / math.sqrt(x ** (-2.0 / 3.0) - 1.0) if x < 1 else 0.0
+                if r < 10.0 * radio:
+                    break
+        # Velocidad: fracción q de la de escape, con densidad q^2 (1 - q^2)^3.5 (rechazo)
+        while True:
+            q, y = rng.random(), rng.random()
+            if 0.1 * y < q * q * (1.0 - q * q) ** 3.5:
+                break
+        v = q * math.sqrt(2.0 * G * masa_total / math.sqrt(r * r + radio * radio))
+        posiciones.append([r * c for c in _direccion(rng)])
+        velocidades.append([v * c for c in _direccion(rng)])
+    masas = [masa_total / n] * n
+    return _simulador([f"P{i}" for i in range(n)], masas, posiciones, velocidades, opciones)
+
+
+def _orbita_circular(rng: random.Random, a: float, masa_central: float, inclinacion_max: float):
+    """Posición y velocidad de una órbita circular de radio a con fase e inclinación aleatorias."""
+    fase = rng.uniform(0.0, 2.0 * math.pi)
+    inclinacion = rng.uniform(-inclinacion_max, inclinacion_max)
+    v = math.sqrt(G * masa_central / a)
+    ci = math.cos(inclinacion)
+    si = math.sin(inclinacion)
+    posicion = [a * math.cos(fase), a * math.sin(fase) * ci, a * math.sin(fase) * si]
+    velocidad = [-v * math.sin(fase), v * math.cos(fase) * ci, v * math.cos(fase) * si]
+    return posicion, velocidad
+
+
+def sistema_solar(n: int = 9, semilla: int = 0, **opciones) -> Simulador:
+    """
+    El Sol, los ocho planetas en órbitas circulares con fases aleatorias y, si n > 9,
+    n - 9 asteroides del cinturón principal (2.2-3.3 UA) con inclinaciones de hasta 5°.
+    Con n < 9 se toman el Sol y los primeros planetas.
+    """
+    rng = random.Random(f"solar:{semilla}")
+    ids, masas = ["Sol"], [MASA_SOL]
+    posiciones, velocidades = [[0.0, 0.0, 0.0]], [[0.0, 0.0, 0.0]]
+    for nombre, masa, a in PLANETAS[:max(n - 1, 0)]:
+        posicion, velocidad = _orbita_circular(rng, a, MASA_SOL, 0.0)
+        ids.append(nombre)
+        masas.append(masa)
+        posiciones.append(posicion)
+        velocidades.append(velocidad)
+    for i in range(n - len(ids)):
+        posicion, velocidad = _orbita_circular(rng, rng.uniform(2.2, 3.3) * UA, MASA_SOL, math.radians(5.0))
+        ids.append(f"A{i}")
+        masas.append(10.0 ** rng.uniform(15.0, 18.0))
+        posiciones.append(posicion)
+        velocidades.append(velocidad)
+    return _simulador(ids[:n], masas[:n], posiciones[:n], velocidades[:n], opciones)
+
+
+def disco_frio(n: int, semilla: int = 0, masa_central: float = MASA_SOL, fraccion_disco: float = 0.01,
+               radio_min: float = 0.5 * UA, radio_max: float = 5.0 * UA, **opciones) -> Simulador:
+    """
+    Una estrella central y n - 1 partículas de igual masa en un disco delgado de
+    densidad superficial uniforme, en órbitas circulares sin dispersión de velocidades
+    (la velocidad circular incluye la masa del disco interior a cada radio).
+    """
+    rng = random.Random(f"disco:{semilla}")
+    masa_disco = fraccion_disco * masa_central
+    ids, masas = ["Estrella"], [masa_central]
+    posiciones, velocidades = [[0.0, 0.0, 0.0]], [[0.0, 0.0, 0.0]]
+    for i in range(n - 1):
+        r = math.sqrt(rng.uniform(radio_min ** 2, radio_max ** 2))
+        interior = masa_disco * (r * r - radio_min ** 2) / (radio_max ** 2 - radio_min ** 2)
+        fase = rng.uniform(0.0, 2.0 * math.pi)
+        v = math.sqrt(G * (masa_central + interior) / r)
+        ids.append(f"D{i}")
+        masas.append(masa_disco / (n - 1))
+        posiciones.append([r * math.cos(fase), r * math.sin(fase), rng.gauss(0.0, 1e-3 * r)])
+        velocidades.append([-v * math.sin(fase), v * math.cos(fase), 0.0])
+    return _simulador(ids[:n], masas[:n], posiciones[:n], velocidades[:n], opciones)
+
+
+ESCENARIOS = {
+    "plummer": esfera_plummer,
+    "solar": sistema_solar,
+    "disco": disco_frio,
+}
+
+
+def paso_tipico(escenario: str, sim: Simulador) -> float:
+    """Paso de tiempo razonable para el escenario (una fracción de su tiempo dinámico)."""
+    masas = [c.masa for c in sim.cuerpos.values()]
+    if escenario == "plummer":
+        # Una milésima del tiempo de cruce sqrt(a^3 / (G M))
+        return math.sqrt(PARSEC ** 3 / (G * sum(masas))) / 1000.0
+    if escenario == "solar":
+        return 86400.0
+    # Disco: 1/200 del periodo en el borde interior
+    return 2.0 * math.pi * math.sqrt((0.5 * UA) ** 3 / (G * masas[0])) / 200.0
@@ -0,0 +1,217 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from benchmarks.escenarios import ESCENARIOS, paso_tipico
+from benchmarks.bench_vector3d import casos as casos_vector3d, ns_por_operacion
+from src.celeste.simulador import Simulador
+
+# Suite de rendimiento y regresión del núcleo de simulación.
+#
+# Para cada caso (escenario, N, motor, solver) mide los pasos/s de paso_simulacion,
+# las interacciones de pares/s (con Barnes–Hut, los N(N-1)/2 pares equivalentes de la
+# suma directa), el pico de memoria (estado más un paso) y el error relativo de energía
+# tras un número fijo de pasos (pasos_energia); además mide las operaciones/s de Vector3D y
+# los cuerpos/s de guardar y cargar. Los resultados se pueden guardar como
+# referencia y comparar con ella: la suite termina con código 1 si alguna métrica
+# de rendimiento cae más del umbral.
+#
+# Uso (desde la raíz del proyecto):
+#   python -m benchmarks.suite --guardar-referencia        # mide y guarda la referencia
+#   python -m benchmarks.suite --comparar --umbral 0.15    # falla si algo empeora > 15 %
+#   python -m benchmarks.suite --max-n 1000 --filtro plummer
+
+REFERENCIA = os.path.join(os.path.dirname(__file__), "referencia.json")
+# Métricas de rendimiento (mayor es mejor) que se comparan con la referencia
+METRICAS_RENDIMIENTO = ("pasos_s", "interacciones_s", "operaciones_s", "cuerpos_s")
+# N a partir del cual no se mide el error de energía con solvers aproximados
+# (la energía potencial exacta costaría O(N^2))
+N_MAX_ENERGIA_APROXIMADA = 20000
+
+# (escenario, N, motor, solver)
+CASOS_PASO = (
+    [(escenario, n, "python", None) for escenario in ESCENARIOS for n in (10, 100, 1000)]
+    + [(escenario, n, "numpy", "directo") for escenario in ESCENARIOS for n in (10, 100, 1000, 10000)]
+    + [(escenario, n, "numpy", "barnes_hut") for escenario in ESCENARIOS for n in (10000, 100000)]
+)
+CASOS_ARCHIVO = [(formato, n) for formato in ("json", "csv", "cel") for n in (1000, 100000)]
+
+
+def nombre_caso(escenario: str, n: int, motor: str, solver: str | None) -> str:
+    return f"paso/{escenario}/n={n}/{motor}" + (f"/{solver}" if solver else "")
+
+
+def _crear(escenario: str, n: int, motor: str, solver: str | None):
+    opciones = {"motor": motor, "integrador": "leapfrog"}
+    if solver:
+        opciones["solver"] = solver
+    return ESCENARIOS[escenario](n, semilla=0, **opciones)
+
+
+def _energia(sim) -> float:
+    return sim._calcular_energia_cinetica_total() + sim._energia_potencial_actual()
+
+
+def pasos_energia(n: int) -> int:
+    """Pasos tras los que se mide el error de energía: fijo para cada N, para que sea reproducible."""
+    return max(2, min(50, 10 ** 6 // (n * n)))
+
+
+def medir_paso(escenario: str, n: int, motor: str, solver: str | None, tiempo_minimo: float) -> dict:
+    """
+    Integra el escenario con leapfrog durante pasos_energia(n) pasos, mide el error de
+    energía (fuera del tiempo medido) y sigue hasta acumular tiempo_minimo segundos.
+    El pico de memoria (el estado más un paso) se mide aparte con tracemalloc, para
+    no alterar los tiempos.
+    """
+    sim = _crear(escenario, n, motor, solver)
+    dt = paso_tipico(escenario, sim)
+    medir_energia = solver != "barnes_hut" or n <= N_MAX_ENERGIA_APROXIMADA
+    e0 = _energia(sim) if medir_energia else None
+    evaluaciones = sim.evaluaciones_fuerzas
+    pasos = 0
+    inicio = time.perf_counter()
+    while pasos < pasos_energia(n):
+        sim.paso_simulacion(dt, pasos * dt)
+        pasos += 1
+    duracion = time.perf_counter() - inicio
+    error = abs((_energia(sim) - e0) / e0) if medir_energia else None
+    inicio = time.perf_counter() - duracion
+    while time.perf_counter() - inicio < tiempo_minimo:
+        sim.paso_simulacion(dt, pasos * dt)
+        pasos += 1
+    duracion = time.perf_counter() - inicio
+    pares = (sim.evaluaciones_fuerzas - evaluaciones) * n * (n - 1) // 2
+    resultado = {
+        "pasos": pasos,
+        "pasos_s": pasos / duracion,
+        "interacciones_s": pares / duracion,
+        "error_energia": error,
+    }
+
+    tracemalloc.start()
+    sim = _crear(escenario, n, motor, solver)
+    sim.paso_simulacion(dt, 0.0)
+    resultado["memoria_pico_mb"] = tracemalloc.get_traced_memory()[1] / 1e6
+    tracemalloc.stop()
+    return resultado
+
+
+def medir_archivo(formato: str, n: int, tiempo_minimo: float) -> dict:
+    """Mide los cuerpos/s de guardar y cargar el escenario plummer con el motor "numpy"."""
+    sim = _crear("plummer", n, "numpy", None)
+    with tempfile.TemporaryDirectory() as directorio:
+        archivo = os.path.join(directorio, f"estado.{formato}")
+        guardar = _repetir(lambda: sim.guardar(archivo), tiempo_minimo)
+        destino = Simulador(motor="numpy", imprimir_pasos=False)
+        cargar = _repetir(lambda: destino.cargar(archivo), tiempo_minimo)
+    return {"cuerpos_s": n / cargar, "cuerpos_s_guardar": n / guardar}
+
+
+def _repetir(funcion, tiempo_minimo: float) -> float:
+    """Mejor duración de funcion() repitiéndola hasta acumular tiempo_minimo segundos."""
+    mejor = float("inf")
+    total = 0.0
+    while total < tiempo_minimo or mejor == float("inf"):
+        inicio = time.perf_counter()
+        funcion()
+        duracion = time.perf_counter() - inicio
+        mejor = min(mejor, duracion)
+        total += duracion
+    return mejor
+
+
+def ejecutar(max_n: int, filtro: str = "", tiempo_minimo: float = 0.5, mostrar=print) -> dict:
+    """Ejecuta los casos con N <= max_n cuyo nombre contiene filtro y devuelve {caso: métricas}."""
+    resultados = {}
+
+    def registrar(nombre, medir):
+        if filtro not in nombre:
+            return
+        # Los mensajes de guardar/cargar no forman parte de la medida
+        salida, sys.stdout = sys.stdout, open(os.devnull, "w")
+        try:
+            resultados[nombre] = medir()
+        finally:
+            sys.stdout.close()
+            sys.stdout = salida
+        mostrar(formatear(nombre, resultados[nombre]))
+
+    for operacion, funcion in casos_vector3d():
+        registrar(f"vector3d/{operacion}", lambda: {"operaciones_s": 1e9 / ns_por_operacion(funcion)})
+    for escenario, n, motor, solver in CASOS_PASO:
+        if n <= max_n:
+            registrar(nombre_caso(escenario, n, motor, solver),
+                      lambda: medir_paso(escenario, n, motor, solver, tiempo_minimo))
+    for formato, n in CASOS_ARCHIVO:
+        if n <= max_n:
+            registrar(f"archivo/{formato}/n={n}", lambda: medir_archivo(formato, n, tiempo_minimo))
+    return resultados
+
+
+def formatear(nombre: str, metricas: dict) -> str:
+    partes = []
+    for clave, valor in metricas.items():
+        if valor is None:
+            continue
+        partes.append(f"{clave}={valor:.3g}" if isinstance(valor, float) else f"{clave}={valor}")
+    return f"{nombre}: " + ", ".join(partes)
+
+
+def comparar(resultados: dict, referencia: dict, umbral: float) -> list:
+    """
+    Devuelve las regresiones (caso, métrica, referencia, actual) de las métricas de
+    rendimiento que han caído más de umbral (fracción) respecto a la referencia.
+    Los casos o métricas que no están en la referencia no se comparan.
+    """
+    regresiones = []
+    for nombre, metricas in resultados.items():
+        anteriores = referencia.get(nombre, {})
+        for metrica in METRICAS_RENDIMIENTO:
+            antes, ahora = anteriores.get(metrica), metricas.get(metrica)
+            if antes and ahora is not None and ahora < antes * (1.0 - umbral):
+                regresiones.append((nombre, metrica, antes, ahora))
+    return regresiones
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.suite",
+                                     description="Suite de rendimiento y regresión del simulador.")
+    parser.add_argument("--max-n", type=int, default=100000, help="mayor N medido")
+    parser.add_argument("--filtro", default="", help="solo los casos cuyo nombre contiene este texto")
+    parser.add_argument("--tiempo", type=float, default=0.5, help="segundos mínimos por medida")
+    parser.add_argument("--referencia", default=REFERENCIA, help="archivo JSON de referencia")
+    parser.add_argument("--guardar-referencia", action="store_true",
+                        help="guarda los resultados como referencia (se fusionan con los existentes)")
+    parser.add_argument("--comparar", action="store_true", help="compara con la referencia")
+    parser.add_argument("--umbral", type=float, default=0.2,
+                        help="caída relativa de rendimiento que cuenta como regresión (por defecto 0.2)")
+    args = parser.parse_args(argv)
+
+    resultados = ejecutar(args.max_n, args.filtro, args.tiempo)
+    codigo = 0
+    if args.comparar:
+        with open(args.referencia) as f:
+            referencia = json.load(f)
+        regresiones = comparar(resultados, referencia, args.umbral)
+        for nombre, metrica, antes, ahora in regresiones:
+            print(f"REGRESIÓN {nombre} {metrica}: {antes:.3g} -> {ahora:.3g} ({ahora / antes - 1:+.0%})")
+        print(f"{len(regresiones)} regresiones (umbral {args.umbral:.0%}) en {len(resultados)} casos")
+        codigo = 1 if regresiones else 0
+    if args.guardar_referencia:
+        referencia = {}
+        if os.path.exists(args.referencia):
+            with open(args.referencia) as f:
+                referencia = json.load(f)
+        referencia.update(resultados)
+        with open(args.referencia, "w") as f:
+            json.dump(referencia, f, indent=1, sort_keys=True)
+        print(f"Referencia guardada en '{args.referencia}'")
+    return codigo
+
+
+if __name__ == '__main__':
+    sys.exit(main())
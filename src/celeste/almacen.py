@@ -0,0 +1,283 @@
+from typing import Dict, List
+import numpy as np
+from .vector3d import Vector3D
+from .cuerpo import CuerpoCeleste
+
+
+class AlmacenCuerpos:
+    """
+    Almacén de cuerpos en formato "estructura de arrays": masas, radios, posiciones,
+    velocidades y aceleraciones se guardan en arrays float64 contiguos.
+    Los arrays reservan capacidad de más y se duplican al llenarse, de modo
+    que agregar un cuerpo tiene coste amortizado O(1).
+    """
+
+    CAPACIDAD_INICIAL = 16
+
+    def __init__(self, capacidad: int = CAPACIDAD_INICIAL):
+        """
+        Inicializa un almacén vacío con la capacidad indicada.
+        """
+        self.n = 0
+        self.ids: List[str] = []
+        self.indices: Dict[str, int] = {}
+        self.vistas: List['CuerpoVista'] = []
+        self._reservar(max(capacidad, 1))
+
+    def _reservar(self, capacidad: int):
+        """Reserva arrays de la capacidad dada conservando los n cuerpos actuales."""
+        masas = np.zeros(capacidad)
+        radios = np.zeros(capacidad)
+        posiciones = np.zeros((capacidad, 3))
+        velocidades = np.zeros((capacidad, 3))
+        aceleraciones = np.zeros((capacidad, 3))
+        if self.n:
+            masas[:self.n] = self._masas[:self.n]
+            radios[:self.n] = self._radios[:self.n]
+            posiciones[:self.n] = self._posiciones[:self.n]
+            velocidades[:self.n] = self._velocidades[:self.n]
+            aceleraciones[:self.n] = self._aceleraciones[:self.n]
+        self._masas = masas
+        self._radios = radios
+        self._posiciones = posiciones
+        self._velocidades = velocidades
+        self._aceleraciones = aceleraciones
+
+    @property
+    def masas(self) -> np.ndarray:
+        """Vista (N,) de las masas de los cuerpos almacenados."""
+        return self._masas[:self.n]
+
+    @property
+    def radios(self) -> np.ndarray:
+        """Vista (N,) de los radios de los cuerpos almacenados (0 para cuerpos puntuales)."""
+        return self._radios[:self.n]
+
+    @property
+    def posiciones(self) -> np.ndarray:
+        """Vista (N, 3) de las posiciones de los cuerpos almacenados."""
+        return self._posiciones[:self.n]
+
+    @property
+    def velocidades(self) -> np.ndarray:
+        """Vista (N, 3) de las velocidades de los cuerpos almacenados."""
+        return self._velocidades[:self.n]
+
+    @property
+    def aceleraciones(self) -> np.ndarray:
+        """Vista (N, 3) de las aceleraciones calculadas en el último paso de fuerzas."""
+        return self._aceleraciones[:self.n]
+
+    def __len__(self) -> int:
+        return self.n
+
+    def agregar(self, id: str, masa: float, posicion: Vector3D, velocidad: Vector3D,
+                radio: float = 0.0) -> 'CuerpoVista':
+        """
+        Agrega un cuerpo al final de los arrays y devuelve la vista que lo representa.
+        Las validaciones de CuerpoCeleste se aplican antes de ocupar la fila.
+        """
+        if id in self.indices:
+            raise ValueError(f"Ya existe un cuerpo con el identificador '{id}'.")
+        if self.n == len(self._masas):
+            self._reservar(2 * len(self._masas))
+        vista = CuerpoVista(self, self.n, id, masa, posicion, velocidad, radio)
+        self.ids.append(id)
+        self.vistas.append(vista)
+        self.indices[id] = self.n
+        self.n += 1
+        return vista
+
+    def agregar_particula(self, id: str, posicion: Vector3D, velocidad: Vector3D,
+                          radio: float = 0.0) -> 'CuerpoVista':
+        """Agrega una partícula de prueba (una fila con masa 0) y devuelve su vista."""
+        if radio < 0:
+            raise ValueError("El radio no puede ser negativo.")
+        return self.agregar_lote([id], [0.0], [posicion.to_list()], [velocidad.to_list()], [radio])[0]
+
+    def agregar_lote(self, ids: List[str], masas, posiciones, velocidades, radios=None) -> List['CuerpoVista']:
+        """
+        Agrega varios cuerpos copiando columnas enteras en los arrays y devuelve sus
+        vistas. Las filas con masa 0 son partículas de prueba. La validación es
+        vectorizada y se hace antes de modificar nada: si algún cuerpo no es válido
+        no se agrega ninguno.
+        """
+        n = len(ids)
+        masas = np.asarray(masas, dtype=float)
+        posiciones = np.asarray(posiciones, dtype=float)
+        velocidades = np.asarray(velocidades, dtype=float)
+        radios = np.zeros(n) if radios is None else np.asarray(radios, dtype=float)
+        if (masas.shape != (n,) or radios.shape != (n,)
+                or posiciones.shape != (n, 3) or velocidades.shape != (n, 3)):
+            raise ValueError("Las columnas del lote deben tener un valor (o un vector) por identificador.")
+        if len(set(ids)) != n:
+            raise ValueError("Hay identificadores repetidos en el lote.")
+        repetidos = [id for id in ids if id in self.indices]
+        if repetidos:
+            raise ValueError(f"Ya existe un cuerpo con el identificador '{repetidos[0]}'.")
+        invalidos = np.flatnonzero(~(masas >= 0))
+        if len(invalidos):
+            raise ValueError(f"La masa debe ser un valor positivo, o 0 para una partícula de prueba "
+                             f"(cuerpo '{ids[invalidos[0]]}').")
+        invalidos = np.flatnonzero(~(radios >= 0))
+        if len(invalidos):
+            raise ValueError(f"El radio no puede ser negativo (cuerpo '{ids[invalidos[0]]}').")
+
+        inicio, fin = self.n, self.n + n
+        if fin > len(self._masas):
+            self._reservar(max(2 * len(self._masas), fin))
+        self._masas[inicio:fin] = masas
+        self._radios[inicio:fin] = radios
+        self._posiciones[inicio:fin] = posiciones
+        self._velocidades[inicio:fin] = velocidades
+        self._aceleraciones[inicio:fin] = 0.0
+        vistas = [CuerpoVista._sobre_fila(self, i, id) for i, id in enumerate(ids, inicio)]
+        self.ids.extend(ids)
+        self.vistas.extend(vistas)
+        self.indices.update(zip(ids, range(inicio, fin)))
+        self.n = fin
+        return vistas
+
+    def eliminar(self, id: str):
+        """
+        Elimina un cuerpo en O(1): la última fila se copia en la del cuerpo eliminado
+        (swap-remove) y la vista del cuerpo movido se actualiza. El resto de cuerpos
+        conserva su fila. La vista del cuerpo eliminado se desvincula (ver _desvincular).
+        """
+        indice = self.indices.pop(id)
+        ultima = self.n - 1
+        self._desvincular([self.vistas[indice]])
+        if indice != ultima:
+            for array in (self._masas, self._radios, self._posiciones, self._velocidades, self._aceleraciones):
+                array[indice] = array[ultima]
+            movido = self.ids[ultima]
+            self.ids[indice] = movido
+            self.vistas[indice] = self.vistas[ultima]
+            self.vistas[indice]._indice = indice
+            self.indices[movido] = indice
+        self.ids.pop()
+        self.vistas.pop()
+        self.n = ultima
+
+    def vaciar(self):
+        """Elimina todos los cuerpos sin liberar la capacidad reservada y desvincula sus vistas."""
+        self._desvincular(self.vistas)
+        self.n = 0
+        self.ids.clear()
+        self.indices.clear()
+        self.vistas.clear()
+
+    def _desvincular(self, vistas: List['CuerpoVista']):
+        """
+        Pasa las vistas de cuerpos que se van a eliminar a un almacén propio con una
+        copia de sus filas. Siguen dando el último estado del cuerpo y se pueden
+        modificar, pero ya no leen ni escriben la fila que pase a ocupar otro cuerpo.
+        """
+        if not vistas:
+            return
+        filas = [vista._indice for vista in vistas]
+        copia = AlmacenCuerpos(len(filas))
+        for nombre in ("_masas", "_radios", "_posiciones", "_velocidades", "_aceleraciones"):
+            getattr(copia, nombre)[:len(filas)] = getattr(self, nombre)[filas]
+        copia.n = len(filas)
+        copia.ids = [vista.id for vista in vistas]
+        copia.indices = {id: fila for fila, id in enumerate(copia.ids)}
+        copia.vistas = list(vistas)
+        for fila, vista in enumerate(copia.vistas):
+            vista._almacen = copia
+            vista._indice = fila
+
+
+class CuerpoVista(CuerpoCeleste):
+    """
+    CuerpoCeleste cuyos atributos de estado (masa, radio, posición, velocidad y fuerza neta)
+    son vistas sobre una fila de un AlmacenCuerpos. Leer un atributo devuelve un
+    Vector3D con los valores actuales de la fila y asignarlo escribe en los arrays,
+    por lo que el código que trabaja con CuerpoCeleste sigue funcionando sin cambios.
+    """
+
+    def __init__(self, almacen: AlmacenCuerpos, indice: int, id: str, masa: float,
+                 posicion: Vector3D, velocidad: Vector3D, radio: float = 0.0):
+        """
+        Inicializa la vista sobre la fila indice del almacén y escribe en ella el estado inicial.
+        """
+        self._almacen = almacen
+        self._indice = indice
+        super().__init__(id, masa, posicion, velocidad, radio)
+
+    @classmethod
+    def _sobre_fila(cls, almacen: AlmacenCuerpos, indice: int, id: str) -> 'CuerpoVista':
+        """Crea la vista de una fila ya escrita (y validada) sin volver a escribir en ella."""
+        vista = cls.__new__(cls)
+        vista._almacen = almacen
+        vista._indice = indice
+        vista.id = id
+        return vista
+
+    @property
+    def masa(self) -> float:
+        return float(self._almacen._masas[self._indice])
+
+    @masa.setter
+    def masa(self, valor: float):
+        self._almacen._masas[self._indice] = valor
+
+    @property
+    def sin_masa(self) -> bool:
+        """Indica si la fila es una partícula de prueba (masa 0)."""
+        return self._almacen._masas[self._indice] == 0
+
+    @property
+    def radio(self) -> float:
+        return float(self._almacen._radios[self._indice])
+
+    @radio.setter
+    def radio(self, valor: float):
+        self._almacen._radios[self._indice] = valor
+
+    @property
+    def posicion(self) -> Vector3D:
+        x, y, z = self._almacen._posiciones[self._indice].tolist()
+        return Vector3D(x, y, z)
+
+    @posicion.setter
+    def posicion(self, valor: Vector3D):
+        self._almacen._posiciones[self._indice] = (valor.x, valor.y, valor.z)
+
+    @property
+    def velocidad(self) -> Vector3D:
+        x, y, z = self._almacen._velocidades[self._indice].tolist()
+        return Vector3D(x, y, z)
+
+    @velocidad.setter
+    def velocidad(self, valor: Vector3D):
+        self._almacen._velocidades[self._indice] = (valor.x, valor.y, valor.z)
+
+    @property
+    def fuerza_neta(self) -> Vector3D:
+        # El almacén guarda aceleraciones; la fuerza es F = m * a
+        masa = self.masa
+        x, y, z = self._almacen._aceleraciones[self._indice].tolist()
+        return Vector3D(x * masa, y * masa, z * masa)
+
+    @fuerza_neta.setter
+    def fuerza_neta(self, valor: Vector3D):
+        masa = self.masa
+        if masa == 0:
+            # Como en ParticulaPrueba, la fuerza neta de una partícula de prueba se
+            # ignora: su fila conserva la aceleración del último cálculo de fuerzas
+            return
+        self._almacen._aceleraciones[self._indice] = (valor.x / masa, valor.y / masa, valor.z / masa)
+
+    def aplicar_fuerza(self, fuerza: Vector3D, dt: float):
+        if self.masa == 0:
+            raise ValueError("Una partícula de prueba no tiene masa: use acelerar(dt) con su aceleración.")
+        super().aplicar_fuerza(fuerza, dt)
+
+    @property
+    def aceleracion(self) -> Vector3D:
+        x, y, z = self._almacen._aceleraciones[self._indice].tolist()
+        return Vector3D(x, y, z)
+
+    def acelerar(self, dt: float):
+        self._almacen._velocidades[self._indice] += self._almacen._aceleraciones[self._indice] * dt
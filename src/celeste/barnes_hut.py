@@ -0,0 +1,314 @@
+from typing import Dict, List, Sequence
+import numpy as np
+from .nucleos import _factores, errores_relativos
+
+
+class Octree:
+    """
+    Octree de cuerpos para el método de Barnes–Hut.
+
+    Los nodos se guardan en arrays paralelos (estructura de arrays): centro
+    geométrico, semilado, masa total, centro de masas, rango de cuerpos e hijos.
+    Los cuerpos se reordenan en self.orden de modo que los de cada nodo ocupan un rango contiguo [inicio, fin).
+    """
+
+    def __init__(self, masas: np.ndarray, posiciones: np.ndarray, hoja_max: int = 16):
+        """
+        Construye el octree de los cuerpos dados. Un nodo se subdivide mientras
+        contenga más de hoja_max cuerpos.
+        """
+        n = len(masas)
+        self.hoja_max = hoja_max
+        self.orden = np.arange(n)
+
+        minimo = posiciones.min(axis=0) if n else np.zeros(3)
+        maximo = posiciones.max(axis=0) if n else np.zeros(3)
+        semilado_raiz = max(float((maximo - minimo).max()) / 2.0, 1e-300) * (1.0 + 1e-12)
+
+        centros: List[np.ndarray] = [(minimo + maximo) / 2.0]
+        semilados: List[float] = [semilado_raiz]
+        inicios: List[int] = [0]
+        fines: List[int] = [n]
+        hijos: List[List[int]] = [[]]
+
+        # Construcción en anchura: cada nodo reparte su rango de cuerpos entre sus octantes
+        pendientes = [0]
+        while pendientes:
+            nodo = pendientes.pop()
+            ini, fin = inicios[nodo], fines[nodo]
+            if fin - ini <= hoja_max:
+                continue
+            indices = self.orden[ini:fin]
+            centro = centros[nodo]
+            p = posiciones[indices]
+            if np.all(p == p[0]):
+                # Cuerpos coincidentes: no se pueden separar, el nodo queda como hoja
+                continue
+            octante = ((p[:, 0] > centro[0]).astype(np.int64)
+                       | ((p[:, 1] > centro[1]).astype(np.int64) << 1)
+                       | ((p[:, 2] > centro[2]).astype(np.int64) << 2))
+            permutacion = np.argsort(octante, kind='stable')
+            self.orden[ini:fin] = indices[permutacion]
+            cortes = np.searchsorted(octante[permutacion], np.arange(9))
+
+            semilado = semilados[nodo] / 2.0
+            for k in range(8):
+                if cortes[k + 1] == cortes[k]:
+                    continue
+                signo = np.array([1.0 if k & 1 else -1.0, 1.0 if k & 2 else -1.0, 1.0 if k & 4 else -1.0])
+                hijo = len(centros)
+                centros.append(centro + signo * semilado)
+                semilados.append(semilado)
+                inicios.append(ini + int(cortes[k]))
+                fines.append(ini + int(cortes[k + 1]))
+                hijos.append([])
+                hijos[nodo].append(hijo)
+                pendientes.append(hijo)
+
+        self.num_nodos = len(centros)
+        self.centros = np.array(centros)
+        self.semilados = np.array(semilados)
+        self.inicios = np.array(inicios)
+        self.fines = np.array(fines)
+        # Hijos de cada nodo en una tabla (num_nodos, 8) con -1 donde no hay hijo
+        self.hijos = np.full((self.num_nodos, 8), -1, dtype=np.int64)
+        for nodo, lista in enumerate(hijos):
+            self.hijos[nodo, :len(lista)] = lista
+        self.es_hoja = self.hijos[:, 0] < 0
+        # Hojas ordenadas por su rango de cuerpos; juntas cubren [0, N) sin solaparse
+        hojas = np.flatnonzero(self.es_hoja)
+        self.hojas = hojas[np.argsort(self.inicios[hojas])]
+
+        # Masa total y centro de masas de cada nodo a partir de sumas prefijas sobre el orden
+        masas_ord = masas[self.orden]
+        momento_ord = masas_ord[:, None] * posiciones[self.orden]
+        masa_acum = np.concatenate(([0.0], np.cumsum(masas_ord)))
+        momento_acum = np.vstack((np.zeros((1, 3)), np.cumsum(momento_ord, axis=0)))
+        self.masas = masa_acum[self.fines] - masa_acum[self.inicios]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            self.centros_masa = (momento_acum[self.fines] - momento_acum[self.inicios]) / self.masas[:, None]
+        self.centros_masa[self.masas == 0] = self.centros[self.masas == 0]
+
+        # Distancia entre centro geométrico y centro de masas, usada en el criterio de apertura
+        self.desplazamientos = np.sqrt(((self.centros_masa - self.centros) ** 2).sum(axis=1))
+
+
+class SolverBarnesHut:
+    """
+    Solver de fuerzas por el método de Barnes–Hut, O(N log N).
+
+    En cada llamada se reconstruye el octree. Las hojas del árbol actúan como grupos
+    de cuerpos: un nodo de lado s cuyo centro de masas está a distancia d del centro
+    de un grupo de radio r_g se aproxima por una masa puntual para todo el grupo si
+    d - r_g > s / theta + delta, donde delta es la distancia entre el centro geométrico
+    y el centro de masas del nodo. Con theta = 0 el resultado coincide con la suma directa.
+    """
+
+    nombre = "barnes_hut"
+
+    # Número máximo de interacciones cuerpo-nodo o cuerpo-cuerpo evaluadas a la vez
+    PARES_POR_LOTE = 1 << 18
+
+    def __init__(self, theta: float = 0.5, hoja_max: int = 16, suavizado=None):
+        """
+        Inicializa el solver con el ángulo de apertura theta, el número máximo de cuerpos
+        por hoja y, opcionalmente, un núcleo de suavizado (ver suavizado.py), que se
+        aplica tanto a los pares directos como a los monopolos.
+        """
+        if theta < 0:
+            raise ValueError("El ángulo de apertura theta no puede ser negativo.")
+        if hoja_max < 1:
+            raise ValueError("hoja_max debe ser al menos 1.")
+        self.theta = theta
+        self.hoja_max = hoja_max
+        self.suavizado = suavizado
+        self.arbol: Octree | None = None
+        # Interacciones evaluadas en la última llamada: cuerpo-nodo (monopolos) más
+        # cuerpo-cuerpo (suma directa entre hojas)
+        self.interacciones = 0
+
+    def aceleraciones(self, masas: np.ndarray, posiciones: np.ndarray, G: float) -> np.ndarray:
+        """Reconstruye el octree y devuelve la aceleración (N, 3) de cada cuerpo."""
+        return self.aceleraciones_y_potencial(masas, posiciones, G)[0]
+
+    def aceleraciones_y_potencial(self, masas: np.ndarray, posiciones: np.ndarray, G: float):
+        """
+        Devuelve la aceleración (N, 3) de cada cuerpo y la energía potencial total
+        U = -G/2 * sum_i m_i * phi_i, donde phi_i se acumula en el mismo recorrido con
+        la misma aproximación que la fuerza (monopolos de los nodos aceptados y suma
+        directa entre hojas). La energía es -inf si dos cuerpos coinciden (salvo con
+        suavizado), igual que en la suma directa.
+        """
+        self.interacciones = 0
+        self.arbol = Octree(masas, posiciones, self.hoja_max)
+        return self._recorrer(self.arbol, masas, posiciones, G)
+
+    def _recorrer(self, arbol: Octree, masas: np.ndarray, posiciones: np.ndarray, G: float):
+        """
+        Recorre el árbol para todos los grupos (hojas) a la vez. Se mantiene una lista
+        de pares (grupo, nodo) que se procesa nivel a nivel de forma vectorizada: los
+        pares que cumplen el criterio de apertura pasan a la lista monopolar, los pares
+        hoja-hoja que no lo cumplen a la lista de suma directa y el resto se sustituye
+        por los pares (grupo, hijo). Devuelve (aceleraciones, energía potencial).
+        """
+        n = len(masas)
+        aceleraciones = np.zeros((n, 3))
+        if n < 2:
+            return aceleraciones, 0.0
+
+        hojas = arbol.hojas
+        # Esfera que envuelve los cuerpos de cada hoja
+        extremo_min = np.minimum.reduceat(posiciones[arbol.orden], arbol.inicios[hojas], axis=0)
+        extremo_max = np.maximum.reduceat(posiciones[arbol.orden], arbol.inicios[hojas], axis=0)
+        centro_grupo = np.zeros((arbol.num_nodos, 3))
+        radio_grupo = np.zeros(arbol.num_nodos)
+        centro_grupo[hojas] = (extremo_min + extremo_max) / 2.0
+        radio_grupo[hojas] = np.sqrt((((extremo_max - extremo_min) / 2.0) ** 2).sum(axis=1))
+
+        lado = 2.0 * arbol.semilados
+        grupos = hojas.copy()
+        nodos = np.zeros(len(hojas), dtype=np.int64)
+        monopolos = []
+        directos = []
+        while len(grupos):
+            cg = centro_grupo[grupos]
+            rg = radio_grupo[grupos]
+            if self.theta > 0:
+                d = np.sqrt(((arbol.centros_masa[nodos] - cg) ** 2).sum(axis=1))
+                limite = lado[nodos] / self.theta + arbol.desplazamientos[nodos]
+                # Un grupo nunca acepta un nodo que lo contiene (evita la autointeracción)
+                fuera = (np.abs(cg - arbol.centros[nodos]) > (arbol.semilados[nodos] + rg)[:, None]).any(axis=1)
+                acepta = (d - rg > limite) & fuera
+            else:
+                acepta = np.zeros(len(grupos), dtype=bool)
+            monopolos.append((grupos[acepta], nodos[acepta]))
+
+            grupos, nodos = grupos[~acepta], nodos[~acepta]
+            es_hoja = arbol.es_hoja[nodos]
+            directos.append((grupos[es_hoja], nodos[es_hoja]))
+
+            grupos, nodos = grupos[~es_hoja], nodos[~es_hoja]
+            hijos = arbol.hijos[nodos]
+            existe = hijos >= 0
+            grupos = np.repeat(grupos, existe.sum(axis=1))
+            nodos = hijos[existe]
+
+        g_mono = np.concatenate([g for g, _ in monopolos])
+        s_mono = np.concatenate([s for _, s in monopolos])
+        g_dir = np.concatenate([g for g, _ in directos])
+        s_dir = np.concatenate([s for _, s in directos])
+        tam = arbol.fines - arbol.inicios
+        self.interacciones = int(tam[g_mono].sum() + (tam[g_dir] * tam[s_dir]).sum())
+
+        # La evaluación trabaja en el orden del árbol, donde los cuerpos de cada nodo son contiguos
+        orden = arbol.orden
+        xyz = tuple(np.ascontiguousarray(posiciones[orden, k]) for k in range(3))
+        masas_ord = masas[orden]
+        acumulada = np.zeros((3, n))
+        potencial = np.zeros(n)
+        self._aplicar_monopolos(arbol, g_mono, s_mono, xyz, acumulada, potencial)
+        colision = self._aplicar_directos(arbol, g_dir, s_dir, masas_ord, xyz, acumulada, potencial)
+
+        aceleraciones[orden] = acumulada.T
+        aceleraciones *= G
+        if colision:
+            return aceleraciones, float('-inf')
+        return aceleraciones, -0.5 * G * float(masas_ord @ potencial)
+
+    def _aplicar_monopolos(self, arbol: Octree, grupos: np.ndarray, nodos: np.ndarray,
+                           xyz: tuple, acumulada: np.ndarray, potencial: np.ndarray):
+        """Suma a cada cuerpo de cada grupo la atracción y el potencial monopolares del nodo aceptado."""
+        tam = arbol.fines[grupos] - arbol.inicios[grupos]
+        for ini, fin in _lotes(tam, self.PARES_POR_LOTE):
+            cuerpos, rep = _expandir(arbol, grupos[ini:fin], tam[ini:fin])
+            fuentes = nodos[ini:fin][rep]
+            cm = arbol.centros_masa[fuentes]
+            d = [cm[:, k] - xyz[k][cuerpos] for k in range(3)]
+            f, g = _factores(d[0] * d[0] + d[1] * d[1] + d[2] * d[2], self.suavizado)
+            m = arbol.masas[fuentes]
+            _acumular(acumulada, cuerpos, g * m, d)
+            potencial += np.bincount(cuerpos, weights=f * m, minlength=len(potencial))
+
+    def _aplicar_directos(self, arbol: Octree, grupos: np.ndarray, hojas: np.ndarray,
+                          masas_ord: np.ndarray, xyz: tuple, acumulada: np.ndarray,
+                          potencial: np.ndarray) -> bool:
+        """
+        Suma directa entre los cuerpos de cada grupo y los de la hoja fuente (pares a
+        distancia cero ignorados en la fuerza). Devuelve True si dos cuerpos distintos
+        coinciden sin suavizado, en cuyo caso la energía potencial es -inf.
+        """
+        colision = False
+        tam_g = arbol.fines[grupos] - arbol.inicios[grupos]
+        tam_s = arbol.fines[hojas] - arbol.inicios[hojas]
+        for ini, fin in _lotes(tam_g * tam_s, self.PARES_POR_LOTE):
+            cuerpos, rep = _expandir(arbol, grupos[ini:fin], tam_g[ini:fin])
+            fuentes, rep2 = _expandir(arbol, hojas[ini:fin][rep], tam_s[ini:fin][rep])
+            cuerpos = cuerpos[rep2]
+            d = [xyz[k][fuentes] - xyz[k][cuerpos] for k in range(3)]
+            r2 = d[0] * d[0] + d[1] * d[1] + d[2] * d[2]
+            f, g = _factores(r2, self.suavizado)
+            m = masas_ord[fuentes]
+            _acumular(acumulada, cuerpos, g * m, d)
+            if self.suavizado is not None:
+                # Con suavizado el par de un cuerpo consigo mismo tiene f finito y no cuenta
+                f = np.where(cuerpos == fuentes, 0.0, f)
+            else:
+                colision = colision or bool(np.any((r2 == 0) & (cuerpos != fuentes)))
+            potencial += np.bincount(cuerpos, weights=f * m, minlength=len(potencial))
+        return colision
+
+    def comparar_con_directo(self, masas: np.ndarray, posiciones: np.ndarray, G: float,
+                             muestra: int | None = 1000, semilla: int = 0) -> Dict[str, float]:
+        """
+        Mide el error relativo |a_BH - a_directa| / |a_directa| sobre una muestra
+        aleatoria de cuerpos (o sobre todos si muestra es None). La referencia se
+        calcula por suma directa solo para la muestra, con coste O(muestra * N).
+        Devuelve un diccionario con el error máximo, la mediana, el percentil 99 y el RMS.
+        """
+        aproximadas = self.aceleraciones(masas, posiciones, G)
+        return {"theta": self.theta,
+                **errores_relativos(aproximadas, masas, posiciones, G, muestra, semilla, self.suavizado)}
+
+
+def elegir_theta(masas: np.ndarray, posiciones: np.ndarray, G: float, error_objetivo: float,
+                 candidatos: Sequence[float] = (1.0, 0.8, 0.7, 0.6, 0.5, 0.4, 0.3, 0.2, 0.1),
+                 metrica: str = "p99", muestra: int | None = 1000) -> float:
+    """
+    Devuelve el mayor theta de los candidatos cuyo error relativo (según la métrica
+    de SolverBarnesHut.comparar_con_directo) no supera error_objetivo. Si ninguno lo
+    cumple devuelve 0.0, que equivale a la suma directa.
+    """
+    for theta in sorted(candidatos, reverse=True):
+        informe = SolverBarnesHut(theta).comparar_con_directo(masas, posiciones, G, muestra)
+        if informe[metrica] <= error_objetivo:
+            return theta
+    return 0.0
+
+
+def _lotes(costes: np.ndarray, maximo: int):
+    """Divide una lista de tareas en rangos [ini, fin) cuya suma de costes no supera mucho maximo."""
+    acumulado = np.cumsum(costes)
+    ini = 0
+    while ini < len(costes):
+        base = acumulado[ini - 1] if ini else 0
+        fin = int(np.searchsorted(acumulado, base + maximo, side='right'))
+        fin = max(fin, ini + 1)
+        yield ini, fin
+        ini = fin
+
+
+def _expandir(arbol: Octree, nodos: np.ndarray, tam: np.ndarray):
+    """
+    Expande cada nodo en las posiciones (en el orden del árbol) de sus cuerpos.
+    Devuelve esas posiciones y, para cada una, el índice del nodo de origen en el array de entrada.
+    """
+    rep = np.repeat(np.arange(len(nodos)), tam)
+    desplazamiento = np.arange(len(rep)) - np.repeat(np.cumsum(tam) - tam, tam)
+    return arbol.inicios[nodos][rep] + desplazamiento, rep
+
+
+def _acumular(acumulada: np.ndarray, cuerpos: np.ndarray, w: np.ndarray, d: list):
+    """Suma w * d a las columnas (3, N) indicadas por cuerpos, admitiendo índices repetidos."""
+    n = acumulada.shape[1]
+    for k in range(3):
+        acumulada[k] += np.bincount(cuerpos, weights=w * d[k], minlength=n)
@@ -0,0 +1,133 @@
+"""
+Carga masiva de catálogos de condiciones iniciales.
+
+Los catálogos se leen por bloques de filas en columnas NumPy (identificadores,
+masas, posiciones, velocidades y radios) que se entregan directamente a
+Simulador.agregar_cuerpos, sin crear objetos por cuerpo durante la lectura ni
+mostrar nada por consola. Solo hay un bloque en memoria a la vez, así que el
+archivo puede ser mayor que la memoria disponible (lo que tiene que caber es el
+estado del simulador, no el texto del archivo).
+
+Formatos:
+  - .csv: el mismo formato de Simulador.guardar (separador ';', encabezado
+    id;masa;pos_x;pos_y;pos_z;vel_x;vel_y;vel_z y una columna radio opcional).
+  - .npy: un array estructurado con los campos id, masa, posicion (3),
+    velocidad (3) y radio, escrito con guardar_npy. Se lee mapeado en memoria.
+"""
+
+import itertools
+from typing import Iterator, Tuple
+import numpy as np
+
+# Filas por bloque de lectura por defecto (unos 10 MB de texto CSV)
+FILAS_POR_BLOQUE = 100_000
+
+ENCABEZADO_CSV = ['id', 'masa', 'pos_x', 'pos_y', 'pos_z', 'vel_x', 'vel_y', 'vel_z']
+
+
+def tipo_npy(longitud_id: int) -> np.dtype:
+    """Tipo de las filas de un catálogo .npy con identificadores de hasta longitud_id caracteres."""
+    return np.dtype([("id", f"U{max(longitud_id, 1)}"), ("masa", "f8"), ("posicion", "f8", (3,)),
+                     ("velocidad", "f8", (3,)), ("radio", "f8")])
+
+
+def leer_bloques(archivo: str, filas: int = FILAS_POR_BLOQUE) -> Iterator[Tuple]:
+    """
+    Recorre un catálogo .csv o .npy por bloques de como mucho filas cuerpos.
+    Cada bloque es (ids, masas, posiciones, velocidades, radios), con ids una lista
+    de str y el resto arrays float64 de forma (n,), (n, 3), (n, 3) y (n,).
+    """
+    if filas < 1:
+        raise ValueError("El número de filas por bloque debe ser al menos 1.")
+    if archivo.endswith('.csv'):
+        return _bloques_csv(archivo, filas)
+    if archivo.endswith('.npy'):
+        return _bloques_npy(archivo, filas)
+    raise ValueError("Formato de catálogo no soportado. Use .csv o .npy")
+
+
+def _bloques_csv(archivo: str, filas: int):
+    with open(archivo, 'r', newline='') as f:
+        encabezado = f.readline().rstrip('\r\n').split(';')
+        if encabezado[:len(ENCABEZADO_CSV)] != ENCABEZADO_CSV:
+            raise ValueError(f"'{archivo}' no tiene el encabezado de un catálogo CSV.")
+        columnas = len(encabezado)
+        while True:
+            lineas = list(itertools.islice(f, filas))
+            if not lineas:
+                return
+            if any('"' in linea for linea in lineas):
+                # Identificadores entrecomillados por el módulo csv: se leen con él
+                yield _bloque_csv_lento(lineas, columnas)
+                continue
+            ids = [linea.partition(';')[0] for linea in lineas]
+            valores = np.loadtxt(lineas, delimiter=';', usecols=range(1, columnas), ndmin=2)
+            yield _columnas(ids, valores)
+
+
+def _bloque_csv_lento(lineas, columnas: int):
+    import csv
+    ids, valores = [], []
+    for fila in csv.reader(lineas, delimiter=';'):
+        ids.append(fila[0])
+        valores.append([float(v) for v in fila[1:columnas]])
+    return _columnas(ids, np.array(valores).reshape(len(ids), columnas - 1))
+
+
+def _columnas(ids, valores: np.ndarray):
+    """Separa la matriz masa, pos_x..vel_z[, radio] de un bloque CSV en columnas."""
+    radios = valores[:, 7] if valores.shape[1] > 7 else np.zeros(len(ids))
+    return ids, valores[:, 0], valores[:, 1:4], valores[:, 4:7], radios
+
+
+def _bloques_npy(archivo: str, filas: int):
+    datos = np.load(archivo, mmap_mode='r')
+    if datos.dtype.names is None or not {"id", "masa", "posicion", "velocidad"} <= set(datos.dtype.names):
+        raise ValueError(f"'{archivo}' no es un catálogo .npy.")
+    for inicio in range(0, len(datos), filas):
+        bloque = datos[inicio:inicio + filas]
+        radios = (np.array(bloque["radio"], dtype=float) if "radio" in datos.dtype.names
+                  else np.zeros(len(bloque)))
+        yield (bloque["id"].tolist(), np.array(bloque["masa"], dtype=float),
+               np.array(bloque["posicion"], dtype=float), np.array(bloque["velocidad"], dtype=float), radios)
+
+
+def cargar_catalogo(sim, archivo: str, filas: int = FILAS_POR_BLOQUE) -> int:
+    """
+    Agrega al simulador los cuerpos de un catálogo .csv o .npy, bloque a bloque,
+    y devuelve el número de cuerpos agregados. Los cuerpos existentes se conservan.
+    Si un bloque no se puede leer o tiene un cuerpo no válido, se eliminan los
+    cuerpos de los bloques anteriores antes de propagar el error: o se carga el
+    catálogo entero o no se carga nada.
+    """
+    agregados = []
+    try:
+        for ids, masas, posiciones, velocidades, radios in leer_bloques(archivo, filas):
+            sim.agregar_cuerpos(ids, masas, posiciones, velocidades, radios)
+            agregados.extend(ids)
+    except Exception:
+        # En orden inverso cada cuerpo eliminado es el último, así que el resto no se mueve
+        for id in reversed(agregados):
+            sim._eliminar_cuerpo(id)
+        raise
+    return len(agregados)
+
+
+def guardar_npy(sim, archivo: str):
+    """Guarda los cuerpos del simulador como catálogo .npy (ver tipo_npy)."""
+    cuerpos = list(sim.cuerpos.values())
+    datos = np.zeros(len(cuerpos), dtype=tipo_npy(max((len(c.id) for c in cuerpos), default=1)))
+    if sim._almacen is not None:
+        almacen = sim._almacen
+        datos["id"] = almacen.ids
+        datos["masa"] = almacen.masas
+        datos["posicion"] = almacen.posiciones
+        datos["velocidad"] = almacen.velocidades
+        datos["radio"] = almacen.radios
+    else:
+        datos["id"] = [c.id for c in cuerpos]
+        datos["masa"] = [c.masa for c in cuerpos]
+        datos["posicion"] = [c.posicion.to_list() for c in cuerpos]
+        datos["velocidad"] = [c.velocidad.to_list() for c in cuerpos]
+        datos["radio"] = [c.radio for c in cuerpos]
+    np.save(archivo, datos)
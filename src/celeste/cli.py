@@ -0,0 +1,226 @@
+"""
+Línea de comandos no interactiva para ejecuciones por lotes.
+
+Ejemplos:
+    python -m src.celeste.cli sistema.json --dt 3600 --tiempo-total 3.156e7 \
+        --motor numpy --solver barnes_hut --integrador leapfrog --salida final.json
+    python -m src.celeste.cli --reanudar control.pkl --punto-control control.pkl
+
+Por defecto no se escribe nada durante la ejecución; al terminar se muestra un
+resumen con el rendimiento (pasos/s e interacciones de pares/s).
+"""
+
+import argparse
+import sys
+import time
+from .simulador import Simulador
+from .integradores import INTEGRADORES
+from .observadores import ObservadorConsola
+from .suavizado import SUAVIZADOS, crear_suavizado
+from .main import run_simulation
+
+
+def crear_parser() -> argparse.ArgumentParser:
+    """Devuelve el analizador de argumentos de la línea de comandos."""
+    parser = argparse.ArgumentParser(
+        prog="python -m src.celeste.cli",
+        description="Ejecuta una simulación gravitatoria sin interacción a partir de un archivo de estado.")
+    parser.add_argument("estado", nargs="?",
+                        help="archivo de estado inicial (.json, .csv, .cel, .celz o .npy, como los de Simulador.guardar)")
+    parser.add_argument("--reanudar", metavar="ARCHIVO",
+                        help="continúa desde un punto de control (con su dt, tiempo total e integrador)")
+
+    simulacion = parser.add_argument_group("simulación")
+    simulacion.add_argument("--dt", type=float, help="paso de tiempo en segundos")
+    simulacion.add_argument("--tiempo-total", type=float, help="tiempo total simulado en segundos")
+    simulacion.add_argument("--motor", choices=Simulador.MOTORES,
+                            help="motor de cálculo (por defecto 'numpy' si se elige un solver, si no 'python')")
+    simulacion.add_argument("--integrador", choices=list(INTEGRADORES) + ["hermite_bloques", "wisdom_holman"],
+                            help="integrador temporal (por defecto euler)")
+    simulacion.add_argument("--solver", choices=Simulador.SOLVERS, help="solver de fuerzas (motor 'numpy')")
+    simulacion.add_argument("--theta", type=float,
+                            help="ángulo de apertura de los solvers barnes_hut y fmm (por defecto 0.5)")
+    simulacion.add_argument("--orden", type=int,
+                            help="orden de las expansiones del solver fmm (por defecto 4)")
+    simulacion.add_argument("--precision", choices=("float64", "float32"),
+                            help="precisión de la suma directa (solver directo, por defecto float64); float32 "
+                                 "es más rápida y tiene un error relativo de ~1e-7")
+    simulacion.add_argument("--hilos", type=int, metavar="N",
+                            help="hilos del solver paralelo (por defecto, uno por núcleo)")
+    simulacion.add_argument("--colisiones", action="store_true",
+                            help="fusiona los cuerpos cuyos radios se solapan y muestra las fusiones al final")
+    simulacion.add_argument("--encuentros", action="store_true",
+                            help="detecta los encuentros cercanos (esferas de Hill) y los muestra al final")
+    simulacion.add_argument("--radio-encuentro", type=float, metavar="METROS",
+                            help="radio de encuentro común en lugar del radio de Hill (requiere --encuentros)")
+    simulacion.add_argument("--suavizado", choices=list(SUAVIZADOS),
+                            help="núcleo de suavizado gravitatorio (requiere --epsilon)")
+    simulacion.add_argument("--epsilon", type=float, metavar="METROS", help="longitud de suavizado")
+
+    salida = parser.add_argument_group("salida")
+    salida.add_argument("--salida", metavar="ARCHIVO",
+                        help="guarda el estado final (.json, .csv, .cel, .celz o .npy)")
+    salida.add_argument("--trayectoria", metavar="ARCHIVO",
+                        help="registra la trayectoria en formato binario (ver trayectoria.py)")
+    salida.add_argument("--intervalo-trayectoria", type=int, default=1, metavar="N",
+                        help="pasos entre dos tramas de la trayectoria")
+    salida.add_argument("--punto-control", metavar="ARCHIVO", help="guarda puntos de control en este archivo")
+    salida.add_argument("--intervalo-control", type=int, default=1000, metavar="N",
+                        help="pasos entre dos puntos de control")
+    salida.add_argument("--diagnosticos", type=int, default=0, metavar="N",
+                        help="muestra energías y momento cada N pasos (0: nunca)")
+    salida.add_argument("--mostrar-pasos", action="store_true", help="muestra un mensaje en cada paso")
+    salida.add_argument("--salida-asincrona", action="store_true",
+                        help="escribe los diagnósticos y la trayectoria desde un hilo aparte (ver salida.py)")
+    salida.add_argument("--perfil", metavar="ARCHIVO",
+                        help="mide el tiempo de cada fase, escribe el perfil en JSON Lines ('-': salida de errores) "
+                             "y muestra la tabla de fases al final")
+    salida.add_argument("--intervalo-perfil", type=int, default=1000, metavar="N",
+                        help="pasos entre dos líneas del perfil")
+    return parser
+
+
+def _crear_simulador(args, parser) -> Simulador:
+    """Crea el simulador pedido y carga en él el estado inicial."""
+    motor = args.motor or ("numpy" if args.solver or args.precision not in (None, "float64") else "python")
+    suavizado = None
+    if args.suavizado:
+        if args.epsilon is None:
+            parser.error("--suavizado requiere --epsilon")
+        try:
+            suavizado = crear_suavizado(args.suavizado, args.epsilon)
+        except ValueError as e:
+            parser.error(str(e))
+    solver = args.solver
+    # Opciones que solo usa un solver concreto: no se ignoran en silencio
+    for opcion, valor, solvers in (("--theta", args.theta, ("barnes_hut", "fmm")), ("--orden", args.orden, ("fmm",)),
+                                   ("--hilos", args.hilos, ("paralelo",))):
+        if valor is not None and solver not in solvers:
+            parser.error(f"{opcion} solo se aplica al solver {' o '.join(solvers)}")
+    theta = 0.5 if args.theta is None else args.theta
+    if args.precision not in (None, "float64"):
+        if solver not in (None, "directo"):
+            parser.error("--precision solo se aplica al solver directo")
+        from .nucleos import SolverDirecto
+        solver = SolverDirecto(precision=args.precision)
+    elif solver == "barnes_hut":
+        from .barnes_hut import SolverBarnesHut
+        solver = SolverBarnesHut(theta=theta)
+    elif solver == "fmm":
+        from .fmm import SolverFMM
+        solver = SolverFMM(orden=4 if args.orden is None else args.orden, theta=theta)
+    elif solver == "paralelo":
+        from .paralelo import SolverParalelo
+        solver = SolverParalelo(hilos=args.hilos)
+    try:
+        sim = Simulador(motor=motor, solver=solver, integrador=args.integrador or "euler", imprimir_pasos=False,
+                        colisiones=args.colisiones, suavizado=suavizado)
+    except ValueError as e:
+        parser.error(str(e))
+    sim.cargar(args.estado)
+    return sim
+
+
+def main(argv=None) -> int:
+    """Punto de entrada de la línea de comandos. Devuelve el código de salida."""
+    parser = crear_parser()
+    args = parser.parse_args(argv)
+
+    tiempo_inicial, paso_inicial = 0.0, 0
+    if args.reanudar:
+        # El simulador se reconstruye tal como estaba en el punto de control
+        ignoradas = [opcion for opcion, valor in (
+            ("estado", args.estado), ("--motor", args.motor), ("--solver", args.solver),
+            ("--integrador", args.integrador), ("--theta", args.theta), ("--orden", args.orden),
+            ("--hilos", args.hilos), ("--precision", args.precision), ("--suavizado", args.suavizado),
+            ("--epsilon", args.epsilon), ("--colisiones", args.colisiones or None)) if valor is not None]
+        if ignoradas:
+            parser.error(f"--reanudar restaura el simulador del punto de control y no admite {', '.join(ignoradas)}")
+        from .puntos_control import cargar_punto_control, restaurar_estado
+        estado = cargar_punto_control(args.reanudar)
+        sim = restaurar_estado(estado, imprimir_pasos=False)
+        dt = args.dt or estado["parametros"]["dt"]
+        tiempo_total = args.tiempo_total or estado["parametros"]["total_time"]
+        tiempo_inicial, paso_inicial = estado["tiempo"], estado["paso"]
+    else:
+        if args.estado is None:
+            parser.error("indique un archivo de estado o --reanudar")
+        if args.dt is None or args.tiempo_total is None:
+            parser.error("--dt y --tiempo-total son obligatorios")
+        dt, tiempo_total = args.dt, args.tiempo_total
+        sim = _crear_simulador(args, parser)
+    if dt <= 0 or tiempo_total <= 0:
+        parser.error("El paso de tiempo y el tiempo total deben ser positivos.")
+
+    # Observadores que hay que cerrar al terminar (escritores y salidas asíncronas)
+    cerrar = []
+    if args.diagnosticos > 0:
+        consola = ObservadorConsola()
+        if args.salida_asincrona:
+            from .salida import DestinoConsola, SalidaAsincrona
+            consola = SalidaAsincrona([DestinoConsola()])
+            cerrar.append(consola)
+        sim.agregar_observador(consola, intervalo=args.diagnosticos)
+    if args.trayectoria:
+        if args.salida_asincrona:
+            from .salida import DestinoTrayectoria, SalidaAsincrona
+            escritor = SalidaAsincrona([DestinoTrayectoria(args.trayectoria)])
+        else:
+            from .trayectoria import EscritorTrayectoria
+            escritor = EscritorTrayectoria(args.trayectoria)
+        cerrar.append(escritor)
+        sim.agregar_observador(escritor, intervalo=args.intervalo_trayectoria)
+    monitor = None
+    if args.encuentros:
+        from .encuentros import MonitorEncuentros
+        try:
+            monitor = MonitorEncuentros(radio=args.radio_encuentro)
+        except ValueError as e:
+            parser.error(str(e))
+        sim.agregar_observador(monitor)
+    elif args.radio_encuentro is not None:
+        parser.error("--radio-encuentro requiere --encuentros")
+    registro_perfil = None
+    if args.perfil:
+        from .perfilado import RegistroPerfil
+        sim.activar_perfilado()
+        registro_perfil = RegistroPerfil(sys.stderr if args.perfil == "-" else args.perfil)
+        sim.agregar_observador(registro_perfil, intervalo=args.intervalo_perfil)
+
+    # Interacciones de pares evaluadas por el solver (ver Simulador.interacciones)
+    interacciones_previas = sim.interacciones
+    inicio = time.perf_counter()
+    try:
+        pasos = run_simulation(sim, dt, tiempo_total, checkpoint=args.punto_control,
+                               checkpoint_interval=args.intervalo_control,
+                               current_time=tiempo_inicial, step=paso_inicial,
+                               verbose=args.mostrar_pasos)
+    finally:
+        for observador in cerrar:
+            observador.cerrar()
+        if registro_perfil is not None:
+            registro_perfil.cerrar()
+    duracion = time.perf_counter() - inicio
+
+    if args.salida:
+        sim.guardar(args.salida)
+
+    interacciones = sim.interacciones - interacciones_previas
+    por_segundo = (lambda x: x / duracion) if duracion > 0 else (lambda x: float("inf"))
+    print(f"Cuerpos: {len(sim.cuerpos)}  Integrador: {getattr(sim.integrador, 'nombre', type(sim.integrador).__name__)}"
+          f"  Motor: {sim.motor}"
+          + (f"  Solver: {sim.solver.nombre}" if sim.solver is not None else ""))
+    print(f"Pasos: {pasos} en {duracion:.3f} s ({por_segundo(pasos):.1f} pasos/s)")
+    print(f"Interacciones de pares: {interacciones} ({por_segundo(interacciones):.3e} pares/s)")
+    if sim.colisiones is not None:
+        print(f"Fusiones: {len(sim.colisiones.eventos)}")
+    if monitor is not None:
+        inicios = sum(evento.tipo == "inicio" for evento in monitor.eventos)
+        print(f"Encuentros: {inicios} (en curso al final: {len(monitor.activos)})")
+    if sim.perfilador is not None:
+        print(sim.perfilador.texto())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,147 @@
+"""
+Colección de cuerpos del simulador (Simulador.cuerpos).
+
+Se usa como un dict id -> cuerpo, pero guarda los cuerpos en una lista densa en
+el orden de las filas del AlmacenCuerpos del motor "numpy", de modo que la
+posición de un cuerpo al recorrer la colección es su fila en los arrays:
+
+  - agregar un cuerpo lo pone al final, en O(1);
+  - eliminarlo mueve el último cuerpo a su hueco (swap-remove), también en O(1),
+    igual que AlmacenCuerpos.eliminar; el resto de cuerpos no cambia de posición;
+  - cada cuerpo recibe al agregarse un índice estable, un entero que no cambia
+    aunque cambie su fila y que no se reutiliza (indice, por_indice);
+  - values() recorre directamente la lista, sin copiarla ni buscar cada id.
+"""
+
+from collections.abc import ItemsView, MutableMapping, ValuesView
+
+
+class ColeccionCuerpos(MutableMapping):
+    """
+    Mapeo id -> cuerpo con los cuerpos en una lista densa, índices estables y
+    eliminación en O(1) por intercambio con el último (ver el módulo).
+    """
+
+    def __init__(self):
+        """
+        Inicializa una colección vacía.
+        """
+        self._cuerpos: list = []
+        self._ids: list[str] = []
+        self._filas: dict[str, int] = {}
+        # Índice estable de cada fila y fila de cada índice estable
+        self._indices: list[int] = []
+        self._fila_de_indice: dict[int, int] = {}
+        self._siguiente_indice = 0
+        self._tupla_ids = None
+
+    def __len__(self) -> int:
+        return len(self._cuerpos)
+
+    def __contains__(self, id) -> bool:
+        return id in self._filas
+
+    def __iter__(self):
+        return iter(self._ids)
+
+    def __getitem__(self, id: str):
+        return self._cuerpos[self._filas[id]]
+
+    def get(self, id: str, defecto=None):
+        fila = self._filas.get(id)
+        return defecto if fila is None else self._cuerpos[fila]
+
+    def __setitem__(self, id: str, cuerpo):
+        """Agrega el cuerpo al final o, si el id ya existe, lo sustituye en su fila."""
+        fila = self._filas.get(id)
+        if fila is not None:
+            self._cuerpos[fila] = cuerpo
+            return
+        self._filas[id] = len(self._cuerpos)
+        self._fila_de_indice[self._siguiente_indice] = len(self._cuerpos)
+        self._cuerpos.append(cuerpo)
+        self._ids.append(id)
+        self._indices.append(self._siguiente_indice)
+        self._siguiente_indice += 1
+        self._tupla_ids = None
+
+    def __delitem__(self, id: str):
+        """Elimina el cuerpo moviendo el último a su fila."""
+        fila = self._filas.pop(id)
+        del self._fila_de_indice[self._indices[fila]]
+        ultima = len(self._cuerpos) - 1
+        if fila != ultima:
+            movido = self._ids[ultima]
+            self._cuerpos[fila] = self._cuerpos[ultima]
+            self._ids[fila] = movido
+            self._indices[fila] = self._indices[ultima]
+            self._filas[movido] = fila
+            self._fila_de_indice[self._indices[fila]] = fila
+        self._cuerpos.pop()
+        self._ids.pop()
+        self._indices.pop()
+        self._tupla_ids = None
+
+    def clear(self):
+        """Elimina todos los cuerpos. Los índices estables no se reutilizan."""
+        self._cuerpos.clear()
+        self._ids.clear()
+        self._filas.clear()
+        self._indices.clear()
+        self._fila_de_indice.clear()
+        self._tupla_ids = None
+
+    def extender(self, ids: list[str], cuerpos: list):
+        """Agrega al final cuerpos con identificadores nuevos y distintos (ya validados)."""
+        inicio, indice = len(self._cuerpos), self._siguiente_indice
+        fin = inicio + len(ids)
+        self._filas.update(zip(ids, range(inicio, fin)))
+        self._fila_de_indice.update(zip(range(indice, indice + len(ids)), range(inicio, fin)))
+        self._cuerpos.extend(cuerpos)
+        self._ids.extend(ids)
+        self._indices.extend(range(indice, indice + len(ids)))
+        self._siguiente_indice += len(ids)
+        self._tupla_ids = None
+
+    def values(self):
+        return _Valores(self)
+
+    def items(self):
+        return _Elementos(self)
+
+    def __repr__(self) -> str:
+        return repr(dict(zip(self._ids, self._cuerpos)))
+
+    @property
+    def lista(self) -> list:
+        """Lista de los cuerpos en orden de fila. No debe modificarse."""
+        return self._cuerpos
+
+    @property
+    def ids(self) -> tuple[str, ...]:
+        """Identificadores en orden de fila (la tupla se reutiliza mientras no cambie la colección)."""
+        if self._tupla_ids is None:
+            self._tupla_ids = tuple(self._ids)
+        return self._tupla_ids
+
+    def fila(self, id: str) -> int:
+        """Posición actual del cuerpo (su fila en el almacén del motor "numpy")."""
+        return self._filas[id]
+
+    def indice(self, id: str) -> int:
+        """Índice estable del cuerpo: no cambia mientras el cuerpo esté en la colección."""
+        return self._indices[self._filas[id]]
+
+    def por_indice(self, indice: int):
+        """Devuelve el cuerpo con el índice estable dado (KeyError si ya no está)."""
+        return self._cuerpos[self._fila_de_indice[indice]]
+
+
+class _Valores(ValuesView):
+    def __iter__(self):
+        return iter(self._mapping._cuerpos)
+
+
+class _Elementos(ItemsView):
+    def __iter__(self):
+        return zip(self._mapping._ids, self._mapping._cuerpos)
@@ -0,0 +1,262 @@
+"""
+Detección y fusión de colisiones entre cuerpos con radio.
+
+La búsqueda de pares se hace en dos fases:
+  - Fase amplia: una tabla hash espacial uniforme con celdas de lado al menos
+    2 * radio máximo. Dos cuerpos que se tocan están en la misma celda o en celdas
+    vecinas, así que solo se comparan los cuerpos de cada celda con los de la
+    propia celda y los de sus 13 vecinas "hacia delante" (cada par de celdas una
+    sola vez). Con una densidad acotada por celda el coste es O(N).
+  - Fase estrecha: de los candidatos se quedan los pares con |r_i - r_j| <= R_i + R_j.
+
+Los cuerpos que chocan (incluidas las cadenas a-b, b-c en el mismo paso) se
+fusionan en el más masivo del grupo conservando la masa, el momento lineal y el
+volumen, y cada fusión se registra como un EventoColision.
+"""
+
+import math
+from collections import defaultdict
+from typing import Dict, List, Sequence, Tuple
+from .vector3d import Vector3D
+
+# Desplazamientos a las 13 celdas vecinas "hacia delante" (la mitad de las 26)
+_VECINAS = [(dx, dy, dz)
+            for dx in (-1, 0, 1) for dy in (-1, 0, 1) for dz in (-1, 0, 1)
+            if (dx, dy, dz) > (0, 0, 0)]
+
+
+class EventoColision:
+    """Registro de una fusión: quién absorbió a quién, cuándo y con qué resultado."""
+
+    def __init__(self, tiempo: float, paso: int, superviviente: str, absorbidos: List[str],
+                 masa: float, posicion: Vector3D, velocidad: Vector3D, radio: float,
+                 energia_disipada: float):
+        self.tiempo = tiempo
+        self.paso = paso
+        self.superviviente = superviviente
+        self.absorbidos = absorbidos
+        self.masa = masa
+        self.posicion = posicion
+        self.velocidad = velocidad
+        self.radio = radio
+        # Energía cinética perdida en la fusión (choque perfectamente inelástico)
+        self.energia_disipada = energia_disipada
+
+    def __repr__(self) -> str:
+        return (f"EventoColision(t={self.tiempo}, paso={self.paso}, superviviente='{self.superviviente}', "
+                f"absorbidos={self.absorbidos}, masa={self.masa})")
+
+
+def pares_candidatos(posiciones, radios, tamano_celda: float | None = None) -> List[Tuple[int, int]]:
+    """
+    Fase amplia: devuelve los pares (i, j), i < j, de cuerpos en la misma celda o en
+    celdas vecinas de una tabla hash espacial. posiciones es un array (N, 3) o una
+    secuencia de tuplas (x, y, z); por defecto el lado de celda es 2 * radio máximo.
+    """
+    if tamano_celda is None:
+        tamano_celda = 2.0 * max(radios, default=0.0)
+    if len(radios) < 2 or tamano_celda <= 0:
+        return []
+    if hasattr(posiciones, "shape"):
+        indices = candidatos_numpy(posiciones, tamano_celda)
+        if indices is not None:
+            return list(zip(*(a.tolist() for a in indices)))
+    return _candidatos_python(posiciones, tamano_celda)
+
+
+def pares_en_contacto(posiciones, radios, tamano_celda: float | None = None) -> List[Tuple[int, int]]:
+    """Devuelve los pares (i, j), i < j, cuya distancia es menor o igual que la suma de sus radios."""
+    return _en_contacto(posiciones, radios, pares_candidatos(posiciones, radios, tamano_celda))
+
+
+def _en_contacto(posiciones, radios, candidatos: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """Fase estrecha: filtra los candidatos que se tocan."""
+    if not candidatos:
+        return []
+    if hasattr(posiciones, "shape"):
+        import numpy as np
+        i, j = np.array(candidatos).T
+        radios = np.asarray(radios)
+        d = posiciones[j] - posiciones[i]
+        tocan = (d * d).sum(axis=1) <= (radios[i] + radios[j]) ** 2
+        return [candidatos[k] for k in np.flatnonzero(tocan).tolist()]
+    contacto = []
+    for i, j in candidatos:
+        pi, pj = posiciones[i], posiciones[j]
+        d2 = (pj[0] - pi[0]) ** 2 + (pj[1] - pi[1]) ** 2 + (pj[2] - pi[2]) ** 2
+        if d2 <= (radios[i] + radios[j]) ** 2:
+            contacto.append((i, j))
+    return contacto
+
+
+def _candidatos_python(posiciones, tamano_celda: float) -> List[Tuple[int, int]]:
+    """Tabla hash espacial con un diccionario de celdas."""
+    celdas: Dict[Tuple[int, int, int], List[int]] = defaultdict(list)
+    for i, (x, y, z) in enumerate(posiciones):
+        celdas[(math.floor(x / tamano_celda), math.floor(y / tamano_celda),
+                math.floor(z / tamano_celda))].append(i)
+    pares = []
+    for (cx, cy, cz), miembros in celdas.items():
+        for a in range(len(miembros)):
+            for b in range(a + 1, len(miembros)):
+                pares.append(_ordenar(miembros[a], miembros[b]))
+        for dx, dy, dz in _VECINAS:
+            vecinos = celdas.get((cx + dx, cy + dy, cz + dz))
+            if vecinos:
+                pares.extend(_ordenar(i, j) for i in miembros for j in vecinos)
+    return pares
+
+
+def candidatos_numpy(posiciones, tamano_celda: float):
+    """
+    Tabla hash espacial vectorizada: cada celda se codifica en un entero, los cuerpos
+    se ordenan por celda y las celdas vecinas se buscan con searchsorted. Devuelve
+    los pares como dos arrays de índices (i, j), i < j, o None si las celdas ocupan
+    un rango demasiado grande para codificarlas en int64.
+    """
+    import numpy as np
+    celdas = np.floor(posiciones / tamano_celda).astype(np.int64)
+    # Margen de una celda a cada lado para que los vecinos nunca se salgan del rango
+    minimo = celdas.min(axis=0) - 1
+    dims = celdas.max(axis=0) - minimo + 2
+    if math.prod(int(d) for d in dims) >= 2 ** 62:
+        return None
+    celdas -= minimo
+    claves = (celdas[:, 0] * dims[1] + celdas[:, 1]) * dims[2] + celdas[:, 2]
+
+    orden = np.argsort(claves, kind="stable")
+    unicas, inicios, cuentas = np.unique(claves[orden], return_index=True, return_counts=True)
+
+    todos_i, todos_j = [], []
+    for dx, dy, dz in [(0, 0, 0)] + _VECINAS:
+        desplazamiento = (dx * dims[1] + dy) * dims[2] + dz
+        if desplazamiento == 0:
+            a = np.flatnonzero(cuentas > 1)
+            b = a
+        else:
+            pos = np.searchsorted(unicas, unicas + desplazamiento)
+            pos = np.minimum(pos, len(unicas) - 1)
+            a = np.flatnonzero(unicas[pos] == unicas + desplazamiento)
+            b = pos[a]
+        if len(a) == 0:
+            continue
+        # Todas las combinaciones de un miembro de la celda a con uno de la celda b
+        na, nb = cuentas[a], cuentas[b]
+        total = na * nb
+        par = np.repeat(np.arange(len(a)), total)
+        t = np.arange(total.sum()) - np.repeat(np.cumsum(total) - total, total)
+        i = inicios[a][par] + t // nb[par]
+        j = inicios[b][par] + t % nb[par]
+        if desplazamiento == 0:
+            mantener = i < j
+            i, j = i[mantener], j[mantener]
+        todos_i.append(orden[i])
+        todos_j.append(orden[j])
+
+    if not todos_i:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    i = np.concatenate(todos_i)
+    j = np.concatenate(todos_j)
+    return np.minimum(i, j), np.maximum(i, j)
+
+
+def _ordenar(i: int, j: int) -> Tuple[int, int]:
+    return (i, j) if i < j else (j, i)
+
+
+def _grupos(pares: Sequence[Tuple[int, int]]) -> List[List[int]]:
+    """Agrupa los cuerpos conectados por pares en contacto (unión-búsqueda), en orden de índice."""
+    padre: Dict[int, int] = {}
+
+    def raiz(i):
+        padre.setdefault(i, i)
+        while padre[i] != i:
+            padre[i] = padre[padre[i]]
+            i = padre[i]
+        return i
+
+    for i, j in pares:
+        ri, rj = raiz(i), raiz(j)
+        if ri != rj:
+            padre[max(ri, rj)] = min(ri, rj)
+    grupos: Dict[int, List[int]] = defaultdict(list)
+    for i in sorted(padre):
+        grupos[raiz(i)].append(i)
+    return list(grupos.values())
+
+
+class DetectorColisiones:
+    """
+    Detecta tras cada paso los cuerpos cuyos radios se solapan y los fusiona.
+    Se activa con Simulador(colisiones=DetectorColisiones()) o colisiones=True.
+    Los eventos quedan en self.eventos.
+    """
+
+    def __init__(self, tamano_celda: float | None = None):
+        """
+        tamano_celda fija el lado de las celdas de la tabla hash; por defecto se usa
+        2 * radio máximo en cada paso. Debe ser al menos 2 * radio máximo.
+        """
+        self.tamano_celda = tamano_celda
+        self.eventos: List[EventoColision] = []
+        # Pares comparados en la fase estrecha en la última llamada a procesar
+        self.candidatos = 0
+
+    def procesar(self, sim, tiempo: float = 0.0, paso: int = 0) -> List[EventoColision]:
+        """Fusiona los grupos de cuerpos en contacto y devuelve los eventos nuevos."""
+        cuerpos = sim.cuerpos.lista
+        if sim._almacen is not None:
+            posiciones = sim._almacen.posiciones
+            radios = sim._almacen.radios.tolist()
+        else:
+            posiciones = [(c.posicion.x, c.posicion.y, c.posicion.z) for c in cuerpos]
+            radios = [c.radio for c in cuerpos]
+        if not any(radios):
+            self.candidatos = 0
+            return []
+
+        candidatos = pares_candidatos(posiciones, radios, self.tamano_celda)
+        self.candidatos = len(candidatos)
+        contacto = _en_contacto(posiciones, radios, candidatos)
+        if not contacto:
+            return []
+
+        # Los grupos se forman antes de fusionar: al eliminar cuerpos cambian los índices
+        grupos = [[cuerpos[i] for i in grupo] for grupo in _grupos(contacto)]
+        nuevos = [self._fusionar(sim, grupo, tiempo, paso) for grupo in grupos]
+        self.eventos.extend(nuevos)
+        return nuevos
+
+    def _fusionar(self, sim, grupo, tiempo: float, paso: int) -> EventoColision:
+        """
+        Fusiona un grupo en su cuerpo más masivo conservando masa, momento y volumen.
+        Un grupo solo de partículas de prueba (masa total 0) toma la media simple.
+        """
+        superviviente = max(grupo, key=lambda c: c.masa)
+        masa = 0.0
+        centro = Vector3D(0.0, 0.0, 0.0)
+        momento = Vector3D(0.0, 0.0, 0.0)
+        volumen = 0.0
+        energia_antes = 0.0
+        sin_masa = superviviente.masa == 0
+        for cuerpo in grupo:
+            peso = 1.0 if sin_masa else cuerpo.masa
+            masa += cuerpo.masa
+            centro.iadd_escalado(cuerpo.posicion, peso)
+            momento.iadd_escalado(cuerpo.velocidad, peso)
+            volumen += cuerpo.radio ** 3
+            energia_antes += cuerpo.energia_cinetica()
+        pesos = len(grupo) if sin_masa else masa
+        centro /= pesos
+        momento /= pesos
+
+        superviviente.masa = masa
+        superviviente.posicion = centro
+        superviviente.velocidad = momento
+        superviviente.radio = volumen ** (1.0 / 3.0)
+        absorbidos = [c.id for c in grupo if c is not superviviente]
+        for id in absorbidos:
+            sim._eliminar_cuerpo(id)
+        return EventoColision(tiempo, paso, superviviente.id, absorbidos, masa, centro.copia(),
+                              momento.copia(), superviviente.radio,
+                              energia_antes - superviviente.energia_cinetica())
@@ -0,0 +1,218 @@
+"""
+Ejecución de conjuntos (ensembles) de simulaciones perturbadas en paralelo.
+
+Un conjunto parte de un estado base (capturado con puntos_control.capturar_estado)
+y de una o varias perturbaciones: funciones perturbacion(sim, rng) que modifican
+la copia del sistema de cada miembro usando un random.Random propio del miembro.
+Los miembros se reparten entre un conjunto de procesos:
+
+  - El estado base se envía una sola vez a cada proceso (en su inicialización);
+    cada tarea es solo el índice del miembro.
+  - Los resúmenes de los miembros se devuelven según van terminando y las
+    estadísticas del conjunto se actualizan de forma incremental.
+
+Las perturbaciones y la función de resumen deben poder serializarse con pickle
+(funciones de módulo o instancias de clases como PerturbacionPosiciones).
+"""
+
+import math
+import multiprocessing
+import os
+import random
+import time
+from typing import Callable, Dict, Iterator, List, Sequence
+from .vector3d import Vector3D
+from .puntos_control import capturar_estado, restaurar_estado
+
+# Estado compartido de cada proceso del conjunto, fijado por _inicializar
+_BASE = None
+
+
+class PerturbacionPosiciones:
+    """Desplaza cada componente de la posición de los cuerpos un factor (1 + N(0, sigma))."""
+
+    def __init__(self, sigma: float, ids: Sequence[str] | None = None):
+        """sigma es la desviación relativa; ids limita la perturbación a esos cuerpos."""
+        self.sigma = sigma
+        self.ids = ids
+
+    def __call__(self, sim, rng: random.Random):
+        for cuerpo in _cuerpos(sim, self.ids):
+            p = cuerpo.posicion
+            cuerpo.posicion = Vector3D(p.x * (1.0 + rng.gauss(0.0, self.sigma)),
+                                     p.y * (1.0 + rng.gauss(0.0, self.sigma)),
+                                     p.z * (1.0 + rng.gauss(0.0, self.sigma)))
+
+
+class PerturbacionVelocidades:
+    """Multiplica cada componente de la velocidad de los cuerpos por (1 + N(0, sigma))."""
+
+    def __init__(self, sigma: float, ids: Sequence[str] | None = None):
+        """sigma es la desviación relativa; ids limita la perturbación a esos cuerpos."""
+        self.sigma = sigma
+        self.ids = ids
+
+    def __call__(self, sim, rng: random.Random):
+        for cuerpo in _cuerpos(sim, self.ids):
+            v = cuerpo.velocidad
+            cuerpo.velocidad = Vector3D(v.x * (1.0 + rng.gauss(0.0, self.sigma)),
+                                      v.y * (1.0 + rng.gauss(0.0, self.sigma)),
+                                      v.z * (1.0 + rng.gauss(0.0, self.sigma)))
+
+
+def _cuerpos(sim, ids):
+    """Cuerpos del simulador a los que se aplica una perturbación."""
+    if ids is None:
+        return list(sim.cuerpos.values())
+    return [sim.cuerpos[id] for id in ids]
+
+
+def resumen_estabilidad(sim, energia_inicial: float) -> Dict[str, float]:
+    """
+    Resumen por defecto de un miembro: error relativo de la energía y la mayor
+    distancia de un cuerpo al centro de masas al final de la simulación.
+    """
+    energia_final = sim._calcular_energia_cinetica_total() + sim._energia_potencial_actual()
+    cuerpos = list(sim.cuerpos.values())
+    masa_total = sum(c.masa for c in cuerpos)
+    cx = sum(c.masa * c.posicion.x for c in cuerpos) / masa_total
+    cy = sum(c.masa * c.posicion.y for c in cuerpos) / masa_total
+    cz = sum(c.masa * c.posicion.z for c in cuerpos) / masa_total
+    distancia = max(math.sqrt((c.posicion.x - cx) ** 2 + (c.posicion.y - cy) ** 2 + (c.posicion.z - cz) ** 2)
+                    for c in cuerpos)
+    error = abs((energia_final - energia_inicial) / energia_inicial) if energia_inicial else 0.0
+    return {"energia_final": energia_final, "error_energia": error, "distancia_maxima": distancia}
+
+
+class EstadisticasIncrementales:
+    """
+    Media, desviación típica, mínimo y máximo de cada magnitud numérica de los
+    resúmenes, actualizados uno a uno con el algoritmo de Welford (sin guardar
+    los resúmenes).
+    """
+
+    def __init__(self, ignorar: Sequence[str] = ("indice",)):
+        """ignorar son las claves de los resúmenes que no se agregan."""
+        self.ignorar = set(ignorar)
+        self.n = 0
+        self._media: Dict[str, float] = {}
+        self._m2: Dict[str, float] = {}
+        self.minimo: Dict[str, float] = {}
+        self.maximo: Dict[str, float] = {}
+
+    def agregar(self, resumen: Dict[str, float]):
+        """Incorpora el resumen de un miembro."""
+        self.n += 1
+        for clave, valor in resumen.items():
+            if clave in self.ignorar or isinstance(valor, bool) or not isinstance(valor, (int, float)):
+                continue
+            media = self._media.get(clave, 0.0)
+            delta = valor - media
+            media += delta / self.n
+            self._media[clave] = media
+            self._m2[clave] = self._m2.get(clave, 0.0) + delta * (valor - media)
+            self.minimo[clave] = min(self.minimo.get(clave, valor), valor)
+            self.maximo[clave] = max(self.maximo.get(clave, valor), valor)
+
+    def media(self, clave: str) -> float:
+        """Media de una magnitud."""
+        return self._media[clave]
+
+    def desviacion(self, clave: str) -> float:
+        """Desviación típica muestral de una magnitud (0 con menos de dos miembros)."""
+        if self.n < 2:
+            return 0.0
+        return math.sqrt(self._m2[clave] / (self.n - 1))
+
+    def como_dict(self) -> Dict[str, Dict[str, float]]:
+        """Devuelve las estadísticas de todas las magnitudes."""
+        return {clave: {"media": self.media(clave), "desviacion": self.desviacion(clave),
+                        "minimo": self.minimo[clave], "maximo": self.maximo[clave]}
+                for clave in self._media}
+
+
+class Conjunto:
+    """
+    Conjunto de miembros perturbados de un mismo sistema, integrados en paralelo.
+
+        conjunto = Conjunto(sim, [PerturbacionVelocidades(1e-3)], dt=3600, tiempo_total=ANIO)
+        for resumen in conjunto.ejecutar(200):
+            ...
+        conjunto.estadisticas.como_dict()
+    """
+
+    def __init__(self, sim_base, perturbaciones: Sequence[Callable], dt: float, tiempo_total: float,
+                 procesos: int | None = None, semilla: int = 0, resumen: Callable = resumen_estabilidad):
+        """
+        sim_base es el simulador cuyo estado se copia en cada miembro (con su motor,
+        solver e integrador). procesos es el número de procesos (por defecto, uno por
+        núcleo); con procesos=1 los miembros se integran en el proceso actual.
+        """
+        if dt <= 0 or tiempo_total <= 0:
+            raise ValueError("El paso de tiempo y el tiempo total deben ser positivos.")
+        self.estado_base = capturar_estado(sim_base)
+        self.perturbaciones = list(perturbaciones)
+        self.dt = dt
+        self.tiempo_total = tiempo_total
+        self.procesos = procesos or os.cpu_count() or 1
+        self.semilla = semilla
+        self.resumen = resumen
+        self.estadisticas = EstadisticasIncrementales()
+
+    def _base(self):
+        """Configuración que se comparte una vez con cada proceso."""
+        return (self.estado_base, self.perturbaciones, self.dt, self.tiempo_total,
+                self.semilla, self.resumen)
+
+    def ejecutar(self, miembros: int) -> Iterator[Dict[str, float]]:
+        """
+        Integra miembros copias perturbadas y devuelve sus resúmenes según terminan
+        (no necesariamente en orden de índice), actualizando self.estadisticas.
+        """
+        global _BASE
+        if self.procesos == 1:
+            anterior, _BASE = _BASE, self._base()
+            try:
+                for indice in range(miembros):
+                    resumen = _ejecutar_miembro(indice)
+                    self.estadisticas.agregar(resumen)
+                    yield resumen
+            finally:
+                _BASE = anterior
+            return
+
+        with multiprocessing.Pool(self.procesos, initializer=_inicializar, initargs=(self._base(),)) as pool:
+            for resumen in pool.imap_unordered(_ejecutar_miembro, range(miembros)):
+                self.estadisticas.agregar(resumen)
+                yield resumen
+
+    def ejecutar_todo(self, miembros: int) -> List[Dict[str, float]]:
+        """Integra todos los miembros y devuelve sus resúmenes ordenados por índice."""
+        return sorted(self.ejecutar(miembros), key=lambda r: r["indice"])
+
+
+def _inicializar(base):
+    """Guarda en el proceso el estado base y la configuración del conjunto."""
+    global _BASE
+    _BASE = base
+
+
+def _ejecutar_miembro(indice: int) -> Dict[str, float]:
+    """Restaura el estado base, lo perturba con la semilla del miembro y lo integra."""
+    estado, perturbaciones, dt, tiempo_total, semilla, resumen = _BASE
+    inicio = time.perf_counter()
+    sim = restaurar_estado(estado, imprimir_pasos=False)
+    rng = random.Random(f"{semilla}:{indice}")
+    for perturbacion in perturbaciones:
+        perturbacion(sim, rng)
+    energia_inicial = sim._calcular_energia_cinetica_total() + sim._energia_potencial_actual()
+
+    tiempo = 0.0
+    while tiempo < tiempo_total:
+        sim.paso_simulacion(dt, tiempo)
+        tiempo += dt
+
+    datos = {"indice": indice, "energia_inicial": energia_inicial}
+    datos.update(resumen(sim, energia_inicial))
+    datos["tiempo_calculo"] = time.perf_counter() - inicio
+    return datos
@@ -1,14 +1,22 @@
 from .vector3d import Vector3D
 
 class CuerpoCeleste:
-    def __init__(self, id: str, masa: float, posicion: Vector3D, velocidad: Vector3D):
+    # Los cuerpos con masa participan en la suma de fuerzas; ver ParticulaPrueba
+    sin_masa = False
+
+    def __init__(self, id: str, masa: float, posicion: Vector3D, velocidad: Vector3D,
+                 radio: float = 0.0):
         """
-        Inicializa un nuevo CuerpoCeleste.
+        Inicializa un nuevo CuerpoCeleste. El radio es opcional: con radio 0 el cuerpo
+        es puntual y solo puede chocar con cuerpos que lo alcancen con su propio radio.
         """
         if masa <= 0:
             raise ValueError("La masa debe ser un valor positivo.")
+        if radio < 0:
+            raise ValueError("El radio no puede ser negativo.")
         self.id = id
         self.masa = masa
+        self.radio = radio
         self.posicion = posicion
         self.velocidad = velocidad
         self.fuerza_neta = Vector3D(0.0, 0.0, 0.0) # Para acumular fuerzas en cada paso
@@ -18,15 +26,30 @@ class CuerpoCeleste:
         Actualiza la velocidad del cuerpo basándose en una fuerza aplicada y un paso de tiempo.
         v_nueva = v_actual + (F/m) * dt
         """
-        aceleracion = fuerza / self.masa
-        self.velocidad = self.velocidad + aceleracion * dt
+        # Un único Vector3D nuevo en lugar de tres (F/m, (F/m)*dt y la suma). Se asigna
+        # un vector nuevo en vez de modificar el actual porque quien haya leído
+        # self.velocidad antes conserva el valor anterior.
+        masa = self.masa
+        v = self.velocidad
+        self.velocidad = Vector3D(v.x + fuerza.x / masa * dt,
+                                  v.y + fuerza.y / masa * dt,
+                                  v.z + fuerza.z / masa * dt)
+
+    @property
+    def aceleracion(self) -> Vector3D:
+        """Aceleración del último cálculo de fuerzas: F / m."""
+        return self.fuerza_neta / self.masa
+
+    def acelerar(self, dt: float):
+        """Actualiza la velocidad con la fuerza neta del último cálculo de fuerzas: v += (F/m) * dt."""
+        self.aplicar_fuerza(self.fuerza_neta, dt)
 
     def mover(self, dt: float):
         """
         Actualiza la posición del cuerpo basándose en su velocidad y un paso de tiempo.
         r_nueva = r_actual + v * dt
         """
-        self.posicion = self.posicion + self.velocidad * dt
+        self.posicion = self.posicion.sumar_escalado(self.velocidad, dt)
 
     def energia_cinetica(self) -> float:
         """
@@ -34,13 +57,20 @@ class CuerpoCeleste:
         """
         return 0.5 * self.masa * (self.velocidad.magnitude()**2)
 
-    def energia_potencial_con(self, otro: 'CuerpoCeleste', G: float) -> float:
+    def energia_potencial_con(self, otro: 'CuerpoCeleste', G: float, suavizado=None) -> float:
         """
         Calcula la energía potencial gravitatoria entre este cuerpo y otro.
         U = -G * (m1 * m2) / ||r1 - r2||
+        Con un núcleo de suavizado (ver suavizado.py) 1/||r1 - r2|| se sustituye por su factor f.
         """
-        if self.id == otro.id:
-            return 0.0 # No hay energía potencial consigo mismo
+        if self.id == otro.id or self.masa == 0 or otro.masa == 0:
+            return 0.0 # No hay energía potencial consigo mismo ni con una partícula de prueba
+
+        if suavizado is not None:
+            dx = self.posicion.x - otro.posicion.x
+            dy = self.posicion.y - otro.posicion.y
+            dz = self.posicion.z - otro.posicion.z
+            return -G * (self.masa * otro.masa) * suavizado.factores_escalar(dx * dx + dy * dy + dz * dz)[0]
 
         distancia_vector = self.posicion - otro.posicion
         distancia = distancia_vector.magnitude()
@@ -63,24 +93,84 @@ class CuerpoCeleste:
         """
         Representación oficial del cuerpo celeste.
         """
+        radio = f", radio={self.radio}" if self.radio else ""
         return (f"CuerpoCeleste(id='{self.id}', masa={self.masa}, "
-                f"posicion={repr(self.posicion)}, velocidad={repr(self.velocidad)})")
+                f"posicion={repr(self.posicion)}, velocidad={repr(self.velocidad)}{radio})")
 
     def to_dict(self) -> dict:
         """Convierte el cuerpo celeste a un diccionario para persistencia."""
-        return {
+        data = {
             "id": self.id,
             "masa": self.masa,
             "posicion": self.posicion.to_list(),
             "velocidad": self.velocidad.to_list()
         }
+        if self.radio:
+            data["radio"] = self.radio
+        return data
 
     @staticmethod
     def from_dict(data: dict) -> 'CuerpoCeleste':
-        """Crea un CuerpoCeleste desde un diccionario."""
+        """Crea un CuerpoCeleste (o una ParticulaPrueba, si la masa es 0) desde un diccionario."""
+        if data["masa"] == 0:
+            return ParticulaPrueba(data["id"], Vector3D.from_list(data["posicion"]),
+                                   Vector3D.from_list(data["velocidad"]), data.get("radio", 0.0))
         return CuerpoCeleste(
             id=data["id"],
             masa=data["masa"],
             posicion=Vector3D.from_list(data["posicion"]),
-            velocidad=Vector3D.from_list(data["velocidad"])
-        )
\ No newline at end of file
+            velocidad=Vector3D.from_list(data["velocidad"]),
+            radio=data.get("radio", 0.0)
+        )
+
+
+class ParticulaPrueba(CuerpoCeleste):
+    """
+    Cuerpo sin masa (sonda, grano de polvo) que siente la gravedad de los cuerpos con
+    masa pero no atrae a ninguno. El cálculo de fuerzas lo trata aparte: su aceleración
+    se obtiene solo de los cuerpos con masa, con coste O(N_masivos * N_partículas) en
+    lugar de entrar en la suma de todos los pares, y no contribuye a la energía
+    potencial ni a la cinética. Su fuerza neta es siempre nula; la aceleración del
+    último cálculo de fuerzas se guarda en el atributo aceleracion.
+    """
+
+    sin_masa = True
+
+    def __init__(self, id: str, posicion: Vector3D, velocidad: Vector3D, radio: float = 0.0):
+        """
+        Inicializa una partícula de prueba. El radio es opcional, como en CuerpoCeleste.
+        """
+        if radio < 0:
+            raise ValueError("El radio no puede ser negativo.")
+        self.id = id
+        self.masa = 0.0
+        self.radio = radio
+        self.posicion = posicion
+        self.velocidad = velocidad
+        self.fuerza_neta = Vector3D(0.0, 0.0, 0.0)
+        self._aceleracion = Vector3D(0.0, 0.0, 0.0)
+
+    @property
+    def aceleracion(self) -> Vector3D:
+        """Aceleración del último cálculo de fuerzas."""
+        return self._aceleracion
+
+    @aceleracion.setter
+    def aceleracion(self, valor: Vector3D):
+        self._aceleracion = valor
+
+    def aplicar_fuerza(self, fuerza: Vector3D, dt: float):
+        raise ValueError("Una partícula de prueba no tiene masa: use acelerar(dt) con su aceleración.")
+
+    def acelerar(self, dt: float):
+        """Actualiza la velocidad con la aceleración del último cálculo de fuerzas: v += a * dt."""
+        self.velocidad = self.velocidad.sumar_escalado(self._aceleracion, dt)
+
+    def __str__(self) -> str:
+        return (f"ID: {self.id}, Partícula de prueba (sin masa), "
+                f"Posición: {self.posicion}, Velocidad: {self.velocidad} m/s")
+
+    def __repr__(self) -> str:
+        radio = f", radio={self.radio}" if self.radio else ""
+        return (f"ParticulaPrueba(id='{self.id}', posicion={repr(self.posicion)}, "
+                f"velocidad={repr(self.velocidad)}{radio})")
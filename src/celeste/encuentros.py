@@ -0,0 +1,344 @@
+"""
+Índice de encuentros cercanos: qué cuerpos están a menos de una distancia dada
+de un cuerpo y cuándo empieza y termina cada encuentro.
+
+Cada cuerpo tiene un radio de encuentro, una distancia fija elegida por el
+usuario o un múltiplo de su radio de Hill respecto al cuerpo central,
+r_H = |r - r_central| * (m / (3 m_central))^(1/3), y dos cuerpos están en
+encuentro mientras su distancia es menor que el mayor de sus dos radios.
+
+Para no recorrer todos los pares en cada paso se mantiene una lista de Verlet:
+los pares cuya distancia es menor que su radio de encuentro más una piel,
+buscados con la tabla hash espacial de colisiones.py (celdas de lado igual al
+mayor radio más la piel, coste O(N)). Un par que no está en la lista solo puede
+entrar en encuentro si sus dos cuerpos se han acercado, entre los dos, más que
+la piel (descontando lo que hayan crecido los radios de encuentro), así que
+mientras 2 * desplazamiento máximo + crecimiento máximo <= piel basta con medir
+las distancias de la lista. La lista se reconstruye cuando deja de cumplirse o
+cuando se agregan cuerpos a la simulación; cuando solo se eliminan (bajas,
+fusiones por colisión) basta con quitar los pares de los cuerpos eliminados y
+renumerar las filas que ha movido el swap-remove, porque los demás cuerpos
+siguen cumpliendo la condición respecto a su posición de referencia.
+"""
+
+import math
+from .colisiones import candidatos_numpy, pares_candidatos
+
+
+class EventoEncuentro:
+    """Inicio o fin de un encuentro entre dos cuerpos."""
+
+    def __init__(self, tipo: str, tiempo: float, paso: int, id_a: str, id_b: str, distancia: float):
+        # "inicio" o "fin"
+        self.tipo = tipo
+        self.tiempo = tiempo
+        self.paso = paso
+        self.id_a = id_a
+        self.id_b = id_b
+        # Distancia entre los dos cuerpos en ese paso (nan si uno de ellos ya no existe)
+        self.distancia = distancia
+
+    def __repr__(self) -> str:
+        return (f"EventoEncuentro('{self.tipo}', t={self.tiempo}, paso={self.paso}, "
+                f"'{self.id_a}'-'{self.id_b}', distancia={self.distancia:.6e})")
+
+
+class MonitorEncuentros:
+    """
+    Observador que detecta tras cada paso los encuentros cercanos con una lista de
+    Verlet (ver el módulo). Se registra con sim.agregar_observador(monitor) y deja
+    los eventos de inicio y fin en self.eventos y los encuentros en curso en
+    self.activos. cercanos(sim, id, distancia) responde qué cuerpos están a menos
+    de una distancia de un cuerpo. Funciona con los dos motores.
+    """
+
+    def __init__(self, radio: float | None = None, factor_hill: float = 1.0, piel: float = 0.5,
+                 central: str | None = None):
+        """
+        radio es el radio de encuentro común a todos los cuerpos, en metros; si no se
+        da, el de cada cuerpo es factor_hill veces su radio de Hill respecto a central
+        (por defecto, el cuerpo de mayor masa, que no tiene radio de encuentro propio).
+        piel es el margen de la lista de Verlet, como fracción del mayor radio de
+        encuentro: una piel mayor reconstruye menos veces una lista más larga.
+        """
+        if radio is not None and radio <= 0:
+            raise ValueError("El radio de encuentro debe ser positivo.")
+        if factor_hill <= 0:
+            raise ValueError("El factor de Hill debe ser positivo.")
+        if piel <= 0:
+            raise ValueError("La piel de la lista de Verlet debe ser positiva.")
+        self.radio = radio
+        self.factor_hill = factor_hill
+        self.piel = piel
+        self.central = central
+        self.eventos: list[EventoEncuentro] = []
+        # (id_a, id_b) -> tiempo de inicio de los encuentros en curso, con id_a < id_b
+        self.activos: dict[tuple[str, str], float] = {}
+        # Veces que se ha construido la lista y pares que contiene
+        self.reconstrucciones = 0
+        self.pares_lista = 0
+        # ids de la última construcción de la lista y de la última traducción de los activos a filas
+        self._ids = None
+        self._ids_activos = None
+        self._pares = None
+
+    def __call__(self, diagnostico):
+        self.actualizar(diagnostico.sim, diagnostico.tiempo, diagnostico.paso)
+
+    def actualizar(self, sim, tiempo: float = 0.0, paso: int = 0) -> list[EventoEncuentro]:
+        """Mide las distancias de la lista, actualiza los encuentros en curso y devuelve los eventos nuevos."""
+        ids, posiciones, radios = self._preparar(sim)
+        # Encuentros de cuerpos que ya no están en la simulación
+        fines = self._reindexar_activos(ids) if ids is not self._ids_activos else []
+        if hasattr(posiciones, "shape"):
+            empiezan, terminan = self._cambios_numpy(len(ids), posiciones, radios)
+        else:
+            empiezan, terminan = self._cambios_python(posiciones, radios)
+        fines += [(_clave(ids[i], ids[j]), d) for i, j, d in terminan]
+        inicios = [(_clave(ids[i], ids[j]), d) for i, j, d in empiezan]
+
+        # Los eventos de cada paso, en orden de ids: primero los fines y después los inicios
+        nuevos = []
+        for clave, distancia in sorted(fines):
+            del self.activos[clave]
+            nuevos.append(EventoEncuentro("fin", tiempo, paso, *clave, distancia))
+        for clave, distancia in sorted(inicios):
+            self.activos[clave] = tiempo
+            nuevos.append(EventoEncuentro("inicio", tiempo, paso, *clave, distancia))
+        self.eventos.extend(nuevos)
+        return nuevos
+
+    def _cambios_numpy(self, n: int, posiciones, radios):
+        """
+        Pares de la lista que entran y salen de encuentro: (fila_a, fila_b, distancia).
+        Los encuentros en curso se guardan como claves fila_a * n + fila_b ordenadas, así
+        que en cada paso solo se convierten a ids los pares que cambian.
+        """
+        import numpy as np
+        i, j = self._pares
+        d = posiciones[j] - posiciones[i]
+        distancias = np.sqrt((d * d).sum(axis=1))
+        dentro = np.flatnonzero(distancias < np.maximum(radios[i], radios[j]))
+        claves = i[dentro] * n + j[dentro]
+        orden = np.argsort(claves)
+        claves, distancias = claves[orden], distancias[dentro][orden]
+        previas = self._filas_activas
+        empiezan = ~np.isin(claves, previas, assume_unique=True)
+        terminan = previas[~np.isin(previas, claves, assume_unique=True)]
+        self._filas_activas = claves
+        a, b = terminan // n, terminan % n
+        d = posiciones[b] - posiciones[a]
+        return (zip(*(x.tolist() for x in (claves[empiezan] // n, claves[empiezan] % n, distancias[empiezan]))),
+                zip(a.tolist(), b.tolist(), np.sqrt((d * d).sum(axis=1)).tolist()))
+
+    def _cambios_python(self, posiciones, radios):
+        """Pares de la lista que entran y salen de encuentro, con el motor "python"."""
+        en_curso = {}
+        for i, j in self._pares:
+            distancia = math.dist(posiciones[i], posiciones[j])
+            if distancia < max(radios[i], radios[j]):
+                en_curso[(i, j)] = distancia
+        previas = self._filas_activas
+        self._filas_activas = set(en_curso)
+        return ([(i, j, d) for (i, j), d in en_curso.items() if (i, j) not in previas],
+                [(i, j, math.dist(posiciones[i], posiciones[j])) for i, j in previas - en_curso.keys()])
+
+    def _reindexar_activos(self, ids) -> list:
+        """
+        Traduce los encuentros en curso a las filas actuales tras un cambio en los cuerpos
+        de la simulación y devuelve como (clave, nan) los de cuerpos que ya no están.
+        """
+        filas = {id: fila for fila, id in enumerate(ids)}
+        self._ids_activos = ids
+        activos, desaparecidos = [], []
+        for clave in self.activos:
+            if clave[0] in filas and clave[1] in filas:
+                activos.append(tuple(sorted((filas[clave[0]], filas[clave[1]]))))
+            else:
+                desaparecidos.append((clave, math.nan))
+        if not isinstance(self._pares, list):
+            import numpy as np
+            n = len(ids)
+            self._filas_activas = np.sort(np.array([i * n + j for i, j in activos], dtype=np.int64))
+        else:
+            self._filas_activas = set(activos)
+        return desaparecidos
+
+    def cercanos(self, sim, id: str, distancia: float) -> list[tuple[str, float]]:
+        """
+        Devuelve los cuerpos a menos de distancia del cuerpo id como pares (id, distancia),
+        de más cercano a más lejano. Si la distancia cabe en la cobertura de la lista de
+        Verlet para ese cuerpo solo se miran sus vecinos de la lista; si no, todos los cuerpos.
+        """
+        ids, posiciones, _ = self._preparar(sim)
+        fila = sim.cuerpos.fila(id)
+        if distancia <= self._cobertura(fila):
+            candidatos = self._vecinos_de(fila)
+        else:
+            candidatos = [k for k in range(len(ids)) if k != fila]
+        if hasattr(posiciones, "shape"):
+            import numpy as np
+            d = posiciones[candidatos] - posiciones[fila]
+            distancias = np.sqrt((d * d).sum(axis=1)).tolist()
+        else:
+            distancias = [math.dist(posiciones[fila], posiciones[k]) for k in candidatos]
+        return sorted(((ids[k], d) for k, d in zip(candidatos, distancias) if d < distancia),
+                      key=lambda par: par[1])
+
+    def _vecinos_de(self, fila: int) -> list[int]:
+        """Vecinos de fila en la lista de Verlet; la tabla de vecinos se crea en la primera consulta."""
+        if isinstance(self._pares, list):
+            if self._vecinos is None:
+                self._vecinos = {}
+                for i, j in self._pares:
+                    self._vecinos.setdefault(i, []).append(j)
+                    self._vecinos.setdefault(j, []).append(i)
+            return self._vecinos.get(fila, [])
+        import numpy as np
+        if self._vecinos is None:
+            i, j = self._pares
+            origen, destino = np.concatenate([i, j]), np.concatenate([j, i])
+            orden = np.argsort(origen, kind="stable")
+            self._vecinos = (origen[orden], destino[orden])
+        origen, destino = self._vecinos
+        inicio, fin = np.searchsorted(origen, [fila, fila + 1])
+        return destino[inicio:fin].tolist()
+
+    def _preparar(self, sim):
+        """Lee el estado del simulador y reconstruye la lista de Verlet si ha dejado de ser válida."""
+        ids = sim.cuerpos.ids
+        masas, posiciones = self._estado(sim)
+        radios = self._radios(sim, masas, posiciones)
+        if ids is not self._ids and not self._renumerar(ids):
+            self._construir(ids, posiciones, radios)
+        elif self._desplazamiento(posiciones, radios) > self._piel:
+            self._construir(ids, posiciones, radios)
+        return ids, posiciones, radios
+
+    def _renumerar(self, ids) -> bool:
+        """
+        Adapta la lista de Verlet a los cuerpos actuales si desde la última construcción
+        solo se han eliminado cuerpos: quita los pares de los eliminados y traduce las
+        filas de los demás, junto con sus posiciones y radios de referencia. Devuelve
+        False (y la lista se ha de reconstruir) si hay cuerpos nuevos.
+        """
+        if self._ids is None:
+            return False
+        filas = {id: fila for fila, id in enumerate(ids)}
+        mapa = [filas.get(id, -1) for id in self._ids]
+        if len(ids) != len(mapa) - mapa.count(-1):
+            return False
+        self._ids = ids
+        self._vecinos = None
+        if isinstance(self._pares, list):
+            self._pares = [(min(mapa[i], mapa[j]), max(mapa[i], mapa[j])) for i, j in self._pares
+                           if mapa[i] >= 0 and mapa[j] >= 0]
+            referencia = [None] * len(ids)
+            radios = [0.0] * len(ids)
+            for vieja, nueva in enumerate(mapa):
+                if nueva >= 0:
+                    referencia[nueva] = self._referencia[vieja]
+                    radios[nueva] = self._radios_referencia[vieja]
+            self._referencia, self._radios_referencia = referencia, radios
+            self.pares_lista = len(self._pares)
+            return True
+        import numpy as np
+        mapa = np.array(mapa, dtype=np.int64)
+        a, b = mapa[self._pares[0]], mapa[self._pares[1]]
+        conservados = (a >= 0) & (b >= 0)
+        a, b = a[conservados], b[conservados]
+        self._pares = (np.minimum(a, b), np.maximum(a, b))
+        viejas = np.flatnonzero(mapa >= 0)
+        referencia = np.empty((len(ids), 3))
+        radios = np.empty(len(ids))
+        referencia[mapa[viejas]] = self._referencia[viejas]
+        radios[mapa[viejas]] = self._radios_referencia[viejas]
+        self._referencia, self._radios_referencia = referencia, radios
+        self.pares_lista = len(a)
+        return True
+
+    def _estado(self, sim):
+        """Masas y posiciones: arrays del almacén con el motor "numpy", listas con el motor "python"."""
+        if sim._almacen is not None:
+            return sim._almacen.masas, sim._almacen.posiciones
+        cuerpos = sim.cuerpos.lista
+        return [c.masa for c in cuerpos], [(c.posicion.x, c.posicion.y, c.posicion.z) for c in cuerpos]
+
+    def _radios(self, sim, masas, posiciones):
+        """Radio de encuentro de cada cuerpo: el fijo o factor_hill veces su radio de Hill."""
+        n = len(masas)
+        if hasattr(posiciones, "shape"):
+            import numpy as np
+            if self.radio is not None:
+                return np.full(n, self.radio)
+            radios = np.zeros(n)
+            if n == 0:
+                return radios
+            central = sim.cuerpos.fila(self.central) if self.central is not None else int(np.argmax(masas))
+            if masas[central] > 0:
+                d = posiciones - posiciones[central]
+                radios = self.factor_hill * np.sqrt((d * d).sum(axis=1)) * np.cbrt(masas / (3.0 * masas[central]))
+                radios[central] = 0.0
+            return radios
+
+        if self.radio is not None:
+            return [self.radio] * n
+        radios = [0.0] * n
+        if n == 0:
+            return radios
+        central = sim.cuerpos.fila(self.central) if self.central is not None else masas.index(max(masas))
+        m0, r0 = masas[central], posiciones[central]
+        if m0 > 0:
+            radios = [self.factor_hill * math.dist(p, r0) * (m / (3.0 * m0)) ** (1.0 / 3.0)
+                      for m, p in zip(masas, posiciones)]
+            radios[central] = 0.0
+        return radios
+
+    def _construir(self, ids, posiciones, radios):
+        """Construye la lista de Verlet: los pares a menos de su radio de encuentro más la piel."""
+        self.reconstrucciones += 1
+        self._ids = ids
+        self._vecinos = None
+        self._piel = self.piel * max(radios, default=0.0)
+        self._holgura = self._piel
+        tamano_celda = max(radios, default=0.0) + self._piel
+        if hasattr(posiciones, "shape"):
+            import numpy as np
+            self._referencia = posiciones.copy()
+            self._radios_referencia = radios.copy()
+            indices = candidatos_numpy(posiciones, tamano_celda) if self._piel > 0 else None
+            if indices is None:
+                candidatos = pares_candidatos(posiciones, radios, tamano_celda) if self._piel > 0 else []
+                indices = np.array(candidatos, dtype=np.int64).reshape(-1, 2).T
+            i, j = indices
+            d = posiciones[j] - posiciones[i]
+            en_lista = np.sqrt((d * d).sum(axis=1)) < np.maximum(radios[i], radios[j]) + self._piel
+            self._pares = (i[en_lista], j[en_lista])
+            self.pares_lista = int(en_lista.sum())
+        else:
+            self._referencia = list(posiciones)
+            self._radios_referencia = list(radios)
+            candidatos = pares_candidatos(posiciones, radios, tamano_celda) if self._piel > 0 else []
+            self._pares = [(i, j) for i, j in candidatos
+                           if math.dist(posiciones[i], posiciones[j]) < max(radios[i], radios[j]) + self._piel]
+            self.pares_lista = len(self._pares)
+
+    def _desplazamiento(self, posiciones, radios) -> float:
+        """2 * desplazamiento máximo desde la construcción más el crecimiento máximo de los radios."""
+        if not hasattr(posiciones, "shape"):
+            desplazamiento = max((math.dist(p, q) for p, q in zip(posiciones, self._referencia)), default=0.0)
+            crecimiento = max((r - q for r, q in zip(radios, self._radios_referencia)), default=0.0)
+        else:
+            d = posiciones - self._referencia
+            desplazamiento = math.sqrt((d * d).sum(axis=1).max(initial=0.0))
+            crecimiento = float((radios - self._radios_referencia).max(initial=0.0))
+        self._holgura = self._piel - 2.0 * desplazamiento
+        return 2.0 * desplazamiento + max(crecimiento, 0.0)
+
+    def _cobertura(self, fila: int) -> float:
+        """Distancia por debajo de la cual todos los vecinos de fila están en la lista de Verlet."""
+        return self._radios_referencia[fila] + self._holgura
+
+
+def _clave(id_a: str, id_b: str) -> tuple[str, str]:
+    return (id_a, id_b) if id_a < id_b else (id_b, id_a)
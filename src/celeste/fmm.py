@@ -0,0 +1,403 @@
+"""
+Método multipolar rápido (FMM) cartesiano sobre un octree adaptativo.
+
+Cada nodo del octree (el mismo de barnes_hut.Octree) tiene una expansión
+multipolar de sus cuerpos y una expansión local del campo lejano alrededor de
+su centro de masas, ambas en potencias cartesianas hasta el orden p:
+
+  P2M  momentos de las hojas        N_a = sum_j m_j h_j^a / a!       (h = y_j - centro)
+  M2M  momentos de cada nodo a partir de los de sus hijos
+  M2L  expansión local de un nodo debida a un nodo fuente lejano:
+       L_b = sum_a (-1)^|a| N_a D^(a+b)(1/|R|)    (R = centro destino - centro fuente)
+  L2L  traslado de la expansión local de cada nodo a sus hijos
+  L2P  potencial y aceleración de cada cuerpo a partir de la expansión de su hoja
+
+Las derivadas D^k(1/|R|) hasta el orden 2p se obtienen con la recurrencia de
+los coeficientes de Taylor de 1/|R|. Los pares de nodos se eligen con un
+recorrido dual del árbol: dos nodos de radios r_A y r_B cuyos centros están a
+distancia d interactúan por M2L si r_A + r_B < theta * d; si no, se abre el
+mayor, y dos hojas cercanas se suman directamente (P2P). Cada par de nodos se
+visita una sola vez y se aplica en los dos sentidos: M2L usa que
+D^k(-R) = (-1)^|k| D^k(R), y P2P la tercera ley de Newton. El número de pares por
+nodo está acotado, así que el coste es O(N) para un theta y un orden fijos, y
+el error decrece como theta^(p+1). Como en Barnes–Hut, todo se evalúa de forma
+vectorizada nivel a nivel sobre listas de pares.
+
+El núcleo de suavizado, si lo hay, se aplica a los pares directos; el campo
+lejano usa 1/r, que coincide con él a distancias mayores que unas pocas
+longitudes de suavizado (exactamente a partir de 2.8·ε con el spline).
+"""
+
+import math
+from functools import lru_cache
+from typing import Dict
+import numpy as np
+from .barnes_hut import Octree, _acumular, _expandir, _lotes
+from .nucleos import _factores, errores_relativos
+
+# Órdenes de expansión admitidos (coste de M2L ~ número de coeficientes al cuadrado)
+ORDEN_MAXIMO = 8
+
+
+@lru_cache(maxsize=None)
+def _multi_indices(orden: int):
+    """
+    Multi-índices (a_x, a_y, a_z) con |a| <= orden ordenados por grado, el índice de
+    cada uno y sus factoriales a!.
+    """
+    lista = [(i, j, g - i - j) for g in range(orden + 1) for i in range(g, -1, -1) for j in range(g - i, -1, -1)]
+    indice = {a: k for k, a in enumerate(lista)}
+    factoriales = np.array([float(math.prod(math.factorial(c) for c in a)) for a in lista])
+    return lista, indice, factoriales
+
+
+@lru_cache(maxsize=None)
+def _tablas(orden: int):
+    """
+    Tablas de índices del orden p:
+      recurrencia  para cada multi-índice k de grado >= 1 de la lista de orden 2p,
+                   los índices de k - e_i (con su componente x_i) y de k - 2 e_i
+      m2l          (nL, nM) con el índice de a + b en la lista de orden 2p
+      signos       (-1)^|a| de cada multi-índice de orden p
+      traslados    (mayor, menor, diferencia) con menor <= mayor componente a componente
+      gradiente    para cada eje i, los índices b con b_i >= 1 y de b - e_i
+    """
+    lista2, indice2, factoriales2 = _multi_indices(2 * orden)
+    lista, indice, _ = _multi_indices(orden)
+    recurrencia = []
+    for k in lista2[1:]:
+        grado = sum(k)
+        menos_uno = [(i, indice2[_restar(k, i, 1)]) for i in range(3) if k[i] >= 1]
+        menos_dos = [indice2[_restar(k, i, 2)] for i in range(3) if k[i] >= 2]
+        recurrencia.append((indice2[k], grado, menos_uno, menos_dos))
+    m2l = np.array([[indice2[tuple(a_i + b_i for a_i, b_i in zip(a, b))] for a in lista] for b in lista])
+    signos = np.array([(-1.0) ** sum(a) for a in lista])
+    traslados = [(indice[a], indice[b], indice[tuple(x - y for x, y in zip(a, b))])
+                 for a in lista for b in lista if all(y <= x for x, y in zip(a, b))]
+    gradiente = []
+    for i in range(3):
+        con_eje = [b for b in lista if b[i] >= 1]
+        gradiente.append((np.array([indice[b] for b in con_eje], dtype=np.int64),
+                          np.array([indice[_restar(b, i, 1)] for b in con_eje], dtype=np.int64)))
+    return {
+        "recurrencia": recurrencia,
+        "factoriales2": factoriales2,
+        "m2l": m2l,
+        "signos": signos,
+        "traslados": traslados,
+        "gradiente": gradiente,
+    }
+
+
+def _restar(a, eje: int, cantidad: int):
+    return tuple(c - cantidad if i == eje else c for i, c in enumerate(a))
+
+
+def _monomios(d: np.ndarray, orden: int) -> np.ndarray:
+    """Devuelve (n, nM) con d^a / a! para cada multi-índice a de orden <= orden."""
+    lista, _, factoriales = _multi_indices(orden)
+    potencias = np.ones((3, orden + 1, len(d)))
+    for k in range(1, orden + 1):
+        potencias[:, k] = potencias[:, k - 1] * d.T
+    resultado = np.empty((len(d), len(lista)))
+    for columna, (i, j, k) in enumerate(lista):
+        resultado[:, columna] = potencias[0, i] * potencias[1, j] * potencias[2, k]
+    resultado /= factoriales
+    return resultado
+
+
+def derivadas_inverso(r: np.ndarray, orden: int) -> np.ndarray:
+    """
+    Devuelve (nD, n) con las derivadas D^k(1/|r|) de cada vector r (n, 3) para todos
+    los multi-índices k de grado <= orden, en el orden de _multi_indices(orden).
+    Se calculan con la recurrencia de los coeficientes de Taylor a_k = D^k(1/|r|) / k!:
+        |k| r^2 a_k = -(2|k| - 1) sum_i r_i a_(k - e_i) - (|k| - 1) sum_i a_(k - 2 e_i)
+    """
+    if orden % 2:
+        raise ValueError("derivadas_inverso requiere un orden par (2p).")
+    tablas = _tablas(orden // 2)
+    r2 = (r * r).sum(axis=1)
+    coeficientes = np.empty((len(tablas["factoriales2"]), len(r)))
+    coeficientes[0] = 1.0 / np.sqrt(r2)
+    inv_r2 = 1.0 / r2
+    for destino, grado, menos_uno, menos_dos in tablas["recurrencia"]:
+        suma = (2 * grado - 1) * sum(r[:, i] * coeficientes[k] for i, k in menos_uno)
+        if menos_dos:
+            suma = suma + (grado - 1) * sum(coeficientes[k] for k in menos_dos)
+        coeficientes[destino] = -suma * inv_r2 / grado
+    coeficientes *= tablas["factoriales2"][:, None]
+    return coeficientes
+
+
+class SolverFMM:
+    """
+    Solver de fuerzas por el método multipolar rápido, O(N) (ver el módulo).
+
+    orden es el orden p de las expansiones y theta el parámetro de apertura del
+    recorrido dual (r_A + r_B < theta * d). El error relativo de la aceleración
+    decrece aproximadamente como theta^(p+1): con los valores por defecto su
+    percentil 99 es de unos 5e-4 y con orden=8, theta=0.4, de unos 1e-7.
+    Además de las aceleraciones obtiene la energía potencial en el mismo recorrido.
+    """
+
+    nombre = "fmm"
+
+    # Número máximo de coeficientes de M2L (pares por coeficientes al cuadrado) y de
+    # interacciones directas evaluados a la vez
+    COEFICIENTES_M2L_POR_LOTE = 1 << 19
+    PARES_POR_LOTE = 1 << 18
+    # Dos nodos lejanos con N_A * N_B <= FACTOR_COSTE_M2L * (coeficientes)^2 se suman directamente
+    FACTOR_COSTE_M2L = 0.05
+
+    def __init__(self, orden: int = 4, theta: float = 0.5, hoja_max: int = 64, suavizado=None):
+        """
+        Inicializa el solver con el orden de las expansiones, el parámetro de apertura,
+        el número máximo de cuerpos por hoja y, opcionalmente, un núcleo de suavizado
+        (ver suavizado.py) para los pares directos.
+        """
+        if not 1 <= orden <= ORDEN_MAXIMO:
+            raise ValueError(f"El orden de la expansión debe estar entre 1 y {ORDEN_MAXIMO}.")
+        if not 0 < theta < 1:
+            raise ValueError("El parámetro de apertura theta debe estar entre 0 y 1.")
+        if hoja_max < 1:
+            raise ValueError("hoja_max debe ser al menos 1.")
+        self.orden = orden
+        self.theta = theta
+        self.hoja_max = hoja_max
+        self.suavizado = suavizado
+        self.arbol: Octree | None = None
+        # Pares de nodos evaluados en la última llamada y total de interacciones:
+        # los pares M2L más los pares de cuerpos de la suma directa (P2P)
+        self.pares_m2l = 0
+        self.pares_p2p = 0
+        self.interacciones = 0
+
+    def aceleraciones(self, masas: np.ndarray, posiciones: np.ndarray, G: float) -> np.ndarray:
+        """Reconstruye el octree y devuelve la aceleración (N, 3) de cada cuerpo."""
+        return self.aceleraciones_y_potencial(masas, posiciones, G)[0]
+
+    def aceleraciones_y_potencial(self, masas: np.ndarray, posiciones: np.ndarray, G: float):
+        """
+        Devuelve la aceleración (N, 3) de cada cuerpo y la energía potencial total
+        U = -G/2 * sum_i m_i * phi_i, con phi_i = sum_(j != i) m_j / |r_ij|. La energía
+        es -inf si dos cuerpos coinciden (salvo con suavizado), igual que en la suma directa.
+        """
+        n = len(masas)
+        aceleraciones = np.zeros((n, 3))
+        if n < 2:
+            self.arbol = None
+            self.pares_m2l = self.pares_p2p = self.interacciones = 0
+            return aceleraciones, 0.0
+        arbol = self.arbol = Octree(masas, posiciones, self.hoja_max)
+        orden = arbol.orden
+        masas_ord = masas[orden]
+        posiciones_ord = posiciones[orden]
+        niveles = self._niveles(arbol)
+        centros, radios = self._centros_y_radios(arbol, niveles, posiciones_ord)
+        multipolos = self._multipolos(arbol, niveles, centros, masas_ord, posiciones_ord)
+        m2l, p2p, propias = self._recorrido_dual(arbol, centros, radios)
+        self.pares_m2l, self.pares_p2p = len(m2l[0]), len(p2p[0]) + len(propias)
+        tam = arbol.fines - arbol.inicios
+        self.interacciones = self.pares_m2l + int((tam[p2p[0]] * tam[p2p[1]]).sum() + (tam[propias] ** 2).sum())
+
+        locales = np.zeros_like(multipolos)
+        self._m2l(m2l, centros, multipolos, locales)
+        for nivel in niveles[1:]:
+            # L2L: de cada nodo del nivel anterior a sus hijos
+            padres = self._padres[nivel]
+            monomios = _monomios(centros[nivel] - centros[padres], self.orden)
+            for mayor, menor, diferencia in _tablas(self.orden)["traslados"]:
+                locales[nivel, menor] += locales[padres, mayor] * monomios[:, diferencia]
+
+        acumulada, potencial = self._l2p(arbol, centros, locales, posiciones_ord)
+        xyz = tuple(np.ascontiguousarray(posiciones_ord[:, k]) for k in range(3))
+        colision = self._p2p(arbol, p2p[0], p2p[1], masas_ord, xyz, acumulada, potencial)
+        colision |= self._p2p(arbol, propias, propias, masas_ord, xyz, acumulada, potencial, mutuo=False)
+
+        aceleraciones[orden] = acumulada.T
+        aceleraciones *= G
+        if colision:
+            return aceleraciones, float('-inf')
+        return aceleraciones, -0.5 * G * float(masas_ord @ potencial)
+
+    def _niveles(self, arbol: Octree):
+        """Nodos de cada nivel del árbol, de la raíz a las hojas (y el padre de cada nodo)."""
+        self._padres = np.full(arbol.num_nodos, -1, dtype=np.int64)
+        niveles = [np.zeros(1, dtype=np.int64)]
+        while True:
+            hijos = arbol.hijos[niveles[-1]]
+            existe = hijos >= 0
+            if not existe.any():
+                return niveles
+            self._padres[hijos[existe]] = np.repeat(niveles[-1], existe.sum(axis=1))
+            niveles.append(hijos[existe])
+
+    def _centros_y_radios(self, arbol: Octree, niveles, posiciones_ord: np.ndarray):
+        """
+        Centros de las expansiones (los centros de masas) y radio de cada nodo: la
+        mayor distancia de uno de sus cuerpos al centro.
+        """
+        centros = arbol.centros_masa
+        hojas = arbol.hojas
+        tam = arbol.fines[hojas] - arbol.inicios[hojas]
+        distancias = np.sqrt(((posiciones_ord - np.repeat(centros[hojas], tam, axis=0)) ** 2).sum(axis=1))
+        radios = np.zeros(arbol.num_nodos)
+        radios[hojas] = np.maximum.reduceat(distancias, arbol.inicios[hojas])
+        for nivel in reversed(niveles):
+            internos = nivel[~arbol.es_hoja[nivel]]
+            hijos = arbol.hijos[internos]
+            existe = hijos >= 0
+            padres = np.repeat(internos, existe.sum(axis=1))
+            hijos = hijos[existe]
+            cota = radios[hijos] + np.sqrt(((centros[hijos] - centros[padres]) ** 2).sum(axis=1))
+            np.maximum.at(radios, padres, cota)
+        return centros, radios
+
+    def _multipolos(self, arbol: Octree, niveles, centros: np.ndarray, masas_ord: np.ndarray,
+                    posiciones_ord: np.ndarray) -> np.ndarray:
+        """P2M en las hojas y M2M de los hijos a los padres, de las hojas a la raíz."""
+        hojas = arbol.hojas
+        tam = arbol.fines[hojas] - arbol.inicios[hojas]
+        monomios = _monomios(posiciones_ord - np.repeat(centros[hojas], tam, axis=0), self.orden)
+        multipolos = np.zeros((arbol.num_nodos, monomios.shape[1]))
+        multipolos[hojas] = np.add.reduceat(monomios * masas_ord[:, None], arbol.inicios[hojas], axis=0)
+        traslados = _tablas(self.orden)["traslados"]
+        for nivel in reversed(niveles[1:]):
+            padres = self._padres[nivel]
+            monomios = _monomios(centros[nivel] - centros[padres], self.orden)
+            aporte = np.zeros((len(nivel), multipolos.shape[1]))
+            for mayor, menor, diferencia in traslados:
+                aporte[:, mayor] += multipolos[nivel, menor] * monomios[:, diferencia]
+            np.add.at(multipolos, padres, aporte)
+        return multipolos
+
+    def _recorrido_dual(self, arbol: Octree, centros: np.ndarray, radios: np.ndarray):
+        """
+        Recorre a la vez el árbol como destino y como fuente, empezando por el par
+        (raíz, raíz). Cada par de nodos distintos se visita una sola vez y sus
+        interacciones se aplican en los dos sentidos. Devuelve los pares (A, B) de
+        M2L, los pares (A, B) de P2P y las hojas que se suman consigo mismas.
+        """
+        a = np.zeros(1, dtype=np.int64)
+        b = np.zeros(1, dtype=np.int64)
+        m2l, p2p, propias = [], [], []
+        es_hoja = arbol.es_hoja
+        tam = arbol.fines - arbol.inicios
+        coste_m2l = self.FACTOR_COSTE_M2L * len(_multi_indices(self.orden)[0]) ** 2
+        # Pares de hijos (i, j) con i <= j en los que se abre un nodo consigo mismo
+        i_hijo, j_hijo = np.triu_indices(8)
+        while len(a):
+            mismo = a == b
+            propias.append(a[mismo & es_hoja[a]])
+            d = np.sqrt(((centros[a] - centros[b]) ** 2).sum(axis=1))
+            lejos = ~mismo & (radios[a] + radios[b] < self.theta * d)
+            # Entre nodos con pocos cuerpos la suma directa es más barata que M2L
+            directo = lejos & (tam[a] * tam[b] <= coste_m2l)
+            m2l.append((a[lejos & ~directo], b[lejos & ~directo]))
+            hojas = ~mismo & ~lejos & es_hoja[a] & es_hoja[b]
+            p2p.append((a[hojas | directo], b[hojas | directo]))
+
+            # Un nodo consigo mismo se abre en sus pares de hijos (cada par una vez)
+            hijos = arbol.hijos[a[mismo & ~es_hoja[a]]]
+            existe = (hijos[:, i_hijo] >= 0) & (hijos[:, j_hijo] >= 0)
+            nuevos_a = [hijos[:, i_hijo][existe]]
+            nuevos_b = [hijos[:, j_hijo][existe]]
+
+            # El resto abre el nodo de mayor radio que no sea una hoja
+            abrir = ~mismo & ~lejos & ~hojas
+            a, b = a[abrir], b[abrir]
+            abrir_a = ~es_hoja[a] & (es_hoja[b] | (radios[a] >= radios[b]))
+            a, b = np.concatenate((a[abrir_a], b[~abrir_a])), np.concatenate((b[abrir_a], a[~abrir_a]))
+            hijos = arbol.hijos[a]
+            existe = hijos >= 0
+            nuevos_a.append(hijos[existe])
+            nuevos_b.append(np.repeat(b, existe.sum(axis=1)))
+            a = np.concatenate(nuevos_a)
+            b = np.concatenate(nuevos_b)
+        return ((np.concatenate([x for x, _ in m2l]), np.concatenate([y for _, y in m2l])),
+                (np.concatenate([x for x, _ in p2p]), np.concatenate([y for _, y in p2p])),
+                np.concatenate(propias))
+
+    def _m2l(self, pares, centros: np.ndarray, multipolos: np.ndarray, locales: np.ndarray):
+        """
+        Suma a la expansión local de cada nodo del par la del multipolo del otro. Las
+        derivadas se calculan una vez por par: D^k(-R) = (-1)^|k| D^k(R).
+        """
+        nodos_a, nodos_b = pares
+        tablas = _tablas(self.orden)
+        m2l, signos = tablas["m2l"], tablas["signos"]
+        multipolos_signo = multipolos * signos
+        lote = max(1, self.COEFICIENTES_M2L_POR_LOTE // len(tablas["factoriales2"]))
+        for ini in range(0, len(nodos_a), lote):
+            a = nodos_a[ini:ini + lote]
+            b = nodos_b[ini:ini + lote]
+            derivadas = derivadas_inverso(centros[a] - centros[b], 2 * self.orden)
+            hacia_a = np.zeros((m2l.shape[0], len(a)))
+            hacia_b = np.zeros((m2l.shape[0], len(a)))
+            fuentes_a = multipolos_signo[b].T
+            fuentes_b = multipolos[a].T
+            for columna in range(m2l.shape[1]):
+                bloque = derivadas[m2l[:, columna]]
+                hacia_a += bloque * fuentes_a[columna]
+                hacia_b += bloque * fuentes_b[columna]
+            np.add.at(locales, a, hacia_a.T)
+            np.add.at(locales, b, (hacia_b * signos[:, None]).T)
+
+    def _l2p(self, arbol: Octree, centros: np.ndarray, locales: np.ndarray, posiciones_ord: np.ndarray):
+        """
+        Evalúa en cada cuerpo la expansión local de su hoja. Devuelve el gradiente del
+        potencial (3, N) y el potencial phi (N,), en el orden del árbol.
+        """
+        hojas = arbol.hojas
+        tam = arbol.fines[hojas] - arbol.inicios[hojas]
+        hoja_de_cuerpo = np.repeat(hojas, tam)
+        monomios = _monomios(posiciones_ord - centros[hoja_de_cuerpo], self.orden)
+        coeficientes = locales[hoja_de_cuerpo]
+        potencial = (coeficientes * monomios).sum(axis=1)
+        gradiente = np.empty((3, len(posiciones_ord)))
+        for eje, (con_eje, menos_eje) in enumerate(_tablas(self.orden)["gradiente"]):
+            gradiente[eje] = (coeficientes[:, con_eje] * monomios[:, menos_eje]).sum(axis=1)
+        return gradiente, potencial
+
+    def _p2p(self, arbol: Octree, destinos: np.ndarray, fuentes: np.ndarray, masas_ord: np.ndarray,
+             xyz: tuple, acumulada: np.ndarray, potencial: np.ndarray, mutuo: bool = True) -> bool:
+        """
+        Suma directa entre los cuerpos de cada par de hojas. Con mutuo cada par se
+        aplica en los dos sentidos (tercera ley de Newton); sin él, solo sobre los
+        cuerpos de destinos (se usa para una hoja consigo misma). Devuelve True si dos
+        cuerpos distintos coinciden sin suavizado, en cuyo caso la energía es -inf.
+        """
+        colision = False
+        tam_d = arbol.fines[destinos] - arbol.inicios[destinos]
+        tam_f = arbol.fines[fuentes] - arbol.inicios[fuentes]
+        n = len(potencial)
+        for ini, fin in _lotes(tam_d * tam_f, self.PARES_POR_LOTE):
+            cuerpos, rep = _expandir(arbol, destinos[ini:fin], tam_d[ini:fin])
+            origen, rep2 = _expandir(arbol, fuentes[ini:fin][rep], tam_f[ini:fin][rep])
+            cuerpos = cuerpos[rep2]
+            d = [xyz[k][origen] - xyz[k][cuerpos] for k in range(3)]
+            r2 = d[0] * d[0] + d[1] * d[1] + d[2] * d[2]
+            f, g = _factores(r2, self.suavizado)
+            if self.suavizado is None:
+                colision = colision or bool(np.any((r2 == 0) & (cuerpos != origen)))
+            m = masas_ord[origen]
+            _acumular(acumulada, cuerpos, g * m, d)
+            if mutuo:
+                m_cuerpos = masas_ord[cuerpos]
+                _acumular(acumulada, origen, -g * m_cuerpos, d)
+                potencial += np.bincount(origen, weights=f * m_cuerpos, minlength=n)
+            elif self.suavizado is not None:
+                # Con suavizado el par de un cuerpo consigo mismo tiene f finito y no cuenta
+                f = np.where(cuerpos == origen, 0.0, f)
+            potencial += np.bincount(cuerpos, weights=f * m, minlength=n)
+        return colision
+
+    def comparar_con_directo(self, masas: np.ndarray, posiciones: np.ndarray, G: float,
+                             muestra: int | None = 1000, semilla: int = 0) -> Dict[str, float]:
+        """
+        Mide el error relativo de las aceleraciones frente a la suma directa sobre una
+        muestra de cuerpos, como SolverBarnesHut.comparar_con_directo.
+        """
+        aproximadas = self.aceleraciones(masas, posiciones, G)
+        return {"orden": self.orden, "theta": self.theta,
+                **errores_relativos(aproximadas, masas, posiciones, G, muestra, semilla, self.suavizado)}
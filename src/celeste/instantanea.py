@@ -0,0 +1,132 @@
+"""
+Instantáneas binarias del estado de los cuerpos, alternativa compacta al JSON
+de Simulador.guardar.
+
+Estructura del archivo (little-endian):
+  cabecera:       "CELSNAP" + "\\0" | versión (uint16) | opciones (uint16) | n_cuerpos (uint64)
+                  | bytes de la tabla de identificadores (uint64) | bytes de las columnas (uint64)
+  identificadores: tabla de cadenas UTF-8, cada una terminada en "\\0"
+  columnas:       8 columnas float64 de n_cuerpos valores cada una, una tras otra:
+                  masa, pos_x, pos_y, pos_z, vel_x, vel_y, vel_z, radio
+
+Con la opción COMPRIMIDA la tabla y las columnas se guardan comprimidas con zlib
+y los tamaños de la cabecera son los comprimidos. Los valores se guardan con sus
+bits exactos, así que guardar y cargar reproduce el estado sin ninguna pérdida.
+Sin comprimir, las columnas se leen con una sola lectura directamente sobre el
+array de destino. No requiere NumPy: las columnas se leen en un array.array y,
+con el motor "numpy", se ven como un ndarray sin copiarlas.
+"""
+
+import struct
+import sys
+import zlib
+from array import array
+from typing import List, Tuple
+
+MAGICO = b"CELSNAP\0"
+VERSION = 1
+# Opciones de la cabecera (bits)
+COMPRIMIDA = 1
+_CABECERA = struct.Struct("<8sHHQQQ")
+COLUMNAS = ("masa", "pos_x", "pos_y", "pos_z", "vel_x", "vel_y", "vel_z", "radio")
+
+
+def guardar_instantanea(sim, archivo: str, comprimir: bool = False, nivel: int = 6):
+    """
+    Guarda los cuerpos del simulador en una instantánea binaria. Con comprimir=True
+    la tabla de identificadores y las columnas se comprimen con zlib (nivel 1-9).
+    """
+    escribir_instantanea(archivo, list(sim.cuerpos), _columnas_de(sim), comprimir, nivel)
+
+
+def escribir_instantanea(archivo: str, ids: List[str], columnas, comprimir: bool = False, nivel: int = 6):
+    """
+    Escribe una instantánea con los identificadores y las 8 columnas dadas, una tras
+    otra, en un array('d') o en un array de NumPy contiguo (ver salida.Captura).
+    """
+    if any("\0" in id for id in ids):
+        raise ValueError("Los identificadores de una instantánea no pueden contener el carácter nulo.")
+    tabla = "".join(id + "\0" for id in ids).encode("utf-8")
+    if sys.byteorder != "little":
+        columnas = array("d", columnas)
+        columnas.byteswap()
+    datos = memoryview(columnas).cast("B")
+    opciones = 0
+    if comprimir:
+        tabla = zlib.compress(tabla, nivel)
+        datos = zlib.compress(datos, nivel)
+        opciones |= COMPRIMIDA
+    with open(archivo, "wb") as f:
+        f.write(_CABECERA.pack(MAGICO, VERSION, opciones, len(ids), len(tabla), len(datos)))
+        f.write(tabla)
+        f.write(datos)
+
+
+def _columnas_de(sim) -> array:
+    """Devuelve las 8 columnas de los cuerpos, una tras otra, en un array('d')."""
+    if sim._almacen is not None:
+        import numpy as np
+        almacen = sim._almacen
+        matriz = np.empty((len(COLUMNAS), almacen.n))
+        matriz[0] = almacen.masas
+        matriz[1:4] = almacen.posiciones.T
+        matriz[4:7] = almacen.velocidades.T
+        matriz[7] = almacen.radios
+        columnas = array("d")
+        columnas.frombytes(matriz.tobytes())
+        return columnas
+    cuerpos = list(sim.cuerpos.values())
+    columnas = array("d", [c.masa for c in cuerpos])
+    for vector, eje in (("posicion", "x"), ("posicion", "y"), ("posicion", "z"),
+                        ("velocidad", "x"), ("velocidad", "y"), ("velocidad", "z")):
+        columnas.extend([getattr(getattr(c, vector), eje) for c in cuerpos])
+    columnas.extend([c.radio for c in cuerpos])
+    return columnas
+
+
+def leer_instantanea(archivo: str) -> Tuple[List[str], array]:
+    """
+    Lee una instantánea y devuelve (ids, columnas): la lista de identificadores y un
+    array('d') con las 8 columnas de COLUMNAS, una tras otra (n_cuerpos valores cada una).
+    """
+    with open(archivo, "rb") as f:
+        cabecera = f.read(_CABECERA.size)
+        if len(cabecera) < _CABECERA.size or cabecera[:8] != MAGICO:
+            raise ValueError(f"'{archivo}' no es una instantánea.")
+        _, version, opciones, n, bytes_tabla, bytes_datos = _CABECERA.unpack(cabecera)
+        if version > VERSION:
+            raise ValueError(f"Versión de instantánea no soportada: {version}")
+        tabla = f.read(bytes_tabla)
+        if opciones & COMPRIMIDA:
+            tabla = zlib.decompress(tabla)
+            columnas = array("d")
+            columnas.frombytes(zlib.decompress(f.read(bytes_datos)))
+        else:
+            columnas = array("d", [0.0]) * (len(COLUMNAS) * n)
+            if f.readinto(columnas) != bytes_datos:
+                raise ValueError(f"La instantánea '{archivo}' está truncada.")
+    if len(columnas) != len(COLUMNAS) * n:
+        raise ValueError(f"La instantánea '{archivo}' está truncada.")
+    if sys.byteorder != "little":
+        columnas.byteswap()
+    ids = tabla.decode("utf-8").split("\0")[:-1] if n else []
+    if len(ids) != n:
+        raise ValueError(f"La tabla de identificadores de '{archivo}' no es válida.")
+    return ids, columnas
+
+
+def cargar_instantanea(sim, archivo: str) -> int:
+    """Agrega al simulador los cuerpos de una instantánea y devuelve cuántos son."""
+    ids, columnas = leer_instantanea(archivo)
+    return agregar_columnas(sim, ids, columnas)
+
+
+def agregar_columnas(sim, ids: List[str], columnas: array) -> int:
+    """Agrega al simulador los cuerpos dados como las 8 columnas de COLUMNAS en un array('d')."""
+    n = len(ids)
+    if sim._almacen is not None:
+        import numpy as np
+        matriz = np.frombuffer(columnas, dtype=np.float64).reshape(len(COLUMNAS), n)
+        return sim.agregar_cuerpos(ids, matriz[0], matriz[1:4].T, matriz[4:7].T, matriz[7])
+    c = [columnas[k * n:(k + 1) * n] for k in range(len(COLUMNAS))]
+    return sim.agregar_cuerpos(ids, c[0], list(zip(c[1], c[2], c[3])), list(zip(c[4], c[5], c[6])), c[7])
@@ -0,0 +1,148 @@
+"""
+Integradores temporales para Simulador.paso_simulacion.
+
+Cada integrador implementa paso(sim, dt) usando las primitivas del simulador:
+  sim._drift(h):      r += v * h para todos los cuerpos
+  sim._kick(h):       v += a * h con las aceleraciones del último cálculo de fuerzas
+  sim.calcular_fuerzas():  reutiliza las fuerzas anteriores si masas y posiciones no han cambiado
+  sim._leer_estado() / sim._escribir_estado(X, V) / sim._aceleraciones()
+de modo que funcionan igual con el motor "python" y con el motor "numpy".
+"""
+
+# Coeficientes del integrador de Yoshida de 4º orden (composición simétrica de tres leapfrog)
+_W1 = 1.0 / (2.0 - 2.0 ** (1.0 / 3.0))
+_W0 = -(2.0 ** (1.0 / 3.0)) * _W1
+_YOSHIDA_C = (_W1 / 2.0, (_W0 + _W1) / 2.0, (_W0 + _W1) / 2.0, _W1 / 2.0)
+_YOSHIDA_D = (_W1, _W0, _W1)
+
+
+class Euler:
+    """
+    Método de Euler explícito (semi-implícito): v += a(r) * dt y después r += v * dt.
+    Primer orden; la energía deriva con el tiempo.
+    """
+
+    nombre = "euler"
+    orden = 1
+    evaluaciones = 1
+
+    def paso(self, sim, dt: float):
+        """Avanza el sistema un paso dt."""
+        sim.calcular_fuerzas()
+        sim._kick(dt)
+        sim._drift(dt)
+
+
+class Leapfrog:
+    """
+    Leapfrog en la forma kick-drift-kick (Verlet de velocidades).
+    Segundo orden, simpléctico y reversible: el error de energía queda acotado
+    y no deriva. Las fuerzas del final de un paso son las del principio del
+    siguiente, y el simulador las reutiliza: una evaluación de fuerzas por paso.
+    """
+
+    nombre = "leapfrog"
+    orden = 2
+    evaluaciones = 1
+
+    def paso(self, sim, dt: float):
+        """Avanza el sistema un paso dt."""
+        sim.calcular_fuerzas()
+        sim._kick(dt / 2.0)
+        sim._drift(dt)
+        sim.calcular_fuerzas()
+        sim._kick(dt / 2.0)
+
+
+class Yoshida4:
+    """
+    Integrador simpléctico de Yoshida de 4º orden: composición de tres pasos
+    leapfrog con pesos w1, w0, w1. Tres evaluaciones de fuerzas por paso.
+    """
+
+    nombre = "yoshida4"
+    orden = 4
+    evaluaciones = 3
+
+    def paso(self, sim, dt: float):
+        """Avanza el sistema un paso dt."""
+        for c, d in zip(_YOSHIDA_C, _YOSHIDA_D):
+            sim._drift(c * dt)
+            sim.calcular_fuerzas()
+            sim._kick(d * dt)
+        sim._drift(_YOSHIDA_C[3] * dt)
+
+
+class RK4:
+    """
+    Runge-Kutta clásico de 4º orden sobre el estado (r, v). Muy preciso para
+    pasos pequeños, pero no es simpléctico: la energía deriva lentamente.
+    Cuatro evaluaciones de fuerzas por paso.
+    """
+
+    nombre = "rk4"
+    orden = 4
+    evaluaciones = 4
+
+    def paso(self, sim, dt: float):
+        """Avanza el sistema un paso dt."""
+        x0, v0 = sim._leer_estado()
+        a1 = sim._aceleraciones()
+
+        v2 = _combinar(v0, a1, dt / 2.0)
+        sim._escribir_estado(_combinar(x0, v0, dt / 2.0), v2)
+        a2 = sim._aceleraciones()
+
+        v3 = _combinar(v0, a2, dt / 2.0)
+        sim._escribir_estado(_combinar(x0, v2, dt / 2.0), v3)
+        a3 = sim._aceleraciones()
+
+        v4 = _combinar(v0, a3, dt)
+        sim._escribir_estado(_combinar(x0, v3, dt), v4)
+        a4 = sim._aceleraciones()
+
+        x1 = _combinar(x0, _promedio_rk4(v0, v2, v3, v4), dt)
+        v1 = _combinar(v0, _promedio_rk4(a1, a2, a3, a4), dt)
+        sim._escribir_estado(x1, v1)
+
+
+INTEGRADORES = {
+    Euler.nombre: Euler,
+    Leapfrog.nombre: Leapfrog,
+    Yoshida4.nombre: Yoshida4,
+    RK4.nombre: RK4,
+}
+
+
+def crear_integrador(integrador):
+    """Devuelve la instancia de integrador correspondiente a un nombre, o el propio objeto."""
+    if not isinstance(integrador, str):
+        return integrador
+    if integrador == "hermite_bloques":
+        # Requiere NumPy, por eso se importa solo cuando se pide
+        from .pasos_bloque import HermiteBloques
+        return HermiteBloques()
+    if integrador == "wisdom_holman":
+        from .wisdom_holman import WisdomHolman
+        return WisdomHolman()
+    if integrador not in INTEGRADORES:
+        raise ValueError(f"Integrador desconocido '{integrador}'. "
+                         f"Use uno de: {', '.join(INTEGRADORES)}, hermite_bloques, wisdom_holman")
+    return INTEGRADORES[integrador]()
+
+
+def _combinar(x, y, h: float):
+    """
+    Devuelve x + y * h. Admite arrays de NumPy (motor "numpy") o listas de
+    Vector3D (motor "python").
+    """
+    if isinstance(x, list):
+        return [xi + yi * h for xi, yi in zip(x, y)]
+    return x + y * h
+
+
+def _promedio_rk4(k1, k2, k3, k4):
+    """Devuelve (k1 + 2*k2 + 2*k3 + k4) / 6."""
+    if isinstance(k1, list):
+        return [(a + b * 2.0 + c * 2.0 + d) / 6.0 for a, b, c, d in zip(k1, k2, k3, k4)]
+    return (k1 + 2.0 * k2 + 2.0 * k3 + k4) / 6.0
@@ -2,23 +2,73 @@ from .simulador import Simulador
 from .vector3d import Vector3D
 import sys
 
-def run_simulation(sim: Simulador, dt: float, total_time: float):
+def run_simulation(sim: Simulador, dt: float, total_time: float, checkpoint: str | None = None,
+                   checkpoint_interval: int = 1000, current_time: float = 0.0, step: int = 0,
+                   verbose: bool = True) -> int:
     """
-    Ejecuta la simulación por un tiempo total dado.
+    Ejecuta la simulación por un tiempo total dado y devuelve el número de pasos realizados.
+    Si se indica checkpoint, cada checkpoint_interval pasos se guarda en ese archivo
+    (en segundo plano) un punto de control desde el que resume_simulation puede
+    continuar. current_time y step permiten continuar una ejecución empezada.
+    Con verbose=False no se escribe nada por consola. Si el simulador se está
+    perfilando (sim.activar_perfilado()) se miden también la escritura por consola
+    y la captura de los puntos de control.
     """
-    print(f"\n--- Iniciando Simulación (dt={dt}s, tiempo total={total_time}s) ---")
-    current_time = 0.0
-    step = 0
-    while current_time < total_time:
-        print(f"\n--- Paso de Simulación {step + 1} ---")
-        sim.paso_simulacion(dt, current_time)
-        current_time += dt
-        step += 1
-        # Opcional: pausar la simulación o mostrar solo cada N pasos
-        # if step % 10 == 0:
-        #     sim.listar_cuerpos()
-    print("\n--- Simulación Finalizada ---")
-    sim.listar_cuerpos()
+    if verbose:
+        print(f"\n--- Iniciando Simulación (dt={dt}s, tiempo total={total_time}s) ---")
+    inicial = step
+    gestor = None
+    if checkpoint:
+        # pickle y threading solo se cargan si se guardan puntos de control
+        from .puntos_control import GestorPuntosControl
+        gestor = GestorPuntosControl(checkpoint, checkpoint_interval)
+    parametros = {"dt": dt, "total_time": total_time}
+    try:
+        while current_time < total_time:
+            perfil = sim.perfilador
+            if verbose:
+                if perfil is not None:
+                    perfil.iniciar("consola")
+                print(f"\n--- Paso de Simulación {step + 1} ---")
+                if perfil is not None:
+                    perfil.terminar()
+            sim.paso_simulacion(dt, current_time)
+            current_time += dt
+            step += 1
+            if gestor is not None and gestor.toca(step):
+                if perfil is not None:
+                    perfil.iniciar("puntos_control")
+                gestor.guardar(sim, current_time, step, parametros)
+                if perfil is not None:
+                    perfil.terminar()
+            # Opcional: pausar la simulación o mostrar solo cada N pasos
+            # if step % 10 == 0:
+            #     sim.listar_cuerpos()
+    finally:
+        # El último punto de control se termina de escribir aunque la simulación falle
+        if gestor is not None:
+            gestor.esperar()
+    if verbose:
+        print("\n--- Simulación Finalizada ---")
+        sim.listar_cuerpos()
+    return step - inicial
+
+
+def resume_simulation(checkpoint: str, checkpoint_interval: int = 1000,
+                      imprimir_pasos: bool | None = None) -> Simulador:
+    """
+    Reanuda una simulación desde un punto de control guardado por run_simulation y
+    la completa con los mismos dt y tiempo total, siguiendo guardando puntos de
+    control en el mismo archivo. Devuelve el simulador al final de la ejecución.
+    """
+    from .puntos_control import cargar_punto_control, restaurar_estado
+    estado = cargar_punto_control(checkpoint)
+    sim = restaurar_estado(estado, imprimir_pasos)
+    parametros = estado["parametros"]
+    run_simulation(sim, parametros["dt"], parametros["total_time"], checkpoint=checkpoint,
+                   checkpoint_interval=checkpoint_interval,
+                   current_time=estado["tiempo"], step=estado["paso"])
+    return sim
 
 
 def main():
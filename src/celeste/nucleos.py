@@ -0,0 +1,422 @@
+from typing import Dict
+import numpy as np
+
+# Tamaño por defecto de los bloques (teselas) de la suma directa. Con 256x256
+# pares cada temporal de la tesela ocupa 512 KB y cabe en la caché L2/L3.
+BLOQUE_POR_DEFECTO = 256
+
+# Precisiones de la suma directa (ver _suma_directa_simple)
+PRECISIONES = ("float64", "float32")
+
+
+def aceleraciones_directas(masas: np.ndarray, posiciones: np.ndarray, G: float,
+                           bloque: int = BLOQUE_POR_DEFECTO, suavizado=None,
+                           precision: str = "float64") -> np.ndarray:
+    """
+    Calcula la aceleración gravitatoria de cada cuerpo por suma directa de todos los pares.
+    a_i = sum_j G * m_j / |r_ij|^3 * (r_j - r_i)
+
+    El espacio de pares se recorre por teselas de tamaño bloque x bloque. Solo se
+    evalúan las teselas con j >= i y las contribuciones se aplican a ambos cuerpos
+    (tercera ley de Newton), de modo que cada par se calcula una única vez.
+    Los pares a distancia cero se ignoran, igual que en Simulador.calcular_fuerzas.
+    Con un núcleo de suavizado (ver suavizado.py) 1/|r_ij|^3 se sustituye por su factor g.
+    Con precision="float32" las teselas se evalúan en precisión simple (ver
+    _suma_directa_simple).
+    """
+    return _suma(masas, posiciones, G, bloque, False, suavizado, precision)[0]
+
+
+def aceleraciones_y_potencial_directas(masas: np.ndarray, posiciones: np.ndarray, G: float,
+                                       bloque: int = BLOQUE_POR_DEFECTO, suavizado=None,
+                                       precision: str = "float64"):
+    """
+    Igual que aceleraciones_directas, pero en el mismo recorrido de pares acumula la
+    energía potencial total U = -sum_{i<j} G * m_i * m_j / |r_ij| reutilizando la
+    distancia de cada par. Devuelve (aceleraciones, energía potencial); la energía
+    es -inf si dos cuerpos coinciden, igual que CuerpoCeleste.energia_potencial_con.
+    Con suavizado, 1/|r_ij| y 1/|r_ij|^3 se sustituyen por los factores (f, g) del
+    núcleo, evaluados una sola vez por par, y la energía siempre es finita.
+    """
+    return _suma(masas, posiciones, G, bloque, True, suavizado, precision)
+
+
+def _suma(masas: np.ndarray, posiciones: np.ndarray, G: float, bloque: int, con_potencial: bool,
+          suavizado, precision: str):
+    """Elige la implementación de la suma directa según la precisión."""
+    if precision == "float64":
+        return _suma_directa(masas, posiciones, G, bloque, con_potencial, suavizado)
+    if precision == "float32":
+        return _suma_directa_simple(masas, posiciones, G, bloque, con_potencial, suavizado)
+    raise ValueError(f"Precisión desconocida: '{precision}'. Opciones: {', '.join(PRECISIONES)}")
+
+
+def _suma_directa(masas: np.ndarray, posiciones: np.ndarray, G: float, bloque: int,
+                  con_potencial: bool, suavizado=None):
+    """Implementación común de la suma directa por teselas simétricas."""
+    n = len(masas)
+    aceleraciones = np.zeros((n, 3))
+    potencial = 0.0
+    colision = False
+    if n < 2:
+        return aceleraciones, 0.0
+
+    # Columnas contiguas para que cada tesela recorra memoria de forma secuencial
+    x = np.ascontiguousarray(posiciones[:, 0])
+    y = np.ascontiguousarray(posiciones[:, 1])
+    z = np.ascontiguousarray(posiciones[:, 2])
+    ax = np.zeros(n)
+    ay = np.zeros(n)
+    az = np.zeros(n)
+
+    for ini_i in range(0, n, bloque):
+        fin_i = min(ini_i + bloque, n)
+        for ini_j in range(ini_i, n, bloque):
+            fin_j = min(ini_j + bloque, n)
+
+            # Vector distancia de i a j (r_j - r_i) para toda la tesela
+            dx = x[None, ini_j:fin_j] - x[ini_i:fin_i, None]
+            dy = y[None, ini_j:fin_j] - y[ini_i:fin_i, None]
+            dz = z[None, ini_j:fin_j] - z[ini_i:fin_i, None]
+            r2 = dx * dx + dy * dy + dz * dz
+            if con_potencial:
+                # 1/r sirve para el potencial y, elevado al cubo, para la fuerza
+                inv_r, w = _factores(r2, suavizado)
+                mm = masas[ini_i:fin_i, None] * masas[None, ini_j:fin_j]
+                if ini_j == ini_i:
+                    # En la diagonal solo cuentan los pares i < j
+                    superior = np.triu(np.ones(r2.shape, dtype=bool), k=1)
+                    potencial += (mm * inv_r)[superior].sum()
+                    colision = colision or (suavizado is None and bool((r2[superior] == 0).any()))
+                else:
+                    potencial += (mm * inv_r).sum()
+                    colision = colision or (suavizado is None and bool((r2 == 0).any()))
+            else:
+                w = _factores(r2, suavizado)[1]
+
+            # Aceleración sobre i debida a j
+            wj = w * masas[None, ini_j:fin_j]
+            ax[ini_i:fin_i] += (wj * dx).sum(axis=1)
+            ay[ini_i:fin_i] += (wj * dy).sum(axis=1)
+            az[ini_i:fin_i] += (wj * dz).sum(axis=1)
+
+            if ini_j != ini_i:
+                # Tesela fuera de la diagonal: reacción sobre j debida a i
+                wi = w * masas[ini_i:fin_i, None]
+                ax[ini_j:fin_j] -= (wi * dx).sum(axis=0)
+                ay[ini_j:fin_j] -= (wi * dy).sum(axis=0)
+                az[ini_j:fin_j] -= (wi * dz).sum(axis=0)
+
+    aceleraciones[:, 0] = ax
+    aceleraciones[:, 1] = ay
+    aceleraciones[:, 2] = az
+    aceleraciones *= G
+    energia_potencial = float('-inf') if colision else -G * float(potencial)
+    return aceleraciones, energia_potencial
+
+
+def _suma_directa_simple(masas: np.ndarray, posiciones: np.ndarray, G: float, bloque: int,
+                         con_potencial: bool, suavizado=None):
+    """
+    Suma directa por teselas simétricas en precisión simple (float32), con la mitad
+    de tráfico de memoria que _suma_directa:
+
+      - las posiciones siguen en float64 y el vector r_j - r_i de cada par se resta
+        en float64 y se guarda en float32, así que su error relativo es el de
+        float32 (~6e-8) aunque los cuerpos estén lejos del origen;
+      - posiciones y masas se escalan por la extensión del sistema y la mayor masa
+        para que 1/r^3 no se salga del rango de float32 con unidades del SI;
+      - cada tesela se suma en float32 y las sumas de las teselas se acumulan
+        con el algoritmo de Kahan (suma compensada), de modo que el error de la
+        acumulación no crece con el número de teselas.
+
+    El error relativo de la aceleración de un cuerpo es del orden de 1e-7 veces
+    sum_j |F_ij| / |sum_j F_ij|: unos 1e-7 si las fuerzas no se cancelan y mayor
+    en cuerpos cuya fuerza neta es pequeña frente a cada término. Los pares a menos
+    de ~1e-12 veces la extensión del sistema se salen del rango de float32.
+    """
+    n = len(masas)
+    aceleraciones = np.zeros((n, 3))
+    if n < 2:
+        return aceleraciones, 0.0
+    escala = float(np.ptp(posiciones, axis=0).max()) or 1.0
+    masa_escala = float(masas.max()) or 1.0
+    if suavizado is not None:
+        # El mismo núcleo con la longitud de suavizado en las unidades escaladas
+        suavizado = type(suavizado)(suavizado.epsilon / escala)
+    x = np.ascontiguousarray(posiciones[:, 0]) / escala
+    y = np.ascontiguousarray(posiciones[:, 1]) / escala
+    z = np.ascontiguousarray(posiciones[:, 2]) / escala
+    m = (masas / masa_escala).astype(np.float32)
+    # Sumas de cada componente y sus compensaciones de Kahan
+    suma = np.zeros((3, n), dtype=np.float32)
+    compensacion = np.zeros((3, n), dtype=np.float32)
+    potencial = 0.0
+    colision = False
+    d = np.empty((3, bloque, bloque), dtype=np.float32)
+
+    for ini_i in range(0, n, bloque):
+        fin_i = min(ini_i + bloque, n)
+        for ini_j in range(ini_i, n, bloque):
+            fin_j = min(ini_j + bloque, n)
+            dx, dy, dz = d[:, :fin_i - ini_i, :fin_j - ini_j]
+            for columna, componente in ((x, dx), (y, dy), (z, dz)):
+                np.subtract(columna[None, ini_j:fin_j], columna[ini_i:fin_i, None], out=componente,
+                            casting='same_kind')
+            r2 = dx * dx + dy * dy + dz * dz
+            inv_r, w = _factores(r2, suavizado)
+            if con_potencial:
+                mm = m[ini_i:fin_i, None] * m[None, ini_j:fin_j]
+                if ini_j == ini_i:
+                    superior = np.triu(np.ones(r2.shape, dtype=bool), k=1)
+                    potencial += float((mm * inv_r)[superior].sum())
+                    colision = colision or (suavizado is None and bool((r2[superior] == 0).any()))
+                else:
+                    potencial += float((mm * inv_r).sum())
+                    colision = colision or (suavizado is None and bool((r2 == 0).any()))
+
+            wj = w * m[None, ini_j:fin_j]
+            filas = slice(ini_i, fin_i)
+            for k, componente in enumerate((dx, dy, dz)):
+                _sumar_compensado(suma[k, filas], compensacion[k, filas], (wj * componente).sum(axis=1))
+            if ini_j != ini_i:
+                wi = w * m[ini_i:fin_i, None]
+                columnas = slice(ini_j, fin_j)
+                for k, componente in enumerate((dx, dy, dz)):
+                    _sumar_compensado(suma[k, columnas], compensacion[k, columnas], -(wi * componente).sum(axis=0))
+
+    aceleraciones[:] = suma.T
+    aceleraciones *= G * masa_escala / escala ** 2
+    energia_potencial = float('-inf') if colision else -G * masa_escala ** 2 / escala * potencial
+    return aceleraciones, energia_potencial
+
+
+def _sumar_compensado(suma: np.ndarray, compensacion: np.ndarray, valores: np.ndarray):
+    """Suma valores a suma, en su sitio, con el algoritmo de Kahan (actualiza compensacion)."""
+    corregidos = valores - compensacion
+    nueva = suma + corregidos
+    compensacion[:] = (nueva - suma) - corregidos
+    suma[:] = nueva
+
+
+def aceleraciones_sobre(objetivos: np.ndarray, masas: np.ndarray, posiciones: np.ndarray, G: float,
+                        bloque: int = BLOQUE_POR_DEFECTO, suavizado=None) -> np.ndarray:
+    """
+    Calcula la aceleración gravitatoria que los cuerpos (masas, posiciones) producen
+    en cada uno de los puntos objetivos (M, 3). Los pares a distancia cero se ignoran,
+    así que un objetivo que coincide con una fuente no recibe su contribución.
+    Coste O(M * N), recorrido por bloques de objetivos.
+    """
+    aceleraciones = np.zeros((len(objetivos), 3))
+    for ini_i in range(0, len(objetivos), bloque):
+        fin_i = min(ini_i + bloque, len(objetivos))
+        for ini_j in range(0, len(masas), bloque):
+            fin_j = min(ini_j + bloque, len(masas))
+            d = posiciones[None, ini_j:fin_j, :] - objetivos[ini_i:fin_i, None, :]
+            w = _factores((d * d).sum(axis=2), suavizado)[1] * masas[None, ini_j:fin_j]
+            aceleraciones[ini_i:fin_i] += (w[:, :, None] * d).sum(axis=1)
+    aceleraciones *= G
+    return aceleraciones
+
+
+def aceleraciones_y_potencial_filas(masas: np.ndarray, x: np.ndarray, y: np.ndarray, z: np.ndarray,
+                                    G: float, inicio: int, fin: int, bloque: int = BLOQUE_POR_DEFECTO,
+                                    suavizado=None):
+    """
+    Calcula la aceleración de los cuerpos inicio..fin-1 debida a todos los demás y
+    su parte de la energía potencial, -G/2 * sum_i sum_{j != i} m_i m_j / r_ij, de modo
+    que la suma de las partes de todas las filas es la energía potencial total.
+    x, y, z son las columnas contiguas de las posiciones. La parte es -inf si alguno
+    de esos cuerpos coincide con otro (salvo con suavizado).
+    No usa la simetría de los pares: cada fila se calcula de forma independiente,
+    con el mismo orden de operaciones sea cual sea el reparto de filas.
+    """
+    xi = x[inicio:fin, None]
+    yi = y[inicio:fin, None]
+    zi = z[inicio:fin, None]
+    ax = np.zeros(fin - inicio)
+    ay = np.zeros(fin - inicio)
+    az = np.zeros(fin - inicio)
+    potencial = np.zeros(fin - inicio)
+    coincidencias = 0
+    for ini_j in range(0, len(masas), bloque):
+        fin_j = min(ini_j + bloque, len(masas))
+        dx = x[None, ini_j:fin_j] - xi
+        dy = y[None, ini_j:fin_j] - yi
+        dz = z[None, ini_j:fin_j] - zi
+        r2 = dx * dx + dy * dy + dz * dz
+        coincidencias += int(np.count_nonzero(r2 == 0))
+        # 1/r sirve para el potencial y, elevado al cubo, para la fuerza
+        inv_r, w = _factores(r2, suavizado)
+        mj = masas[None, ini_j:fin_j]
+        potencial += (inv_r * mj).sum(axis=1)
+        w = w * mj
+        ax += (w * dx).sum(axis=1)
+        ay += (w * dy).sum(axis=1)
+        az += (w * dz).sum(axis=1)
+
+    aceleraciones = np.empty((fin - inicio, 3))
+    aceleraciones[:, 0] = ax
+    aceleraciones[:, 1] = ay
+    aceleraciones[:, 2] = az
+    aceleraciones *= G
+    if suavizado is not None:
+        # Con suavizado el término de cada cuerpo consigo mismo es finito y se descuenta
+        potencial -= masas[inicio:fin] * suavizado.factores(np.zeros(1))[0][0]
+        return aceleraciones, -G * float(masas[inicio:fin] @ potencial) / 2.0
+    # Cada cuerpo está a distancia cero de sí mismo; cualquier otro cero es una colisión
+    if coincidencias > fin - inicio:
+        return aceleraciones, float('-inf')
+    return aceleraciones, -G * float(masas[inicio:fin] @ potencial) / 2.0
+
+
+def aceleraciones_y_jerk_sobre(objetivos: np.ndarray, vel_objetivos: np.ndarray, masas: np.ndarray,
+                               posiciones: np.ndarray, velocidades: np.ndarray, G: float,
+                               bloque: int = BLOQUE_POR_DEFECTO):
+    """
+    Calcula la aceleración y su derivada temporal (jerk) que los cuerpos fuente
+    producen en los puntos objetivos, que se mueven con velocidades vel_objetivos.
+    j = sum_j G * m_j * [v_ij / r^3 - 3 (r_ij · v_ij) r_ij / r^5]
+    Los pares a distancia cero se ignoran. Devuelve dos arrays (M, 3).
+    """
+    aceleraciones = np.zeros((len(objetivos), 3))
+    jerks = np.zeros((len(objetivos), 3))
+    for ini_i in range(0, len(objetivos), bloque):
+        fin_i = min(ini_i + bloque, len(objetivos))
+        for ini_j in range(0, len(masas), bloque):
+            fin_j = min(ini_j + bloque, len(masas))
+            d = posiciones[None, ini_j:fin_j, :] - objetivos[ini_i:fin_i, None, :]
+            dv = velocidades[None, ini_j:fin_j, :] - vel_objetivos[ini_i:fin_i, None, :]
+            r2 = (d * d).sum(axis=2)
+            w = _inverso_cubo(r2) * masas[None, ini_j:fin_j]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                rv = np.where(r2 > 0, 3.0 * (d * dv).sum(axis=2) / r2, 0.0)
+            aceleraciones[ini_i:fin_i] += (w[:, :, None] * d).sum(axis=1)
+            jerks[ini_i:fin_i] += (w[:, :, None] * (dv - rv[:, :, None] * d)).sum(axis=1)
+    aceleraciones *= G
+    jerks *= G
+    return aceleraciones, jerks
+
+
+def energia_potencial_directa(masas: np.ndarray, posiciones: np.ndarray, G: float,
+                              bloque: int = BLOQUE_POR_DEFECTO, suavizado=None) -> float:
+    """
+    Calcula la energía potencial gravitatoria total U = -sum_{i<j} G * m_i * m_j / |r_ij|
+    recorriendo los pares por teselas. Devuelve -inf si dos cuerpos coinciden,
+    igual que CuerpoCeleste.energia_potencial_con. Con suavizado, 1/|r_ij| se
+    sustituye por el factor f del núcleo.
+    """
+    n = len(masas)
+    total = 0.0
+    for ini_i in range(0, n, bloque):
+        fin_i = min(ini_i + bloque, n)
+        for ini_j in range(ini_i, n, bloque):
+            fin_j = min(ini_j + bloque, n)
+            d = posiciones[None, ini_j:fin_j, :] - posiciones[ini_i:fin_i, None, :]
+            mm = masas[ini_i:fin_i, None] * masas[None, ini_j:fin_j]
+            if suavizado is not None:
+                inv_r = suavizado.factores((d * d).sum(axis=2))[0]
+                if ini_j == ini_i:
+                    inv_r = np.triu(inv_r, k=1)
+                total += (mm * inv_r).sum()
+                continue
+            r = np.sqrt((d * d).sum(axis=2))
+            if ini_j == ini_i:
+                # En la diagonal solo cuentan los pares i < j
+                i_sup, j_sup = np.triu_indices(fin_i - ini_i, k=1)
+                r = r[i_sup, j_sup]
+                mm = mm[i_sup, j_sup]
+            if np.any(r == 0):
+                return float('-inf')
+            total += (mm / r).sum()
+    return -G * total
+
+
+def errores_relativos(aproximadas: np.ndarray, masas: np.ndarray, posiciones: np.ndarray, G: float,
+                      muestra: int | None = 1000, semilla: int = 0, suavizado=None) -> Dict[str, float]:
+    """
+    Mide el error relativo |a - a_directa| / |a_directa| de unas aceleraciones aproximadas
+    sobre una muestra aleatoria de cuerpos (o sobre todos si muestra es None). La
+    referencia se calcula por suma directa solo para la muestra, con coste O(muestra * N).
+    Devuelve un diccionario con el error máximo, la mediana, el percentil 99 y el RMS.
+    """
+    n = len(masas)
+    if muestra is None or muestra >= n:
+        seleccion = np.arange(n)
+    else:
+        seleccion = np.random.default_rng(semilla).choice(n, size=muestra, replace=False)
+
+    exactas = aceleraciones_sobre(posiciones[seleccion], masas, posiciones, G, suavizado=suavizado)
+    modulo = np.sqrt((exactas ** 2).sum(axis=1))
+    diferencia = np.sqrt(((aproximadas[seleccion] - exactas) ** 2).sum(axis=1))
+    validos = modulo > 0
+    errores = diferencia[validos] / modulo[validos]
+    if len(errores) == 0:
+        errores = np.zeros(1)
+    return {
+        "max": float(errores.max()),
+        "mediana": float(np.median(errores)),
+        "p99": float(np.percentile(errores, 99)),
+        "rms": float(np.sqrt((errores ** 2).mean())),
+    }
+
+
+def _inverso(r2: np.ndarray) -> np.ndarray:
+    """Devuelve 1/r a partir de r^2, con 0 donde r^2 == 0 (mismo cuerpo o colisión)."""
+    with np.errstate(divide='ignore'):
+        inv_r = 1.0 / np.sqrt(r2)
+    inv_r[r2 == 0] = 0.0
+    return inv_r
+
+
+def _inverso_cubo(r2: np.ndarray) -> np.ndarray:
+    """Devuelve 1/r^3 a partir de r^2, con 0 donde r^2 == 0 (mismo cuerpo o colisión)."""
+    # 1/sqrt y dos productos es bastante más rápido que r2 ** -1.5
+    inv_r = _inverso(r2)
+    return inv_r * inv_r * inv_r
+
+
+def _factores(r2: np.ndarray, suavizado=None):
+    """
+    Devuelve (1/r, 1/r^3) a partir de r^2 (con 0 donde r^2 == 0), o los factores
+    (f, g) del núcleo de suavizado si se indica uno.
+    """
+    if suavizado is not None:
+        return suavizado.factores(r2)
+    inv_r = _inverso(r2)
+    return inv_r, inv_r * inv_r * inv_r
+
+
+class SolverDirecto:
+    """
+    Solver de fuerzas por suma directa de todos los pares, O(N^2).
+    Es el solver por defecto del motor "numpy" y la referencia para medir
+    la precisión de los solvers aproximados.
+    """
+
+    nombre = "directo"
+
+    def __init__(self, bloque: int = BLOQUE_POR_DEFECTO, suavizado=None, precision: str = "float64"):
+        """
+        Inicializa el solver con el tamaño de tesela indicado y, opcionalmente,
+        un núcleo de suavizado (ver suavizado.py). Con precision="float32" las
+        teselas se evalúan en precisión simple (ver _suma_directa_simple).
+        """
+        if precision not in PRECISIONES:
+            raise ValueError(f"Precisión desconocida: '{precision}'. Opciones: {', '.join(PRECISIONES)}")
+        self.bloque = bloque
+        self.suavizado = suavizado
+        self.precision = precision
+        # Pares evaluados en la última llamada: cada par una vez, N(N-1)/2
+        self.interacciones = 0
+
+    def aceleraciones(self, masas: np.ndarray, posiciones: np.ndarray, G: float) -> np.ndarray:
+        """Devuelve la aceleración (N, 3) de cada cuerpo."""
+        self.interacciones = len(masas) * (len(masas) - 1) // 2
+        return aceleraciones_directas(masas, posiciones, G, self.bloque, self.suavizado, self.precision)
+
+    def aceleraciones_y_potencial(self, masas: np.ndarray, posiciones: np.ndarray, G: float):
+        """Devuelve la aceleración (N, 3) de cada cuerpo y la energía potencial total en un solo recorrido."""
+        self.interacciones = len(masas) * (len(masas) - 1) // 2
+        return aceleraciones_y_potencial_directas(masas, posiciones, G, self.bloque, self.suavizado,
+                                                  self.precision)
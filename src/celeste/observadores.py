@@ -0,0 +1,116 @@
+from .vector3d import Vector3D
+
+
+class Diagnostico:
+    """
+    Diagnósticos del sistema tras un paso de simulación, calculados de forma perezosa:
+    cada magnitud se calcula la primera vez que un observador la pide y se reutiliza
+    para el resto de observadores del mismo paso. La energía potencial se obtiene del
+    mismo recorrido de pares que las fuerzas (ver Simulador._energia_potencial_actual).
+    """
+
+    def __init__(self, sim, paso: int, tiempo: float, tiempo_inicio: float | None = None):
+        """
+        Inicializa el diagnóstico del paso indicado sin calcular nada todavía.
+        tiempo es el del estado del simulador, al final del paso; tiempo_inicio es
+        el del comienzo del paso, con el que la consola lo etiqueta (por defecto, tiempo).
+        """
+        self.sim = sim
+        self.paso = paso
+        self.tiempo = tiempo
+        self.tiempo_inicio = tiempo if tiempo_inicio is None else tiempo_inicio
+        self._cache = {}
+
+    def _calcular(self, funcion):
+        """Llama a funcion() dentro de la fase "diagnosticos" si el simulador se está perfilando."""
+        perfil = self.sim.perfilador
+        if perfil is None:
+            return funcion()
+        perfil.iniciar("diagnosticos")
+        try:
+            return funcion()
+        finally:
+            perfil.terminar()
+
+    @property
+    def energia_cinetica(self) -> float:
+        """Energía cinética total del sistema."""
+        if "cinetica" not in self._cache:
+            self._cache["cinetica"] = self._calcular(self.sim._calcular_energia_cinetica_total)
+        return self._cache["cinetica"]
+
+    @property
+    def energia_potencial(self) -> float:
+        """Energía potencial gravitatoria total del sistema."""
+        if "potencial" not in self._cache:
+            self._cache["potencial"] = self._calcular(self.sim._energia_potencial_actual)
+        return self._cache["potencial"]
+
+    @property
+    def energia_total(self) -> float:
+        """Suma de las energías cinética y potencial."""
+        return self.energia_cinetica + self.energia_potencial
+
+    @property
+    def momento_lineal(self) -> Vector3D:
+        """Momento lineal total del sistema."""
+        if "momento" not in self._cache:
+            self._cache["momento"] = self._calcular(self.sim._calcular_momento_lineal_total)
+        return self._cache["momento"]
+
+
+class ObservadorConsola:
+    """
+    Observador que muestra por consola el tiempo, las energías y el momento lineal
+    del sistema. Las cuatro líneas se escriben con una sola llamada a print.
+    """
+
+    def __call__(self, diagnostico: Diagnostico):
+        print(texto_diagnostico(diagnostico))
+
+
+def texto_diagnostico(diagnostico) -> str:
+    """
+    Texto que ObservadorConsola muestra para un diagnóstico (o cualquier objeto con
+    tiempo_inicio, energia_cinetica, energia_potencial y momento_lineal, como
+    salida.Captura). Cada paso se etiqueta con el tiempo de su comienzo.
+    """
+    return (f"\nPaso t = {diagnostico.tiempo_inicio:.2f} s:\n"
+            f"  Energía Cinética Total: {diagnostico.energia_cinetica:.6e} J\n"
+            f"  Energía Potencial Total: {diagnostico.energia_potencial:.6e} J\n"
+            f"  Momento Lineal Total: {diagnostico.momento_lineal} kg·m/s")
+
+
+class RegistroEnergia:
+    """
+    Observador que acumula en listas el tiempo, las energías y el momento lineal
+    de cada paso muestreado, para analizarlos al terminar la simulación.
+    """
+
+    def __init__(self):
+        """
+        Inicializa el registro vacío.
+        """
+        self.pasos: list[int] = []
+        self.tiempos: list[float] = []
+        self.energia_cinetica: list[float] = []
+        self.energia_potencial: list[float] = []
+        self.momento_lineal: list[Vector3D] = []
+
+    def __call__(self, diagnostico: Diagnostico):
+        self.pasos.append(diagnostico.paso)
+        self.tiempos.append(diagnostico.tiempo)
+        self.energia_cinetica.append(diagnostico.energia_cinetica)
+        self.energia_potencial.append(diagnostico.energia_potencial)
+        self.momento_lineal.append(diagnostico.momento_lineal)
+
+    def energia_total(self) -> list[float]:
+        """Devuelve la energía total de cada paso registrado."""
+        return [k + u for k, u in zip(self.energia_cinetica, self.energia_potencial)]
+
+    def error_relativo_energia(self) -> float:
+        """Devuelve el máximo de |E - E0| / |E0| sobre los pasos registrados."""
+        energias = self.energia_total()
+        if not energias or energias[0] == 0:
+            return 0.0
+        return max(abs((e - energias[0]) / energias[0]) for e in energias)
@@ -0,0 +1,146 @@
+import numpy as np
+from .nucleos import aceleraciones_y_jerk_sobre
+
+
+class HermiteBloques:
+    """
+    Integrador de Hermite de 4º orden con pasos de tiempo individuales por bloques.
+
+    Cada cuerpo avanza con su propio paso dt_max / 2^k (k = 0..niveles), elegido a
+    partir de su aceleración y sus derivadas con el criterio de Aarseth. En cada
+    subpaso solo se corrigen los cuerpos a los que les toca; el resto se predice
+    hasta ese instante con su desarrollo de Taylor para evaluar las fuerzas.
+    Al final de paso(sim, dt) todos los cuerpos quedan sincronizados en t + dt.
+
+    Requiere el motor "numpy". Las fuerzas se calculan por suma directa.
+    """
+
+    nombre = "hermite_bloques"
+    orden = 4
+
+    def __init__(self, eta: float = 0.02, eta_inicial: float = 0.01, niveles: int = 20):
+        """
+        Inicializa el integrador. eta controla la precisión del criterio de paso,
+        eta_inicial se usa en el primer paso (solo con aceleración y jerk) y
+        niveles es el número máximo de divisiones por 2 del paso global.
+        """
+        if niveles < 0 or niveles > 52:
+            raise ValueError("niveles debe estar entre 0 y 52.")
+        self.eta = eta
+        self.eta_inicial = eta_inicial
+        self.niveles = niveles
+        # Contadores acumulados: evaluaciones de fuerza por cuerpo y subpasos de bloque
+        self.evaluaciones = 0
+        self.subpasos = 0
+        self._aceleraciones = None
+        self._jerks = None
+        self._niveles_cuerpo = None
+        self._referencia = None
+
+    def paso(self, sim, dt: float):
+        """Avanza el sistema un paso global dt mediante subpasos por bloques."""
+        almacen = sim._almacen
+        if almacen is None:
+            raise ValueError("El integrador 'hermite_bloques' requiere el motor 'numpy'.")
+        n = len(almacen)
+        if n == 0:
+            return
+        masas = almacen.masas
+        x = almacen.posiciones
+        v = almacen.velocidades
+        G = sim.G
+
+        # Tiempo en unidades enteras de dt / 2^niveles para que los bloques sean exactos
+        total = 1 << self.niveles
+        if not self._estado_valido(x, v, dt):
+            self._aceleraciones, self._jerks = aceleraciones_y_jerk_sobre(x, v, masas, x, v, G)
+            self.evaluaciones += n
+            sim.interacciones += n * (n - 1)
+            self._niveles_cuerpo = self._nivel_inicial(self._aceleraciones, self._jerks, dt)
+        a = self._aceleraciones
+        j = self._jerks
+        nivel = self._niveles_cuerpo
+        t_cuerpo = np.zeros(n, dtype=np.int64)
+
+        t = 0
+        while t < total:
+            pasos = total >> nivel
+            t_siguiente = int((t_cuerpo + pasos).min())
+            activos = np.flatnonzero(t_cuerpo + pasos == t_siguiente)
+
+            # Predicción de todos los cuerpos al instante t_siguiente
+            tau = ((t_siguiente - t_cuerpo) * (dt / total))[:, None]
+            xp = x + v * tau + a * (tau ** 2 / 2.0) + j * (tau ** 3 / 6.0)
+            vp = v + a * tau + j * (tau ** 2 / 2.0)
+
+            # Fuerzas sobre los cuerpos activos a partir de las posiciones predichas
+            a1, j1 = aceleraciones_y_jerk_sobre(xp[activos], vp[activos], masas, xp, vp, G)
+            self.evaluaciones += len(activos)
+            sim.interacciones += len(activos) * (n - 1)
+            self.subpasos += 1
+
+            # Corrección de Hermite
+            h = ((total >> nivel[activos]) * (dt / total))[:, None]
+            a0, j0 = a[activos], j[activos]
+            a2 = (-6.0 * (a0 - a1) - h * (4.0 * j0 + 2.0 * j1)) / h ** 2
+            a3 = (12.0 * (a0 - a1) + 6.0 * h * (j0 + j1)) / h ** 3
+            x[activos] = xp[activos] + a2 * (h ** 4 / 24.0) + a3 * (h ** 5 / 120.0)
+            v[activos] = vp[activos] + a2 * (h ** 3 / 6.0) + a3 * (h ** 4 / 24.0)
+            a[activos] = a1
+            j[activos] = j1
+            t_cuerpo[activos] = t_siguiente
+            t = t_siguiente
+
+            nivel[activos] = self._nuevo_nivel(a1, j1, a2 + a3 * h, a3, nivel[activos],
+                                               t_siguiente, dt)
+
+        almacen.aceleraciones[:] = a
+        self._referencia = (dt, x.copy(), v.copy())
+
+    def _estado_valido(self, x: np.ndarray, v: np.ndarray, dt: float) -> bool:
+        """Indica si las aceleraciones y jerks guardados corresponden al estado actual del almacén."""
+        if self._referencia is None:
+            return False
+        dt_ref, x_ref, v_ref = self._referencia
+        return (dt_ref == dt and x_ref.shape == x.shape
+                and np.array_equal(x_ref, x) and np.array_equal(v_ref, v))
+
+    def _cuantizar(self, dt_deseado: np.ndarray, dt: float) -> np.ndarray:
+        """Devuelve el menor nivel k tal que dt / 2^k <= dt_deseado, limitado a [0, niveles]."""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            k = np.ceil(np.log2(dt / dt_deseado))
+        k = np.nan_to_num(k, nan=0.0, posinf=self.niveles, neginf=0.0)
+        return np.clip(k, 0, self.niveles).astype(np.int64)
+
+    def _nivel_inicial(self, a: np.ndarray, j: np.ndarray, dt: float) -> np.ndarray:
+        """Nivel inicial de cada cuerpo según dt = eta_inicial * |a| / |j|."""
+        mod_a = _modulo(a)
+        mod_j = _modulo(j)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            dt_deseado = np.where(mod_j > 0, self.eta_inicial * mod_a / mod_j, np.inf)
+        return self._cuantizar(dt_deseado, dt)
+
+    def _nuevo_nivel(self, a: np.ndarray, j: np.ndarray, a2: np.ndarray, a3: np.ndarray,
+                     nivel: np.ndarray, t: int, dt: float) -> np.ndarray:
+        """
+        Nivel de los cuerpos recién corregidos según el criterio de Aarseth:
+        dt = sqrt(eta * (|a||a''| + |a'|^2) / (|a'||a'''| + |a''|^2)).
+        El paso puede reducirse libremente, pero solo se duplica si el instante
+        actual es múltiplo del paso duplicado (para conservar la estructura de bloques).
+        """
+        ma, mj, m2, m3 = _modulo(a), _modulo(j), _modulo(a2), _modulo(a3)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            dt_deseado = np.sqrt(self.eta * (ma * m2 + mj ** 2) / (mj * m3 + m2 ** 2))
+        deseado = self._cuantizar(dt_deseado, dt)
+
+        nuevo = np.maximum(deseado, nivel - 1)
+        # Subir de nivel (paso más largo) solo si t está alineado con el paso duplicado
+        sube = nuevo < nivel
+        alineado = (t % (1 << (self.niveles - np.maximum(nivel - 1, 0)))) == 0
+        nuevo[sube & ~alineado] = nivel[sube & ~alineado]
+        return np.maximum(nuevo, 0)
+
+
+def _modulo(u: np.ndarray) -> np.ndarray:
+    """Devuelve el módulo de cada fila de un array (M, 3)."""
+    return np.sqrt((u * u).sum(axis=1))
@@ -0,0 +1,177 @@
+"""
+Perfilado del bucle de simulación: tiempo por fase y contadores de trabajo.
+
+Con sim.activar_perfilado() el simulador mide cada fase de paso_simulacion y
+run_simulation:
+
+  paso            el paso completo (su tiempo propio es la sobrecarga del bucle)
+  integrador      integrador.paso: actualización de velocidades y posiciones
+  fuerzas         recorridos de pares de calcular_fuerzas (no los reutilizados de la caché)
+  colisiones      búsqueda y fusión de colisiones
+  observadores    llamadas a los observadores (escritura por consola, archivos...)
+  diagnosticos    energías y momento calculados para los observadores
+  puntos_control  captura de los puntos de control en run_simulation
+  consola         mensajes por paso de run_simulation (verbose=True)
+
+Las fases se anidan (fuerzas dentro de integrador, diagnosticos dentro de
+observadores...): de cada una se guarda el tiempo total y el propio, sin el de
+las fases internas, además del número de llamadas y la variación neta de bloques
+de memoria asignados por el intérprete (sys.getallocatedblocks). Los bloques son
+orientativos (los objetos creados en una fase y liberados en otra cuentan en las
+dos, y las listas libres del intérprete evitan algunas asignaciones), pero una
+fase cuyo número crece sin parar retiene memoria. Los contadores son pasos,
+recorridos de fuerzas, fuerzas reutilizadas de la caché e interacciones de pares
+evaluadas (pares, ver Simulador.interacciones): las que ha hecho realmente el
+solver, así que con Barnes–Hut y FMM son muchas menos que los N(N-1)/2 pares de
+la suma directa, y las partículas de prueba solo cuentan con los cuerpos con masa.
+
+Sin perfilador (sim.perfilador is None, lo habitual) cada fase cuesta una
+comparación con None.
+"""
+
+import json
+import sys
+import time
+
+FASES = ("paso", "integrador", "fuerzas", "colisiones", "observadores", "diagnosticos",
+         "puntos_control", "consola")
+CONTADORES = ("pasos", "evaluaciones_fuerzas", "fuerzas_reutilizadas", "pares")
+
+
+class Perfilador:
+    """
+    Acumula los tiempos por fase y los contadores de un simulador. Se obtiene con
+    Simulador.activar_perfilado(); resumen() los devuelve como diccionario y
+    texto() como tabla.
+    """
+
+    def __init__(self):
+        """
+        Inicializa el perfilador sin ninguna medida.
+        """
+        # Bloques que asigna el propio perfilador entre iniciar y terminar (el registro
+        # de la fase abierta): se mide con fases vacías y se descuenta de cada fase
+        self._sesgo_bloques = 0
+        self.reiniciar()
+        sesgos = []
+        for _ in range(5):
+            self.iniciar("")
+            self.terminar()
+            sesgos.append(self.fases.pop("")[3])
+        self._sesgo_bloques = min(sesgos)
+        self.reiniciar()
+
+    def reiniciar(self):
+        """Pone a cero los tiempos y los contadores."""
+        # fase -> [llamadas, segundos, segundos propios, bloques]
+        self.fases = {}
+        self.contadores = dict.fromkeys(CONTADORES, 0)
+        self.inicio = time.perf_counter()
+        # Fases abiertas: [fase, inicio, bloques al empezar, segundos de las fases internas]
+        self._pila = []
+        self._interacciones_previas = 0
+
+    def iniciar(self, fase: str):
+        """Empieza a medir una fase; se cierra con terminar()."""
+        abierta = [fase, 0.0, 0, 0.0]
+        self._pila.append(abierta)
+        abierta[2] = sys.getallocatedblocks()
+        abierta[1] = time.perf_counter()
+
+    def terminar(self):
+        """Cierra la última fase abierta con iniciar()."""
+        ahora = time.perf_counter()
+        bloques_fin = sys.getallocatedblocks()
+        fase, inicio, bloques, internas = self._pila.pop()
+        duracion = ahora - inicio
+        datos = self.fases.get(fase)
+        if datos is None:
+            datos = self.fases[fase] = [0, 0.0, 0.0, 0]
+        datos[0] += 1
+        datos[1] += duracion
+        datos[2] += duracion - internas
+        datos[3] += bloques_fin - bloques - self._sesgo_bloques
+        if self._pila:
+            self._pila[-1][3] += duracion
+
+    def iniciar_paso(self, sim):
+        """Abre la fase "paso", descartando las fases que un error haya dejado abiertas."""
+        self._pila.clear()
+        self._interacciones_previas = sim.interacciones
+        self.iniciar("paso")
+
+    def terminar_paso(self, sim):
+        """Cierra la fase "paso" y suma los pasos y las interacciones de pares del paso."""
+        self.terminar()
+        self.contadores["pasos"] += 1
+        self.contadores["pares"] += sim.interacciones - self._interacciones_previas
+
+    def resumen(self) -> dict:
+        """
+        Devuelve los contadores, los segundos transcurridos desde que se creó o
+        reinició el perfilador y, por fase, llamadas, segundos, segundos propios
+        y bloques de memoria netos.
+        """
+        return {
+            **self.contadores,
+            "segundos": time.perf_counter() - self.inicio,
+            "fases": {fase: {"llamadas": d[0], "segundos": d[1], "propio": d[2], "bloques": d[3]}
+                      for fase, d in self.fases.items()},
+        }
+
+    def texto(self) -> str:
+        """Devuelve el resumen como una tabla de texto, con las fases de mayor tiempo propio primero."""
+        resumen = self.resumen()
+        total = resumen["segundos"]
+        lineas = [f"Pasos: {resumen['pasos']}  Recorridos de fuerzas: {resumen['evaluaciones_fuerzas']}"
+                  f" (+{resumen['fuerzas_reutilizadas']} de la caché)  Pares: {resumen['pares']}"
+                  f"  Tiempo: {total:.3f} s",
+                  f"{'Fase':<15}{'Llamadas':>10}{'Total (s)':>12}{'Propio (s)':>12}{'% propio':>10}{'Bloques':>10}"]
+        for fase, d in sorted(resumen["fases"].items(), key=lambda e: -e[1]["propio"]):
+            porcentaje = 100.0 * d["propio"] / total if total > 0 else 0.0
+            lineas.append(f"{fase:<15}{d['llamadas']:>10}{d['segundos']:>12.4f}{d['propio']:>12.4f}"
+                          f"{porcentaje:>9.1f}%{d['bloques']:>10}")
+        return "\n".join(lineas)
+
+
+class RegistroPerfil:
+    """
+    Observador que escribe el resumen del perfilador del simulador como una línea
+    JSON (JSON Lines) cada vez que se le llama, para seguir ejecuciones por lotes:
+
+        sim.activar_perfilado()
+        registro = RegistroPerfil("perfil.jsonl")
+        sim.agregar_observador(registro, intervalo=1000)
+        ...
+        registro.cerrar()
+
+    Cada línea tiene el paso y el tiempo simulado, los contadores y las fases
+    acumulados (ver Perfilador.resumen) y los pasos/s desde la línea anterior.
+    destino puede ser una ruta o un archivo de texto abierto (por ejemplo sys.stderr).
+    """
+
+    def __init__(self, destino):
+        """
+        Abre (o sobrescribe) el archivo destino, o usa el archivo dado.
+        """
+        self._propio = isinstance(destino, str)
+        self._archivo = open(destino, "w") if self._propio else destino
+        self._anterior = None
+
+    def __call__(self, diagnostico):
+        perfilador = diagnostico.sim.perfilador
+        if perfilador is None:
+            raise ValueError("RegistroPerfil requiere activar el perfilado (sim.activar_perfilado()).")
+        resumen = perfilador.resumen()
+        pasos_s = None
+        if self._anterior is not None and resumen["segundos"] > self._anterior[1]:
+            pasos_s = (resumen["pasos"] - self._anterior[0]) / (resumen["segundos"] - self._anterior[1])
+        self._anterior = (resumen["pasos"], resumen["segundos"])
+        self._archivo.write(json.dumps({"paso": diagnostico.paso, "tiempo": diagnostico.tiempo,
+                                        "pasos_s": pasos_s, **resumen}) + "\n")
+        self._archivo.flush()
+
+    def cerrar(self):
+        """Cierra el archivo si lo abrió el propio registro."""
+        if self._propio and not self._archivo.closed:
+            self._archivo.close()
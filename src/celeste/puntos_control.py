@@ -0,0 +1,170 @@
+"""
+Puntos de control para reanudar simulaciones largas.
+
+Un punto de control guarda con pickle todo lo que determina la continuación de
+una simulación: los cuerpos (con sus valores exactos), G, el motor, el solver,
+el integrador con su estado interno (por ejemplo, las aceleraciones y los
+niveles de HermiteBloques), el núcleo de suavizado, el detector de colisiones con sus eventos, las
+fuerzas en caché, el contador de pasos y el reloj de la ejecución. Reanudar desde él reproduce bit a bit la misma
+trayectoria que la ejecución sin interrumpir.
+
+Los observadores no se guardan: pueden contener archivos abiertos o funciones
+que no se pueden serializar, y se vuelven a registrar al reanudar.
+"""
+
+import copy
+import os
+import pickle
+import threading
+from .vector3d import Vector3D
+from .observadores import ObservadorConsola
+
+VERSION = 3
+
+
+def capturar_estado(sim, tiempo: float = 0.0, paso: int = 0, parametros: dict | None = None) -> dict:
+    """
+    Devuelve una copia independiente del estado completo del simulador junto con
+    el reloj (tiempo y número de paso) y los parámetros de la ejecución.
+    """
+    if sim._almacen is not None:
+        almacen = sim._almacen
+        cuerpos = {
+            "ids": list(almacen.ids),
+            "masas": almacen.masas.copy(),
+            "radios": almacen.radios.copy(),
+            "posiciones": almacen.posiciones.copy(),
+            "velocidades": almacen.velocidades.copy(),
+            "aceleraciones": almacen.aceleraciones.copy(),
+        }
+    else:
+        # De las partículas de prueba se guarda la aceleración en lugar de la fuerza
+        cuerpos = [(c.id, c.masa, c.posicion.copia(), c.velocidad.copia(),
+                    (c.aceleracion if c.sin_masa else c.fuerza_neta).copia(), c.radio)
+                   for c in sim.cuerpos.values()]
+    return {
+        "version": VERSION,
+        "motor": sim.motor,
+        "G": sim.G,
+        "solver": copy.deepcopy(sim.solver),
+        "integrador": copy.deepcopy(sim.integrador),
+        "colisiones": copy.deepcopy(sim.colisiones),
+        "suavizado": copy.deepcopy(sim.suavizado),
+        "cuerpos": cuerpos,
+        "cache_fuerzas": copy.deepcopy(sim._cache_fuerzas),
+        "pasos_realizados": sim.pasos_realizados,
+        "imprimir_pasos": any(isinstance(o, ObservadorConsola) for o, _ in sim.observadores),
+        "tiempo": tiempo,
+        "paso": paso,
+        "parametros": dict(parametros or {}),
+    }
+
+
+def restaurar_estado(estado: dict, imprimir_pasos: bool | None = None):
+    """
+    Crea un Simulador con el estado capturado por capturar_estado. Si imprimir_pasos
+    es None se usa el mismo valor que tenía el simulador original.
+    """
+    from .simulador import Simulador
+    if estado.get("version") != VERSION:
+        raise ValueError(f"Versión de punto de control no soportada: {estado.get('version')}")
+    if imprimir_pasos is None:
+        imprimir_pasos = estado["imprimir_pasos"]
+    sim = Simulador(motor=estado["motor"], solver=estado["solver"],
+                    integrador=estado["integrador"], imprimir_pasos=imprimir_pasos,
+                    colisiones=copy.deepcopy(estado["colisiones"]),
+                    suavizado=copy.deepcopy(estado["suavizado"]))
+    if estado["G"] != Simulador.G:
+        sim.G = estado["G"]
+
+    cuerpos = estado["cuerpos"]
+    if sim._almacen is not None:
+        for id, masa, posicion, velocidad, radio in zip(cuerpos["ids"], cuerpos["masas"].tolist(),
+                                                        cuerpos["posiciones"].tolist(),
+                                                        cuerpos["velocidades"].tolist(),
+                                                        cuerpos["radios"].tolist()):
+            sim._insertar_cuerpo(id, masa, Vector3D(*posicion), Vector3D(*velocidad), radio)
+        sim._almacen.aceleraciones[:] = cuerpos["aceleraciones"]
+    else:
+        for id, masa, posicion, velocidad, fuerza, radio in cuerpos:
+            cuerpo = sim._insertar_cuerpo(id, masa, posicion.copia(), velocidad.copia(), radio)
+            if cuerpo.sin_masa:
+                cuerpo.aceleracion = fuerza.copia()
+            else:
+                cuerpo.fuerza_neta = fuerza.copia()
+
+    sim._cache_fuerzas = copy.deepcopy(estado["cache_fuerzas"])
+    sim.pasos_realizados = estado["pasos_realizados"]
+    return sim
+
+
+def guardar_punto_control(estado: dict, archivo: str):
+    """
+    Escribe un estado capturado en archivo de forma atómica: se escribe en un
+    archivo temporal, se sincroniza con el disco y se renombra sobre el destino,
+    de modo que archivo contiene siempre un punto de control completo.
+    """
+    temporal = f"{archivo}.tmp"
+    with open(temporal, "wb") as f:
+        pickle.dump(estado, f, protocol=pickle.HIGHEST_PROTOCOL)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporal, archivo)
+
+
+def cargar_punto_control(archivo: str) -> dict:
+    """Lee un punto de control escrito con guardar_punto_control."""
+    with open(archivo, "rb") as f:
+        estado = pickle.load(f)
+    if not isinstance(estado, dict) or "version" not in estado:
+        raise ValueError(f"'{archivo}' no es un punto de control.")
+    return estado
+
+
+class GestorPuntosControl:
+    """
+    Guarda puntos de control periódicos en segundo plano. La captura del estado
+    (una copia en memoria) se hace en el bucle de pasos; la serialización y la
+    escritura en disco se hacen en un hilo aparte. Solo hay una escritura en
+    curso: si al pedir otra la anterior no ha terminado, se espera a que termine.
+    """
+
+    def __init__(self, archivo: str, intervalo: int = 1000):
+        """
+        archivo es el destino de los puntos de control (se sobrescribe en cada uno)
+        e intervalo el número de pasos entre dos puntos de control.
+        """
+        if intervalo < 1:
+            raise ValueError("El intervalo de los puntos de control debe ser al menos 1.")
+        self.archivo = archivo
+        self.intervalo = intervalo
+        self.guardados = 0
+        self._hilo = None
+        self._error = None
+
+    def toca(self, paso: int) -> bool:
+        """Indica si hay que guardar un punto de control tras completar paso pasos."""
+        return paso % self.intervalo == 0
+
+    def guardar(self, sim, tiempo: float, paso: int, parametros: dict | None = None):
+        """Captura el estado ahora y lo escribe en segundo plano."""
+        estado = capturar_estado(sim, tiempo, paso, parametros)
+        self.esperar()
+        self._hilo = threading.Thread(target=self._escribir, args=(estado,), daemon=True)
+        self._hilo.start()
+
+    def _escribir(self, estado: dict):
+        try:
+            guardar_punto_control(estado, self.archivo)
+            self.guardados += 1
+        except Exception as e:
+            self._error = e
+
+    def esperar(self):
+        """Espera a que termine la escritura en curso y propaga su error, si lo hubo."""
+        if self._hilo is not None:
+            self._hilo.join()
+            self._hilo = None
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
@@ -0,0 +1,328 @@
+"""
+Salida asíncrona: la escritura de resultados (consola, archivos de estado,
+trayectorias) se hace en un hilo aparte para que el bucle de pasos no espere a
+la E/S.
+
+SalidaAsincrona se registra como observador. En el bucle de pasos solo copia el
+estado en una Captura (ids, masas, posiciones, velocidades y radios, y los
+diagnósticos si algún destino los pide) y la pone en una cola acotada; el hilo
+de salida la entrega a cada destino. Con el motor "numpy" la copia es un volcado
+de los arrays en un búfer reutilizado: los búferes de las capturas ya escritas
+vuelven a usarse, así que tras los primeros pasos no se reserva memoria.
+
+Si la cola está llena se aplica la política elegida:
+
+  esperar     el bucle de pasos espera a que haya sitio (contrapresión; no se pierde nada)
+  descartar   se descarta la captura nueva
+  reemplazar  se descarta la captura más antigua de la cola y se pone la nueva
+
+Los destinos son funciones que reciben una Captura; DestinoConsola,
+DestinoArchivo y DestinoTrayectoria cubren las salidas habituales. Un error en
+un destino se propaga en la siguiente llamada a la salida o al cerrarla, como en
+GestorPuntosControl.
+"""
+
+import queue
+import threading
+from array import array
+from typing import List, Tuple
+from .instantanea import COLUMNAS, _columnas_de, agregar_columnas, escribir_instantanea
+from .observadores import texto_diagnostico
+
+POLITICAS = ("esperar", "descartar", "reemplazar")
+
+
+class Captura:
+    """
+    Copia del estado de los cuerpos tras un paso. columnas contiene las 8 columnas
+    de instantanea.COLUMNAS una tras otra (N valores cada una): un array('d') con
+    el motor "python" o un array de NumPy de solo lectura con el motor "numpy".
+    Con el motor "numpy" el búfer se reutiliza cuando todos los destinos han
+    terminado, así que un destino no debe conservar columnas ni sus vistas.
+    Las energías y el momento son None si ningún destino pidió los diagnósticos.
+    """
+
+    __slots__ = ("paso", "tiempo", "tiempo_inicio", "ids", "columnas", "energia_cinetica", "energia_potencial",
+                 "momento_lineal", "_bufer")
+
+    def __init__(self, paso: int, tiempo: float, ids: Tuple[str, ...], columnas, bufer=None,
+                 tiempo_inicio: float | None = None):
+        """
+        Inicializa la captura sin diagnósticos. tiempo es el del estado capturado y
+        tiempo_inicio el del comienzo del paso, como en observadores.Diagnostico.
+        """
+        self.paso = paso
+        self.tiempo = tiempo
+        self.tiempo_inicio = tiempo if tiempo_inicio is None else tiempo_inicio
+        self.ids = ids
+        self.columnas = columnas
+        self.energia_cinetica = None
+        self.energia_potencial = None
+        self.momento_lineal = None
+        self._bufer = bufer
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def matriz(self):
+        """Columnas como array de NumPy (8, N), sin copiarlas (requiere NumPy)."""
+        import numpy as np
+        return np.frombuffer(self.columnas, dtype=np.float64).reshape(len(COLUMNAS), len(self.ids))
+
+    @property
+    def posiciones(self):
+        """Posiciones como vista (N, 3) de las columnas (requiere NumPy)."""
+        return self.matriz()[1:4].T
+
+    @property
+    def velocidades(self):
+        """Velocidades como vista (N, 3) de las columnas (requiere NumPy)."""
+        return self.matriz()[4:7].T
+
+    def simulador(self, motor: str = "python"):
+        """Crea un Simulador sin observadores con los cuerpos de la captura."""
+        from .simulador import Simulador
+        sim = Simulador(motor=motor, imprimir_pasos=False)
+        columnas = self.columnas
+        if not isinstance(columnas, array):
+            columnas = array("d")
+            columnas.frombytes(self.columnas.tobytes())
+        agregar_columnas(sim, list(self.ids), columnas)
+        return sim
+
+
+class SalidaAsincrona:
+    """
+    Observador que entrega copias del estado a unos destinos desde un hilo aparte
+    (ver el módulo):
+
+        salida = SalidaAsincrona([DestinoConsola(), DestinoArchivo("estado_{paso:06d}.cel")])
+        sim.agregar_observador(salida, intervalo=100)
+        ...
+        salida.cerrar()
+
+    capacidad es el número máximo de capturas en espera y politica lo que se hace
+    cuando la cola está llena (POLITICAS). capturadas cuenta las llamadas (y las
+    peticiones de guardar), escritas las capturas entregadas a todos sus destinos
+    y descartadas las que ha descartado la política.
+    """
+
+    def __init__(self, destinos, capacidad: int = 4, politica: str = "esperar"):
+        """
+        destinos es una lista de funciones que reciben una Captura. Los destinos con
+        un atributo diagnosticos verdadero reciben también las energías y el momento.
+        """
+        if capacidad < 1:
+            raise ValueError("La capacidad de la cola de salida debe ser al menos 1.")
+        if politica not in POLITICAS:
+            raise ValueError(f"Política de salida desconocida: '{politica}'. Opciones: {', '.join(POLITICAS)}")
+        self.destinos = list(destinos)
+        self.capacidad = capacidad
+        self.politica = politica
+        self.diagnosticos = any(getattr(destino, "diagnosticos", False) for destino in self.destinos)
+        self.capturadas = 0
+        self.escritas = 0
+        self.descartadas = 0
+        self._cola = queue.Queue(maxsize=capacidad)
+        # Búferes de NumPy libres para las capturas del motor "numpy"
+        self._libres = []
+        self._cerrojo = threading.Lock()
+        self._hilo = None
+        self._error = None
+        self._cerrada = False
+
+    def __call__(self, diagnostico):
+        """Captura el estado del simulador del diagnóstico y lo pone en la cola."""
+        self._propagar_error()
+        self.capturadas += 1
+        if self.politica == "descartar" and self._cola.full():
+            self.descartadas += 1
+            return
+        captura = self._capturar(diagnostico.sim, diagnostico.paso, diagnostico.tiempo, diagnostico.tiempo_inicio)
+        if self.diagnosticos:
+            captura.energia_cinetica = diagnostico.energia_cinetica
+            captura.energia_potencial = diagnostico.energia_potencial
+            captura.momento_lineal = diagnostico.momento_lineal
+        self._poner(captura, None)
+
+    def guardar(self, sim, archivo: str, tiempo: float = 0.0, paso: int = 0):
+        """
+        Guarda el estado actual del simulador en archivo desde el hilo de salida
+        (como Simulador.guardar, ver DestinoArchivo). Siempre espera a que haya
+        sitio en la cola: una petición de guardar no se descarta.
+        """
+        self._propagar_error()
+        self._arrancar()
+        self.capturadas += 1
+        self._cola.put((self._capturar(sim, paso, tiempo), [DestinoArchivo(archivo)]))
+
+    def _capturar(self, sim, paso: int, tiempo: float, tiempo_inicio: float | None = None) -> Captura:
+        """Copia el estado de los cuerpos en una Captura."""
+        ids = sim.cuerpos.ids
+        almacen = sim._almacen
+        if almacen is None:
+            return Captura(paso, tiempo, ids, _columnas_de(sim), tiempo_inicio=tiempo_inicio)
+        n = almacen.n
+        bufer = self._bufer(len(COLUMNAS) * n)
+        matriz = bufer.reshape(len(COLUMNAS), n)
+        matriz[0] = almacen.masas
+        matriz[1:4] = almacen.posiciones.T
+        matriz[4:7] = almacen.velocidades.T
+        matriz[7] = almacen.radios
+        columnas = bufer.view()
+        columnas.flags.writeable = False
+        return Captura(paso, tiempo, ids, columnas, bufer, tiempo_inicio)
+
+    def _bufer(self, tamano: int):
+        """Devuelve un búfer libre del tamaño dado o reserva uno nuevo."""
+        with self._cerrojo:
+            while self._libres:
+                bufer = self._libres.pop()
+                if len(bufer) == tamano:
+                    return bufer
+        import numpy as np
+        return np.empty(tamano)
+
+    def _liberar(self, captura: Captura):
+        """Devuelve el búfer de una captura ya escrita o descartada."""
+        if captura._bufer is not None:
+            with self._cerrojo:
+                self._libres.append(captura._bufer)
+
+    def _poner(self, captura: Captura, destinos):
+        """Pone la captura en la cola aplicando la política si está llena."""
+        self._arrancar()
+        if self.politica == "esperar":
+            self._cola.put((captura, destinos))
+        else:
+            while True:
+                try:
+                    self._cola.put_nowait((captura, destinos))
+                    break
+                except queue.Full:
+                    if self.politica == "descartar":
+                        self.descartadas += 1
+                        self._liberar(captura)
+                        return
+                try:
+                    antigua = self._cola.get_nowait()
+                except queue.Empty:
+                    continue
+                self.descartadas += 1
+                self._liberar(antigua[0])
+                self._cola.task_done()
+
+    def _arrancar(self):
+        """Arranca el hilo de salida la primera vez que se necesita."""
+        if self._cerrada:
+            raise ValueError("La salida asíncrona está cerrada.")
+        if self._hilo is None:
+            self._hilo = threading.Thread(target=self._escribir, daemon=True)
+            self._hilo.start()
+
+    def _escribir(self):
+        """Bucle del hilo de salida: entrega cada captura a sus destinos hasta recibir None."""
+        while True:
+            elemento = self._cola.get()
+            if elemento is None:
+                self._cola.task_done()
+                return
+            captura, destinos = elemento
+            try:
+                for destino in destinos or self.destinos:
+                    destino(captura)
+                self.escritas += 1
+            except Exception as e:
+                if self._error is None:
+                    self._error = e
+            finally:
+                self._liberar(captura)
+                self._cola.task_done()
+
+    def _propagar_error(self):
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def vaciar(self):
+        """Espera a que se escriban todas las capturas de la cola y propaga los errores."""
+        if self._hilo is not None:
+            self._cola.join()
+        self._propagar_error()
+
+    def cerrar(self):
+        """Escribe las capturas pendientes, termina el hilo y cierra los destinos que lo admiten."""
+        if self._cerrada:
+            return
+        self._cerrada = True
+        if self._hilo is not None:
+            self._cola.put(None)
+            self._hilo.join()
+            self._hilo = None
+        for destino in self.destinos:
+            if hasattr(destino, "cerrar"):
+                destino.cerrar()
+        self._propagar_error()
+
+    def __enter__(self) -> 'SalidaAsincrona':
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+
+class DestinoConsola:
+    """Muestra por consola las energías y el momento, como ObservadorConsola."""
+
+    diagnosticos = True
+
+    def __call__(self, captura: Captura):
+        print(texto_diagnostico(captura))
+
+
+class DestinoArchivo:
+    """
+    Guarda cada captura en un archivo. patron admite {paso} y {tiempo}, por ejemplo
+    "estado_{paso:06d}.cel"; sin ellos el archivo se sobrescribe en cada captura.
+    Las instantáneas .cel y .celz se escriben directamente de las columnas; el resto
+    de formatos, con Simulador.guardar sobre un simulador creado con la captura.
+    """
+
+    def __init__(self, patron: str):
+        """
+        patron es la ruta de los archivos; su extensión elige el formato.
+        """
+        self.patron = patron
+        self.archivos: List[str] = []
+
+    def __call__(self, captura: Captura):
+        archivo = self.patron.format(paso=captura.paso, tiempo=captura.tiempo)
+        if archivo.endswith(('.cel', '.celz')):
+            escribir_instantanea(archivo, list(captura.ids), captura.columnas,
+                                 comprimir=archivo.endswith('.celz'))
+        else:
+            captura.simulador().guardar(archivo)
+        self.archivos.append(archivo)
+
+
+class DestinoTrayectoria:
+    """Añade cada captura como una trama de un archivo de trayectoria (ver trayectoria.py)."""
+
+    def __init__(self, archivo: str):
+        """
+        Crea (o sobrescribe) el archivo de trayectoria.
+        """
+        from .trayectoria import EscritorTrayectoria
+        self.escritor = EscritorTrayectoria(archivo)
+
+    def __call__(self, captura: Captura):
+        escritor = self.escritor
+        if escritor.ids is None:
+            escritor._escribir_cabecera(list(captura.ids))
+        elif list(captura.ids) != escritor.ids:
+            raise ValueError("Los cuerpos del simulador no coinciden con los de la trayectoria.")
+        escritor.escribir(captura.tiempo, captura.posiciones, captura.velocidades)
+
+    def cerrar(self):
+        """Cierra el archivo de trayectoria."""
+        self.escritor.cerrar()
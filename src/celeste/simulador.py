@@ -1,19 +1,141 @@
-import json
-import csv
-from typing import List, Dict
+import gc
+import math
+# json, csv, NumPy y los solvers y formatos opcionales se importan al usarse por
+# primera vez, para que importar el simulador sea rápido (ver tests/test_arranque.py)
 from .vector3d import Vector3D
-from .cuerpo import CuerpoCeleste
+from .cuerpo import CuerpoCeleste, ParticulaPrueba
+from .coleccion import ColeccionCuerpos
+from .integradores import crear_integrador
+from .observadores import Diagnostico, ObservadorConsola
 
 class Simulador:
     # Constante gravitatoria universal G
     # Valor aproximado para G en m^3 kg^-1 s^-2
     G = 6.67430e-11 
 
-    def __init__(self):
+    # Motores de cálculo disponibles:
+    #   "python": bucle directo sobre objetos Vector3D (sin dependencias externas)
+    #   "numpy":  estado en arrays float64 contiguos y fuerzas vectorizadas por teselas
+    MOTORES = ("python", "numpy")
+
+    # Solvers de fuerzas seleccionables por nombre (requieren el motor "numpy")
+    SOLVERS = ("directo", "barnes_hut", "fmm", "paralelo")
+
+    def __init__(self, motor: str = "python", solver=None, integrador="euler",
+                 imprimir_pasos: bool = True, colisiones=None, suavizado=None):
         """
         Inicializa el simulador con una colección vacía de cuerpos celestes.
+        Con motor="numpy" el estado se guarda en un AlmacenCuerpos y los cuerpos
+        de self.cuerpos son vistas sobre sus arrays.
+        solver puede ser el nombre de un solver de SOLVERS o una instancia con un
+        método aceleraciones(masas, posiciones, G); por defecto se usa la suma directa.
+        integrador puede ser un nombre ("euler", "leapfrog", "yoshida4", "rk4") o una
+        instancia con un método paso(sim, dt).
+        Con imprimir_pasos=True se registra un ObservadorConsola que muestra las
+        energías y el momento en cada paso; con False no se calcula ningún
+        diagnóstico salvo que se agreguen observadores.
+        colisiones puede ser un DetectorColisiones (o True para uno con la configuración
+        por defecto): tras cada paso fusiona los cuerpos cuyos radios se solapan.
+        suavizado es un núcleo de suavizado de suavizado.py (SuavizadoPlummer o
+        SuavizadoSpline) que acota la fuerza y el potencial a distancias menores que su
+        epsilon; con el motor "numpy" se entrega al solver, que debe admitirlo.
         """
-        self.cuerpos: Dict[str, CuerpoCeleste] = {}
+        if motor not in self.MOTORES:
+            raise ValueError(f"Motor desconocido '{motor}'. Use uno de: {', '.join(self.MOTORES)}")
+        if solver is not None and motor != "numpy":
+            raise ValueError("Los solvers de fuerzas requieren el motor 'numpy'.")
+        self.motor = motor
+        self.integrador = crear_integrador(integrador)
+        if colisiones is True:
+            from .colisiones import DetectorColisiones
+            colisiones = DetectorColisiones()
+        self.colisiones = colisiones or None
+        # id -> cuerpo, en el orden de las filas del almacén (ver coleccion.py)
+        self.cuerpos = ColeccionCuerpos()
+        self._almacen = None
+        self.solver = None
+        if motor == "numpy":
+            from .almacen import AlmacenCuerpos
+            self._almacen = AlmacenCuerpos()
+            self.solver = self._crear_solver(solver if solver is not None else "directo")
+            if suavizado is not None:
+                if not hasattr(self.solver, "suavizado"):
+                    raise ValueError(f"El solver '{getattr(self.solver, 'nombre', type(self.solver).__name__)}' no admite suavizado.")
+                self.solver.suavizado = suavizado
+            suavizado = getattr(self.solver, "suavizado", None)
+        if getattr(self.integrador, "nombre", None) == "hermite_bloques":
+            if suavizado is not None:
+                raise ValueError("El integrador 'hermite_bloques' no admite suavizado.")
+            # Calcula sus fuerzas y jerks por suma directa sin pasar por el solver
+            nombre_solver = getattr(self.solver, "nombre", None)
+            if self.solver is not None and nombre_solver != "directo":
+                raise ValueError(f"El integrador 'hermite_bloques' calcula las fuerzas por suma directa "
+                                 f"y no admite el solver '{nombre_solver or type(self.solver).__name__}'.")
+        self.suavizado = suavizado
+
+        # Fuerzas y energía potencial del último recorrido de pares, junto con la
+        # firma (masas y posiciones) del estado en que se calcularon
+        self._cache_fuerzas = None
+        # Recorridos completos de fuerzas realizados (sin contar los reutilizados de la caché)
+        self.evaluaciones_fuerzas = 0
+        # Interacciones evaluadas en esos recorridos: pares de cuerpos de la suma directa
+        # y, con los solvers de árbol, interacciones con nodos (ver _aceleraciones_solver)
+        self.interacciones = 0
+        self.pasos_realizados = 0
+        # Perfilador de fases y contadores (ver perfilado.py); None si no se perfila
+        self.perfilador = None
+        self.observadores: list[list] = []
+        if imprimir_pasos:
+            self.agregar_observador(ObservadorConsola())
+
+    def agregar_observador(self, observador, intervalo: int = 1):
+        """
+        Registra un observador: una función que recibe un Diagnostico cada
+        intervalo pasos de simulación. Los diagnósticos solo se calculan si
+        algún observador los pide en ese paso.
+        """
+        if intervalo < 1:
+            raise ValueError("El intervalo de un observador debe ser al menos 1.")
+        self.observadores.append([observador, intervalo])
+
+    def quitar_observador(self, observador):
+        """Elimina un observador registrado con agregar_observador."""
+        self.observadores = [o for o in self.observadores if o[0] is not observador]
+
+    def activar_perfilado(self):
+        """
+        Empieza a medir el tiempo de cada fase de los pasos y los contadores de trabajo
+        (ver perfilado.py) y devuelve el Perfilador, que se guarda en self.perfilador.
+        Si ya estaba activo se devuelve el mismo, sin reiniciarlo.
+        """
+        if self.perfilador is None:
+            from .perfilado import Perfilador
+            self.perfilador = Perfilador()
+        return self.perfilador
+
+    def desactivar_perfilado(self):
+        """Deja de perfilar y devuelve el Perfilador con las medidas acumuladas (o None)."""
+        perfilador, self.perfilador = self.perfilador, None
+        return perfilador
+
+    @classmethod
+    def _crear_solver(cls, solver):
+        """Devuelve la instancia de solver correspondiente a un nombre, o el propio objeto."""
+        if not isinstance(solver, str):
+            return solver
+        if solver == "directo":
+            from .nucleos import SolverDirecto
+            return SolverDirecto()
+        if solver == "barnes_hut":
+            from .barnes_hut import SolverBarnesHut
+            return SolverBarnesHut()
+        if solver == "fmm":
+            from .fmm import SolverFMM
+            return SolverFMM()
+        if solver == "paralelo":
+            from .paralelo import SolverParalelo
+            return SolverParalelo()
+        raise ValueError(f"Solver desconocido '{solver}'. Use uno de: {', '.join(cls.SOLVERS)}")
 
     def listar_cuerpos(self):
         """
@@ -29,21 +151,127 @@ class Simulador:
             print(f"{i+1}. {cuerpo}")
         print("----------------------------------")
 
-    def agregar_cuerpo(self, id: str, masa: float, posicion: Vector3D, velocidad: Vector3D):
+    def agregar_cuerpo(self, id: str, masa: float, posicion: Vector3D, velocidad: Vector3D,
+                       radio: float = 0.0):
         """
         Permite agregar un cuerpo celeste al simulador.
-        Valida que el identificador sea único y que la masa sea positiva.
+        Valida que el identificador sea único, que la masa sea positiva y que el
+        radio (opcional, para las colisiones) no sea negativo.
         """
         if id in self.cuerpos:
             raise ValueError(f"Ya existe un cuerpo con el identificador '{id}'.")
         
         try:
-            nuevo_cuerpo = CuerpoCeleste(id, masa, posicion, velocidad)
-            self.cuerpos[id] = nuevo_cuerpo
+            if not masa > 0:
+                raise ValueError("La masa debe ser un valor positivo.")
+            self._insertar_cuerpo(id, masa, posicion, velocidad, radio)
             print(f"Cuerpo '{id}' agregado exitosamente.")
         except ValueError as e:
             print(f"Error al agregar cuerpo: {e}")
 
+    def agregar_particula(self, id: str, posicion: Vector3D, velocidad: Vector3D, radio: float = 0.0):
+        """
+        Agrega una partícula de prueba: un cuerpo sin masa que siente la gravedad de
+        los cuerpos con masa pero no atrae a ninguno (ver ParticulaPrueba).
+        """
+        if id in self.cuerpos:
+            raise ValueError(f"Ya existe un cuerpo con el identificador '{id}'.")
+
+        try:
+            self._insertar_cuerpo(id, 0.0, posicion, velocidad, radio)
+            print(f"Partícula de prueba '{id}' agregada exitosamente.")
+        except ValueError as e:
+            print(f"Error al agregar partícula: {e}")
+
+    def agregar_particulas(self, ids, posiciones, velocidades, radios=None) -> int:
+        """
+        Agrega un lote de partículas de prueba a partir de columnas, como agregar_cuerpos
+        (equivale a agregar_cuerpos con todas las masas a 0). Devuelve cuántas se agregaron.
+        """
+        return self.agregar_cuerpos(ids, [0.0] * len(ids), posiciones, velocidades, radios)
+
+    def agregar_cuerpos(self, ids, masas, posiciones, velocidades, radios=None) -> int:
+        """
+        Agrega un lote de cuerpos a partir de columnas: ids, masas, posiciones y
+        velocidades (N x 3) y radios opcionales, como listas o arrays NumPy.
+        Todo el lote se valida antes de agregar nada (con el motor "numpy", de forma
+        vectorizada) y un cuerpo no válido produce un ValueError. Los cuerpos con
+        masa 0 se agregan como partículas de prueba. No se muestra ningún mensaje
+        por cuerpo. Devuelve el número de cuerpos agregados.
+        """
+        ids = [str(id) for id in ids]
+        # Crear cientos de miles de objetos seguidos dispara recolecciones del GC que
+        # recorren todo el montón; los cuerpos no forman ciclos, así que se pausa
+        gc_activo = gc.isenabled()
+        gc.disable()
+        try:
+            return self._agregar_lote(ids, masas, posiciones, velocidades, radios)
+        finally:
+            if gc_activo:
+                gc.enable()
+
+    def _agregar_lote(self, ids, masas, posiciones, velocidades, radios) -> int:
+        """Valida el lote y crea sus cuerpos en el motor activo."""
+        if self._almacen is not None:
+            vistas = self._almacen.agregar_lote(ids, masas, posiciones, velocidades, radios)
+            self.cuerpos.extender(ids, vistas)
+            return len(ids)
+
+        columnas = [c.tolist() if hasattr(c, "tolist") else list(c) for c in (masas, posiciones, velocidades)]
+        radios = [0.0] * len(ids) if radios is None else (radios.tolist() if hasattr(radios, "tolist") else list(radios))
+        if any(len(c) != len(ids) for c in columnas + [radios]):
+            raise ValueError("Las columnas del lote deben tener un valor (o un vector) por identificador.")
+        if len(set(ids)) != len(ids):
+            raise ValueError("Hay identificadores repetidos en el lote.")
+        repetidos = [id for id in ids if id in self.cuerpos]
+        if repetidos:
+            raise ValueError(f"Ya existe un cuerpo con el identificador '{repetidos[0]}'.")
+        # Mismas comprobaciones que AlmacenCuerpos.agregar_lote (NaN incluido)
+        for id, masa, radio in zip(ids, columnas[0], radios):
+            if not masa >= 0:
+                raise ValueError(f"La masa debe ser un valor positivo, o 0 para una partícula de prueba "
+                                 f"(cuerpo '{id}').")
+            if not radio >= 0:
+                raise ValueError(f"El radio no puede ser negativo (cuerpo '{id}').")
+        nuevos = [CuerpoCeleste(id, masa, Vector3D(*posicion), Vector3D(*velocidad), radio) if masa
+                  else ParticulaPrueba(id, Vector3D(*posicion), Vector3D(*velocidad), radio)
+                  for id, masa, posicion, velocidad, radio in zip(ids, *columnas, radios)]
+        self.cuerpos.extender(ids, nuevos)
+        return len(nuevos)
+
+    def _insertar_cuerpo(self, id: str, masa: float, posicion: Vector3D, velocidad: Vector3D,
+                         radio: float = 0.0) -> CuerpoCeleste:
+        """
+        Crea el cuerpo en el motor activo y lo registra en la colección. Con masa 0
+        se crea una partícula de prueba.
+        """
+        if self._almacen is not None:
+            if masa == 0:
+                cuerpo = self._almacen.agregar_particula(id, posicion, velocidad, radio)
+            else:
+                cuerpo = self._almacen.agregar(id, masa, posicion, velocidad, radio)
+        elif masa == 0:
+            cuerpo = ParticulaPrueba(id, posicion, velocidad, radio)
+        else:
+            cuerpo = CuerpoCeleste(id, masa, posicion, velocidad, radio)
+        self.cuerpos[id] = cuerpo
+        return cuerpo
+
+    def eliminar_cuerpo(self, id: str):
+        """
+        Elimina un cuerpo del simulador en O(1): el último cuerpo pasa a ocupar su
+        posición (ver coleccion.py); el resto conserva su posición y su índice estable.
+        """
+        if id not in self.cuerpos:
+            raise ValueError(f"No existe un cuerpo con el identificador '{id}'.")
+        self._eliminar_cuerpo(id)
+
+    def _eliminar_cuerpo(self, id: str):
+        """Elimina un cuerpo de la colección y, con el motor "numpy", del almacén."""
+        del self.cuerpos[id]
+        if self._almacen is not None:
+            self._almacen.eliminar(id)
+
     def obtener_cuerpo(self, id: str) -> CuerpoCeleste | None:
         """
         Devuelve un cuerpo celeste por su identificador, o None si no existe.
@@ -55,64 +283,328 @@ class Simulador:
         Para cada cuerpo, calcula la fuerza neta resultante de la atracción gravitatoria
         de todos los demás cuerpos (ley de gravitación universal de Newton).
         La fuerza neta se almacena temporalmente en el atributo fuerza_neta de cada cuerpo.
+        Las partículas de prueba (sin masa) se calculan aparte: solo reciben la
+        aceleración de los cuerpos con masa, que se guarda en su atributo aceleracion.
         """
-        for cuerpo_i in self.cuerpos.values():
-            cuerpo_i.fuerza_neta = Vector3D(0.0, 0.0, 0.0) # Resetear la fuerza neta
+        # Si el estado no ha cambiado desde el último cálculo se reutilizan sus fuerzas
+        perfil = self.perfilador
+        firma = self._firma_estado()
+        if self._cache_fuerzas is not None and self._misma_firma(self._cache_fuerzas[0], firma):
+            self._restaurar_fuerzas(self._cache_fuerzas[1])
+            if perfil is not None:
+                perfil.contadores["fuerzas_reutilizadas"] += 1
+            return
+
+        if perfil is not None:
+            perfil.iniciar("fuerzas")
+        if self._almacen is not None:
+            energia_potencial = self._calcular_fuerzas_numpy()
+        else:
+            energia_potencial = self._calcular_fuerzas_python()
+        self._cache_fuerzas = (firma, self._copiar_fuerzas(), energia_potencial)
+        self.evaluaciones_fuerzas += 1
+        if perfil is not None:
+            perfil.terminar()
+            perfil.contadores["evaluaciones_fuerzas"] += 1
 
-        cuerpos_list = list(self.cuerpos.values())
+    def _calcular_fuerzas_python(self) -> float:
+        """
+        Bucle directo sobre todos los pares de cuerpos con masa con objetos Vector3D,
+        más la aceleración de las partículas de prueba debida a esos cuerpos. Devuelve
+        la energía potencial total, que se acumula aprovechando la distancia ya
+        calculada de cada par.
+        """
+        cuerpos_list = self.cuerpos.lista
+        particulas = [cuerpo for cuerpo in cuerpos_list if cuerpo.sin_masa]
+        if particulas:
+            cuerpos_list = [cuerpo for cuerpo in cuerpos_list if not cuerpo.sin_masa]
         num_cuerpos = len(cuerpos_list)
+        self.interacciones += num_cuerpos * (num_cuerpos - 1) // 2 + len(particulas) * num_cuerpos
+        energia_potencial = 0.0
+        suavizado = self.suavizado
+
+        # Posiciones y masas se leen una sola vez por cuerpo y las fuerzas se acumulan
+        # en el sitio sobre vectores propios del bucle: ningún Vector3D nuevo por par.
+        posiciones = [cuerpo.posicion for cuerpo in cuerpos_list]
+        masas = [cuerpo.masa for cuerpo in cuerpos_list]
+        fuerzas = [Vector3D(0.0, 0.0, 0.0) for _ in cuerpos_list] # Fuerzas netas a cero
 
         for i in range(num_cuerpos):
+            p_i = posiciones[i]
+            m_i = masas[i]
+            fuerza_i = fuerzas[i]
             for j in range(i + 1, num_cuerpos):
-                cuerpo_i = cuerpos_list[i]
-                cuerpo_j = cuerpos_list[j]
+                p_j = posiciones[j]
+                m_j = masas[j]
 
                 # Vector distancia de i a j
-                r_ij = cuerpo_j.posicion - cuerpo_i.posicion
-                distancia = r_ij.magnitude()
+                dx = p_j.x - p_i.x
+                dy = p_j.y - p_i.y
+                dz = p_j.z - p_i.z
+                r2 = dx**2 + dy**2 + dz**2
 
-                if distancia == 0:
-                    # En un escenario real, esto podría indicar una colisión.
-                    # Aquí, simplemente evitamos la división por cero.
-                    continue
+                if suavizado is not None:
+                    # Los factores (f, g) del núcleo sustituyen a 1/r y 1/r^3 y salen de la
+                    # misma evaluación; son finitos incluso si los cuerpos coinciden
+                    inv_r, inv_r3 = suavizado.factores_escalar(r2)
+                    energia_potencial -= self.G * (m_i * m_j) * inv_r
+                    magnitud_fuerza = (self.G * m_i * m_j) * inv_r3
+                else:
+                    distancia = math.sqrt(r2)
+
+                    if distancia == 0:
+                        # En un escenario real, esto podría indicar una colisión.
+                        # Aquí, simplemente evitamos la división por cero.
+                        energia_potencial = float('-inf')
+                        continue
+
+                    # U = -G * (m1 * m2) / ||r1 - r2||, con la misma distancia que la fuerza
+                    energia_potencial -= self.G * (m_i * m_j) / distancia
+
+                    # Ley de gravitación universal: F = G * (m1 * m2) / r^2 * r_hat
+                    # r_hat es el vector unitario en la dirección de r_ij
+                    # La fórmula de la ley de gravitación en el enunciado es Fᵢⱼ = G·(mᵢ·mⱼ)/rᵢⱼ³ · (rⱼ – rᵢ)
+                    # Esta fórmula ya incluye el vector dirección, donde (rⱼ – rᵢ) es r_ij
+                    # Y r_ij^3 en el denominador es para que la magnitud sea 1/r^2 y se multiplique por el vector r_ij
+
+                    magnitud_fuerza = (self.G * m_i * m_j) / (distancia**3)
+
+                # Fuerza de i sobre j: r_ij * magnitud_fuerza, componente a componente
+                fx = dx * magnitud_fuerza
+                fy = dy * magnitud_fuerza
+                fz = dz * magnitud_fuerza
 
-                # Ley de gravitación universal: F = G * (m1 * m2) / r^2 * r_hat
-                # r_hat es el vector unitario en la dirección de r_ij
-                # La fórmula de la ley de gravitación en el enunciado es Fᵢⱼ = G·(mᵢ·mⱼ)/rᵢⱼ³ · (rⱼ – rᵢ)
-                # Esta fórmula ya incluye el vector dirección, donde (rⱼ – rᵢ) es r_ij
-                # Y r_ij^3 en el denominador es para que la magnitud sea 1/r^2 y se multiplique por el vector r_ij
-                
-                magnitud_fuerza = (self.G * cuerpo_i.masa * cuerpo_j.masa) / (distancia**3)
-                
-                fuerza_ij = r_ij * magnitud_fuerza # Fuerza de i sobre j
-                
                 # Por la tercera ley de Newton, F_ji = -F_ij
-                cuerpo_i.fuerza_neta = cuerpo_i.fuerza_neta + fuerza_ij
-                cuerpo_j.fuerza_neta = cuerpo_j.fuerza_neta - fuerza_ij # Fuerza de j sobre i
+                fuerza_i.x += fx
+                fuerza_i.y += fy
+                fuerza_i.z += fz
+                fuerza_j = fuerzas[j] # Fuerza de j sobre i
+                fuerza_j.x -= fx
+                fuerza_j.y -= fy
+                fuerza_j.z -= fz
 
-    def paso_simulacion(self, dt: float, current_time: float):
+        for cuerpo, fuerza in zip(cuerpos_list, fuerzas):
+            cuerpo.fuerza_neta = fuerza
+        if particulas:
+            self._acelerar_particulas_python(particulas, posiciones, masas)
+        return energia_potencial
+
+    def _acelerar_particulas_python(self, particulas, posiciones, masas):
+        """Aceleración de cada partícula de prueba debida a los cuerpos con masa (posiciones, masas)."""
+        suavizado = self.suavizado
+        G = self.G
+        for particula in particulas:
+            p = particula.posicion
+            ax = ay = az = 0.0
+            for p_j, m_j in zip(posiciones, masas):
+                dx = p_j.x - p.x
+                dy = p_j.y - p.y
+                dz = p_j.z - p.z
+                r2 = dx**2 + dy**2 + dz**2
+                if suavizado is not None:
+                    w = G * m_j * suavizado.factores_escalar(r2)[1]
+                elif r2 == 0:
+                    continue
+                else:
+                    w = G * m_j / (math.sqrt(r2)**3)
+                ax += dx * w
+                ay += dy * w
+                az += dz * w
+            particula.aceleracion = Vector3D(ax, ay, az)
+
+    def _firma_estado(self):
+        """Devuelve una copia de lo que determina las fuerzas: G, identificadores, masas y posiciones."""
+        if self._almacen is not None:
+            almacen = self._almacen
+            return (self.G, self.cuerpos.ids, almacen.masas.copy(), almacen.posiciones.copy())
+        return (self.G, tuple((c.id, c.masa, c.posicion.x, c.posicion.y, c.posicion.z)
+                              for c in self.cuerpos.values()))
+
+    def _misma_firma(self, a, b) -> bool:
+        """Compara dos firmas devueltas por _firma_estado."""
+        if self._almacen is not None:
+            import numpy as np
+            return (a[0] == b[0] and a[1] == b[1]
+                    and np.array_equal(a[2], b[2]) and np.array_equal(a[3], b[3]))
+        return a == b
+
+    def _copiar_fuerzas(self):
         """
-        Ejecuta un paso de tiempo de la simulación usando el método de Euler explícito.
+        Copia las fuerzas (o aceleraciones, con el motor "numpy" y en las partículas
+        de prueba) recién calculadas.
+        """
+        if self._almacen is not None:
+            return self._almacen.aceleraciones.copy()
+        return [(c.aceleracion if c.sin_masa else c.fuerza_neta).copia() for c in self.cuerpos.values()]
+
+    def _restaurar_fuerzas(self, fuerzas):
+        """Vuelve a asignar unas fuerzas copiadas con _copiar_fuerzas."""
+        if self._almacen is not None:
+            self._almacen.aceleraciones[:] = fuerzas
+            return
+        for cuerpo, fuerza in zip(self.cuerpos.values(), fuerzas):
+            if cuerpo.sin_masa:
+                cuerpo.aceleracion = fuerza.copia()
+            else:
+                cuerpo.fuerza_neta = Vector3D(fuerza.x, fuerza.y, fuerza.z)
+
+    def _energia_potencial_actual(self) -> float:
+        """
+        Devuelve la energía potencial del estado actual reutilizando el recorrido de pares
+        de calcular_fuerzas. Si las fuerzas del estado actual aún no se han calculado, se
+        calculan ahora (fuerzas y potencial en un solo recorrido) y el siguiente paso las reutiliza.
         """
         self.calcular_fuerzas()
+        firma, fuerzas, energia_potencial = self._cache_fuerzas
+        if energia_potencial is None:
+            # El solver no calcula el potencial: se suma aparte, por teselas
+            from .nucleos import energia_potencial_directa
+            masas, posiciones = self._almacen.masas, self._almacen.posiciones
+            con_masa = masas > 0
+            if not con_masa.all():
+                # Las partículas de prueba no contribuyen
+                masas, posiciones = masas[con_masa], posiciones[con_masa]
+            energia_potencial = energia_potencial_directa(masas, posiciones, self.G, suavizado=self.suavizado)
+            self._cache_fuerzas = (firma, fuerzas, energia_potencial)
+        return energia_potencial
+
+    def paso_simulacion(self, dt: float, current_time: float):
+        """
+        Ejecuta un paso de tiempo de la simulación con el integrador configurado
+        (por defecto, el método de Euler explícito).
+        Con el perfilado activo se mide el tiempo de cada fase (ver perfilado.py).
+        """
+        perfil = self.perfilador
+        if perfil is not None:
+            perfil.iniciar_paso(self)
+            perfil.iniciar("integrador")
 
         # Actualizar velocidades y posiciones
+        self.integrador.paso(self, dt)
+        if perfil is not None:
+            perfil.terminar()
+
+        # Fusionar los cuerpos que han chocado durante el paso
+        if self.colisiones is not None:
+            if perfil is not None:
+                perfil.iniciar("colisiones")
+            self.colisiones.procesar(self, current_time + dt, self.pasos_realizados)
+            if perfil is not None:
+                perfil.terminar()
+
+        # Notificar a los observadores a los que les toca en este paso, con el estado
+        # al final del paso (current_time + dt); las energías y el momento solo se
+        # calculan si alguno de ellos los pide
+        diagnostico = None
+        for observador, intervalo in self.observadores:
+            if self.pasos_realizados % intervalo == 0:
+                if diagnostico is None:
+                    diagnostico = Diagnostico(self, self.pasos_realizados, current_time + dt, current_time)
+                if perfil is not None:
+                    perfil.iniciar("observadores")
+                observador(diagnostico)
+                if perfil is not None:
+                    perfil.terminar()
+        self.pasos_realizados += 1
+        if perfil is not None:
+            perfil.terminar_paso(self)
+
+    def _kick(self, h: float):
+        """Actualiza las velocidades con las fuerzas del último cálculo: v += (F/m) * h."""
+        if self._almacen is not None:
+            self._almacen.velocidades[:] += self._almacen.aceleraciones * h
+            return
         for cuerpo in self.cuerpos.values():
-            cuerpo.aplicar_fuerza(cuerpo.fuerza_neta, dt)
-            cuerpo.mover(dt)
+            cuerpo.acelerar(h)
 
-        # Calcular y mostrar energías y momento
-        energia_cinetica_total = self._calcular_energia_cinetica_total()
-        energia_potencial_total = self._calcular_energia_potencial_total()
-        momento_lineal_total = self._calcular_momento_lineal_total()
+    def _drift(self, h: float):
+        """Actualiza las posiciones con las velocidades actuales: r += v * h."""
+        if self._almacen is not None:
+            self._almacen.posiciones[:] += self._almacen.velocidades * h
+            return
+        for cuerpo in self.cuerpos.values():
+            cuerpo.mover(h)
+
+    def _leer_estado(self):
+        """
+        Devuelve una copia de las posiciones y velocidades de todos los cuerpos:
+        arrays (N, 3) con el motor "numpy" o listas de Vector3D con el motor "python".
+        """
+        if self._almacen is not None:
+            return self._almacen.posiciones.copy(), self._almacen.velocidades.copy()
+        cuerpos = self.cuerpos.values()
+        return [c.posicion for c in cuerpos], [c.velocidad for c in cuerpos]
 
-        print(f"\nPaso t = {current_time:.2f} s:")
-        print(f"  Energía Cinética Total: {energia_cinetica_total:.6e} J")
-        print(f"  Energía Potencial Total: {energia_potencial_total:.6e} J")
-        print(f"  Momento Lineal Total: {momento_lineal_total} kg·m/s")
+    def _escribir_estado(self, posiciones, velocidades):
+        """Sustituye posiciones y velocidades por las dadas (en el formato de _leer_estado)."""
+        if self._almacen is not None:
+            self._almacen.posiciones[:] = posiciones
+            self._almacen.velocidades[:] = velocidades
+            return
+        for cuerpo, posicion, velocidad in zip(self.cuerpos.values(), posiciones, velocidades):
+            cuerpo.posicion = posicion
+            cuerpo.velocidad = velocidad
+
+    def _aceleraciones(self):
+        """Calcula las fuerzas en el estado actual y devuelve una copia de las aceleraciones."""
+        self.calcular_fuerzas()
+        if self._almacen is not None:
+            return self._almacen.aceleraciones.copy()
+        return [c.aceleracion for c in self.cuerpos.values()]
+
+    def _calcular_fuerzas_numpy(self) -> float | None:
+        """
+        Calcula las aceleraciones de todos los cuerpos del almacén con el solver configurado.
+        Devuelve la energía potencial si el solver la obtiene en el mismo recorrido, o None.
+        Si hay partículas de prueba (masa 0), el solver recibe solo los cuerpos con masa
+        y las partículas se aceleran aparte con nucleos.aceleraciones_sobre, con coste
+        O(N_masivos * N_partículas).
+        """
+        almacen = self._almacen
+        aceleraciones, energia_potencial = self._aceleraciones_de(almacen.masas, almacen.posiciones)
+        almacen.aceleraciones[:] = aceleraciones
+        return energia_potencial
+
+    def _aceleraciones_de(self, masas, posiciones):
+        """
+        Devuelve (aceleraciones, energía potencial o None) de unos cuerpos dados con el
+        solver configurado, acelerando aparte las partículas de prueba (masa 0).
+        """
+        con_masa = masas > 0
+        if con_masa.all():
+            return self._aceleraciones_solver(masas, posiciones)
+
+        import numpy as np
+        from .nucleos import aceleraciones_sobre
+        masivos = con_masa.nonzero()[0]
+        particulas = (~con_masa).nonzero()[0]
+        masas, posiciones_masivos = masas[masivos], posiciones[masivos]
+        aceleraciones = np.empty((len(con_masa), 3))
+        aceleraciones[masivos], energia_potencial = self._aceleraciones_solver(masas, posiciones_masivos)
+        aceleraciones[particulas] = aceleraciones_sobre(posiciones[particulas], masas, posiciones_masivos,
+                                                        self.G, suavizado=self.suavizado)
+        self.interacciones += len(particulas) * len(masivos)
+        return aceleraciones, energia_potencial
+
+    def _aceleraciones_solver(self, masas, posiciones):
+        """
+        Devuelve (aceleraciones, energía potencial o None) del solver para los cuerpos
+        dados y suma a self.interacciones las que el solver indica en su atributo
+        interacciones; si no lo tiene, se cuentan los N(N-1)/2 pares de la suma directa.
+        """
+        if hasattr(self.solver, "aceleraciones_y_potencial"):
+            resultado = self.solver.aceleraciones_y_potencial(masas, posiciones, self.G)
+        else:
+            resultado = self.solver.aceleraciones(masas, posiciones, self.G), None
+        n = len(masas)
+        self.interacciones += getattr(self.solver, "interacciones", n * (n - 1) // 2)
+        return resultado
 
     def _calcular_energia_cinetica_total(self) -> float:
         """Calcula la energía cinética total del sistema."""
+        if self._almacen is not None:
+            almacen = self._almacen
+            return float(0.5 * (almacen.masas * (almacen.velocidades ** 2).sum(axis=1)).sum())
         total_energia_cinetica = 0.0
         for cuerpo in self.cuerpos.values():
             total_energia_cinetica += cuerpo.energia_cinetica()
@@ -120,38 +612,42 @@ class Simulador:
 
     def _calcular_energia_potencial_total(self) -> float:
         """Calcula la energía potencial gravitatoria total del sistema."""
-        total_energia_potencial = 0.0
-        cuerpos_list = list(self.cuerpos.values())
-        num_cuerpos = len(cuerpos_list)
-
-        for i in range(num_cuerpos):
-            for j in range(i + 1, num_cuerpos):
-                cuerpo_i = cuerpos_list[i]
-                cuerpo_j = cuerpos_list[j]
-                total_energia_potencial += cuerpo_i.energia_potencial_con(cuerpo_j, self.G)
-        return total_energia_potencial
+        return self._energia_potencial_actual()
 
     def _calcular_momento_lineal_total(self) -> Vector3D:
         """Calcula el momento lineal total del sistema."""
+        if self._almacen is not None:
+            px, py, pz = (self._almacen.masas[:, None] * self._almacen.velocidades).sum(axis=0).tolist()
+            return Vector3D(px, py, pz)
         total_momento_lineal = Vector3D(0.0, 0.0, 0.0)
         for cuerpo in self.cuerpos.values():
-            momento_cuerpo = cuerpo.velocidad * cuerpo.masa
-            total_momento_lineal = total_momento_lineal + momento_cuerpo
+            total_momento_lineal.iadd_escalado(cuerpo.velocidad, cuerpo.masa)
         return total_momento_lineal
 
     def guardar(self, archivo: str):
         """
-        Guarda el estado completo del sistema en formato JSON o CSV.
+        Guarda el estado completo del sistema en formato JSON o CSV, como instantánea
+        binaria .cel (.celz, comprimida; ver instantanea.py) o como catálogo .npy
+        (requiere NumPy; ver catalogos.py).
         """
         if archivo.endswith('.json'):
             self._guardar_json(archivo)
         elif archivo.endswith('.csv'):
             self._guardar_csv(archivo)
+        elif archivo.endswith(('.cel', '.celz')):
+            from .instantanea import guardar_instantanea
+            guardar_instantanea(self, archivo, comprimir=archivo.endswith('.celz'))
+            print(f"Estado del simulador guardado en '{archivo}' (instantánea binaria).")
+        elif archivo.endswith('.npy'):
+            from .catalogos import guardar_npy
+            guardar_npy(self, archivo)
+            print(f"Estado del simulador guardado en '{archivo}' (NPY).")
         else:
-            raise ValueError("Formato de archivo no soportado. Use .json o .csv")
+            raise ValueError("Formato de archivo no soportado. Use .json o .csv (o .cel, .celz y, con NumPy, .npy)")
 
     def _guardar_json(self, archivo: str):
         """Guarda el estado del simulador en un archivo JSON."""
+        import json
         data = [cuerpo.to_dict() for cuerpo in self.cuerpos.values()]
         with open(archivo, 'w') as f:
             json.dump(data, f, indent=4)
@@ -159,45 +655,71 @@ class Simulador:
 
     def _guardar_csv(self, archivo: str):
         """Guarda el estado del simulador en un archivo CSV."""
+        import csv
         with open(archivo, 'w', newline='') as f:
             writer = csv.writer(f, delimiter=';')
             # Encabezado CSV: id;masa;pos_x;pos_y;pos_z;vel_x;vel_y;vel_z
-            writer.writerow(['id', 'masa', 'pos_x', 'pos_y', 'pos_z', 'vel_x', 'vel_y', 'vel_z'])
+            # (más una columna radio si algún cuerpo tiene radio)
+            con_radio = any(cuerpo.radio for cuerpo in self.cuerpos.values())
+            encabezado = ['id', 'masa', 'pos_x', 'pos_y', 'pos_z', 'vel_x', 'vel_y', 'vel_z']
+            writer.writerow(encabezado + ['radio'] if con_radio else encabezado)
             for cuerpo in self.cuerpos.values():
                 row = [
                     cuerpo.id, cuerpo.masa,
                     cuerpo.posicion.x, cuerpo.posicion.y, cuerpo.posicion.z,
                     cuerpo.velocidad.x, cuerpo.velocidad.y, cuerpo.velocidad.z
                 ]
+                if con_radio:
+                    row.append(cuerpo.radio)
                 writer.writerow(row)
         print(f"Estado del simulador guardado en '{archivo}' (CSV).")
 
     def cargar(self, archivo: str):
         """
-        Carga el estado completo del sistema desde un archivo JSON o CSV.
-        Vacía la colección actual de cuerpos antes de cargar.
+        Carga el estado completo del sistema desde un archivo JSON, CSV, .cel/.celz o .npy.
+        Vacía la colección actual de cuerpos antes de cargar. Los cuerpos se agregan
+        por lotes con agregar_cuerpos; los CSV y .npy se leen por bloques de columnas
+        si NumPy está disponible (ver catalogos.py).
         """
         self.cuerpos.clear() # Vaciar colección antes de cargar
+        if self._almacen is not None:
+            self._almacen.vaciar()
 
         if archivo.endswith('.json'):
             self._cargar_json(archivo)
         elif archivo.endswith('.csv'):
             self._cargar_csv(archivo)
+        elif archivo.endswith(('.cel', '.celz')):
+            from .instantanea import cargar_instantanea
+            cargar_instantanea(self, archivo)
+        elif archivo.endswith('.npy'):
+            from .catalogos import cargar_catalogo
+            cargar_catalogo(self, archivo)
         else:
-            raise ValueError("Formato de archivo no soportado. Use .json o .csv")
+            raise ValueError("Formato de archivo no soportado. Use .json o .csv (o .cel, .celz y, con NumPy, .npy)")
         print(f"Estado del simulador cargado desde '{archivo}'.")
 
     def _cargar_json(self, archivo: str):
         """Carga el estado del simulador desde un archivo JSON."""
+        import json
         with open(archivo, 'r') as f:
             data = json.load(f)
-        
-        for item in data:
-            cuerpo = CuerpoCeleste.from_dict(item)
-            self.cuerpos[cuerpo.id] = cuerpo
+
+        self.agregar_cuerpos([item["id"] for item in data], [item["masa"] for item in data],
+                             [item["posicion"] for item in data], [item["velocidad"] for item in data],
+                             [item.get("radio", 0.0) for item in data])
 
     def _cargar_csv(self, archivo: str):
         """Carga el estado del simulador desde un archivo CSV."""
+        try:
+            from .catalogos import cargar_catalogo
+        except ImportError:
+            pass # Sin NumPy se lee fila a fila
+        else:
+            cargar_catalogo(self, archivo)
+            return
+
+        import csv
         with open(archivo, 'r', newline='') as f:
             reader = csv.reader(f, delimiter=';')
             header = next(reader) # Saltar el encabezado
@@ -207,6 +729,6 @@ class Simulador:
                 masa_val = float(row[1])
                 posicion_val = Vector3D(float(row[2]), float(row[3]), float(row[4]))
                 velocidad_val = Vector3D(float(row[5]), float(row[6]), float(row[7]))
-                
-                cuerpo = CuerpoCeleste(id_val, masa_val, posicion_val, velocidad_val)
-                self.cuerpos[cuerpo.id] = cuerpo
\ No newline at end of file
+                radio_val = float(row[8]) if len(row) > 8 else 0.0
+
+                self._insertar_cuerpo(id_val, masa_val, posicion_val, velocidad_val, radio_val)
\ No newline at end of file
@@ -0,0 +1,126 @@
+"""
+Núcleos de suavizado gravitatorio.
+
+Un núcleo de suavizado sustituye 1/r y 1/r^3 de la ley de Newton por versiones
+acotadas a distancias menores que una longitud epsilon, de modo que los
+encuentros cercanos no obligan a reducir el paso de tiempo sin límite:
+
+    U_ij = -G * m_i * m_j * f(r)        (f(r) = 1/r sin suavizado)
+    a_i  = sum_j G * m_j * g(r) * (r_j - r_i)   (g(r) = 1/r^3 sin suavizado)
+
+Cada núcleo devuelve los dos factores (f, g) a partir de r^2 en una sola
+evaluación, para que la fuerza y el potencial de un par compartan la distancia.
+A distancia cero ambos factores son finitos, así que con suavizado no hay
+energías -inf ni pares que ignorar; la fuerza de un par que coincide es nula
+porque el vector r_j - r_i también lo es.
+"""
+
+import math
+
+
+class SuavizadoPlummer:
+    """
+    Suavizado de Plummer: f = 1/sqrt(r^2 + eps^2) y g = f^3. Es el potencial de una
+    esfera de Plummer de radio eps; nunca coincide exactamente con Newton, pero la
+    diferencia decae como (eps/r)^2.
+    """
+
+    nombre = "plummer"
+
+    def __init__(self, epsilon: float):
+        """epsilon es la longitud de suavizado, en metros."""
+        if not epsilon > 0:
+            raise ValueError("La longitud de suavizado debe ser positiva.")
+        self.epsilon = epsilon
+        self._eps2 = epsilon * epsilon
+
+    def factores(self, r2):
+        """Devuelve (f, g) para un array de distancias al cuadrado."""
+        import numpy as np
+        inv_r = 1.0 / np.sqrt(r2 + self._eps2)
+        return inv_r, inv_r * inv_r * inv_r
+
+    def factores_escalar(self, r2: float) -> tuple[float, float]:
+        """Devuelve (f, g) para una distancia al cuadrado."""
+        inv_r = 1.0 / math.sqrt(r2 + self._eps2)
+        return inv_r, inv_r * inv_r * inv_r
+
+    def __repr__(self) -> str:
+        return f"SuavizadoPlummer(epsilon={self.epsilon})"
+
+
+class SuavizadoSpline:
+    """
+    Suavizado con el núcleo spline cúbico (Monaghan y Lattanzio, como en GADGET-2):
+    la masa de cada cuerpo se reparte en una esfera de radio h = 2.8 * epsilon.
+    Fuera de ella la interacción es exactamente newtoniana y en r = 0 el potencial
+    vale lo mismo que el de Plummer con el mismo epsilon (-G m / epsilon).
+    """
+
+    nombre = "spline"
+
+    def __init__(self, epsilon: float):
+        """epsilon es la longitud de suavizado equivalente a la de Plummer, en metros."""
+        if not epsilon > 0:
+            raise ValueError("La longitud de suavizado debe ser positiva.")
+        self.epsilon = epsilon
+        self.h = 2.8 * epsilon
+
+    def factores(self, r2):
+        """Devuelve (f, g) para un array de distancias al cuadrado."""
+        import numpy as np
+        h = self.h
+        r = np.sqrt(r2)
+        u = r / h
+        u2 = u * u
+        u3 = u2 * u
+        # Las tres ramas se evalúan en todo el array y np.where elige la que corresponde
+        with np.errstate(divide='ignore', invalid='ignore'):
+            f_interior = -(-2.8 + u2 * (5.333333333333 + u2 * (6.4 * u - 9.6))) / h
+            g_interior = (10.666666666667 + u2 * (32.0 * u - 38.4)) / h ** 3
+            f_media = -(-3.2 + 0.066666666667 / u
+                        + u2 * (10.666666666667 + u * (-16.0 + u * (9.6 - 2.133333333333 * u)))) / h
+            g_media = (21.333333333333 - 48.0 * u + 38.4 * u2 - 10.666666666667 * u3
+                       - 0.066666666667 / u3) / h ** 3
+            f_exterior = 1.0 / r
+            g_exterior = f_exterior / r2
+        interior = u < 0.5
+        exterior = u >= 1.0
+        f = np.where(interior, f_interior, np.where(exterior, f_exterior, f_media))
+        g = np.where(interior, g_interior, np.where(exterior, g_exterior, g_media))
+        return f, g
+
+    def factores_escalar(self, r2: float) -> tuple[float, float]:
+        """Devuelve (f, g) para una distancia al cuadrado."""
+        h = self.h
+        r = math.sqrt(r2)
+        u = r / h
+        if u >= 1.0:
+            return 1.0 / r, 1.0 / (r * r2)
+        u2 = u * u
+        if u < 0.5:
+            f = -(-2.8 + u2 * (5.333333333333 + u2 * (6.4 * u - 9.6))) / h
+            g = (10.666666666667 + u2 * (32.0 * u - 38.4)) / h ** 3
+        else:
+            u3 = u2 * u
+            f = -(-3.2 + 0.066666666667 / u
+                  + u2 * (10.666666666667 + u * (-16.0 + u * (9.6 - 2.133333333333 * u)))) / h
+            g = (21.333333333333 - 48.0 * u + 38.4 * u2 - 10.666666666667 * u3
+                 - 0.066666666667 / u3) / h ** 3
+        return f, g
+
+    def __repr__(self) -> str:
+        return f"SuavizadoSpline(epsilon={self.epsilon})"
+
+
+SUAVIZADOS = {
+    SuavizadoPlummer.nombre: SuavizadoPlummer,
+    SuavizadoSpline.nombre: SuavizadoSpline,
+}
+
+
+def crear_suavizado(nombre: str, epsilon: float):
+    """Devuelve el núcleo de suavizado con el nombre indicado y longitud epsilon."""
+    if nombre not in SUAVIZADOS:
+        raise ValueError(f"Suavizado desconocido '{nombre}'. Use uno de: {', '.join(SUAVIZADOS)}")
+    return SUAVIZADOS[nombre](epsilon)
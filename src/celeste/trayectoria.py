@@ -0,0 +1,221 @@
+"""
+Trayectorias en un formato binario de tramas de ancho fijo, pensado para
+registrar una simulación larga sin pasar por JSON ni CSV.
+
+Estructura del archivo (little-endian):
+  cabecera:  "CELTRAY1" | n_cuerpos (uint64) | n_tramas (uint64) | inicio_datos (uint64)
+             | identificadores en JSON (UTF-8), rellenos hasta inicio_datos
+  tramas:    n_tramas filas de 1 + 6 * n_cuerpos float64:
+             t, x0, y0, z0, x1, ..., vx0, vy0, vz0, vx1, ...
+
+Las tramas se escriben sobre un np.memmap que se amplía duplicando su capacidad,
+y LectorTrayectoria las expone como vistas del archivo mapeado en memoria, sin
+cargarlo entero.
+"""
+
+import json
+import os
+import struct
+from typing import List, Sequence, Tuple
+import numpy as np
+
+MAGICO = b"CELTRAY1"
+_CABECERA = struct.Struct("<8sQQQ")
+# Inicio de las tramas alineado a este número de bytes
+_ALINEACION = 64
+
+
+class EscritorTrayectoria:
+    """
+    Escribe tramas (tiempo, posiciones y velocidades de todos los cuerpos) al final
+    de un archivo de trayectoria. Puede usarse como observador del simulador:
+
+        escritor = EscritorTrayectoria("orbita.tray")
+        sim.agregar_observador(escritor, intervalo=100)
+        ...
+        escritor.cerrar()
+
+    Los identificadores se fijan con la primera trama (o al crear el escritor) y
+    todas las tramas deben tener los mismos cuerpos en el mismo orden.
+    """
+
+    CAPACIDAD_INICIAL = 64
+
+    def __init__(self, archivo: str, ids: Sequence[str] | None = None,
+                 capacidad: int = CAPACIDAD_INICIAL):
+        """
+        Crea (o sobrescribe) el archivo de trayectoria. Si no se dan ids, la cabecera
+        se escribe con la primera trama usando los cuerpos del simulador.
+        """
+        self.archivo = archivo
+        self.ids: List[str] | None = None
+        self.n_tramas = 0
+        self._capacidad = max(capacidad, 1)
+        self._inicio_datos = 0
+        self._tramas = None
+        self._cerrado = False
+        if ids is not None:
+            self._escribir_cabecera(list(ids))
+
+    def _escribir_cabecera(self, ids: List[str]):
+        """Escribe la cabecera y reserva espacio para la capacidad inicial de tramas."""
+        texto_ids = json.dumps(ids).encode("utf-8")
+        inicio = _CABECERA.size + len(texto_ids)
+        inicio += -inicio % _ALINEACION
+        self.ids = ids
+        self._inicio_datos = inicio
+        with open(self.archivo, "wb") as f:
+            f.write(_CABECERA.pack(MAGICO, len(ids), 0, inicio))
+            f.write(texto_ids)
+        self._mapear(self._capacidad)
+
+    @property
+    def ancho_trama(self) -> int:
+        """Número de float64 de cada trama: 1 + 6 * n_cuerpos."""
+        return 1 + 6 * len(self.ids)
+
+    def _mapear(self, capacidad: int):
+        """Amplía el archivo hasta capacidad tramas y lo vuelve a mapear en memoria."""
+        if self._tramas is not None:
+            self._tramas.flush()
+            self._tramas = None
+        with open(self.archivo, "r+b") as f:
+            f.truncate(self._inicio_datos + capacidad * self.ancho_trama * 8)
+        self._tramas = np.memmap(self.archivo, dtype="<f8", mode="r+", offset=self._inicio_datos,
+                                 shape=(capacidad, self.ancho_trama))
+        self._capacidad = capacidad
+
+    def escribir(self, tiempo: float, posiciones, velocidades):
+        """
+        Añade una trama. posiciones y velocidades son arrays (N, 3) o listas de
+        Vector3D en el orden de self.ids.
+        """
+        if self._cerrado:
+            raise ValueError("El escritor de trayectoria está cerrado.")
+        if self.ids is None:
+            raise ValueError("Los identificadores de los cuerpos no están definidos.")
+        n = len(self.ids)
+        if len(posiciones) != n or len(velocidades) != n:
+            raise ValueError(f"La trama debe tener {n} cuerpos.")
+        if self.n_tramas == self._capacidad:
+            self._mapear(2 * self._capacidad)
+        fila = self._tramas[self.n_tramas]
+        fila[0] = tiempo
+        fila[1:1 + 3 * n].reshape(n, 3)[:] = _como_array(posiciones)
+        fila[1 + 3 * n:].reshape(n, 3)[:] = _como_array(velocidades)
+        self.n_tramas += 1
+
+    def __call__(self, diagnostico):
+        """Registra el estado del simulador del diagnóstico como una trama."""
+        sim = diagnostico.sim
+        ids = list(sim.cuerpos)
+        if self.ids is None:
+            self._escribir_cabecera(ids)
+        elif ids != self.ids:
+            raise ValueError("Los cuerpos del simulador no coinciden con los de la trayectoria.")
+        posiciones, velocidades = sim._leer_estado()
+        self.escribir(diagnostico.tiempo, posiciones, velocidades)
+
+    def vaciar(self):
+        """Vuelca al disco las tramas escritas y actualiza su número en la cabecera."""
+        if self._tramas is None:
+            return
+        self._tramas.flush()
+        with open(self.archivo, "r+b") as f:
+            f.write(_CABECERA.pack(MAGICO, len(self.ids), self.n_tramas, self._inicio_datos))
+
+    def cerrar(self):
+        """Vuelca las tramas, recorta la capacidad sobrante del archivo y lo cierra."""
+        if self._cerrado:
+            return
+        self.vaciar()
+        self._tramas = None
+        if self.ids is not None:
+            with open(self.archivo, "r+b") as f:
+                f.truncate(self._inicio_datos + self.n_tramas * self.ancho_trama * 8)
+        self._cerrado = True
+
+    def __enter__(self) -> 'EscritorTrayectoria':
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+
+class LectorTrayectoria:
+    """
+    Acceso aleatorio a un archivo de trayectoria mapeado en memoria. Las tramas,
+    los tiempos y las series de cada cuerpo se devuelven como vistas de solo
+    lectura sobre el archivo: solo se leen del disco las páginas que se usan.
+    """
+
+    def __init__(self, archivo: str):
+        """Lee la cabecera y mapea las tramas del archivo."""
+        self.archivo = archivo
+        with open(archivo, "rb") as f:
+            cabecera = f.read(_CABECERA.size)
+            if len(cabecera) < _CABECERA.size:
+                raise ValueError(f"'{archivo}' no es un archivo de trayectoria.")
+            magico, n_cuerpos, n_tramas, inicio = _CABECERA.unpack(cabecera)
+            if magico != MAGICO:
+                raise ValueError(f"'{archivo}' no es un archivo de trayectoria.")
+            self.ids: List[str] = json.loads(f.read(inicio - _CABECERA.size).rstrip(b"\0").decode("utf-8"))
+        self.n_cuerpos = n_cuerpos
+        self.n_tramas = n_tramas
+        self.indices = {id: i for i, id in enumerate(self.ids)}
+        ancho = 1 + 6 * n_cuerpos
+        if n_tramas == 0:
+            self.datos = np.zeros((0, ancho))
+        else:
+            if os.path.getsize(archivo) < inicio + n_tramas * ancho * 8:
+                raise ValueError(f"El archivo de trayectoria '{archivo}' está incompleto.")
+            self.datos = np.memmap(archivo, dtype="<f8", mode="r", offset=inicio,
+                                   shape=(n_tramas, ancho))
+
+    def __len__(self) -> int:
+        return self.n_tramas
+
+    @property
+    def tiempos(self) -> np.ndarray:
+        """Vista (T,) con el tiempo de cada trama."""
+        return self.datos[:, 0]
+
+    @property
+    def posiciones(self) -> np.ndarray:
+        """Vista (T, N, 3) con las posiciones de todas las tramas."""
+        n = self.n_cuerpos
+        return self.datos[:, 1:1 + 3 * n].reshape(self.n_tramas, n, 3)
+
+    @property
+    def velocidades(self) -> np.ndarray:
+        """Vista (T, N, 3) con las velocidades de todas las tramas."""
+        n = self.n_cuerpos
+        return self.datos[:, 1 + 3 * n:].reshape(self.n_tramas, n, 3)
+
+    def trama(self, k: int) -> Tuple[float, np.ndarray, np.ndarray]:
+        """Devuelve el tiempo, las posiciones (N, 3) y las velocidades (N, 3) de la trama k."""
+        return float(self.datos[k, 0]), self.posiciones[k], self.velocidades[k]
+
+    def serie(self, id: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Devuelve las posiciones (T, 3) y velocidades (T, 3) de un cuerpo a lo largo de la trayectoria."""
+        if id not in self.indices:
+            raise KeyError(f"No hay ningún cuerpo '{id}' en la trayectoria.")
+        i = self.indices[id]
+        return self.posiciones[:, i], self.velocidades[:, i]
+
+    def cerrar(self):
+        """Libera el mapeo del archivo."""
+        self.datos = None
+
+    def __enter__(self) -> 'LectorTrayectoria':
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+
+def _como_array(valores) -> np.ndarray:
+    """Convierte una lista de Vector3D (motor "python") en un array (N, 3)."""
+    if isinstance(valores, np.ndarray):
+        return valores
+    return np.array([(v.x, v.y, v.z) for v in valores], dtype=float)
@@ -1,6 +1,9 @@
 import math
 
 class Vector3D:
+    # Sin __dict__: cada vector ocupa menos memoria y el acceso a x, y, z es más rápido
+    __slots__ = ('x', 'y', 'z')
+
     def __init__(self, x: float, y: float, z: float):
         """
         Inicializa un nuevo Vector3D.
@@ -19,7 +22,7 @@ class Vector3D:
         """
         Sobrecarga del operador + para la suma de vectores.
         """
-        return self.add(other)
+        return Vector3D(self.x + other.x, self.y + other.y, self.z + other.z)
 
     def sub(self, other: 'Vector3D') -> 'Vector3D':
         """
@@ -31,7 +34,7 @@ class Vector3D:
         """
         Sobrecarga del operador - para la resta de vectores.
         """
-        return self.sub(other)
+        return Vector3D(self.x - other.x, self.y - other.y, self.z - other.z)
 
     def mul(self, scalar: float) -> 'Vector3D':
         """
@@ -43,13 +46,13 @@ class Vector3D:
         """
         Sobrecarga del operador * para la multiplicación por un escalar.
         """
-        return self.mul(scalar)
+        return Vector3D(self.x * scalar, self.y * scalar, self.z * scalar)
 
     def __rmul__(self, scalar: float) -> 'Vector3D':
         """
         Sobrecarga del operador * para la multiplicación por un escalar (cuando el escalar está a la izquierda).
         """
-        return self.mul(scalar)
+        return Vector3D(self.x * scalar, self.y * scalar, self.z * scalar)
 
     def div(self, scalar: float) -> 'Vector3D':
         """
@@ -65,6 +68,65 @@ class Vector3D:
         """
         return self.div(scalar)
 
+    def __iadd__(self, other: 'Vector3D') -> 'Vector3D':
+        """
+        Operador += : suma otro vector a este vector sin crear uno nuevo.
+        """
+        self.x += other.x
+        self.y += other.y
+        self.z += other.z
+        return self
+
+    def __isub__(self, other: 'Vector3D') -> 'Vector3D':
+        """
+        Operador -= : resta otro vector de este vector sin crear uno nuevo.
+        """
+        self.x -= other.x
+        self.y -= other.y
+        self.z -= other.z
+        return self
+
+    def __imul__(self, scalar: float) -> 'Vector3D':
+        """
+        Operador *= : multiplica este vector por un escalar sin crear uno nuevo.
+        """
+        self.x *= scalar
+        self.y *= scalar
+        self.z *= scalar
+        return self
+
+    def __itruediv__(self, scalar: float) -> 'Vector3D':
+        """
+        Operador /= : divide este vector por un escalar sin crear uno nuevo.
+        """
+        if scalar == 0:
+            raise ValueError("No se puede dividir por cero.")
+        self.x /= scalar
+        self.y /= scalar
+        self.z /= scalar
+        return self
+
+    def iadd_escalado(self, other: 'Vector3D', scalar: float) -> 'Vector3D':
+        """
+        Suma multiplicada en el sitio: self += other * scalar, sin crear vectores intermedios.
+        """
+        self.x += other.x * scalar
+        self.y += other.y * scalar
+        self.z += other.z * scalar
+        return self
+
+    def sumar_escalado(self, other: 'Vector3D', scalar: float) -> 'Vector3D':
+        """
+        Devuelve self + other * scalar creando un único vector (en lugar de dos).
+        """
+        return Vector3D(self.x + other.x * scalar, self.y + other.y * scalar, self.z + other.z * scalar)
+
+    def copia(self) -> 'Vector3D':
+        """
+        Devuelve un vector nuevo con las mismas componentes.
+        """
+        return Vector3D(self.x, self.y, self.z)
+
     def magnitude(self) -> float:
         """
         Calcula la magnitud (longitud) del vector.
@@ -0,0 +1,224 @@
+"""
+Integrador simpléctico de variables mixtas (Wisdom–Holman) para sistemas
+dominados por un cuerpo central: una estrella con planetas y lunas.
+
+Se usan coordenadas heliocéntricas democráticas (Duncan, Levison y Lee, 1998):
+posiciones Q_i relativas al cuerpo central y velocidades V_i baricéntricas. El
+hamiltoniano se separa en tres partes que se integran exactamente:
+
+  Kepler       cada cuerpo en su órbita de dos cuerpos alrededor del central
+               (mu = G * m_central), resuelta analíticamente con deriva_kepler
+  interacción  atracción entre los cuerpos no centrales: un impulso V += a * h
+               con las aceleraciones del solver del simulador
+  salto        Q += h * sum_j m_j V_j / m_central (movimiento del central)
+
+y un paso dt es la composición simétrica impulso(dt/2) salto(dt/2) Kepler(dt)
+salto(dt/2) impulso(dt/2). El error de energía es del orden de
+(m_planeta / m_central) * (dt / P)^2 en lugar de (dt / P)^2 como en leapfrog,
+así que basta un paso de ~1/20 del periodo orbital más corto. Las lunas se
+integran como perturbaciones de la órbita heliocéntrica: el periodo más corto
+es entonces el de la luna más rápida.
+"""
+
+import numpy as np
+
+# Las funciones de Stumpff se evalúan con su serie si |z| < 1 (sin cancelaciones)
+_TERMINOS_SERIE = 10
+_FACTORIALES = np.cumprod([1.0] + list(range(1, 2 * _TERMINOS_SERIE + 3)))
+
+
+def deriva_kepler(mu, posiciones: np.ndarray, velocidades: np.ndarray, dt: float,
+                  tolerancia: float = 1e-15, max_iteraciones: int = 50):
+    """
+    Avanza cada cuerpo (fila de posiciones y velocidades, (N, 3)) un tiempo dt por
+    su órbita kepleriana alrededor de un centro fijo de parámetro mu = G * M (un
+    número o un array (N,)). Vale para órbitas elípticas, parabólicas e hiperbólicas:
+    se resuelve la ecuación de Kepler en la variable universal chi por iteración de
+    Laguerre–Conway, vectorizada sobre todos los cuerpos, y se aplican las
+    funciones f y g de Gauss. Devuelve las nuevas posiciones y velocidades.
+    """
+    r0 = np.sqrt((posiciones * posiciones).sum(axis=1))
+    v2 = (velocidades * velocidades).sum(axis=1)
+    rv = (posiciones * velocidades).sum(axis=1)
+    mu = np.broadcast_to(np.asarray(mu, dtype=float), r0.shape)
+    raiz_mu = np.sqrt(mu)
+    alfa = 2.0 / r0 - v2 / mu
+    eta = rv / raiz_mu
+    zeta = 1.0 - alfa * r0
+
+    # En las órbitas elípticas se descuentan los periodos completos
+    tiempo = np.full(r0.shape, float(dt))
+    elipticas = alfa > 0
+    if elipticas.any():
+        periodo = 2.0 * np.pi / (raiz_mu[elipticas] * alfa[elipticas] ** 1.5)
+        tiempo[elipticas] = np.fmod(tiempo[elipticas], periodo)
+    chi = _estimacion_inicial(raiz_mu, r0, rv, alfa, tiempo)
+
+    for _ in range(max_iteraciones):
+        z = alfa * chi * chi
+        c, s = _stumpff(z)
+        chi2 = chi * chi
+        terminos = (eta * chi2 * c, zeta * chi2 * chi * s, r0 * chi, -raiz_mu * tiempo)
+        f = sum(terminos)
+        df = eta * chi * (1.0 - z * s) + zeta * chi2 * c + r0
+        ddf = eta * (1.0 - z * c) + zeta * chi * (1.0 - z * s)
+        raiz = np.sqrt(np.abs(16.0 * df * df - 20.0 * f * ddf))
+        delta = 5.0 * f / (df + np.copysign(raiz, df))
+        chi = chi - delta
+        # Convergido si el paso es despreciable o si f ya es del orden del redondeo de sus términos
+        redondeo = 4.0 * np.finfo(float).eps * sum(np.abs(t) for t in terminos)
+        if ((np.abs(delta) <= tolerancia * np.abs(chi)) | (np.abs(f) <= redondeo)).all():
+            break
+    else:
+        raise RuntimeError("La ecuación de Kepler no ha convergido.")
+
+    z = alfa * chi * chi
+    c, s = _stumpff(z)
+    chi2 = chi * chi
+    # f - 1 y dg/dt - 1 se calculan directamente para no perder precisión
+    f_menos_1 = -chi2 * c / r0
+    g = tiempo - chi2 * chi * s / raiz_mu
+    nuevas = posiciones + f_menos_1[:, None] * posiciones + g[:, None] * velocidades
+    r = np.sqrt((nuevas * nuevas).sum(axis=1))
+    df_dt = raiz_mu / (r * r0) * chi * (z * s - 1.0)
+    dg_dt_menos_1 = -chi2 * c / r
+    return nuevas, velocidades + df_dt[:, None] * posiciones + dg_dt_menos_1[:, None] * velocidades
+
+
+def _estimacion_inicial(raiz_mu, r0, rv, alfa, tiempo):
+    """Valor inicial de chi: exacto para órbitas circulares y el de Vallado para las hiperbólicas."""
+    chi = np.where(alfa > 0, raiz_mu * alfa * tiempo, raiz_mu * tiempo / r0)
+    hiperbolicas = alfa < 0
+    if hiperbolicas.any():
+        a = 1.0 / alfa[hiperbolicas]
+        t = tiempo[hiperbolicas]
+        signo = np.sign(t)
+        mu_h = raiz_mu[hiperbolicas] ** 2
+        with np.errstate(divide='ignore', invalid='ignore'):
+            argumento = (-2.0 * mu_h * alfa[hiperbolicas] * t
+                         / (rv[hiperbolicas] + signo * np.sqrt(-mu_h * a) * (1.0 - r0[hiperbolicas] * alfa[hiperbolicas])))
+            estimacion = signo * np.sqrt(-a) * np.log(argumento)
+        chi[hiperbolicas] = np.where(np.isfinite(estimacion) & (t != 0), estimacion, chi[hiperbolicas])
+    return chi
+
+
+def _stumpff(z: np.ndarray):
+    """Funciones de Stumpff C(z) = (1 - cos sqrt z) / z y S(z) = (sqrt z - sin sqrt z) / z^1.5."""
+    c = np.empty_like(z)
+    s = np.empty_like(z)
+    pequeno = np.abs(z) < 1.0
+    if pequeno.any():
+        zp = z[pequeno]
+        # Series de Taylor: C = sum (-z)^k / (2k+2)!, S = sum (-z)^k / (2k+3)!
+        suma_c = np.zeros_like(zp)
+        suma_s = np.zeros_like(zp)
+        for k in range(_TERMINOS_SERIE - 1, -1, -1):
+            suma_c = 1.0 / _FACTORIALES[2 * k + 2] - zp * suma_c
+            suma_s = 1.0 / _FACTORIALES[2 * k + 3] - zp * suma_s
+        c[pequeno] = suma_c
+        s[pequeno] = suma_s
+    positivo = ~pequeno & (z > 0)
+    if positivo.any():
+        x = np.sqrt(z[positivo])
+        # 1 - cos x = 2 sin^2(x/2) evita la cancelación
+        c[positivo] = 2.0 * np.sin(x / 2.0) ** 2 / z[positivo]
+        s[positivo] = (x - np.sin(x)) / (x * z[positivo])
+    negativo = ~pequeno & (z < 0)
+    if negativo.any():
+        x = np.sqrt(-z[negativo])
+        c[negativo] = -2.0 * np.sinh(x / 2.0) ** 2 / z[negativo]
+        s[negativo] = (np.sinh(x) - x) / (-x * z[negativo])
+    return c, s
+
+
+class WisdomHolman:
+    """
+    Integrador de Wisdom–Holman en coordenadas heliocéntricas democráticas (ver el
+    módulo). Simpléctico de segundo orden con una evaluación de las fuerzas de
+    interacción por paso: las aceleraciones del final de un paso se reutilizan al
+    principio del siguiente mientras nadie cambie el estado del simulador.
+
+    Requiere el motor "numpy". Las interacciones entre los cuerpos no centrales se
+    calculan con el solver del simulador (suma directa, Barnes–Hut...) y con su
+    suavizado, si lo hay; la parte kepleriana es newtoniana.
+    """
+
+    nombre = "wisdom_holman"
+    orden = 2
+    evaluaciones = 1
+
+    def __init__(self, central: str | None = None):
+        """
+        central es el id del cuerpo central; por defecto, el de mayor masa.
+        """
+        self.central = central
+        # Estado heliocéntrico del último paso y estado del almacén que le corresponde
+        self._referencia = None
+
+    def paso(self, sim, dt: float):
+        """Avanza el sistema un paso dt."""
+        almacen = sim._almacen
+        if almacen is None:
+            raise ValueError("El integrador 'wisdom_holman' requiere el motor 'numpy'.")
+        n = len(almacen)
+        if n < 2:
+            sim._drift(dt)
+            return
+        masas = almacen.masas
+        x = almacen.posiciones
+        v = almacen.velocidades
+        central = sim.cuerpos.fila(self.central) if self.central is not None else int(np.argmax(masas))
+        otros = np.flatnonzero(np.arange(n) != central)
+        m0 = masas[central]
+        m = masas[otros]
+
+        if self._estado_valido(x, v, masas, central):
+            q, p, centro, v_centro, a = self._referencia[4]
+            q, p = q.copy(), p.copy()
+        else:
+            masa_total = masas.sum()
+            centro = masas @ x / masa_total
+            v_centro = masas @ v / masa_total
+            q = x[otros] - x[central]
+            p = v[otros] - v_centro
+            a = self._interaccion(sim, m, q)
+
+        p += a * (dt / 2.0)
+        q += (m @ p) * (dt / 2.0 / m0)
+        q, p = deriva_kepler(sim.G * m0, q, p, dt)
+        q += (m @ p) * (dt / 2.0 / m0)
+        a = self._interaccion(sim, m, q)
+        p += a * (dt / 2.0)
+        centro = centro + v_centro * dt
+
+        # Vuelta a coordenadas baricéntricas
+        x0 = centro - (m @ q) / masas.sum()
+        x[central] = x0
+        x[otros] = x0 + q
+        v[central] = v_centro - (m @ p) / m0
+        v[otros] = p + v_centro
+        # Aceleraciones completas, para quien las consulte después del paso
+        r3 = ((q * q).sum(axis=1) ** 1.5)[:, None]
+        almacen.aceleraciones[otros] = a - sim.G * m0 * q / r3
+        almacen.aceleraciones[central] = sim.G * (m[:, None] * q / r3).sum(axis=0)
+        self._referencia = (central, masas.copy(), x.copy(), v.copy(), (q, p, centro, v_centro, a))
+
+    def _estado_valido(self, x: np.ndarray, v: np.ndarray, masas: np.ndarray, central: int) -> bool:
+        """Indica si el estado heliocéntrico guardado corresponde al estado actual del almacén."""
+        if self._referencia is None:
+            return False
+        central_ref, masas_ref, x_ref, v_ref, _ = self._referencia
+        return (central_ref == central and x_ref.shape == x.shape and np.array_equal(masas_ref, masas)
+                and np.array_equal(x_ref, x) and np.array_equal(v_ref, v))
+
+    def _interaccion(self, sim, masas: np.ndarray, posiciones: np.ndarray) -> np.ndarray:
+        """Aceleraciones de interacción entre los cuerpos no centrales, medidas como un recorrido de fuerzas."""
+        perfil = sim.perfilador
+        if perfil is not None:
+            perfil.iniciar("fuerzas")
+        aceleraciones = sim._aceleraciones_de(masas, posiciones)[0]
+        sim.evaluaciones_fuerzas += 1
+        if perfil is not None:
+            perfil.terminar()
+            perfil.contadores["evaluaciones_fuerzas"] += 1
+        return aceleraciones
@@ -0,0 +1,107 @@
+import pytest
+np = pytest.importorskip("numpy")
+from src.celeste.almacen import AlmacenCuerpos, CuerpoVista
+from src.celeste.simulador import Simulador
+from src.celeste.vector3d import Vector3D
+
+def test_almacen_agregar_y_vistas():
+    almacen = AlmacenCuerpos(capacidad=1)
+    tierra = almacen.agregar("Tierra", 5.972e24, Vector3D(1, 2, 3), Vector3D(4, 5, 6))
+    luna = almacen.agregar("Luna", 7.348e22, Vector3D(7, 8, 9), Vector3D(0, 0, 0))
+    assert isinstance(tierra, CuerpoVista)
+    assert len(almacen) == 2
+    assert almacen.indices == {"Tierra": 0, "Luna": 1}
+    assert almacen.masas.tolist() == [5.972e24, 7.348e22]
+    assert almacen.posiciones[1].tolist() == [7.0, 8.0, 9.0]
+    # Las vistas siguen siendo válidas tras crecer los arrays
+    assert tierra.posicion == Vector3D(1.0, 2.0, 3.0)
+    assert luna.masa == 7.348e22
+
+def test_almacen_vista_escribe_en_arrays():
+    almacen = AlmacenCuerpos()
+    cuerpo = almacen.agregar("Test", 2.0, Vector3D(0, 0, 0), Vector3D(1, 0, 0))
+    cuerpo.mover(2.0)
+    assert almacen.posiciones[0].tolist() == [2.0, 0.0, 0.0]
+    cuerpo.aplicar_fuerza(Vector3D(4.0, 0.0, 0.0), 1.0)
+    assert almacen.velocidades[0].tolist() == [3.0, 0.0, 0.0]
+    cuerpo.fuerza_neta = Vector3D(4.0, 0.0, 0.0)
+    assert almacen.aceleraciones[0].tolist() == [2.0, 0.0, 0.0]
+    assert cuerpo.fuerza_neta == Vector3D(4.0, 0.0, 0.0)
+
+    # Y los cambios en los arrays se ven a través de la vista
+    almacen.velocidades[0] = (0.0, 1.0, 0.0)
+    assert cuerpo.velocidad == Vector3D(0.0, 1.0, 0.0)
+
+def test_almacen_valida_masa_y_duplicados():
+    almacen = AlmacenCuerpos()
+    with pytest.raises(ValueError, match="La masa debe ser un valor positivo."):
+        almacen.agregar("Invalido", 0, Vector3D(0, 0, 0), Vector3D(0, 0, 0))
+    assert len(almacen) == 0
+    almacen.agregar("A", 1.0, Vector3D(0, 0, 0), Vector3D(0, 0, 0))
+    with pytest.raises(ValueError, match="Ya existe un cuerpo con el identificador 'A'."):
+        almacen.agregar("A", 1.0, Vector3D(0, 0, 0), Vector3D(0, 0, 0))
+
+def test_simulador_motor_numpy_guardar_cargar(tmp_path):
+    sim = Simulador(motor="numpy")
+    sim.agregar_cuerpo("Tierra", 5.972e24, Vector3D(0, 0, 0), Vector3D(0, 0, 0))
+    sim.agregar_cuerpo("Luna", 7.348e22, Vector3D(3.844e8, 0, 0), Vector3D(0, 1.022e3, 0))
+    file_path = tmp_path / "test_sim.json"
+    sim.guardar(str(file_path))
+
+    sim.cargar(str(file_path))
+    assert len(sim.cuerpos) == 2
+    assert len(sim._almacen) == 2
+    assert sim.cuerpos["Luna"].velocidad == Vector3D(0.0, 1.022e3, 0.0)
+
+def test_simulador_motor_desconocido():
+    with pytest.raises(ValueError, match="Motor desconocido"):
+        Simulador(motor="fortran")
+
+def test_almacen_eliminar_actualiza_vistas():
+    almacen = AlmacenCuerpos()
+    vistas = [almacen.agregar(id, i + 1.0, Vector3D(i, 0, 0), Vector3D(0, i, 0), radio=0.5 * i)
+              for i, id in enumerate("ABCD")]
+    almacen.eliminar("B")
+    # El último cuerpo ocupa la fila del eliminado; el resto no se mueve
+    assert almacen.ids == ["A", "D", "C"]
+    assert almacen.indices == {"A": 0, "D": 1, "C": 2}
+    assert almacen.masas.tolist() == [1.0, 4.0, 3.0]
+    assert almacen.radios.tolist() == [0.0, 1.5, 1.0]
+    assert vistas[2].posicion == Vector3D(2.0, 0.0, 0.0)
+    assert vistas[3].velocidad == Vector3D(0.0, 3.0, 0.0)
+    almacen.eliminar("C")
+    assert almacen.ids == ["A", "D"]
+    assert vistas[3].masa == 4.0
+
+def test_vista_eliminada_no_toca_otro_cuerpo():
+    almacen = AlmacenCuerpos()
+    a, b, c = [almacen.agregar(id, i + 1.0, Vector3D(i, 0, 0), Vector3D(0, i, 0)) for i, id in enumerate("ABC")]
+    almacen.eliminar("A")
+    # C ocupa ahora la fila 0; la vista de A conserva el último estado de A
+    assert (a.masa, a.posicion) == (1.0, Vector3D(0.0, 0.0, 0.0))
+    a.posicion = Vector3D(9.0, 9.0, 9.0)
+    a.fuerza_neta = Vector3D(5.0, 0.0, 0.0)
+    assert c.posicion == Vector3D(2.0, 0.0, 0.0)
+    assert almacen.posiciones.tolist() == [[2.0, 0.0, 0.0], [1.0, 0.0, 0.0]]
+    assert almacen.aceleraciones.tolist() == [[0.0, 0.0, 0.0], [0.0, 0.0, 0.0]]
+    # Tras vaciar, un cuerpo nuevo tampoco se ve a través de las vistas antiguas
+    almacen.vaciar()
+    almacen.agregar("D", 7.0, Vector3D(7, 7, 7), Vector3D(0, 0, 0))
+    assert (b.id, b.masa, b.posicion) == ("B", 2.0, Vector3D(1.0, 0.0, 0.0))
+    assert (c.masa, c.velocidad) == (3.0, Vector3D(0.0, 2.0, 0.0))
+    b.masa = 100.0
+    assert almacen.masas.tolist() == [7.0]
+
+def test_fuerza_neta_de_particula_de_prueba():
+    almacen = AlmacenCuerpos()
+    _, particula = almacen.agregar_lote(["a", "p"], [1.0, 0.0], np.zeros((2, 3)), np.zeros((2, 3)))
+    almacen.aceleraciones[1] = (1.0, 2.0, 3.0)
+    # Como con ParticulaPrueba: la fuerza se ignora y la aceleración se conserva
+    particula.fuerza_neta = Vector3D(5.0, 0.0, 0.0)
+    particula.fuerza_neta = particula.fuerza_neta + Vector3D(1.0, 0.0, 0.0)
+    assert particula.fuerza_neta == Vector3D(0.0, 0.0, 0.0)
+    assert particula.aceleracion == Vector3D(1.0, 2.0, 3.0)
+    particula.acelerar(2.0)
+    assert particula.velocidad == Vector3D(2.0, 4.0, 6.0)
+    with pytest.raises(ValueError, match="partícula de prueba"):
+        particula.aplicar_fuerza(Vector3D(1.0, 0.0, 0.0), 1.0)
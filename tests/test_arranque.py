@@ -0,0 +1,36 @@
+import os
+import subprocess
+import sys
+
+# Módulos de entrada (el presupuesto de tiempo de importación se mide en benchmarks/bench_arranque.py)
+ENTRADAS = ("src.celeste.simulador", "src.celeste.main")
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Subsistemas que solo se cargan al usar el motor, el solver o el formato que los necesita
+OPCIONALES = ("numpy", "json", "csv", "pickle", "threading", "zlib", "struct", "typing", "re",
+              "src.celeste.almacen", "src.celeste.nucleos", "src.celeste.barnes_hut", "src.celeste.fmm",
+              "src.celeste.instantanea", "src.celeste.catalogos", "src.celeste.puntos_control")
+
+def _ejecutar(codigo):
+    return subprocess.run([sys.executable, "-c", codigo], cwd=RAIZ, capture_output=True,
+                          text=True, check=True)
+
+def _modulos_nuevos(codigo):
+    """Módulos que quedan cargados tras ejecutar el código en un intérprete nuevo."""
+    salida = _ejecutar("import sys\nantes = set(sys.modules)\n" + codigo
+                       + "\nprint(' '.join(sorted(set(sys.modules) - antes)))")
+    return set(salida.stdout.splitlines()[-1].split())
+
+def test_importar_no_carga_subsistemas_opcionales():
+    for modulo in ENTRADAS:
+        cargados = _modulos_nuevos(f"import {modulo}")
+        assert modulo in cargados
+        assert not cargados & set(OPCIONALES), f"{modulo} carga {sorted(cargados & set(OPCIONALES))}"
+
+def test_subsistemas_se_cargan_al_usarse(tmp_path):
+    archivo = str(tmp_path / "estado.json")
+    cargados = _modulos_nuevos(
+        "from src.celeste.simulador import Simulador\n"
+        "sim = Simulador(imprimir_pasos=False)\n"
+        f"sim.guardar({archivo!r})")
+    assert "json" in cargados and "csv" not in cargados and "numpy" not in cargados
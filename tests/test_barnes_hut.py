@@ -0,0 +1,96 @@
+import pytest
+np = pytest.importorskip("numpy")
+from src.celeste.barnes_hut import Octree, SolverBarnesHut, elegir_theta
+from src.celeste.nucleos import aceleraciones_directas, aceleraciones_y_potencial_directas, SolverDirecto
+from src.celeste.simulador import Simulador
+from src.celeste.vector3d import Vector3D
+
+def _nube(n, semilla=0):
+    rng = np.random.default_rng(semilla)
+    return rng.uniform(0.5, 1.5, n), rng.normal(size=(n, 3))
+
+def test_octree_masas_y_rangos():
+    masas, posiciones = _nube(300)
+    arbol = Octree(masas, posiciones, hoja_max=4)
+    assert sorted(arbol.orden.tolist()) == list(range(300))
+    assert arbol.masas[0] == pytest.approx(masas.sum())
+    centro_masas = (masas[:, None] * posiciones).sum(axis=0) / masas.sum()
+    assert np.allclose(arbol.centros_masa[0], centro_masas)
+    # Las hojas cubren todos los cuerpos sin solaparse y respetan hoja_max
+    tam_hojas = arbol.fines[arbol.hojas] - arbol.inicios[arbol.hojas]
+    assert tam_hojas.sum() == 300
+    assert tam_hojas.max() <= 4
+
+def test_octree_cuerpos_coincidentes():
+    masas = np.ones(10)
+    posiciones = np.zeros((10, 3))
+    arbol = Octree(masas, posiciones, hoja_max=2)
+    assert arbol.num_nodos == 1
+
+def test_barnes_hut_theta_cero_igual_que_directo():
+    masas, posiciones = _nube(400)
+    exactas = aceleraciones_directas(masas, posiciones, 1.0)
+    aproximadas = SolverBarnesHut(theta=0.0, hoja_max=8).aceleraciones(masas, posiciones, 1.0)
+    assert np.allclose(aproximadas, exactas, rtol=1e-10, atol=1e-12)
+
+def test_barnes_hut_potencial_frente_a_directo():
+    masas, posiciones = _nube(400)
+    exactas, potencial_exacto = aceleraciones_y_potencial_directas(masas, posiciones, 1.0)
+    aceleraciones, potencial = SolverBarnesHut(theta=0.0, hoja_max=8).aceleraciones_y_potencial(
+        masas, posiciones, 1.0)
+    assert np.allclose(aceleraciones, exactas, rtol=1e-10, atol=1e-12)
+    assert potencial == pytest.approx(potencial_exacto, rel=1e-10)
+    # Con theta > 0 el potencial usa los mismos monopolos que la fuerza
+    potencial = SolverBarnesHut(theta=0.3, hoja_max=8).aceleraciones_y_potencial(masas, posiciones, 1.0)[1]
+    assert potencial == pytest.approx(potencial_exacto, rel=1e-3)
+
+def test_barnes_hut_potencial_cuerpos_coincidentes():
+    masas, posiciones = _nube(50)
+    posiciones[7] = posiciones[3]
+    assert SolverBarnesHut(0.5).aceleraciones_y_potencial(masas, posiciones, 1.0)[1] == float('-inf')
+    assert SolverBarnesHut(0.5).aceleraciones_y_potencial(masas[:1], posiciones[:1], 1.0)[1] == 0.0
+
+def test_barnes_hut_error_decrece_con_theta():
+    masas, posiciones = _nube(2000, semilla=3)
+    errores = [SolverBarnesHut(theta).comparar_con_directo(masas, posiciones, 1.0, muestra=300)["p99"]
+               for theta in (1.0, 0.5, 0.25)]
+    assert errores[0] > errores[1] > errores[2]
+    assert errores[1] < 1e-2
+
+def test_barnes_hut_comparar_informe():
+    masas, posiciones = _nube(200)
+    informe = SolverBarnesHut(0.6).comparar_con_directo(masas, posiciones, 1.0, muestra=None)
+    assert set(informe) == {"theta", "max", "mediana", "p99", "rms"}
+    assert 0.0 <= informe["mediana"] <= informe["p99"] <= informe["max"]
+
+def test_elegir_theta():
+    masas, posiciones = _nube(1000, semilla=5)
+    theta = elegir_theta(masas, posiciones, 1.0, error_objetivo=1e-3, muestra=200)
+    assert 0.0 < theta < 1.0
+    informe = SolverBarnesHut(theta).comparar_con_directo(masas, posiciones, 1.0, muestra=200)
+    assert informe["p99"] <= 1e-3
+    assert elegir_theta(masas, posiciones, 1.0, error_objetivo=0.0, candidatos=(0.5,), muestra=200) == 0.0
+
+def test_barnes_hut_theta_negativo():
+    with pytest.raises(ValueError, match="theta no puede ser negativo"):
+        SolverBarnesHut(theta=-0.1)
+
+def test_simulador_selecciona_solver():
+    sim = Simulador(motor="numpy", solver="barnes_hut")
+    assert isinstance(sim.solver, SolverBarnesHut)
+    assert isinstance(Simulador(motor="numpy").solver, SolverDirecto)
+    solver = SolverBarnesHut(theta=0.3)
+    assert Simulador(motor="numpy", solver=solver).solver is solver
+    with pytest.raises(ValueError, match="Solver desconocido"):
+        Simulador(motor="numpy", solver="magia")
+    with pytest.raises(ValueError, match="requieren el motor 'numpy'"):
+        Simulador(solver="barnes_hut")
+
+def test_simulador_barnes_hut_calcula_fuerzas():
+    sim = Simulador(motor="numpy", solver=SolverBarnesHut(theta=0.5, hoja_max=2))
+    sim.agregar_cuerpo("Tierra", 5.972e24, Vector3D(0, 0, 0), Vector3D(0, 0, 0))
+    sim.agregar_cuerpo("Luna", 7.348e22, Vector3D(3.844e8, 0, 0), Vector3D(0, 1.022e3, 0))
+    sim.calcular_fuerzas()
+    fuerza = sim.G * 5.972e24 * 7.348e22 / 3.844e8 ** 2
+    assert sim.cuerpos["Tierra"].fuerza_neta.x == pytest.approx(fuerza)
+    assert sim.cuerpos["Luna"].fuerza_neta.x == pytest.approx(-fuerza)
@@ -0,0 +1,47 @@
+import math
+import pytest
+from benchmarks.escenarios import esfera_plummer, sistema_solar, disco_frio, ESCENARIOS
+from benchmarks.suite import comparar, ejecutar
+
+def _estado(sim):
+    return [(c.id, c.masa, c.posicion.to_list(), c.velocidad.to_list()) for c in sim.cuerpos.values()]
+
+@pytest.mark.parametrize("escenario", list(ESCENARIOS))
+def test_escenarios_reproducibles_y_en_reposo(escenario):
+    generador = ESCENARIOS[escenario]
+    a = generador(60, semilla=3)
+    assert len(a.cuerpos) == 60
+    assert _estado(a) == _estado(generador(60, semilla=3))
+    assert _estado(a) != _estado(generador(60, semilla=4))
+    momento = a._calcular_momento_lineal_total().magnitude()
+    escala = sum(c.masa * c.velocidad.magnitude() for c in a.cuerpos.values())
+    assert momento < 1e-12 * escala
+
+def test_plummer_en_equilibrio_virial():
+    sim = esfera_plummer(800, semilla=1)
+    cinetica = sim._calcular_energia_cinetica_total()
+    potencial = sim._energia_potencial_actual()
+    assert 2 * cinetica / abs(potencial) == pytest.approx(1.0, abs=0.15)
+
+def test_sistema_solar_y_disco():
+    assert list(sistema_solar(3).cuerpos) == ["Sol", "Mercurio", "Venus"]
+    assert len(sistema_solar(20).cuerpos) == 20
+    disco = disco_frio(50)
+    z = max(abs(c.posicion.z) for c in disco.cuerpos.values())
+    r = max(math.hypot(c.posicion.x, c.posicion.y) for c in disco.cuerpos.values())
+    assert z < 0.01 * r
+
+def test_comparar_detecta_regresiones():
+    referencia = {"a": {"pasos_s": 100.0, "interacciones_s": 1e6}, "b": {"cuerpos_s": 10.0}}
+    resultados = {"a": {"pasos_s": 85.0, "interacciones_s": 7e5, "error_energia": 1.0},
+                  "b": {"cuerpos_s": 50.0}, "nuevo": {"pasos_s": 1.0}}
+    assert comparar(resultados, referencia, 0.2) == [("a", "interacciones_s", 1e6, 7e5)]
+    assert len(comparar(resultados, referencia, 0.1)) == 2
+
+def test_ejecutar_un_caso():
+    resultados = ejecutar(10, filtro="paso/solar/n=10/python", tiempo_minimo=0.01, mostrar=lambda texto: None)
+    metricas = resultados["paso/solar/n=10/python"]
+    assert metricas["pasos"] >= 2
+    assert metricas["interacciones_s"] == pytest.approx(metricas["pasos_s"] * 45, rel=0.1)
+    assert metricas["error_energia"] < 1e-6
+    assert metricas["memoria_pico_mb"] > 0
@@ -0,0 +1,111 @@
+import pytest
+np = pytest.importorskip("numpy")
+from src.celeste.simulador import Simulador
+from src.celeste.vector3d import Vector3D
+from src.celeste.catalogos import leer_bloques, cargar_catalogo
+
+def _columnas(n, semilla=0):
+    rng = np.random.default_rng(semilla)
+    return ([f"C{i}" for i in range(n)], rng.uniform(1e20, 1e25, n),
+            rng.normal(scale=1e11, size=(n, 3)), rng.normal(scale=1e4, size=(n, 3)), rng.uniform(0, 1e6, n))
+
+def _estado(sim):
+    return [(c.id, c.masa, c.posicion.to_list(), c.velocidad.to_list(), c.radio) for c in sim.cuerpos.values()]
+
+@pytest.mark.parametrize("motor", Simulador.MOTORES)
+def test_agregar_cuerpos_igual_que_uno_a_uno(motor, capsys):
+    ids, masas, posiciones, velocidades, radios = _columnas(50)
+    lote = Simulador(motor=motor, imprimir_pasos=False)
+    capsys.readouterr()
+    assert lote.agregar_cuerpos(ids, masas, posiciones, velocidades, radios) == 50
+    assert capsys.readouterr().out == ""
+    uno_a_uno = Simulador(motor=motor, imprimir_pasos=False)
+    for i, id in enumerate(ids):
+        uno_a_uno._insertar_cuerpo(id, float(masas[i]), Vector3D(*posiciones[i].tolist()),
+                                   Vector3D(*velocidades[i].tolist()), float(radios[i]))
+    assert _estado(lote) == _estado(uno_a_uno)
+    lote.calcular_fuerzas()
+    uno_a_uno.calcular_fuerzas()
+    assert lote._energia_potencial_actual() == uno_a_uno._energia_potencial_actual()
+
+@pytest.mark.parametrize("motor", Simulador.MOTORES)
+def test_agregar_cuerpos_valida_todo_el_lote(motor):
+    sim = Simulador(motor=motor, imprimir_pasos=False)
+    sim.agregar_cuerpos(["A"], [1.0], [[0.0, 0.0, 0.0]], [[0.0, 0.0, 0.0]])
+    casos = [
+        (["B", "C"], [1.0, -1.0], None),
+        (["B", "C"], [1.0, float("nan")], None),
+        (["B", "B"], [1.0, 1.0], None),
+        (["B", "A"], [1.0, 1.0], None),
+        (["B", "C"], [1.0, 1.0], [0.0, -1.0]),
+    ]
+    for ids, masas, radios in casos:
+        with pytest.raises(ValueError):
+            sim.agregar_cuerpos(ids, masas, [[0.0] * 3] * 2, [[0.0] * 3] * 2, radios)
+        assert list(sim.cuerpos) == ["A"]
+    with pytest.raises(ValueError):
+        sim.agregar_cuerpos(["B", "C"], [1.0], [[0.0] * 3] * 2, [[0.0] * 3] * 2)
+
+def test_vistas_del_lote_escriben_en_el_almacen():
+    sim = Simulador(motor="numpy", imprimir_pasos=False)
+    sim.agregar_cuerpos(*_columnas(40))
+    sim.cuerpos["C7"].posicion = Vector3D(1.0, 2.0, 3.0)
+    assert sim._almacen.posiciones[7].tolist() == [1.0, 2.0, 3.0]
+    sim._eliminar_cuerpo("C3")
+    assert sim.cuerpos["C7"].posicion.to_list() == [1.0, 2.0, 3.0]
+
+@pytest.mark.parametrize("extension", ["csv", "npy", "json"])
+@pytest.mark.parametrize("motor", Simulador.MOTORES)
+def test_guardar_y_cargar_catalogo(extension, motor, tmp_path):
+    original = Simulador(motor="numpy", imprimir_pasos=False)
+    original.agregar_cuerpos(*_columnas(250))
+    archivo = str(tmp_path / f"catalogo.{extension}")
+    original.guardar(archivo)
+    cargado = Simulador(motor=motor, imprimir_pasos=False)
+    cargado.cargar(archivo)
+    assert _estado(cargado) == _estado(original)
+
+@pytest.mark.parametrize("extension", ["csv", "npy"])
+def test_lectura_por_bloques(extension, tmp_path):
+    original = Simulador(motor="numpy", imprimir_pasos=False)
+    original.agregar_cuerpos(*_columnas(25))
+    archivo = str(tmp_path / f"catalogo.{extension}")
+    original.guardar(archivo)
+    bloques = list(leer_bloques(archivo, filas=10))
+    assert [len(b[0]) for b in bloques] == [10, 10, 5]
+    assert np.array_equal(np.concatenate([b[2] for b in bloques]), original._almacen.posiciones)
+    # cargar_catalogo agrega a los cuerpos existentes
+    sim = Simulador(imprimir_pasos=False)
+    sim._insertar_cuerpo("Sol", 2e30, Vector3D(0.0, 0.0, 0.0), Vector3D(0.0, 0.0, 0.0))
+    assert cargar_catalogo(sim, archivo, filas=7) == 25
+    assert len(sim.cuerpos) == 26
+
+def test_csv_con_identificadores_entrecomillados(tmp_path):
+    sim = Simulador(imprimir_pasos=False)
+    sim._insertar_cuerpo('a;"b"', 1.0, Vector3D(1.0, 2.0, 3.0), Vector3D(0.0, 0.0, 0.0))
+    sim._insertar_cuerpo("c", 2.0, Vector3D(4.0, 5.0, 6.0), Vector3D(0.0, 0.0, 0.0), 0.5)
+    archivo = str(tmp_path / "raro.csv")
+    sim.guardar(archivo)
+    cargado = Simulador(imprimir_pasos=False)
+    cargado.cargar(archivo)
+    assert _estado(cargado) == _estado(sim)
+
+@pytest.mark.parametrize("motor", Simulador.MOTORES)
+def test_error_en_un_bloque_posterior_no_deja_carga_a_medias(motor, tmp_path):
+    original = Simulador(motor="numpy", imprimir_pasos=False)
+    original.agregar_cuerpos(*_columnas(6))
+    archivo = tmp_path / "catalogo.csv"
+    original.guardar(str(archivo))
+    lineas = archivo.read_text().splitlines()
+    # Masa negativa en la última fila: el error salta en el tercer bloque de 2 filas
+    campos = lineas[-1].split(";")
+    lineas[-1] = ";".join([campos[0], "-1"] + campos[2:])
+    archivo.write_text("\n".join(lineas) + "\n")
+    sim = Simulador(motor=motor, imprimir_pasos=False)
+    sim._insertar_cuerpo("Sol", 2e30, Vector3D(0.0, 0.0, 0.0), Vector3D(0.0, 0.0, 0.0))
+    antes = _estado(sim)
+    with pytest.raises(ValueError, match="masa"):
+        cargar_catalogo(sim, str(archivo), filas=2)
+    assert _estado(sim) == antes
+    if sim._almacen is not None:
+        assert len(sim._almacen) == 1
@@ -0,0 +1,132 @@
+import json
+import pytest
+from src.celeste.simulador import Simulador
+from src.celeste.vector3d import Vector3D
+from src.celeste.cli import main
+
+@pytest.fixture
+def estado_inicial(tmp_path):
+    sim = Simulador(imprimir_pasos=False)
+    sim.agregar_cuerpo("Sol", 1.989e30, Vector3D(0, 0, 0), Vector3D(0, 0, 0))
+    sim.agregar_cuerpo("Tierra", 5.972e24, Vector3D(1.496e11, 0, 0), Vector3D(0, 2.978e4, 0))
+    sim.agregar_cuerpo("Marte", 6.39e23, Vector3D(2.279e11, 0, 0), Vector3D(0, 2.407e4, 0))
+    archivo = tmp_path / "sistema.json"
+    sim.guardar(str(archivo))
+    return archivo
+
+def test_ejecucion_por_lotes_sin_salida_por_paso(estado_inicial, tmp_path, capsys):
+    salida = tmp_path / "final.json"
+    capsys.readouterr()
+    assert main([str(estado_inicial), "--dt", "3600", "--tiempo-total", "36000",
+                 "--integrador", "leapfrog", "--salida", str(salida)]) == 0
+    lineas = capsys.readouterr().out.splitlines()
+    assert not any("--- Paso" in linea or "Energía" in linea for linea in lineas)
+    assert "Pasos: 10 " in lineas[-2]
+    # Leapfrog reutiliza las fuerzas: 11 recorridos de 3 pares
+    assert "Interacciones de pares: 33 " in lineas[-1]
+    final = json.loads(salida.read_text())
+    assert [c["id"] for c in final] == ["Sol", "Tierra", "Marte"]
+    assert final[1]["posicion"][1] > 0
+
+def test_diagnosticos_y_pasos_bajo_demanda(estado_inicial, capsys):
+    capsys.readouterr()
+    main([str(estado_inicial), "--dt", "3600", "--tiempo-total", "36000",
+          "--diagnosticos", "5", "--mostrar-pasos"])
+    salida = capsys.readouterr().out
+    assert salida.count("Energía Cinética Total") == 2
+    assert salida.count("--- Paso de Simulación") == 10
+
+def test_reanudar_desde_punto_de_control(estado_inicial, tmp_path, capsys):
+    pytest.importorskip("numpy")
+    control = tmp_path / "control.pkl"
+    continua = tmp_path / "continua.json"
+    reanudada = tmp_path / "reanudada.json"
+    comunes = ["--dt", "3600", "--tiempo-total", "36000", "--motor", "numpy", "--integrador", "yoshida4"]
+    main([str(estado_inicial), *comunes, "--salida", str(continua),
+          "--punto-control", str(control), "--intervalo-control", "4"])
+    # El último punto de control es el del paso 8: reanudar completa los pasos 9 y 10
+    capsys.readouterr()
+    main(["--reanudar", str(control), "--salida", str(reanudada)])
+    assert "Pasos: 2 " in capsys.readouterr().out
+    assert json.loads(reanudada.read_text()) == json.loads(continua.read_text())
+
+@pytest.mark.parametrize("opciones", [["sistema.json"], ["--solver", "barnes_hut"], ["--integrador", "leapfrog"],
+                                      ["--motor", "python"], ["--colisiones"], ["--precision", "float32"],
+                                      ["--suavizado", "plummer", "--epsilon", "1e6"]])
+def test_reanudar_no_admite_opciones_de_construccion(estado_inicial, tmp_path, capsys, opciones):
+    pytest.importorskip("numpy")
+    control = tmp_path / "control.pkl"
+    main([str(estado_inicial), "--dt", "3600", "--tiempo-total", "36000", "--motor", "numpy",
+          "--punto-control", str(control), "--intervalo-control", "4"])
+    capsys.readouterr()
+    with pytest.raises(SystemExit) as error:
+        main(["--reanudar", str(control)] + opciones)
+    assert error.value.code == 2
+    assert "no admite" in capsys.readouterr().err
+
+@pytest.mark.parametrize("asincrona", [[], ["--salida-asincrona", "--diagnosticos", "5"]])
+def test_trayectoria(estado_inicial, tmp_path, asincrona):
+    pytest.importorskip("numpy")
+    from src.celeste.trayectoria import LectorTrayectoria
+    trayectoria = tmp_path / "tray.bin"
+    main([str(estado_inicial), "--dt", "3600", "--tiempo-total", "36000", "--solver", "barnes_hut",
+          "--trayectoria", str(trayectoria), "--intervalo-trayectoria", "3"] + asincrona)
+    lector = LectorTrayectoria(str(trayectoria))
+    assert lector.ids == ["Sol", "Tierra", "Marte"]
+    assert list(lector.tiempos) == [3600.0, 4 * 3600.0, 7 * 3600.0, 10 * 3600.0]
+
+@pytest.mark.parametrize("argumentos", [
+    [],
+    ["sistema.json"],
+    ["sistema.json", "--dt", "-1", "--tiempo-total", "10"],
+    ["sistema.json", "--dt", "1", "--tiempo-total", "10", "--motor", "python", "--solver", "directo"],
+    ["sistema.json", "--dt", "1", "--tiempo-total", "10", "--integrador", "desconocido"],
+    ["sistema.json", "--dt", "1", "--tiempo-total", "10", "--solver", "barnes_hut", "--precision", "float32"],
+    ["sistema.json", "--dt", "1", "--tiempo-total", "10", "--radio-encuentro", "1e9"],
+    ["sistema.json", "--dt", "1", "--tiempo-total", "10", "--theta", "0.3"],
+    ["sistema.json", "--dt", "1", "--tiempo-total", "10", "--solver", "paralelo", "--theta", "0.3"],
+    ["sistema.json", "--dt", "1", "--tiempo-total", "10", "--solver", "barnes_hut", "--orden", "6"],
+    ["sistema.json", "--dt", "1", "--tiempo-total", "10", "--solver", "directo", "--hilos", "2"],
+])
+def test_argumentos_invalidos(argumentos, estado_inicial, monkeypatch):
+    monkeypatch.chdir(estado_inicial.parent)
+    with pytest.raises(SystemExit) as error:
+        main(argumentos)
+    assert error.value.code == 2
+
+def test_suavizado_requiere_epsilon(estado_inicial, tmp_path, capsys):
+    with pytest.raises(SystemExit):
+        main([str(estado_inicial), "--dt", "3600", "--tiempo-total", "36000", "--suavizado", "plummer"])
+    salida = tmp_path / "final.json"
+    assert main([str(estado_inicial), "--dt", "3600", "--tiempo-total", "36000",
+                 "--suavizado", "spline", "--epsilon", "1e6", "--salida", str(salida)]) == 0
+    assert salida.exists()
+
+def test_precision_simple(estado_inicial, tmp_path):
+    pytest.importorskip("numpy")
+    for precision in ("float64", "float32"):
+        assert main([str(estado_inicial), "--dt", "3600", "--tiempo-total", "36000", "--motor", "numpy",
+                     "--precision", precision, "--salida", str(tmp_path / f"{precision}.json")]) == 0
+    doble, simple = (json.loads((tmp_path / f"{p}.json").read_text()) for p in ("float64", "float32"))
+    for a, b in zip(doble, simple):
+        assert b["posicion"] == pytest.approx(a["posicion"], rel=1e-9, abs=1.0)
+
+@pytest.mark.parametrize("solver", [[], ["--solver", "barnes_hut", "--theta", "0.3"], ["--solver", "fmm", "--orden", "2"]])
+def test_interacciones_iguales_que_el_perfilador(estado_inicial, tmp_path, capsys, solver):
+    if solver:
+        pytest.importorskip("numpy")
+    assert main([str(estado_inicial), "--dt", "3600", "--tiempo-total", "36000", "--integrador", "leapfrog",
+                 "--perfil", str(tmp_path / "perfil.jsonl")] + solver) == 0
+    salida = capsys.readouterr().out
+    interacciones = int(salida.split("Interacciones de pares: ")[1].split()[0])
+    assert interacciones > 0
+    assert f"Pares: {interacciones} " in salida
+
+def test_perfil_en_json_lines(estado_inicial, tmp_path, capsys):
+    perfil = tmp_path / "perfil.jsonl"
+    assert main([str(estado_inicial), "--dt", "3600", "--tiempo-total", "36000",
+                 "--perfil", str(perfil), "--intervalo-perfil", "5"]) == 0
+    salida = capsys.readouterr().out
+    assert "Propio (s)" in salida and "integrador" in salida
+    lineas = [json.loads(linea) for linea in perfil.read_text().splitlines()]
+    assert [l["paso"] for l in lineas] == [0, 5]
@@ -0,0 +1,94 @@
+import pytest
+from src.celeste.coleccion import ColeccionCuerpos
+from src.celeste.simulador import Simulador
+from src.celeste.vector3d import Vector3D
+
+def _coleccion(ids):
+    coleccion = ColeccionCuerpos()
+    for id in ids:
+        coleccion[id] = id.lower()
+    return coleccion
+
+def test_se_comporta_como_un_dict():
+    coleccion = _coleccion("ABC")
+    assert len(coleccion) == 3
+    assert "B" in coleccion and "Z" not in coleccion
+    assert coleccion["B"] == "b"
+    assert coleccion.get("Z") is None
+    assert list(coleccion) == ["A", "B", "C"]
+    assert list(coleccion.values()) == ["a", "b", "c"]
+    assert list(coleccion.items()) == [("A", "a"), ("B", "b"), ("C", "c")]
+    assert coleccion == {"A": "a", "B": "b", "C": "c"}
+    coleccion["B"] = "nuevo"
+    assert list(coleccion.values()) == ["a", "nuevo", "c"]
+    with pytest.raises(KeyError):
+        del coleccion["Z"]
+
+def test_eliminar_mueve_el_ultimo_a_su_fila():
+    coleccion = _coleccion("ABCD")
+    del coleccion["B"]
+    assert list(coleccion) == ["A", "D", "C"]
+    assert [coleccion.fila(id) for id in "ADC"] == [0, 1, 2]
+    del coleccion["C"]
+    assert list(coleccion) == ["A", "D"]
+    assert coleccion.ids == ("A", "D")
+
+def test_indices_estables():
+    coleccion = _coleccion("ABCD")
+    indices = {id: coleccion.indice(id) for id in "ABCD"}
+    assert sorted(indices.values()) == [0, 1, 2, 3]
+    del coleccion["A"]
+    coleccion["E"] = "e"
+    # D cambia de fila pero no de índice; los índices no se reutilizan
+    assert coleccion.fila("D") == 0
+    assert {id: coleccion.indice(id) for id in "BCD"} == {id: indices[id] for id in "BCD"}
+    assert coleccion.indice("E") == 4
+    assert coleccion.por_indice(indices["D"]) == "d"
+    with pytest.raises(KeyError):
+        coleccion.por_indice(indices["A"])
+    coleccion.clear()
+    coleccion["F"] = "f"
+    assert coleccion.indice("F") == 5
+
+def test_extender_y_tupla_de_ids():
+    coleccion = _coleccion("AB")
+    ids = coleccion.ids
+    assert coleccion.ids is ids
+    coleccion.extender(["C", "D"], ["c", "d"])
+    assert coleccion.ids == ("A", "B", "C", "D")
+    assert coleccion.indice("D") == 3
+    assert coleccion.por_indice(2) == "c"
+
+@pytest.mark.parametrize("motor", Simulador.MOTORES)
+def test_entrada_y_salida_de_cuerpos_durante_la_simulacion(motor):
+    if motor == "numpy":
+        pytest.importorskip("numpy")
+    sim = Simulador(motor=motor, integrador="leapfrog", imprimir_pasos=False)
+    sim.agregar_cuerpo("Sol", 1.989e30, Vector3D(0, 0, 0), Vector3D(0, 0, 0))
+    for k in range(6):
+        sim.agregar_cuerpo(f"M{k}", 1e12, Vector3D(1.5e11 + 1e9 * k, 0, 0), Vector3D(0, 3e4, 0))
+    indice_sol = sim.cuerpos.indice("Sol")
+    for paso in range(6):
+        sim.paso_simulacion(3600.0, paso * 3600.0)
+        sim.eliminar_cuerpo(f"M{paso}")
+        sim.agregar_cuerpo(f"N{paso}", 1e12, Vector3D(0, 2e11, 0), Vector3D(-2.5e4, 0, 0))
+    assert len(sim.cuerpos) == 7
+    assert sim.cuerpos.indice("Sol") == indice_sol
+    if sim._almacen is not None:
+        assert sim._almacen.ids == list(sim.cuerpos)
+        assert all(sim._almacen.vistas[sim.cuerpos.fila(id)] is sim.cuerpos[id] for id in sim.cuerpos)
+
+    # Las fuerzas tras las altas y bajas son las de un simulador creado con los mismos cuerpos
+    nuevo = Simulador(motor=motor, imprimir_pasos=False)
+    for cuerpo in sim.cuerpos.values():
+        nuevo.agregar_cuerpo(cuerpo.id, cuerpo.masa, cuerpo.posicion, cuerpo.velocidad)
+    sim.calcular_fuerzas()
+    nuevo.calcular_fuerzas()
+    for id, cuerpo in nuevo.cuerpos.items():
+        assert sim.cuerpos[id].fuerza_neta.x == pytest.approx(cuerpo.fuerza_neta.x)
+        assert sim.cuerpos[id].fuerza_neta.y == pytest.approx(cuerpo.fuerza_neta.y)
+
+def test_eliminar_cuerpo_inexistente():
+    sim = Simulador(imprimir_pasos=False)
+    with pytest.raises(ValueError, match="No existe un cuerpo con el identificador 'X'."):
+        sim.eliminar_cuerpo("X")
@@ -0,0 +1,90 @@
+import itertools
+import random
+import pytest
+from src.celeste.simulador import Simulador
+from src.celeste.cuerpo import CuerpoCeleste
+from src.celeste.vector3d import Vector3D
+from src.celeste.colisiones import DetectorColisiones, pares_candidatos, pares_en_contacto
+
+def _nube(n, semilla=0, lado=100.0):
+    rng = random.Random(semilla)
+    posiciones = [(rng.uniform(0, lado), rng.uniform(0, lado), rng.uniform(0, lado)) for _ in range(n)]
+    radios = [rng.uniform(0.1, 1.0) for _ in range(n)]
+    return posiciones, radios
+
+def _fuerza_bruta(posiciones, radios):
+    return sorted((i, j) for i, j in itertools.combinations(range(len(posiciones)), 2)
+                  if sum((a - b) ** 2 for a, b in zip(posiciones[i], posiciones[j])) <= (radios[i] + radios[j]) ** 2)
+
+def test_pares_en_contacto_igual_que_fuerza_bruta():
+    posiciones, radios = _nube(600)
+    esperados = _fuerza_bruta(posiciones, radios)
+    assert esperados
+    assert sorted(pares_en_contacto(posiciones, radios)) == esperados
+    # La fase amplia descarta casi todos los pares
+    assert len(pares_candidatos(posiciones, radios)) < 600 * 599 / 2 / 50
+
+def test_fase_amplia_vectorizada_igual_que_la_de_python():
+    np = pytest.importorskip("numpy")
+    posiciones, radios = _nube(600, semilla=3)
+    esperados = sorted(pares_candidatos(posiciones, radios))
+    assert sorted(pares_candidatos(np.array(posiciones), radios)) == esperados
+    assert sorted(pares_en_contacto(np.array(posiciones), radios)) == _fuerza_bruta(posiciones, radios)
+
+def test_cuerpo_radio():
+    cuerpo = CuerpoCeleste("A", 1.0, Vector3D(0, 0, 0), Vector3D(0, 0, 0), radio=2.0)
+    assert cuerpo.radio == 2.0
+    assert CuerpoCeleste.from_dict(cuerpo.to_dict()).radio == 2.0
+    assert "radio" not in CuerpoCeleste("B", 1.0, Vector3D(0, 0, 0), Vector3D(0, 0, 0)).to_dict()
+    with pytest.raises(ValueError):
+        CuerpoCeleste("C", 1.0, Vector3D(0, 0, 0), Vector3D(0, 0, 0), radio=-1.0)
+
+@pytest.mark.parametrize("motor", ["python", "numpy"])
+def test_fusion_conserva_masa_y_momento(motor):
+    if motor == "numpy":
+        pytest.importorskip("numpy")
+    sim = Simulador(motor=motor, imprimir_pasos=False, colisiones=True)
+    sim.agregar_cuerpo("A", 3.0, Vector3D(0, 0, 0), Vector3D(1, 0, 0), radio=1.0)
+    sim.agregar_cuerpo("B", 1.0, Vector3D(1.5, 0, 0), Vector3D(-1, 2, 0), radio=1.0)
+    sim.agregar_cuerpo("C", 0.5, Vector3D(3.0, 0, 0), Vector3D(0, 0, 4), radio=0.5)
+    sim.agregar_cuerpo("D", 2.0, Vector3D(50, 0, 0), Vector3D(0, 0, 0), radio=1.0)
+    momento = sim._calcular_momento_lineal_total()
+
+    eventos = sim.colisiones.procesar(sim, tiempo=10.0, paso=3)
+    assert list(sim.cuerpos) == ["A", "D"]
+    assert len(eventos) == 1
+    evento = eventos[0]
+    assert (evento.superviviente, evento.absorbidos, evento.tiempo, evento.paso) == ("A", ["B", "C"], 10.0, 3)
+    a = sim.obtener_cuerpo("A")
+    assert a.masa == 4.5
+    assert a.radio == pytest.approx((1.0 + 1.0 + 0.125) ** (1 / 3))
+    assert a.posicion.x == pytest.approx((1.5 + 1.5) / 4.5)
+    nuevo_momento = sim._calcular_momento_lineal_total()
+    for eje in "xyz":
+        assert getattr(nuevo_momento, eje) == pytest.approx(getattr(momento, eje))
+    assert evento.energia_disipada > 0
+
+@pytest.mark.parametrize("motor", ["python", "numpy"])
+def test_colision_durante_la_simulacion(motor):
+    if motor == "numpy":
+        pytest.importorskip("numpy")
+    sim = Simulador(motor=motor, imprimir_pasos=False, colisiones=DetectorColisiones())
+    sim.agregar_cuerpo("Planeta", 6e24, Vector3D(0, 0, 0), Vector3D(0, 0, 0), radio=6.4e6)
+    sim.agregar_cuerpo("Asteroide", 1e15, Vector3D(1e7, 0, 0), Vector3D(-1e3, 0, 0), radio=1e3)
+    for paso in range(20):
+        sim.paso_simulacion(60.0, paso * 60.0)
+    assert list(sim.cuerpos) == ["Planeta"]
+    assert sim.obtener_cuerpo("Planeta").masa == 6e24 + 1e15
+    assert len(sim.colisiones.eventos) == 1
+    # La simulación continúa con el cuerpo fusionado
+    sim.paso_simulacion(60.0, 20 * 60.0)
+
+def test_radio_en_csv_y_json(tmp_path):
+    sim = Simulador(imprimir_pasos=False)
+    sim.agregar_cuerpo("A", 1.0, Vector3D(0, 0, 0), Vector3D(0, 0, 0), radio=2.5)
+    sim.agregar_cuerpo("B", 1.0, Vector3D(9, 0, 0), Vector3D(0, 0, 0))
+    for nombre in ("s.json", "s.csv"):
+        sim.guardar(str(tmp_path / nombre))
+        cargado = Simulador(imprimir_pasos=False)
+        cargado.cargar(str(tmp_path / nombre))
+        assert [c.radio for c in cargado.cuerpos.values()] == [2.5, 0.0]
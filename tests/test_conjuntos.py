@@ -0,0 +1,63 @@
+import math
+import statistics
+import pytest
+from src.celeste.simulador import Simulador
+from src.celeste.vector3d import Vector3D
+from src.celeste.conjuntos import (Conjunto, EstadisticasIncrementales, PerturbacionPosiciones,
+                                   PerturbacionVelocidades)
+
+DIA = 86400.0
+
+def _sol_tierra(**kwargs):
+    sim = Simulador(imprimir_pasos=False, **kwargs)
+    sim.agregar_cuerpo("Sol", 1.989e30, Vector3D(0, 0, 0), Vector3D(0, 0, 0))
+    sim.agregar_cuerpo("Tierra", 5.972e24, Vector3D(1.496e11, 0, 0), Vector3D(0, 2.978e4, 0))
+    return sim
+
+def _resumen_tierra(sim, energia_inicial):
+    tierra = sim.obtener_cuerpo("Tierra")
+    return {"x": tierra.posicion.x, "vy": tierra.velocidad.y}
+
+def test_estadisticas_incrementales():
+    valores = [3.0, 1.5, 4.0, 1.0, 5.5, 9.0]
+    estadisticas = EstadisticasIncrementales()
+    for i, valor in enumerate(valores):
+        estadisticas.agregar({"indice": i, "a": valor, "etiqueta": "x"})
+    assert estadisticas.n == 6
+    assert estadisticas.media("a") == pytest.approx(statistics.mean(valores))
+    assert estadisticas.desviacion("a") == pytest.approx(statistics.stdev(valores))
+    assert estadisticas.minimo["a"] == 1.0 and estadisticas.maximo["a"] == 9.0
+    assert set(estadisticas.como_dict()) == {"a"}
+
+def test_miembros_reproducibles_y_distintos():
+    sim = _sol_tierra()
+    conjunto = Conjunto(sim, [PerturbacionVelocidades(1e-3, ids=["Tierra"])], dt=DIA,
+                        tiempo_total=30 * DIA, procesos=1, semilla=7, resumen=_resumen_tierra)
+    resumenes = conjunto.ejecutar_todo(4)
+    assert [r["indice"] for r in resumenes] == [0, 1, 2, 3]
+    assert len({r["x"] for r in resumenes}) == 4
+    assert conjunto.estadisticas.n == 4
+
+    otra = Conjunto(sim, [PerturbacionVelocidades(1e-3, ids=["Tierra"])], dt=DIA,
+                    tiempo_total=30 * DIA, procesos=1, semilla=7, resumen=_resumen_tierra)
+    assert [r["x"] for r in otra.ejecutar_todo(4)] == [r["x"] for r in resumenes]
+    # El simulador base no se modifica
+    assert sim.obtener_cuerpo("Tierra").posicion == Vector3D(1.496e11, 0, 0)
+
+def test_procesos_en_paralelo_igual_que_en_serie():
+    sim = _sol_tierra()
+    perturbaciones = [PerturbacionPosiciones(1e-4), PerturbacionVelocidades(1e-4)]
+    serie = Conjunto(sim, perturbaciones, dt=DIA, tiempo_total=20 * DIA, procesos=1).ejecutar_todo(6)
+    conjunto = Conjunto(sim, perturbaciones, dt=DIA, tiempo_total=20 * DIA, procesos=2)
+    paralelo = conjunto.ejecutar_todo(6)
+    for a, b in zip(serie, paralelo):
+        assert a["energia_final"] == b["energia_final"]
+        assert a["distancia_maxima"] == b["distancia_maxima"]
+    assert conjunto.estadisticas.n == 6
+    media = conjunto.estadisticas.media("error_energia")
+    assert media == pytest.approx(statistics.mean(r["error_energia"] for r in paralelo))
+    assert math.isclose(conjunto.estadisticas.media("distancia_maxima"), 1.496e11, rel_tol=0.05)
+
+def test_parametros_invalidos():
+    with pytest.raises(ValueError):
+        Conjunto(_sol_tierra(), [], dt=0.0, tiempo_total=1.0)
@@ -0,0 +1,193 @@
+import math
+import random
+import pytest
+from src.celeste.cli import main
+from src.celeste.encuentros import EventoEncuentro, MonitorEncuentros
+from src.celeste.simulador import Simulador
+from src.celeste.vector3d import Vector3D
+
+DIA = 86400.0
+
+def _requiere_numpy(motor):
+    if motor == "numpy":
+        pytest.importorskip("numpy")
+
+def _anillo(motor, n=120, semilla=0):
+    """Sol, Júpiter y partículas en órbitas cercanas a la de Júpiter."""
+    rng = random.Random(semilla)
+    sim = Simulador(motor=motor, integrador="leapfrog", imprimir_pasos=False)
+    sim.agregar_cuerpo("Sol", 1.989e30, Vector3D(0, 0, 0), Vector3D(0, 0, 0))
+    a = 7.785e11
+    sim.agregar_cuerpo("Jupiter", 1.898e27, Vector3D(a, 0, 0), Vector3D(0, (sim.G * 1.989e30 / a) ** 0.5, 0))
+    for k in range(n):
+        r = rng.uniform(0.95, 1.05) * a
+        angulo = rng.uniform(-0.3, 0.3)
+        v = (sim.G * 1.989e30 / r) ** 0.5
+        sim._insertar_cuerpo(f"A{k}", 0.0, Vector3D(r * math.cos(angulo), r * math.sin(angulo), rng.gauss(0, 5e9)),
+                             Vector3D(-v * math.sin(angulo), v * math.cos(angulo), 0))
+    return sim
+
+def _encuentros_todos_los_pares(sim, factor_hill=1.0):
+    """Encuentros de Hill midiendo todos los pares."""
+    cuerpos = list(sim.cuerpos.values())
+    sol = max(cuerpos, key=lambda c: c.masa)
+    radios = [0.0 if c is sol else
+              factor_hill * (c.posicion - sol.posicion).magnitude() * (c.masa / (3 * sol.masa)) ** (1 / 3)
+              for c in cuerpos]
+    pares = set()
+    for i in range(len(cuerpos)):
+        for j in range(i + 1, len(cuerpos)):
+            if (cuerpos[i].posicion - cuerpos[j].posicion).magnitude() < max(radios[i], radios[j]):
+                pares.add(tuple(sorted((cuerpos[i].id, cuerpos[j].id))))
+    return pares
+
+def _dos_cuerpos(motor):
+    sim = Simulador(motor=motor, imprimir_pasos=False)
+    sim.agregar_cuerpo("A", 1.0, Vector3D(0, 0, 0), Vector3D(0, 0, 0))
+    sim.agregar_cuerpo("B", 1.0, Vector3D(10.0, 0, 0), Vector3D(0, 0, 0))
+    sim.agregar_cuerpo("C", 1.0, Vector3D(0, 50.0, 0), Vector3D(0, 0, 0))
+    return sim
+
+@pytest.mark.parametrize("motor", ["python", "numpy"])
+def test_eventos_de_inicio_y_fin_con_radio_fijo(motor):
+    _requiere_numpy(motor)
+    sim = _dos_cuerpos(motor)
+    monitor = MonitorEncuentros(radio=3.0)
+    # B atraviesa la zona de encuentro de A: x = 10, 5, 2, -1, -4
+    eventos = []
+    for paso, x in enumerate((10.0, 5.0, 2.0, -1.0, -4.0)):
+        sim.cuerpos["B"].posicion = Vector3D(x, 0, 0)
+        eventos.append(monitor.actualizar(sim, tiempo=float(paso), paso=paso))
+    assert [len(e) for e in eventos] == [0, 0, 1, 0, 1]
+    inicio, fin = eventos[2][0], eventos[4][0]
+    assert (inicio.tipo, inicio.id_a, inicio.id_b, inicio.paso) == ("inicio", "A", "B", 2)
+    assert inicio.distancia == pytest.approx(2.0)
+    assert (fin.tipo, fin.paso, fin.distancia) == ("fin", 4, pytest.approx(4.0))
+    assert monitor.eventos == [inicio, fin] and not monitor.activos
+    assert isinstance(inicio, EventoEncuentro)
+
+@pytest.mark.parametrize("motor", ["python", "numpy"])
+def test_encuentros_de_hill_iguales_que_todos_los_pares(motor):
+    _requiere_numpy(motor)
+    sim = _anillo(motor)
+    monitor = MonitorEncuentros()
+    sim.agregar_observador(monitor)
+    for paso in range(200):
+        sim.paso_simulacion(5 * DIA, paso * 5 * DIA)
+        if paso % 20 == 0:
+            assert set(monitor.activos) == _encuentros_todos_los_pares(sim)
+    inicios = sum(e.tipo == "inicio" for e in monitor.eventos)
+    assert inicios > 0
+    assert inicios - sum(e.tipo == "fin" for e in monitor.eventos) == len(monitor.activos)
+    # La lista solo se reconstruye cuando los cuerpos se han movido lo suficiente
+    assert monitor.reconstrucciones < 200
+
+def test_motores_dan_los_mismos_eventos():
+    pytest.importorskip("numpy")
+    eventos = {}
+    for motor in ("python", "numpy"):
+        sim = _anillo(motor, n=60, semilla=3)
+        monitor = MonitorEncuentros(factor_hill=2.0)
+        sim.agregar_observador(monitor)
+        for paso in range(100):
+            sim.paso_simulacion(5 * DIA, paso * 5 * DIA)
+        eventos[motor] = [(e.tipo, e.paso, e.id_a, e.id_b) for e in monitor.eventos]
+    assert eventos["python"] == eventos["numpy"]
+    assert eventos["python"]
+
+def test_lista_no_se_reconstruye_si_nadie_se_mueve():
+    sim = _dos_cuerpos("python")
+    monitor = MonitorEncuentros(radio=12.0)
+    for paso in range(10):
+        monitor.actualizar(sim, paso=paso)
+    assert monitor.reconstrucciones == 1
+    assert monitor.pares_lista == 1
+    # Un desplazamiento menor que la mitad de la piel (6 m) tampoco la reconstruye
+    sim.cuerpos["C"].posicion = Vector3D(0, 48.0, 0)
+    monitor.actualizar(sim)
+    assert monitor.reconstrucciones == 1
+    sim.cuerpos["C"].posicion = Vector3D(0, 20.0, 0)
+    monitor.actualizar(sim)
+    assert monitor.reconstrucciones == 2
+
+@pytest.mark.parametrize("motor", ["python", "numpy"])
+def test_cercanos(motor):
+    _requiere_numpy(motor)
+    sim = _anillo(motor, n=80, semilla=1)
+    monitor = MonitorEncuentros()
+    for paso in range(30):
+        sim.paso_simulacion(5 * DIA, paso * 5 * DIA)
+        monitor.actualizar(sim)
+    jupiter = sim.cuerpos["Jupiter"].posicion
+    # Dentro de la cobertura de la lista de Verlet y más allá (se miran todos los cuerpos)
+    for distancia in (3e10, 3e11):
+        esperados = sorted((id, (c.posicion - jupiter).magnitude()) for id, c in sim.cuerpos.items()
+                           if id != "Jupiter" and (c.posicion - jupiter).magnitude() < distancia)
+        resultado = monitor.cercanos(sim, "Jupiter", distancia)
+        assert sorted(id for id, _ in resultado) == [id for id, _ in esperados]
+        assert [d for _, d in resultado] == sorted(d for _, d in resultado)
+
+def test_baja_de_un_cuerpo_termina_sus_encuentros():
+    sim = _dos_cuerpos("python")
+    monitor = MonitorEncuentros(radio=12.0)
+    assert len(monitor.actualizar(sim)) == 1
+    sim.eliminar_cuerpo("B")
+    fin, = monitor.actualizar(sim, paso=1)
+    assert (fin.tipo, fin.id_a, fin.id_b) == ("fin", "A", "B")
+    assert math.isnan(fin.distancia)
+    # La baja solo quita los pares de B de la lista, sin reconstruirla
+    assert monitor.reconstrucciones == 1 and monitor.pares_lista == 0
+
+@pytest.mark.parametrize("motor", ["python", "numpy"])
+def test_bajas_renumeran_la_lista_sin_reconstruirla(motor):
+    _requiere_numpy(motor)
+    sim = _anillo(motor, n=80, semilla=2)
+    monitor = MonitorEncuentros(factor_hill=3.0)
+    sim.agregar_observador(monitor)
+    for paso in range(40):
+        sim.paso_simulacion(5 * DIA, paso * 5 * DIA)
+    assert monitor.activos
+    # Se eliminan cuerpos en encuentro (el swap-remove mueve la última fila a la suya) y Júpiter
+    bajas = sorted({id for clave in monitor.activos for id in clave} - {"Sol", "Jupiter"})[:3] + ["Jupiter"]
+    reconstrucciones = monitor.reconstrucciones
+    for id in bajas:
+        sim.eliminar_cuerpo(id)
+    fines = monitor.actualizar(sim, paso=40)
+    assert monitor.reconstrucciones == reconstrucciones
+    assert fines and all(e.tipo == "fin" and math.isnan(e.distancia) for e in fines)
+    assert set(monitor.activos) == _encuentros_todos_los_pares(sim, factor_hill=3.0)
+    # Las consultas usan la lista renumerada: mismos vecinos que con una lista nueva
+    for id in list(sim.cuerpos.ids)[-5:]:
+        assert monitor.cercanos(sim, id, 5e9) == MonitorEncuentros(factor_hill=3.0).cercanos(sim, id, 5e9)
+    for paso in range(40, 80):
+        sim.paso_simulacion(5 * DIA, paso * 5 * DIA)
+        if paso % 10 == 0:
+            assert set(monitor.activos) == _encuentros_todos_los_pares(sim, factor_hill=3.0)
+    # Un cuerpo nuevo sí obliga a reconstruir la lista
+    reconstrucciones = monitor.reconstrucciones
+    sim.agregar_cuerpo("Nuevo", 1e20, Vector3D(7.785e11, 1e9, 0), Vector3D(0, 1.3e4, 0))
+    monitor.actualizar(sim, paso=80)
+    assert monitor.reconstrucciones == reconstrucciones + 1
+
+@pytest.mark.parametrize("opciones, mensaje", [
+    ({"radio": 0.0}, "radio de encuentro"),
+    ({"factor_hill": -1.0}, "factor de Hill"),
+    ({"piel": 0.0}, "piel"),
+])
+def test_parametros_invalidos(opciones, mensaje):
+    with pytest.raises(ValueError, match=mensaje):
+        MonitorEncuentros(**opciones)
+
+@pytest.mark.parametrize("radio", [[], ["--radio-encuentro", "1e9"]])
+def test_cli_encuentros(tmp_path, capsys, radio):
+    sim = Simulador(imprimir_pasos=False)
+    sim.agregar_cuerpo("Sol", 1.989e30, Vector3D(0, 0, 0), Vector3D(0, 0, 0))
+    sim.agregar_cuerpo("Tierra", 5.972e24, Vector3D(1.496e11, 0, 0), Vector3D(0, 2.978e4, 0))
+    sim.agregar_cuerpo("Luna", 7.348e22, Vector3D(1.496e11 + 3.844e8, 0, 0), Vector3D(0, 2.978e4 + 1.022e3, 0))
+    sim.agregar_cuerpo("Marte", 6.39e23, Vector3D(2.279e11, 0, 0), Vector3D(0, 2.407e4, 0))
+    sim.guardar(str(tmp_path / "sistema.json"))
+    capsys.readouterr()
+    assert main([str(tmp_path / "sistema.json"), "--dt", "3600", "--tiempo-total", "36000",
+                 "--integrador", "leapfrog", "--encuentros"] + radio) == 0
+    # La Luna está dentro de la esfera de Hill de la Tierra (y a menos de 1e9 m)
+    assert "Encuentros: 1 (en curso al final: 1)" in capsys.readouterr().out
@@ -0,0 +1,122 @@
+import pytest
+np = pytest.importorskip("numpy")
+from src.celeste.cli import main
+from src.celeste.fmm import SolverFMM, _multi_indices, derivadas_inverso
+from src.celeste.nucleos import aceleraciones_y_potencial_directas
+from src.celeste.simulador import Simulador
+from src.celeste.suavizado import crear_suavizado
+from src.celeste.vector3d import Vector3D
+
+def _nube(n, semilla=0):
+    rng = np.random.default_rng(semilla)
+    return rng.uniform(0.5, 1.5, n), rng.normal(size=(n, 3))
+
+def test_derivadas_inverso_frente_a_diferencias_finitas():
+    r = np.array([[0.7, -0.4, 1.1], [2.0, 0.3, -0.5]])
+    derivadas = derivadas_inverso(r, 4)
+    lista, indice, _ = _multi_indices(4)
+    assert derivadas[0] == pytest.approx(1.0 / np.linalg.norm(r, axis=1))
+    h = 1e-4
+    # Cada derivada de grado g + 1 es la derivada numérica de una de grado g
+    for k, a in enumerate(lista):
+        if sum(a) == 4:
+            continue
+        for eje in range(3):
+            paso = np.zeros(3)
+            paso[eje] = h
+            numerica = (derivadas_inverso(r + paso, 4)[k] - derivadas_inverso(r - paso, 4)[k]) / (2 * h)
+            mayor = tuple(c + (i == eje) for i, c in enumerate(a))
+            assert derivadas[indice[mayor]] == pytest.approx(numerica, rel=1e-5, abs=1e-8)
+
+def test_error_decrece_con_el_orden():
+    masas, posiciones = _nube(3000, semilla=1)
+    errores = [SolverFMM(orden, theta=0.5, hoja_max=16).comparar_con_directo(masas, posiciones, 1.0,
+                                                                            muestra=300)["p99"]
+               for orden in (1, 3, 5)]
+    assert errores[0] > errores[1] > errores[2]
+    assert errores[1] < 1e-2
+
+def test_orden_alto_cerca_de_directo():
+    masas, posiciones = _nube(800, semilla=2)
+    solver = SolverFMM(orden=8, theta=0.4, hoja_max=16)
+    # Todos los pares lejanos por M2L, aunque la suma directa fuera más barata
+    solver.FACTOR_COSTE_M2L = 0.0
+    aceleraciones, potencial = solver.aceleraciones_y_potencial(masas, posiciones, 1.0)
+    exactas, potencial_exacto = aceleraciones_y_potencial_directas(masas, posiciones, 1.0)
+    assert solver.pares_m2l > 0
+    errores = np.linalg.norm(aceleraciones - exactas, axis=1) / np.linalg.norm(exactas, axis=1)
+    # Cota del error de truncamiento: theta^(p+1) = 0.4^9 ~ 2.6e-4
+    assert errores.max() < 2.6e-4
+    assert np.median(errores) < 1e-6
+    assert potencial == pytest.approx(potencial_exacto, rel=1e-8)
+
+def test_comparar_informe():
+    masas, posiciones = _nube(300)
+    informe = SolverFMM(orden=3).comparar_con_directo(masas, posiciones, 1.0, muestra=None)
+    assert set(informe) == {"orden", "theta", "max", "mediana", "p99", "rms"}
+    assert 0.0 <= informe["mediana"] <= informe["p99"] <= informe["max"]
+
+def test_suavizado_en_los_pares_directos():
+    masas, posiciones = _nube(500, semilla=4)
+    suavizado = crear_suavizado("plummer", 0.05)
+    aproximadas = SolverFMM(orden=6, theta=0.3, hoja_max=8, suavizado=suavizado).aceleraciones(masas, posiciones, 1.0)
+    exactas, _ = aceleraciones_y_potencial_directas(masas, posiciones, 1.0, suavizado=suavizado)
+    assert np.allclose(aproximadas, exactas, rtol=1e-3, atol=1e-3 * np.abs(exactas).max())
+
+def test_casos_limite():
+    solver = SolverFMM()
+    assert solver.aceleraciones(np.ones(1), np.zeros((1, 3)), 1.0).tolist() == [[0.0, 0.0, 0.0]]
+    # Cuerpos coincidentes: un único nodo hoja, ninguna fuerza entre ellos y energía -inf
+    aceleraciones, potencial = solver.aceleraciones_y_potencial(np.ones(5), np.zeros((5, 3)), 1.0)
+    assert not aceleraciones.any() and potencial == float('-inf')
+
+def test_potencial_cuerpos_coincidentes_como_directo():
+    masas, posiciones = _nube(300, semilla=6)
+    posiciones[42] = posiciones[17]
+    exactas, potencial_exacto = aceleraciones_y_potencial_directas(masas, posiciones, 1.0)
+    aceleraciones, potencial = SolverFMM(orden=6, theta=0.3, hoja_max=8).aceleraciones_y_potencial(
+        masas, posiciones, 1.0)
+    assert potencial == potencial_exacto == float('-inf')
+    assert np.allclose(aceleraciones, exactas, rtol=1e-3, atol=1e-3 * np.abs(exactas).max())
+    # Con suavizado el par coincidente tiene energía finita, como en la suma directa
+    suavizado = crear_suavizado("plummer", 0.05)
+    _, potencial_exacto = aceleraciones_y_potencial_directas(masas, posiciones, 1.0, suavizado=suavizado)
+    potencial = SolverFMM(orden=6, theta=0.3, hoja_max=8, suavizado=suavizado).aceleraciones_y_potencial(
+        masas, posiciones, 1.0)[1]
+    assert potencial == pytest.approx(potencial_exacto, rel=1e-4)
+
+@pytest.mark.parametrize("opciones, mensaje", [
+    ({"orden": 0}, "orden de la expansión"),
+    ({"orden": 9}, "orden de la expansión"),
+    ({"theta": 0.0}, "theta"),
+    ({"theta": 1.0}, "theta"),
+    ({"hoja_max": 0}, "hoja_max"),
+])
+def test_parametros_invalidos(opciones, mensaje):
+    with pytest.raises(ValueError, match=mensaje):
+        SolverFMM(**opciones)
+
+def test_simulador_fmm_calcula_fuerzas():
+    sim = Simulador(motor="numpy", solver="fmm")
+    assert isinstance(sim.solver, SolverFMM)
+    sim.agregar_cuerpo("Tierra", 5.972e24, Vector3D(0, 0, 0), Vector3D(0, 0, 0))
+    sim.agregar_cuerpo("Luna", 7.348e22, Vector3D(3.844e8, 0, 0), Vector3D(0, 1.022e3, 0))
+    sim.calcular_fuerzas()
+    fuerza = sim.G * 5.972e24 * 7.348e22 / 3.844e8 ** 2
+    assert sim.cuerpos["Tierra"].fuerza_neta.x == pytest.approx(fuerza)
+    assert sim.cuerpos["Luna"].fuerza_neta.x == pytest.approx(-fuerza)
+
+def test_cli_fmm(tmp_path):
+    sim = Simulador(imprimir_pasos=False)
+    sim.agregar_cuerpo("Sol", 1.989e30, Vector3D(0, 0, 0), Vector3D(0, 0, 0))
+    sim.agregar_cuerpo("Tierra", 5.972e24, Vector3D(1.496e11, 0, 0), Vector3D(0, 2.978e4, 0))
+    sim.agregar_cuerpo("Marte", 6.39e23, Vector3D(2.279e11, 0, 0), Vector3D(0, 2.407e4, 0))
+    sim.guardar(str(tmp_path / "sistema.json"))
+    for solver, opciones in (("directo", []), ("fmm", ["--orden", "6", "--theta", "0.4"])):
+        main([str(tmp_path / "sistema.json"), "--dt", "3600", "--tiempo-total", "36000", "--solver", solver,
+              "--salida", str(tmp_path / f"{solver}.json")] + opciones)
+    directo, fmm = Simulador(imprimir_pasos=False), Simulador(imprimir_pasos=False)
+    directo.cargar(str(tmp_path / "directo.json"))
+    fmm.cargar(str(tmp_path / "fmm.json"))
+    for id, cuerpo in directo.cuerpos.items():
+        assert (fmm.cuerpos[id].posicion - cuerpo.posicion).magnitude() < 1e-6 * cuerpo.posicion.magnitude() + 1.0
@@ -0,0 +1,68 @@
+import math
+import random
+import pytest
+from src.celeste.simulador import Simulador
+from src.celeste.vector3d import Vector3D
+from src.celeste.instantanea import guardar_instantanea, leer_instantanea, COLUMNAS
+
+def _sistema(motor, n=100, semilla=0):
+    rng = random.Random(semilla)
+    sim = Simulador(motor=motor, imprimir_pasos=False)
+    for i in range(n):
+        sim._insertar_cuerpo(f"Cuerpo-{i}-ñ", rng.uniform(1e20, 1e25),
+                             Vector3D(rng.gauss(0, 1e11), rng.gauss(0, 1e11), rng.gauss(0, 1e11)),
+                             Vector3D(rng.gauss(0, 1e4), rng.gauss(0, 1e4), rng.gauss(0, 1e4)),
+                             rng.choice([0.0, rng.uniform(1e3, 1e7)]))
+    return sim
+
+def _estado(sim):
+    return [(c.id, c.masa, c.posicion.to_list(), c.velocidad.to_list(), c.radio) for c in sim.cuerpos.values()]
+
+@pytest.mark.parametrize("extension", [".cel", ".celz"])
+@pytest.mark.parametrize("motor_origen", Simulador.MOTORES)
+@pytest.mark.parametrize("motor_destino", Simulador.MOTORES)
+def test_ida_y_vuelta_exacta(extension, motor_origen, motor_destino, tmp_path):
+    if "numpy" in (motor_origen, motor_destino):
+        pytest.importorskip("numpy")
+    original = _sistema(motor_origen)
+    archivo = str(tmp_path / f"estado{extension}")
+    original.guardar(archivo)
+    cargado = Simulador(motor=motor_destino, imprimir_pasos=False)
+    cargado.cargar(archivo)
+    assert _estado(cargado) == _estado(original)
+
+def test_mucho_menor_que_json(tmp_path):
+    sim = _sistema("python", n=500)
+    for extension in (".json", ".cel", ".celz"):
+        sim.guardar(str(tmp_path / f"estado{extension}"))
+    tam_json = (tmp_path / "estado.json").stat().st_size
+    tam_cel = (tmp_path / "estado.cel").stat().st_size
+    assert tam_cel < tam_json / 3
+    assert (tmp_path / "estado.celz").stat().st_size < tam_cel
+
+def test_valores_especiales_y_sistema_vacio(tmp_path):
+    sim = Simulador(imprimir_pasos=False)
+    archivo = str(tmp_path / "vacio.cel")
+    sim.guardar(archivo)
+    ids, columnas = leer_instantanea(archivo)
+    assert ids == [] and len(columnas) == 0
+
+    sim._insertar_cuerpo("A", 5e-324, Vector3D(-0.0, math.inf, 1e308), Vector3D(0.1, 0.2, 0.3))
+    guardar_instantanea(sim, archivo)
+    ids, columnas = leer_instantanea(archivo)
+    assert ids == ["A"] and len(columnas) == len(COLUMNAS)
+    assert columnas[0] == 5e-324 and math.copysign(1.0, columnas[1]) == -1.0 and columnas[2] == math.inf
+
+def test_archivos_no_validos(tmp_path):
+    archivo = tmp_path / "roto.cel"
+    archivo.write_bytes(b"no es una instantanea")
+    with pytest.raises(ValueError):
+        leer_instantanea(str(archivo))
+    sim = _sistema("python", n=10)
+    sim.guardar(str(archivo))
+    archivo.write_bytes(archivo.read_bytes()[:-8])
+    with pytest.raises(ValueError):
+        leer_instantanea(str(archivo))
+    sim._insertar_cuerpo("mal\0id", 1.0, Vector3D(0, 0, 0), Vector3D(0, 0, 0))
+    with pytest.raises(ValueError):
+        sim.guardar(str(tmp_path / "nulo.cel"))
@@ -0,0 +1,78 @@
+import math
+import pytest
+from src.celeste.simulador import Simulador
+from src.celeste.vector3d import Vector3D
+from src.celeste.integradores import Euler, Leapfrog, Yoshida4, RK4, crear_integrador
+
+ANIO = 365.25 * 86400.0
+
+def _sol_tierra(integrador, motor="python"):
+    sim = Simulador(motor=motor, integrador=integrador)
+    sim._insertar_cuerpo("Sol", 1.989e30, Vector3D(0, 0, 0), Vector3D(0, 0, 0))
+    sim._insertar_cuerpo("Tierra", 5.972e24, Vector3D(1.496e11, 0, 0), Vector3D(0, 2.978e4, 0))
+    return sim
+
+def _energia(sim):
+    return sim._calcular_energia_cinetica_total() + sim._calcular_energia_potencial_total()
+
+def _error_energia(integrador, pasos, motor="python"):
+    # Devuelve el máximo error relativo de energía a lo largo de un año y el simulador final
+    sim = _sol_tierra(integrador, motor)
+    e0 = _energia(sim)
+    dt = ANIO / pasos
+    error_max = 0.0
+    for _ in range(pasos):
+        sim.integrador.paso(sim, dt)
+        error_max = max(error_max, abs((_energia(sim) - e0) / e0))
+    return error_max, sim
+
+def test_crear_integrador():
+    assert isinstance(crear_integrador("euler"), Euler)
+    assert isinstance(crear_integrador("leapfrog"), Leapfrog)
+    assert isinstance(crear_integrador("yoshida4"), Yoshida4)
+    assert isinstance(crear_integrador("rk4"), RK4)
+    propio = Leapfrog()
+    assert crear_integrador(propio) is propio
+    with pytest.raises(ValueError, match="Integrador desconocido 'verlet3'"):
+        crear_integrador("verlet3")
+    assert isinstance(Simulador().integrador, Euler)
+
+def test_euler_igual_que_paso_original():
+    sim = _sol_tierra("euler")
+    sim.calcular_fuerzas()
+    tierra = sim.cuerpos["Tierra"]
+    v_esperada = tierra.velocidad + tierra.fuerza_neta / tierra.masa * 3600.0
+    r_esperada = tierra.posicion + v_esperada * 3600.0
+    sim.integrador.paso(sim, 3600.0)
+    assert tierra.velocidad == v_esperada
+    assert tierra.posicion == r_esperada
+
+def test_integradores_superiores_conservan_mejor_la_energia():
+    error_euler, _ = _error_energia("euler", 200)
+    error_leapfrog, _ = _error_energia("leapfrog", 200)
+    error_yoshida, _ = _error_energia("yoshida4", 200)
+    error_rk4, _ = _error_energia("rk4", 200)
+    assert error_leapfrog < error_euler / 10
+    assert error_yoshida < error_leapfrog / 10
+    assert error_rk4 < error_euler / 10
+
+@pytest.mark.parametrize("integrador, orden", [("leapfrog", 2), ("yoshida4", 4), ("rk4", 4)])
+def test_orden_de_convergencia(integrador, orden):
+    # Al reducir dt a la mitad, el error en la posición final debe caer ~2^orden
+    _, referencia = _error_energia("yoshida4", 4000)
+    r_ref = referencia.cuerpos["Tierra"].posicion
+    _, grueso = _error_energia(integrador, 100)
+    _, fino = _error_energia(integrador, 200)
+    e_grueso = (grueso.cuerpos["Tierra"].posicion - r_ref).magnitude()
+    e_fino = (fino.cuerpos["Tierra"].posicion - r_ref).magnitude()
+    assert math.log2(e_grueso / e_fino) == pytest.approx(orden, abs=0.5)
+
+@pytest.mark.parametrize("integrador", ["euler", "leapfrog", "yoshida4", "rk4"])
+def test_motor_numpy_igual_que_motor_python(integrador):
+    pytest.importorskip("numpy")
+    _, sim_py = _error_energia(integrador, 50)
+    _, sim_np = _error_energia(integrador, 50, motor="numpy")
+    for id in ("Sol", "Tierra"):
+        r_py = sim_py.cuerpos[id].posicion
+        r_np = sim_np.cuerpos[id].posicion
+        assert (r_py - r_np).magnitude() <= 1e-9 * max(r_py.magnitude(), 1.0)
@@ -0,0 +1,130 @@
+import pytest
+np = pytest.importorskip("numpy")
+import random
+from src.celeste.simulador import Simulador
+from src.celeste.vector3d import Vector3D
+from src.celeste.nucleos import (SolverDirecto, _sumar_compensado, aceleraciones_directas,
+                                 aceleraciones_y_potencial_directas, energia_potencial_directa)
+from src.celeste.suavizado import crear_suavizado
+
+G_TEST = 6.67430e-11
+
+def _sistema_aleatorio(n, motor, semilla=1):
+    rng = random.Random(semilla)
+    sim = Simulador(motor=motor)
+    for i in range(n):
+        sim._insertar_cuerpo(f"C{i}", rng.uniform(1e20, 1e25),
+                             Vector3D(rng.uniform(-1e11, 1e11), rng.uniform(-1e11, 1e11), rng.uniform(-1e11, 1e11)),
+                             Vector3D(rng.uniform(-1e3, 1e3), rng.uniform(-1e3, 1e3), rng.uniform(-1e3, 1e3)))
+    return sim
+
+@pytest.mark.parametrize("bloque", [1, 7, 512])
+def test_aceleraciones_directas_igual_que_bucle_python(bloque):
+    sim_py = _sistema_aleatorio(40, "python")
+    sim_py.calcular_fuerzas()
+
+    masas = np.array([c.masa for c in sim_py.cuerpos.values()])
+    posiciones = np.array([c.posicion.to_list() for c in sim_py.cuerpos.values()])
+    aceleraciones = aceleraciones_directas(masas, posiciones, G_TEST, bloque=bloque)
+
+    for i, cuerpo in enumerate(sim_py.cuerpos.values()):
+        esperada = np.array(cuerpo.fuerza_neta.to_list()) / cuerpo.masa
+        assert np.allclose(aceleraciones[i], esperada, rtol=1e-10, atol=0)
+
+def test_aceleraciones_directas_ignora_cuerpos_coincidentes():
+    masas = np.array([1.0, 2.0, 3.0])
+    posiciones = np.array([[0.0, 0.0, 0.0], [0.0, 0.0, 0.0], [1.0, 0.0, 0.0]])
+    aceleraciones = aceleraciones_directas(masas, posiciones, 1.0)
+    assert np.all(np.isfinite(aceleraciones))
+    assert aceleraciones[0, 0] == pytest.approx(3.0)
+    assert aceleraciones[2, 0] == pytest.approx(-3.0)
+
+def test_energia_potencial_directa_igual_que_bucle_python():
+    sim_py = _sistema_aleatorio(30, "python")
+    masas = np.array([c.masa for c in sim_py.cuerpos.values()])
+    posiciones = np.array([c.posicion.to_list() for c in sim_py.cuerpos.values()])
+    esperada = sim_py._calcular_energia_potencial_total()
+    assert energia_potencial_directa(masas, posiciones, G_TEST, bloque=8) == pytest.approx(esperada, rel=1e-12)
+
+    posiciones[1] = posiciones[0]
+    assert energia_potencial_directa(masas, posiciones, G_TEST) == float('-inf')
+
+def test_motor_numpy_paso_igual_que_motor_python(capsys):
+    sim_py = _sistema_aleatorio(25, "python")
+    sim_np = _sistema_aleatorio(25, "numpy")
+    for paso in range(3):
+        sim_py.paso_simulacion(3600.0, paso * 3600.0)
+        sim_np.paso_simulacion(3600.0, paso * 3600.0)
+
+    for id, cuerpo in sim_py.cuerpos.items():
+        otro = sim_np.cuerpos[id]
+        assert np.allclose(otro.posicion.to_list(), cuerpo.posicion.to_list(), rtol=1e-12)
+        assert np.allclose(otro.velocidad.to_list(), cuerpo.velocidad.to_list(), rtol=1e-9)
+    assert sim_np._calcular_energia_cinetica_total() == pytest.approx(sim_py._calcular_energia_cinetica_total(), rel=1e-9)
+    assert sim_np._calcular_energia_potencial_total() == pytest.approx(sim_py._calcular_energia_potencial_total(), rel=1e-9)
+
+def _errores(aproximadas, exactas):
+    return np.linalg.norm(aproximadas - exactas, axis=1) / np.linalg.norm(exactas, axis=1)
+
+@pytest.mark.parametrize("bloque", [64, 256])
+def test_precision_simple_dentro_del_presupuesto_de_error(bloque):
+    rng = np.random.default_rng(3)
+    masas = rng.uniform(1e20, 1e24, 1000)
+    # Nube lejos del origen: las diferencias se restan en float64 antes de pasar a float32
+    posiciones = rng.normal(scale=1e11, size=(1000, 3)) + np.array([3e13, -2e13, 1e13])
+    exactas, potencial = aceleraciones_y_potencial_directas(masas, posiciones, G_TEST, bloque)
+    simples, potencial_simple = aceleraciones_y_potencial_directas(masas, posiciones, G_TEST, bloque,
+                                                                   precision="float32")
+    assert simples.dtype == np.float64
+    errores = _errores(simples, exactas)
+    assert errores.max() < 5e-6
+    assert np.median(errores) < 2e-7
+    assert potencial_simple == pytest.approx(potencial, rel=1e-6)
+
+def test_precision_simple_sistema_planetario():
+    masas = np.array([1.989e30, 5.972e24, 7.348e22])
+    posiciones = np.array([[0.0, 0.0, 0.0], [1.496e11, 0.0, 0.0], [1.496e11 + 3.844e8, 1e5, 0.0]])
+    exactas = aceleraciones_directas(masas, posiciones, G_TEST)
+    simples = aceleraciones_directas(masas, posiciones, G_TEST, precision="float32")
+    assert _errores(simples, exactas).max() < 1e-6
+    # La aceleración relativa Tierra-Luna, que domina su órbita, también se conserva
+    relativa = exactas[2] - exactas[1]
+    assert np.linalg.norm(simples[2] - simples[1] - relativa) < 1e-6 * np.linalg.norm(relativa)
+
+def test_precision_simple_con_suavizado_y_coincidentes():
+    rng = np.random.default_rng(4)
+    masas = rng.uniform(1.0, 2.0, 300)
+    posiciones = rng.normal(size=(300, 3)) * 1e9
+    suavizado = crear_suavizado("spline", 5e7)
+    exactas, potencial = aceleraciones_y_potencial_directas(masas, posiciones, 1.0, suavizado=suavizado)
+    simples, potencial_simple = aceleraciones_y_potencial_directas(masas, posiciones, 1.0, suavizado=suavizado,
+                                                                   precision="float32")
+    assert _errores(simples, exactas).max() < 1e-5
+    assert potencial_simple == pytest.approx(potencial, rel=1e-6)
+    posiciones[1] = posiciones[0]
+    simples, potencial_simple = aceleraciones_y_potencial_directas(masas, posiciones, 1.0, precision="float32")
+    assert potencial_simple == float('-inf')
+    assert np.isfinite(simples).all()
+
+def test_suma_compensada():
+    suma = np.ones(1, dtype=np.float32)
+    compensacion = np.zeros(1, dtype=np.float32)
+    sin_compensar = np.ones(1, dtype=np.float32)
+    for _ in range(10000):
+        _sumar_compensado(suma, compensacion, np.full(1, 1e-4, dtype=np.float32))
+        sin_compensar += np.float32(1e-4)
+    assert abs(float(suma[0]) - 2.0) < 1e-6
+    assert abs(float(sin_compensar[0]) - 2.0) > 1e-5
+
+def test_solver_directo_precision():
+    with pytest.raises(ValueError, match="Precisión desconocida"):
+        SolverDirecto(precision="float16")
+    sim = _sistema_aleatorio(30, "numpy")
+    simple = _sistema_aleatorio(30, "numpy")
+    simple.solver = SolverDirecto(precision="float32")
+    for paso in range(5):
+        sim.paso_simulacion(3600.0, paso * 3600.0)
+        simple.paso_simulacion(3600.0, paso * 3600.0)
+    for id, cuerpo in sim.cuerpos.items():
+        desplazamiento = (cuerpo.posicion - simple.cuerpos[id].posicion).magnitude()
+        assert desplazamiento < 1e-6 * cuerpo.velocidad.magnitude() * 5 * 3600.0
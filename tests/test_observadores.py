@@ -0,0 +1,108 @@
+import pytest
+from src.celeste.simulador import Simulador
+from src.celeste.vector3d import Vector3D
+from src.celeste.observadores import Diagnostico, ObservadorConsola, RegistroEnergia
+
+def _tierra_luna(**kwargs):
+    sim = Simulador(**kwargs)
+    sim.agregar_cuerpo("Tierra", 5.972e24, Vector3D(0, 0, 0), Vector3D(0, 0, 0))
+    sim.agregar_cuerpo("Luna", 7.348e22, Vector3D(3.844e8, 0, 0), Vector3D(0, 1.022e3, 0))
+    return sim
+
+def _contar_recorridos(sim, monkeypatch):
+    contador = {"recorridos": 0}
+    original = sim._calcular_fuerzas_python
+    def contar():
+        contador["recorridos"] += 1
+        return original()
+    monkeypatch.setattr(sim, "_calcular_fuerzas_python", contar)
+    return contador
+
+def test_sin_observadores_no_imprime_ni_calcula_diagnosticos(capsys, monkeypatch):
+    sim = _tierra_luna(imprimir_pasos=False)
+    capsys.readouterr()
+    def no_llamar():
+        raise AssertionError("No debería calcularse la energía potencial")
+    monkeypatch.setattr(sim, "_energia_potencial_actual", no_llamar)
+    for paso in range(5):
+        sim.paso_simulacion(100.0, paso * 100.0)
+    assert capsys.readouterr().out == ""
+    assert sim.pasos_realizados == 5
+
+def test_observador_con_intervalo():
+    sim = _tierra_luna(imprimir_pasos=False)
+    registro = RegistroEnergia()
+    sim.agregar_observador(registro, intervalo=10)
+    for paso in range(25):
+        sim.paso_simulacion(100.0, paso * 100.0)
+    assert registro.pasos == [0, 10, 20]
+    assert registro.tiempos == [100.0, 1100.0, 2100.0]
+    assert len(registro.energia_potencial) == 3
+    assert registro.error_relativo_energia() < 1e-6
+
+def test_diagnostico_perezoso(monkeypatch):
+    sim = _tierra_luna(imprimir_pasos=False)
+    momentos = []
+    sim.agregar_observador(lambda diag: momentos.append(diag.momento_lineal))
+    def no_llamar():
+        raise AssertionError("No debería calcularse la energía potencial")
+    monkeypatch.setattr(sim, "_energia_potencial_actual", no_llamar)
+    sim.paso_simulacion(100.0, 0.0)
+    assert len(momentos) == 1
+
+def test_diagnostico_compartido_entre_observadores(monkeypatch):
+    sim = _tierra_luna(imprimir_pasos=False)
+    llamadas = []
+    original = sim._energia_potencial_actual
+    def contar():
+        llamadas.append(1)
+        return original()
+    monkeypatch.setattr(sim, "_energia_potencial_actual", contar)
+    sim.agregar_observador(RegistroEnergia())
+    sim.agregar_observador(RegistroEnergia())
+    sim.paso_simulacion(100.0, 0.0)
+    assert len(llamadas) == 1
+
+def test_diagnostico_reutiliza_recorrido_de_fuerzas(monkeypatch):
+    # Con Euler, las fuerzas calculadas para el diagnóstico del final de un paso
+    # son las del principio del siguiente: un recorrido de pares por paso (más uno)
+    sim = _tierra_luna(imprimir_pasos=False)
+    sim.agregar_observador(RegistroEnergia())
+    contador = _contar_recorridos(sim, monkeypatch)
+    for paso in range(10):
+        sim.paso_simulacion(100.0, paso * 100.0)
+    assert contador["recorridos"] == 11
+
+def test_leapfrog_una_evaluacion_por_paso(monkeypatch):
+    sim = _tierra_luna(imprimir_pasos=False, integrador="leapfrog")
+    contador = _contar_recorridos(sim, monkeypatch)
+    for paso in range(10):
+        sim.paso_simulacion(100.0, paso * 100.0)
+    assert contador["recorridos"] == 11
+
+def test_energia_potencial_igual_que_por_pares():
+    sim = _tierra_luna(imprimir_pasos=False)
+    tierra, luna = sim.cuerpos["Tierra"], sim.cuerpos["Luna"]
+    assert sim._calcular_energia_potencial_total() == tierra.energia_potencial_con(luna, sim.G)
+    # Tras mover un cuerpo la caché deja de ser válida
+    luna.posicion = Vector3D(1e8, 0, 0)
+    assert sim._calcular_energia_potencial_total() == tierra.energia_potencial_con(luna, sim.G)
+
+def test_observador_consola(capsys):
+    sim = _tierra_luna(imprimir_pasos=False)
+    ObservadorConsola()(Diagnostico(sim, 0, 12.5))
+    salida = capsys.readouterr().out
+    assert "Paso t = 12.50 s:" in salida
+    assert "Energía Cinética Total:" in salida
+    assert "Energía Potencial Total:" in salida
+    assert "Momento Lineal Total:" in salida
+
+def test_agregar_quitar_observador():
+    sim = Simulador()
+    assert len(sim.observadores) == 1
+    registro = RegistroEnergia()
+    sim.agregar_observador(registro, intervalo=5)
+    sim.quitar_observador(registro)
+    assert len(sim.observadores) == 1
+    with pytest.raises(ValueError, match="al menos 1"):
+        sim.agregar_observador(registro, intervalo=0)
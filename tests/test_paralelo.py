@@ -0,0 +1,58 @@
+import copy
+import pytest
+np = pytest.importorskip("numpy")
+from src.celeste.simulador import Simulador
+from src.celeste.vector3d import Vector3D
+from src.celeste.nucleos import aceleraciones_y_potencial_directas, aceleraciones_y_potencial_filas
+from src.celeste.paralelo import SolverParalelo
+
+G = 6.67430e-11
+
+def _nube(n, semilla=0):
+    rng = np.random.default_rng(semilla)
+    return rng.uniform(1e20, 1e24, n), rng.normal(scale=1e11, size=(n, 3))
+
+def test_filas_suman_la_suma_directa():
+    masas, posiciones = _nube(300)
+    esperadas, u_esperada = aceleraciones_y_potencial_directas(masas, posiciones, G)
+    x, y, z = (np.ascontiguousarray(posiciones[:, k]) for k in range(3))
+    a1, u1 = aceleraciones_y_potencial_filas(masas, x, y, z, G, 0, 120, bloque=64)
+    a2, u2 = aceleraciones_y_potencial_filas(masas, x, y, z, G, 120, 300, bloque=64)
+    np.testing.assert_allclose(np.vstack([a1, a2]), esperadas, rtol=1e-10)
+    assert u1 + u2 == pytest.approx(u_esperada, rel=1e-12)
+
+def test_resultado_independiente_del_numero_de_hilos():
+    masas, posiciones = _nube(1000)
+    referencia = SolverParalelo(hilos=1, bloque=128).aceleraciones_y_potencial(masas, posiciones, G)
+    for hilos in (2, 3, 8):
+        solver = SolverParalelo(hilos=hilos, bloque=128)
+        aceleraciones, potencial = solver.aceleraciones_y_potencial(masas, posiciones, G)
+        solver.cerrar()
+        assert np.array_equal(aceleraciones, referencia[0])
+        assert potencial == referencia[1]
+
+def test_colision_da_potencial_infinito():
+    masas, posiciones = _nube(10)
+    posiciones[7] = posiciones[2]
+    aceleraciones, potencial = SolverParalelo(hilos=2, bloque=4).aceleraciones_y_potencial(masas, posiciones, G)
+    assert potencial == float('-inf')
+    assert np.all(np.isfinite(aceleraciones))
+
+def test_simulador_con_solver_paralelo():
+    sims = []
+    for solver in ("directo", SolverParalelo(hilos=4, bloque=2)):
+        sim = Simulador(motor="numpy", solver=solver, imprimir_pasos=False)
+        sim.agregar_cuerpo("Sol", 1.989e30, Vector3D(0, 0, 0), Vector3D(0, 0, 0))
+        sim.agregar_cuerpo("Tierra", 5.972e24, Vector3D(1.496e11, 0, 0), Vector3D(0, 2.978e4, 0))
+        sim.agregar_cuerpo("Marte", 6.39e23, Vector3D(2.279e11, 0, 0), Vector3D(0, 2.407e4, 0))
+        for paso in range(10):
+            sim.paso_simulacion(3600.0, paso * 3600.0)
+        sims.append(sim)
+    for id in ("Tierra", "Marte"):
+        a, b = sims[0].obtener_cuerpo(id).posicion, sims[1].obtener_cuerpo(id).posicion
+        assert (a - b).magnitude() < 1e-6 * a.magnitude()
+    assert sims[1]._energia_potencial_actual() == pytest.approx(sims[0]._energia_potencial_actual(), rel=1e-12)
+    # El solver se puede copiar (puntos de control) aunque ya tenga hilos creados
+    copia = copy.deepcopy(sims[1].solver)
+    assert copia._ejecutor is None and copia.hilos == 4
+    assert isinstance(Simulador(motor="numpy", solver="paralelo").solver, SolverParalelo)
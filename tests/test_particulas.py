@@ -0,0 +1,108 @@
+import pytest
+from src.celeste.cuerpo import CuerpoCeleste, ParticulaPrueba
+from src.celeste.puntos_control import capturar_estado, restaurar_estado
+from src.celeste.simulador import Simulador
+from src.celeste.vector3d import Vector3D
+
+MASA_SOL = 1.989e30
+UA = 1.496e11
+
+def _motor(motor):
+    if motor == "numpy":
+        pytest.importorskip("numpy")
+    return motor
+
+def _sistema(motor, masa_particulas=0.0, **opciones):
+    sim = Simulador(motor=motor, imprimir_pasos=False, **opciones)
+    sim.agregar_cuerpos(["Sol", "Jupiter"], [MASA_SOL, 1.898e27],
+                        [[0.0, 0.0, 0.0], [5.2 * UA, 0.0, 0.0]], [[0.0, 0.0, 0.0], [0.0, 1.3e4, 0.0]])
+    ids = [f"T{k}" for k in range(5)]
+    posiciones = [[(1.0 + 0.5 * k) * UA, 0.3 * k * UA, 0.0] for k in range(5)]
+    velocidades = [[0.0, 3e4 / (1.0 + 0.5 * k) ** 0.5, 0.0] for k in range(5)]
+    if masa_particulas:
+        sim.agregar_cuerpos(ids, [masa_particulas] * 5, posiciones, velocidades)
+    else:
+        sim.agregar_particulas(ids, posiciones, velocidades)
+    return sim
+
+def test_particula_prueba():
+    p = ParticulaPrueba("T", Vector3D(1, 0, 0), Vector3D(0, 1, 0))
+    assert p.sin_masa and p.masa == 0.0
+    assert p.energia_potencial_con(CuerpoCeleste("A", 1e20, Vector3D(0, 0, 0), Vector3D(0, 0, 0)), Simulador.G) == 0.0
+    with pytest.raises(ValueError):
+        p.aplicar_fuerza(Vector3D(1, 0, 0), 1.0)
+    p.aceleracion = Vector3D(2, 0, 0)
+    p.acelerar(0.5)
+    assert p.velocidad == Vector3D(1, 1, 0)
+    assert isinstance(CuerpoCeleste.from_dict(p.to_dict()), ParticulaPrueba)
+
+def test_agregar_cuerpo_sigue_rechazando_masa_cero(capsys):
+    sim = Simulador(imprimir_pasos=False)
+    sim.agregar_cuerpo("A", 0.0, Vector3D(0, 0, 0), Vector3D(0, 0, 0))
+    assert "A" not in sim.cuerpos
+    sim.agregar_particula("T", Vector3D(0, 0, 0), Vector3D(0, 0, 0))
+    assert sim.cuerpos["T"].sin_masa
+    assert "Partícula de prueba 'T' agregada exitosamente." in capsys.readouterr().out
+
+@pytest.mark.parametrize("motor", Simulador.MOTORES)
+@pytest.mark.parametrize("integrador", ["euler", "leapfrog", "rk4"])
+def test_particulas_no_perturban_y_siguen_a_una_masa_despreciable(motor, integrador):
+    motor = _motor(motor)
+    sim = _sistema(motor, integrador=integrador)
+    referencia = _sistema(motor, masa_particulas=1e-10, integrador=integrador)
+    solo_masivos = Simulador(motor=motor, imprimir_pasos=False, integrador=integrador)
+    solo_masivos.agregar_cuerpos(["Sol", "Jupiter"], [MASA_SOL, 1.898e27],
+                                 [[0.0, 0.0, 0.0], [5.2 * UA, 0.0, 0.0]],
+                                 [[0.0, 0.0, 0.0], [0.0, 1.3e4, 0.0]])
+    for paso in range(20):
+        for s in (sim, referencia, solo_masivos):
+            s.paso_simulacion(86400.0, paso * 86400.0)
+    # Los cuerpos con masa evolucionan exactamente igual que sin partículas
+    for id in ("Sol", "Jupiter"):
+        assert sim.cuerpos[id].posicion == solo_masivos.cuerpos[id].posicion
+    for k in range(5):
+        p, q = sim.cuerpos[f"T{k}"].posicion, referencia.cuerpos[f"T{k}"].posicion
+        assert (p - q).magnitude() < 1e-9 * q.magnitude()
+
+@pytest.mark.parametrize("motor", Simulador.MOTORES)
+def test_particulas_excluidas_de_la_energia_potencial(motor):
+    motor = _motor(motor)
+    sim = _sistema(motor)
+    sim.calcular_fuerzas()
+    sol, jupiter = sim.cuerpos["Sol"], sim.cuerpos["Jupiter"]
+    esperada = -Simulador.G * sol.masa * jupiter.masa / (5.2 * UA)
+    assert sim._energia_potencial_actual() == pytest.approx(esperada)
+    assert sim._calcular_energia_cinetica_total() == pytest.approx(0.5 * jupiter.masa * 1.3e4 ** 2)
+
+@pytest.mark.parametrize("motor", Simulador.MOTORES)
+@pytest.mark.parametrize("extension", ["json", "csv"])
+def test_guardar_y_cargar_particulas(tmp_path, motor, extension):
+    motor = _motor(motor)
+    sim = _sistema(motor)
+    archivo = str(tmp_path / f"estado.{extension}")
+    sim.guardar(archivo)
+    cargado = Simulador(motor=motor, imprimir_pasos=False)
+    cargado.cargar(archivo)
+    assert [c.sin_masa for c in cargado.cuerpos.values()] == [False, False] + [True] * 5
+
+@pytest.mark.parametrize("motor", Simulador.MOTORES)
+def test_punto_de_control_con_particulas(motor):
+    motor = _motor(motor)
+    sim = _sistema(motor, integrador="leapfrog")
+    sim.paso_simulacion(86400.0, 0.0)
+    copia = restaurar_estado(capturar_estado(sim, 86400.0, 1))
+    for paso in range(1, 5):
+        sim.paso_simulacion(86400.0, paso * 86400.0)
+        copia.paso_simulacion(86400.0, paso * 86400.0)
+    for id, cuerpo in sim.cuerpos.items():
+        assert copia.cuerpos[id].posicion == cuerpo.posicion
+
+def test_particulas_con_barnes_hut():
+    pytest.importorskip("numpy")
+    sim = _sistema("numpy", solver="barnes_hut")
+    directo = _sistema("numpy")
+    sim.calcular_fuerzas()
+    directo.calcular_fuerzas()
+    for k in range(5):
+        a, b = sim.cuerpos[f"T{k}"].aceleracion, directo.cuerpos[f"T{k}"].aceleracion
+        assert (a - b).magnitude() < 1e-12 * b.magnitude()
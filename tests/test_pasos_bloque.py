@@ -0,0 +1,96 @@
+import pytest
+np = pytest.importorskip("numpy")
+from src.celeste.simulador import Simulador
+from src.celeste.vector3d import Vector3D
+from src.celeste.pasos_bloque import HermiteBloques
+from src.celeste.integradores import crear_integrador
+
+DIA = 86400.0
+
+def _sistema_jerarquico(integrador, lejanos=20):
+    sim = Simulador(motor="numpy", integrador=integrador)
+    sim._insertar_cuerpo("Sol", 1.989e30, Vector3D(0, 0, 0), Vector3D(0, 0, 0))
+    sim._insertar_cuerpo("Tierra", 5.972e24, Vector3D(1.496e11, 0, 0), Vector3D(0, 2.978e4, 0))
+    sim._insertar_cuerpo("Luna", 7.348e22, Vector3D(1.496e11 + 3.844e8, 0, 0), Vector3D(0, 2.978e4 + 1.022e3, 0))
+    # Cuerpos lejanos en órbitas circulares de decenas de UA: pueden dar pasos muy largos
+    rng = np.random.default_rng(0)
+    for i in range(lejanos):
+        r = rng.uniform(5e12, 1e13)
+        angulo = rng.uniform(0, 2 * np.pi)
+        v = np.sqrt(sim.G * 1.989e30 / r)
+        sim._insertar_cuerpo(f"L{i}", 1e20, Vector3D(r * np.cos(angulo), r * np.sin(angulo), 0),
+                             Vector3D(-v * np.sin(angulo), v * np.cos(angulo), 0))
+    return sim
+
+def _energia(sim):
+    return sim._calcular_energia_cinetica_total() + sim._calcular_energia_potencial_total()
+
+def test_crear_integrador_hermite_bloques():
+    assert isinstance(crear_integrador("hermite_bloques"), HermiteBloques)
+
+def test_hermite_bloques_requiere_motor_numpy():
+    sim = Simulador(integrador=HermiteBloques())
+    sim.agregar_cuerpo("Sol", 1.989e30, Vector3D(0, 0, 0), Vector3D(0, 0, 0))
+    with pytest.raises(ValueError, match="requiere el motor 'numpy'"):
+        sim.integrador.paso(sim, 1.0)
+
+@pytest.mark.parametrize("solver", ["barnes_hut", "fmm", "paralelo"])
+def test_hermite_bloques_solo_con_suma_directa(solver):
+    with pytest.raises(ValueError, match=f"no admite el solver '{solver}'"):
+        Simulador(motor="numpy", solver=solver, integrador="hermite_bloques")
+    assert Simulador(motor="numpy", solver="directo", integrador="hermite_bloques").solver.nombre == "directo"
+
+def test_hermite_bloques_orbita_circular():
+    sim = Simulador(motor="numpy", integrador=HermiteBloques())
+    sim._insertar_cuerpo("Sol", 1.989e30, Vector3D(0, 0, 0), Vector3D(0, 0, 0))
+    r = 1.496e11
+    v = (sim.G * 1.989e30 / r) ** 0.5
+    sim._insertar_cuerpo("Planeta", 1.0, Vector3D(r, 0, 0), Vector3D(0, v, 0))
+    periodo = 2 * np.pi * r / v
+    e0 = _energia(sim)
+    for _ in range(16):
+        sim.integrador.paso(sim, periodo / 16)
+    assert abs((_energia(sim) - e0) / e0) < 1e-5
+    # Tras un periodo completo el planeta vuelve al punto de partida
+    assert (sim.cuerpos["Planeta"].posicion - Vector3D(r, 0, 0)).magnitude() < 1e-3 * r
+
+def test_hermite_bloques_ahorra_evaluaciones_en_sistemas_jerarquicos():
+    integrador = HermiteBloques()
+    sim = _sistema_jerarquico(integrador)
+    e0 = _energia(sim)
+    for _ in range(10):
+        sim.integrador.paso(sim, 32 * DIA)
+    assert abs((_energia(sim) - e0) / e0) < 1e-6
+
+    # La Luna necesita pasos mucho más cortos que los cuerpos lejanos
+    niveles = integrador._niveles_cuerpo
+    assert niveles[2] >= niveles[3:].max() + 4
+    # Con un paso común igual al de la Luna se evaluarían N fuerzas en cada subpaso
+    n = len(sim.cuerpos)
+    evaluaciones_paso_comun = n * 10 * 2 ** int(niveles[2])
+    assert integrador.evaluaciones < evaluaciones_paso_comun / 5
+
+def test_hermite_bloques_igual_que_yoshida_con_paso_fino():
+    sim = _sistema_jerarquico(HermiteBloques(eta=0.005), lejanos=3)
+    ref = _sistema_jerarquico("yoshida4", lejanos=3)
+    for _ in range(4):
+        sim.integrador.paso(sim, 8 * DIA)
+    for _ in range(4 * 8 * 24):
+        ref.integrador.paso(ref, DIA / 24)
+    for id in ("Tierra", "Luna", "L0"):
+        r_ref = ref.cuerpos[id].posicion
+        assert (sim.cuerpos[id].posicion - r_ref).magnitude() < 1e-6 * r_ref.magnitude()
+
+def test_hermite_bloques_reutiliza_derivadas_entre_pasos():
+    integrador = HermiteBloques(niveles=0)
+    sim = _sistema_jerarquico(integrador, lejanos=2)
+    n = len(sim.cuerpos)
+    sim.integrador.paso(sim, DIA)
+    # Inicialización + un subpaso
+    assert integrador.evaluaciones == 2 * n
+    sim.integrador.paso(sim, DIA)
+    assert integrador.evaluaciones == 3 * n
+    # Si el estado cambia fuera del integrador, se recalculan aceleración y jerk
+    sim.cuerpos["Luna"].velocidad = Vector3D(0, 2.978e4, 0)
+    sim.integrador.paso(sim, DIA)
+    assert integrador.evaluaciones == 5 * n
@@ -0,0 +1,156 @@
+import io
+import json
+import pytest
+from src.celeste.simulador import Simulador
+from src.celeste.vector3d import Vector3D
+from src.celeste.main import run_simulation
+from src.celeste.observadores import RegistroEnergia
+from src.celeste.perfilado import Perfilador, RegistroPerfil
+
+def _sistema(**kwargs):
+    sim = Simulador(imprimir_pasos=False, **kwargs)
+    sim.agregar_cuerpo("Sol", 1.989e30, Vector3D(0, 0, 0), Vector3D(0, 0, 0))
+    sim.agregar_cuerpo("Tierra", 5.972e24, Vector3D(1.496e11, 0, 0), Vector3D(0, 2.978e4, 0))
+    sim.agregar_cuerpo("Marte", 6.417e23, Vector3D(2.279e11, 0, 0), Vector3D(0, 2.407e4, 0))
+    return sim
+
+def test_sin_perfilado_no_se_mide_nada():
+    sim = _sistema()
+    assert sim.perfilador is None
+    sim.paso_simulacion(3600.0, 0.0)
+    assert sim.perfilador is None
+    assert sim.desactivar_perfilado() is None
+
+def test_fases_y_contadores():
+    sim = _sistema(integrador="leapfrog")
+    perfilador = sim.activar_perfilado()
+    assert sim.activar_perfilado() is perfilador
+    sim.agregar_observador(RegistroEnergia(), intervalo=2)
+    for paso in range(4):
+        sim.paso_simulacion(3600.0, paso * 3600.0)
+    resumen = perfilador.resumen()
+    # Leapfrog: la primera evaluación y una por paso; el resto (el inicio de los pasos
+    # 2-4 y la energía potencial de los pasos observados) se reutiliza de la caché
+    assert resumen["pasos"] == 4
+    assert resumen["evaluaciones_fuerzas"] == 5
+    assert resumen["fuerzas_reutilizadas"] == 3 + 2
+    # Cinco recorridos de 3 pares
+    assert resumen["pares"] == 15
+    fases = resumen["fases"]
+    assert fases["paso"]["llamadas"] == 4
+    assert fases["integrador"]["llamadas"] == 4
+    assert fases["fuerzas"]["llamadas"] == 5
+    # Observadores en los pasos 0 y 2; energías y momento una vez por paso observado
+    assert fases["observadores"]["llamadas"] == 2
+    assert fases["diagnosticos"]["llamadas"] == 6
+    assert "colisiones" not in fases
+    # El tiempo propio excluye el de las fases internas
+    assert fases["integrador"]["propio"] == pytest.approx(
+        fases["integrador"]["segundos"] - fases["fuerzas"]["segundos"])
+    assert fases["paso"]["segundos"] >= fases["integrador"]["segundos"] + fases["observadores"]["segundos"]
+    assert all(d["propio"] >= 0 for d in fases.values())
+
+def test_perfilado_no_cambia_la_trayectoria():
+    normal, perfilado = _sistema(integrador="yoshida4"), _sistema(integrador="yoshida4")
+    perfilado.activar_perfilado()
+    for paso in range(10):
+        normal.paso_simulacion(3600.0, paso * 3600.0)
+        perfilado.paso_simulacion(3600.0, paso * 3600.0)
+    for id, cuerpo in normal.cuerpos.items():
+        assert perfilado.cuerpos[id].posicion == cuerpo.posicion
+        assert perfilado.cuerpos[id].velocidad == cuerpo.velocidad
+
+def test_run_simulation_mide_consola_y_puntos_de_control(tmp_path, capsys):
+    sim = _sistema()
+    perfilador = sim.activar_perfilado()
+    run_simulation(sim, 3600.0, 5 * 3600.0, checkpoint=str(tmp_path / "control.pkl"), checkpoint_interval=2)
+    fases = perfilador.resumen()["fases"]
+    assert fases["consola"]["llamadas"] == 5
+    assert fases["puntos_control"]["llamadas"] == 2
+    assert fases["paso"]["llamadas"] == 5
+
+def test_reiniciar_y_texto():
+    sim = _sistema()
+    perfilador = sim.activar_perfilado()
+    sim.paso_simulacion(3600.0, 0.0)
+    texto = perfilador.texto()
+    assert "Pasos: 1" in texto
+    assert "fuerzas" in texto and "integrador" in texto
+    perfilador.reiniciar()
+    assert perfilador.resumen()["pasos"] == 0
+    assert perfilador.resumen()["fases"] == {}
+
+def test_fase_vacia_no_asigna_bloques():
+    perfilador = Perfilador()
+    for _ in range(100):
+        perfilador.iniciar("vacia")
+        perfilador.terminar()
+    assert abs(perfilador.fases["vacia"][3]) <= 5
+
+def test_hermite_bloques_cuenta_pares_por_cuerpo():
+    pytest.importorskip("numpy")
+    sim = _sistema(motor="numpy", integrador="hermite_bloques")
+    perfilador = sim.activar_perfilado()
+    for paso in range(3):
+        sim.paso_simulacion(3600.0, paso * 3600.0)
+    assert perfilador.resumen()["pares"] == sim.integrador.evaluaciones * 2
+
+@pytest.mark.parametrize("solver", ["directo", "paralelo", "barnes_hut", "fmm"])
+def test_pares_son_los_que_evalua_el_solver(solver):
+    np = pytest.importorskip("numpy")
+    rng = np.random.default_rng(0)
+    n = 3000
+    sim = Simulador(motor="numpy", solver=solver, imprimir_pasos=False)
+    sim.agregar_cuerpos([f"c{i}" for i in range(n)], rng.uniform(1, 2, n) * 1e20,
+                        rng.normal(size=(n, 3)) * 1e11, np.zeros((n, 3)))
+    perfilador = sim.activar_perfilado()
+    sim.paso_simulacion(10.0, 0.0)
+    pares = perfilador.resumen()["pares"]
+    assert pares == sim.solver.interacciones == sim.interacciones
+    # La suma directa evalúa cada par una vez (dos el solver paralelo); los solvers de árbol, menos
+    esperados = {"directo": n * (n - 1) // 2, "paralelo": n * (n - 1)}
+    if solver in esperados:
+        assert pares == esperados[solver]
+    else:
+        assert 0 < pares < n * (n - 1) // 2
+
+@pytest.mark.parametrize("motor", Simulador.MOTORES)
+def test_pares_con_particulas_de_prueba(motor):
+    if motor == "numpy":
+        pytest.importorskip("numpy")
+    sim = _sistema(motor=motor)
+    for k in range(10):
+        sim.agregar_particula(f"P{k}", Vector3D(3e11 + k * 1e9, 0, 0), Vector3D(0, 2e4, 0))
+    perfilador = sim.activar_perfilado()
+    sim.paso_simulacion(3600.0, 0.0)
+    # 3 pares entre los cuerpos con masa y 10 x 3 de las partículas; ninguno entre partículas
+    assert perfilador.resumen()["pares"] == 3 + 30
+
+def test_registro_perfil_en_json_lines(tmp_path):
+    sim = _sistema()
+    sim.activar_perfilado()
+    archivo = tmp_path / "perfil.jsonl"
+    registro = RegistroPerfil(str(archivo))
+    sim.agregar_observador(registro, intervalo=3)
+    for paso in range(7):
+        sim.paso_simulacion(3600.0, paso * 3600.0)
+    registro.cerrar()
+    lineas = [json.loads(linea) for linea in archivo.read_text().splitlines()]
+    assert [l["paso"] for l in lineas] == [0, 3, 6]
+    assert [l["pasos"] for l in lineas] == [0, 3, 6]
+    assert lineas[0]["pasos_s"] is None
+    assert lineas[-1]["pasos_s"] > 0
+    assert "integrador" in lineas[-1]["fases"]
+
+def test_registro_perfil_en_archivo_abierto_y_sin_perfilado():
+    salida = io.StringIO()
+    sim = _sistema()
+    registro = RegistroPerfil(salida)
+    sim.agregar_observador(registro)
+    with pytest.raises(ValueError, match="activar el perfilado"):
+        sim.paso_simulacion(3600.0, 0.0)
+    sim.activar_perfilado()
+    sim.paso_simulacion(3600.0, 3600.0)
+    registro.cerrar()
+    assert not salida.closed
+    assert "fases" in json.loads(salida.getvalue())
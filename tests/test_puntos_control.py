@@ -0,0 +1,92 @@
+import os
+import pytest
+from src.celeste.simulador import Simulador
+from src.celeste.vector3d import Vector3D
+from src.celeste.main import run_simulation, resume_simulation
+from src.celeste.puntos_control import (GestorPuntosControl, capturar_estado, restaurar_estado,
+                                        guardar_punto_control, cargar_punto_control)
+
+def _sistema(**kwargs):
+    sim = Simulador(imprimir_pasos=False, **kwargs)
+    sim.agregar_cuerpo("Sol", 1.989e30, Vector3D(0, 0, 0), Vector3D(0, 0, 0))
+    sim.agregar_cuerpo("Tierra", 5.972e24, Vector3D(1.496e11, 0, 0), Vector3D(0, 2.978e4, 0))
+    sim.agregar_cuerpo("Luna", 7.348e22, Vector3D(1.496e11 + 3.844e8, 0, 0), Vector3D(0, 2.978e4 + 1.022e3, 0))
+    return sim
+
+def _requiere_numpy(kwargs):
+    if kwargs.get("motor") == "numpy":
+        pytest.importorskip("numpy")
+
+def _estado(sim):
+    return [(c.id, c.masa, c.posicion, c.velocidad) for c in sim.cuerpos.values()]
+
+@pytest.mark.parametrize("kwargs", [
+    {"motor": "python", "integrador": "euler"},
+    {"motor": "python", "integrador": "leapfrog"},
+    {"motor": "numpy", "integrador": "yoshida4"},
+    {"motor": "numpy", "solver": "barnes_hut", "integrador": "rk4"},
+    {"motor": "numpy", "integrador": "hermite_bloques"},
+    {"motor": "numpy", "integrador": "wisdom_holman"},
+])
+def test_reanudar_es_identico_bit_a_bit(tmp_path, kwargs):
+    _requiere_numpy(kwargs)
+    dt = 3600.0
+    continua = _sistema(**kwargs)
+    for paso in range(20):
+        continua.paso_simulacion(dt, paso * dt)
+
+    interrumpida = _sistema(**kwargs)
+    for paso in range(8):
+        interrumpida.paso_simulacion(dt, paso * dt)
+    archivo = str(tmp_path / "control.pkl")
+    guardar_punto_control(capturar_estado(interrumpida, 8 * dt, 8), archivo)
+    del interrumpida
+
+    estado = cargar_punto_control(archivo)
+    reanudada = restaurar_estado(estado)
+    assert reanudada.pasos_realizados == 8
+    for paso in range(estado["paso"], 20):
+        reanudada.paso_simulacion(dt, paso * dt)
+    assert _estado(reanudada) == _estado(continua)
+
+def test_resume_simulation_tras_un_fallo(tmp_path, monkeypatch):
+    pytest.importorskip("numpy")
+    dt = 3600.0
+    continua = _sistema(motor="numpy", integrador="leapfrog")
+    run_simulation(continua, dt, 10 * dt)
+
+    archivo = str(tmp_path / "control.pkl")
+    sim = _sistema(motor="numpy", integrador="leapfrog")
+    original = sim.paso_simulacion
+    def fallar_en_el_paso_8(dt, tiempo):
+        if sim.pasos_realizados == 7:
+            raise RuntimeError("fallo simulado")
+        original(dt, tiempo)
+    monkeypatch.setattr(sim, "paso_simulacion", fallar_en_el_paso_8)
+    with pytest.raises(RuntimeError):
+        run_simulation(sim, dt, 10 * dt, checkpoint=archivo, checkpoint_interval=3)
+
+    estado = cargar_punto_control(archivo)
+    assert estado["paso"] == 6
+    assert estado["tiempo"] == 6 * dt
+    reanudada = resume_simulation(archivo, checkpoint_interval=3)
+    assert _estado(reanudada) == _estado(continua)
+    assert not os.path.exists(archivo + ".tmp")
+
+def test_captura_independiente_del_simulador():
+    pytest.importorskip("numpy")
+    sim = _sistema(motor="numpy")
+    estado = capturar_estado(sim)
+    sim.paso_simulacion(3600.0, 0.0)
+    restaurada = restaurar_estado(estado)
+    assert restaurada.obtener_cuerpo("Tierra").posicion == Vector3D(1.496e11, 0, 0)
+    assert restaurada.pasos_realizados == 0
+
+def test_gestor_propaga_errores_de_escritura(tmp_path):
+    gestor = GestorPuntosControl(str(tmp_path / "no_existe" / "control.pkl"), intervalo=2)
+    assert gestor.toca(4) and not gestor.toca(3)
+    gestor.guardar(_sistema(), 0.0, 0)
+    with pytest.raises(FileNotFoundError):
+        gestor.esperar()
+    with pytest.raises(ValueError):
+        GestorPuntosControl("control.pkl", intervalo=0)
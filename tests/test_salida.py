@@ -0,0 +1,121 @@
+import threading
+import pytest
+from src.celeste.instantanea import leer_instantanea
+from src.celeste.observadores import ObservadorConsola
+from src.celeste.salida import DestinoArchivo, DestinoConsola, DestinoTrayectoria, SalidaAsincrona
+from src.celeste.simulador import Simulador
+
+def _motor(motor):
+    if motor == "numpy":
+        pytest.importorskip("numpy")
+    return motor
+
+def _sistema(motor="python"):
+    sim = Simulador(motor=motor, integrador="leapfrog", imprimir_pasos=False)
+    sim.agregar_cuerpos(["Sol", "Tierra", "Luna"], [1.989e30, 5.972e24, 7.348e22],
+                        [[0.0, 0.0, 0.0], [1.496e11, 0.0, 0.0], [1.496e11 + 3.844e8, 0.0, 0.0]],
+                        [[0.0, 0.0, 0.0], [0.0, 2.978e4, 0.0], [0.0, 2.978e4 + 1.022e3, 0.0]])
+    return sim
+
+class Bloqueado:
+    """Destino que no termina hasta que se libera, y guarda las posiciones de la Tierra."""
+
+    def __init__(self):
+        self.liberar = threading.Event()
+        self.recibidas = []
+
+    def __call__(self, captura):
+        self.liberar.wait()
+        self.recibidas.append((captura.paso, captura.columnas[len(captura) + 1]))
+
+@pytest.mark.parametrize("motor", Simulador.MOTORES)
+def test_capturas_copian_el_estado_de_cada_paso(motor):
+    sim = _sistema(_motor(motor))
+    destino = Bloqueado()
+    salida = SalidaAsincrona([destino], capacidad=10)
+    sim.agregar_observador(salida)
+    esperadas = []
+    for paso in range(5):
+        sim.paso_simulacion(3600.0, paso * 3600.0)
+        esperadas.append((paso, sim.cuerpos["Tierra"].posicion.x))
+    # El bucle de pasos no ha esperado al destino y las capturas no cambian con el estado
+    assert destino.recibidas == []
+    destino.liberar.set()
+    salida.cerrar()
+    assert destino.recibidas == esperadas
+    assert salida.capturadas == salida.escritas == 5
+
+@pytest.mark.parametrize("politica, recibidos", [("descartar", [0, 1]), ("reemplazar", [0, 4])])
+def test_politicas_con_la_cola_llena(politica, recibidos):
+    sim = _sistema()
+    destino = Bloqueado()
+    salida = SalidaAsincrona([destino], capacidad=1, politica=politica)
+    sim.agregar_observador(salida)
+    sim.paso_simulacion(3600.0, 0.0)
+    # Espera a que el hilo de salida tome la primera captura
+    while not salida._cola.empty():
+        pass
+    for paso in range(1, 5):
+        sim.paso_simulacion(3600.0, paso * 3600.0)
+    destino.liberar.set()
+    salida.cerrar()
+    assert [paso for paso, _ in destino.recibidas] == recibidos
+    assert salida.descartadas == 3
+    assert salida.capturadas == salida.escritas + salida.descartadas
+
+def test_politica_desconocida():
+    with pytest.raises(ValueError, match="Política de salida desconocida"):
+        SalidaAsincrona([], politica="nada")
+
+def test_destino_consola_igual_que_observador(capsys):
+    sim = _sistema()
+    sim.agregar_observador(ObservadorConsola())
+    with SalidaAsincrona([DestinoConsola()]) as salida:
+        sim.agregar_observador(salida)
+        sim.paso_simulacion(3600.0, 0.0)
+    sincrono, asincrono = capsys.readouterr().out.split("Paso t =")[1:]
+    assert sincrono.strip() == asincrono.strip()
+
+@pytest.mark.parametrize("motor", Simulador.MOTORES)
+def test_destino_archivo_y_guardar(tmp_path, motor):
+    sim = _sistema(_motor(motor))
+    destino = DestinoArchivo(str(tmp_path / "estado_{paso}.cel"))
+    with SalidaAsincrona([destino]) as salida:
+        sim.agregar_observador(salida, intervalo=2)
+        for paso in range(4):
+            sim.paso_simulacion(3600.0, paso * 3600.0)
+        salida.guardar(sim, str(tmp_path / "final.json"))
+    assert [a.rsplit("_", 1)[1] for a in destino.archivos] == ["0.cel", "2.cel"]
+    ids, columnas = leer_instantanea(destino.archivos[-1])
+    assert ids == ["Sol", "Tierra", "Luna"]
+    cargado = Simulador(imprimir_pasos=False)
+    cargado.cargar(str(tmp_path / "final.json"))
+    for id, cuerpo in sim.cuerpos.items():
+        assert cargado.cuerpos[id].posicion == cuerpo.posicion
+        assert cargado.cuerpos[id].velocidad == cuerpo.velocidad
+
+def test_destino_trayectoria(tmp_path):
+    pytest.importorskip("numpy")
+    from src.celeste.trayectoria import LectorTrayectoria
+    sim = _sistema("numpy")
+    archivo = str(tmp_path / "orbita.tray")
+    with SalidaAsincrona([DestinoTrayectoria(archivo)]) as salida:
+        sim.agregar_observador(salida)
+        for paso in range(3):
+            sim.paso_simulacion(3600.0, paso * 3600.0)
+    with LectorTrayectoria(archivo) as lector:
+        assert len(lector) == 3
+        assert lector.trama(2)[1][1, 0] == sim.cuerpos["Tierra"].posicion.x
+
+def test_errores_del_destino_se_propagan():
+    def falla(captura):
+        raise OSError("disco lleno")
+    sim = _sistema()
+    salida = SalidaAsincrona([falla])
+    sim.agregar_observador(salida)
+    sim.paso_simulacion(3600.0, 0.0)
+    with pytest.raises(OSError, match="disco lleno"):
+        salida.vaciar()
+    salida.cerrar()
+    with pytest.raises(ValueError, match="cerrada"):
+        salida.guardar(sim, "x.json")
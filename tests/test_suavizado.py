@@ -0,0 +1,123 @@
+import math
+import random
+import pytest
+from src.celeste.simulador import Simulador
+from src.celeste.vector3d import Vector3D
+from src.celeste.suavizado import SuavizadoPlummer, SuavizadoSpline, crear_suavizado
+
+G_TEST = 6.67430e-11
+
+def _sistema_aleatorio(n, suavizado=None, semilla=1, **kwargs):
+    rng = random.Random(semilla)
+    sim = Simulador(imprimir_pasos=False, suavizado=suavizado, **kwargs)
+    for i in range(n):
+        sim._insertar_cuerpo(f"C{i}", rng.uniform(1e20, 1e25),
+                             Vector3D(rng.uniform(-1e9, 1e9), rng.uniform(-1e9, 1e9), rng.uniform(-1e9, 1e9)),
+                             Vector3D(rng.uniform(-1e3, 1e3), rng.uniform(-1e3, 1e3), rng.uniform(-1e3, 1e3)))
+    return sim
+
+def test_plummer_factores():
+    s = SuavizadoPlummer(3.0)
+    f, g = s.factores_escalar(16.0)
+    assert f == pytest.approx(1 / 5)
+    assert g == pytest.approx(1 / 125)
+    assert s.factores_escalar(0.0) == pytest.approx((1 / 3, 1 / 27))
+
+def test_spline_es_newtoniano_fuera_del_nucleo_y_continuo():
+    s = SuavizadoSpline(1.0)
+    r = 2.8 * 1.5
+    assert s.factores_escalar(r * r) == pytest.approx((1 / r, 1 / r ** 3))
+    # En r = 0 el potencial coincide con el de Plummer del mismo epsilon
+    assert s.factores_escalar(0.0)[0] == pytest.approx(1.0)
+    for u in (0.5, 1.0):
+        r = u * s.h
+        antes = s.factores_escalar((r * (1 - 1e-9)) ** 2)
+        despues = s.factores_escalar((r * (1 + 1e-9)) ** 2)
+        assert antes == pytest.approx(despues, rel=1e-6)
+
+def test_spline_fuerza_es_derivada_del_potencial():
+    s = SuavizadoSpline(1.0)
+    for r in (0.3, 1.0, 2.0, 2.7, 3.5):
+        h = 1e-6
+        derivada = (s.factores_escalar((r + h) ** 2)[0] - s.factores_escalar((r - h) ** 2)[0]) / (2 * h)
+        # d(f)/dr = -r * g, igual que d(1/r)/dr = -r / r^3
+        assert derivada == pytest.approx(-r * s.factores_escalar(r * r)[1], rel=1e-5)
+
+def test_factores_vectorizados_igual_que_escalares():
+    np = pytest.importorskip("numpy")
+    r2 = np.array([0.0, 0.5, 1.0, 3.0, 7.0, 20.0, 100.0])
+    for s in (SuavizadoPlummer(1.0), SuavizadoSpline(1.0)):
+        f, g = s.factores(r2)
+        for k, valor in enumerate(r2.tolist()):
+            assert (f[k], g[k]) == pytest.approx(s.factores_escalar(valor), rel=1e-12)
+
+def test_crear_suavizado_valida():
+    assert isinstance(crear_suavizado("spline", 1.0), SuavizadoSpline)
+    with pytest.raises(ValueError):
+        crear_suavizado("gauss", 1.0)
+    with pytest.raises(ValueError):
+        SuavizadoPlummer(0.0)
+
+def test_cuerpos_coincidentes_con_suavizado_tienen_energia_finita():
+    sim = Simulador(imprimir_pasos=False, suavizado=SuavizadoPlummer(1e3))
+    sim._insertar_cuerpo("A", 1e20, Vector3D(0.0, 0.0, 0.0), Vector3D(0.0, 0.0, 0.0))
+    sim._insertar_cuerpo("B", 2e20, Vector3D(0.0, 0.0, 0.0), Vector3D(0.0, 0.0, 0.0))
+    sim.calcular_fuerzas()
+    assert sim._energia_potencial_actual() == pytest.approx(-G_TEST * 2e40 / 1e3)
+    assert sim.cuerpos["A"].fuerza_neta.magnitude() == 0.0
+
+def test_energia_del_recorrido_igual_que_energia_potencial_con():
+    suavizado = SuavizadoSpline(2e8)
+    sim = _sistema_aleatorio(12, suavizado)
+    cuerpos = list(sim.cuerpos.values())
+    esperada = sum(a.energia_potencial_con(b, sim.G, suavizado)
+                   for i, a in enumerate(cuerpos) for b in cuerpos[i + 1:])
+    assert sim._energia_potencial_actual() == pytest.approx(esperada, rel=1e-12)
+    assert sim.evaluaciones_fuerzas == 1
+
+@pytest.mark.parametrize("solver", ["directo", "paralelo"])
+@pytest.mark.parametrize("clase", [SuavizadoPlummer, SuavizadoSpline])
+def test_motor_numpy_igual_que_python_con_suavizado(solver, clase):
+    np = pytest.importorskip("numpy")
+    sim_py = _sistema_aleatorio(30, clase(2e8))
+    sim_np = _sistema_aleatorio(30, clase(2e8), motor="numpy", solver=solver)
+    sim_py.calcular_fuerzas()
+    sim_np.calcular_fuerzas()
+    for cuerpo in sim_py.cuerpos.values():
+        esperada = np.array(cuerpo.fuerza_neta.to_list()) / cuerpo.masa
+        assert np.allclose(sim_np._almacen.aceleraciones[sim_np._almacen.indices[cuerpo.id]], esperada,
+                           rtol=1e-10, atol=0)
+    assert sim_np._energia_potencial_actual() == pytest.approx(sim_py._energia_potencial_actual(), rel=1e-12)
+
+def test_barnes_hut_con_theta_cero_igual_que_directo_con_suavizado():
+    np = pytest.importorskip("numpy")
+    from src.celeste.barnes_hut import SolverBarnesHut
+    sim_bh = _sistema_aleatorio(50, SuavizadoPlummer(2e8), motor="numpy", solver=SolverBarnesHut(theta=0.0))
+    sim_d = _sistema_aleatorio(50, SuavizadoPlummer(2e8), motor="numpy")
+    sim_bh.calcular_fuerzas()
+    sim_d.calcular_fuerzas()
+    assert np.allclose(sim_bh._almacen.aceleraciones, sim_d._almacen.aceleraciones, rtol=1e-10, atol=0)
+    # Barnes–Hut no devuelve el potencial: se suma aparte con el mismo suavizado
+    assert sim_bh._energia_potencial_actual() == pytest.approx(sim_d._energia_potencial_actual(), rel=1e-12)
+
+def test_suavizado_incompatible():
+    pytest.importorskip("numpy")
+    class SolverSinSuavizado:
+        def aceleraciones(self, masas, posiciones, G):
+            return posiciones * 0.0
+    with pytest.raises(ValueError):
+        Simulador(motor="numpy", solver=SolverSinSuavizado(), suavizado=SuavizadoPlummer(1.0))
+    with pytest.raises(ValueError):
+        Simulador(motor="numpy", integrador="hermite_bloques", suavizado=SuavizadoPlummer(1.0))
+
+def test_encuentro_cercano_conserva_energia_con_suavizado():
+    # Dos cuerpos que caen uno hacia el otro: sin suavizado la energía diverge al cruzarse
+    sim = Simulador(imprimir_pasos=False, integrador="leapfrog", suavizado=SuavizadoPlummer(1e6))
+    sim._insertar_cuerpo("A", 1e24, Vector3D(-1e7, 0.0, 0.0), Vector3D(0.0, 0.0, 0.0))
+    sim._insertar_cuerpo("B", 1e24, Vector3D(1e7, 0.0, 0.0), Vector3D(0.0, 0.0, 0.0))
+    energia = lambda: sim._calcular_energia_cinetica_total() + sim._energia_potencial_actual()
+    inicial = energia()
+    for _ in range(2000):
+        sim.paso_simulacion(5.0, 0.0)
+    assert math.isfinite(energia())
+    assert energia() == pytest.approx(inicial, rel=1e-3)
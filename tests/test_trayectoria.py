@@ -0,0 +1,97 @@
+import pytest
+np = pytest.importorskip("numpy")
+from src.celeste.simulador import Simulador
+from src.celeste.vector3d import Vector3D
+from src.celeste.trayectoria import EscritorTrayectoria, LectorTrayectoria
+
+def _tierra_luna(**kwargs):
+    sim = Simulador(imprimir_pasos=False, **kwargs)
+    sim.agregar_cuerpo("Tierra", 5.972e24, Vector3D(0, 0, 0), Vector3D(0, 0, 0))
+    sim.agregar_cuerpo("Luna", 7.348e22, Vector3D(3.844e8, 0, 0), Vector3D(0, 1.022e3, 0))
+    return sim
+
+def test_escribir_y_leer_tramas(tmp_path):
+    archivo = str(tmp_path / "tray.bin")
+    rng = np.random.default_rng(0)
+    posiciones = rng.normal(size=(100, 3, 3))
+    velocidades = rng.normal(size=(100, 3, 3))
+    with EscritorTrayectoria(archivo, ["a", "b", "c"], capacidad=4) as escritor:
+        for k in range(100):
+            escritor.escribir(k * 0.5, posiciones[k], velocidades[k])
+
+    with LectorTrayectoria(archivo) as lector:
+        assert lector.ids == ["a", "b", "c"]
+        assert len(lector) == 100
+        np.testing.assert_array_equal(lector.tiempos, np.arange(100) * 0.5)
+        t, pos, vel = lector.trama(37)
+        assert t == 18.5
+        np.testing.assert_array_equal(pos, posiciones[37])
+        np.testing.assert_array_equal(vel, velocidades[37])
+        serie_pos, serie_vel = lector.serie("b")
+        np.testing.assert_array_equal(serie_pos, posiciones[:, 1])
+        np.testing.assert_array_equal(serie_vel, velocidades[:, 1])
+        # Vistas sobre el archivo mapeado, sin copias
+        assert isinstance(lector.datos, np.memmap)
+        assert np.shares_memory(serie_pos, lector.datos)
+        with pytest.raises(KeyError):
+            lector.serie("d")
+
+@pytest.mark.parametrize("motor", ["python", "numpy"])
+def test_escritor_como_observador(tmp_path, motor):
+    archivo = str(tmp_path / "tray.bin")
+    sim = _tierra_luna(motor=motor)
+    escritor = EscritorTrayectoria(archivo)
+    sim.agregar_observador(escritor, intervalo=5)
+    for paso in range(12):
+        sim.paso_simulacion(100.0, paso * 100.0)
+    escritor.cerrar()
+
+    lector = LectorTrayectoria(archivo)
+    assert lector.ids == ["Tierra", "Luna"]
+    np.testing.assert_array_equal(lector.tiempos, [100.0, 600.0, 1100.0])
+    t, pos, vel = lector.trama(2)
+    luna = sim.obtener_cuerpo("Luna")
+    # La última trama es el estado tras el paso 10; la Luna ha seguido avanzando
+    assert pos[1, 0] != luna.posicion.x
+    assert vel[1, 1] == pytest.approx(luna.velocidad.y, rel=1e-3)
+
+@pytest.mark.parametrize("motor", ["python", "numpy"])
+def test_tiempo_de_la_trama_es_el_de_sus_posiciones(tmp_path, motor):
+    # Un cuerpo solo a 1 m/s desde x = 0: en cada trama x (m) coincide con t (s)
+    archivo = str(tmp_path / "tray.bin")
+    sim = Simulador(motor=motor, imprimir_pasos=False)
+    sim.agregar_cuerpo("A", 1.0, Vector3D(0, 0, 0), Vector3D(1.0, 0, 0))
+    escritor = EscritorTrayectoria(archivo)
+    sim.agregar_observador(escritor)
+    for paso in range(3):
+        sim.paso_simulacion(10.0, paso * 10.0)
+    escritor.cerrar()
+    lector = LectorTrayectoria(archivo)
+    np.testing.assert_array_equal(lector.tiempos, [10.0, 20.0, 30.0])
+    for k in range(3):
+        t, pos, _ = lector.trama(k)
+        assert pos[0, 0] == t
+
+def test_vaciar_actualiza_la_cabecera(tmp_path):
+    archivo = str(tmp_path / "tray.bin")
+    escritor = EscritorTrayectoria(archivo, ["a"])
+    escritor.escribir(1.0, np.ones((1, 3)), np.zeros((1, 3)))
+    escritor.vaciar()
+    assert len(LectorTrayectoria(archivo)) == 1
+    escritor.escribir(2.0, np.ones((1, 3)), np.zeros((1, 3)))
+    escritor.cerrar()
+    assert len(LectorTrayectoria(archivo)) == 2
+    with pytest.raises(ValueError):
+        escritor.escribir(3.0, np.ones((1, 3)), np.zeros((1, 3)))
+
+def test_errores(tmp_path):
+    archivo = str(tmp_path / "tray.bin")
+    escritor = EscritorTrayectoria(archivo, ["a", "b"])
+    with pytest.raises(ValueError):
+        escritor.escribir(0.0, np.zeros((1, 3)), np.zeros((1, 3)))
+    escritor.cerrar()
+
+    otro = tmp_path / "otro.bin"
+    otro.write_bytes(b"no es una trayectoria, pero es bastante largo")
+    with pytest.raises(ValueError):
+        LectorTrayectoria(str(otro))
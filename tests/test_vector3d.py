@@ -81,4 +81,35 @@ def test_vector3d_normalized():
 def test_vector3d_dot_product():
     v1 = Vector3D(1, 2, 3)
     v2 = Vector3D(4, 5, 6)
-    assert v1.dot(v2) == (1*4 + 2*5 + 3*6) # 4 + 10 + 18 = 32
\ No newline at end of file
+    assert v1.dot(v2) == (1*4 + 2*5 + 3*6) # 4 + 10 + 18 = 32
+
+def test_vector3d_slots():
+    v = Vector3D(1, 2, 3)
+    assert not hasattr(v, "__dict__")
+    with pytest.raises(AttributeError):
+        v.w = 4
+
+def test_vector3d_operadores_en_el_sitio():
+    v = Vector3D(1, 2, 3)
+    original = v
+    v += Vector3D(1, 1, 1)
+    assert v is original and v == Vector3D(2, 3, 4)
+    v -= Vector3D(2, 2, 2)
+    assert v is original and v == Vector3D(0, 1, 2)
+    v *= 3
+    assert v is original and v == Vector3D(0, 3, 6)
+    v /= 3
+    assert v is original and v == Vector3D(0, 1, 2)
+    with pytest.raises(ValueError, match="No se puede dividir por cero."):
+        v /= 0
+
+def test_vector3d_suma_escalada():
+    a = Vector3D(1, 2, 3)
+    b = Vector3D(4, 5, 6)
+    assert a.sumar_escalado(b, 0.5) == a + b * 0.5
+    assert a == Vector3D(1, 2, 3)
+
+    c = a.copia()
+    assert c == a and c is not a
+    assert c.iadd_escalado(b, 2.0) is c
+    assert c == Vector3D(9, 12, 15)
@@ -0,0 +1,155 @@
+import pytest
+np = pytest.importorskip("numpy")
+from src.celeste.cli import main
+from src.celeste.integradores import crear_integrador
+from src.celeste.simulador import Simulador
+from src.celeste.vector3d import Vector3D
+from src.celeste.wisdom_holman import WisdomHolman, deriva_kepler
+
+DIA = 86400.0
+MU_SOL = 6.67430e-11 * 1.989e30
+
+def _sistema_planetario(integrador):
+    sim = Simulador(motor="numpy", integrador=integrador)
+    sim._insertar_cuerpo("Sol", 1.989e30, Vector3D(0, 0, 0), Vector3D(0, 0, 0))
+    for id, masa, r in (("Mercurio", 3.3e23, 5.79e10), ("Venus", 4.87e24, 1.082e11),
+                        ("Tierra", 5.972e24, 1.496e11), ("Marte", 6.39e23, 2.279e11),
+                        ("Jupiter", 1.898e27, 7.785e11), ("Saturno", 5.68e26, 1.434e12)):
+        v = (sim.G * 1.989e30 / r) ** 0.5
+        sim._insertar_cuerpo(id, masa, Vector3D(r, 0, 0), Vector3D(0, v, 0))
+    return sim
+
+def _energia(sim):
+    return sim._calcular_energia_cinetica_total() + sim._calcular_energia_potencial_total()
+
+def _orbitas(n, semilla=0):
+    """Órbitas elípticas e hiperbólicas aleatorias alrededor del Sol."""
+    rng = np.random.default_rng(semilla)
+    posiciones = rng.normal(size=(n, 3)) * 1.5e11
+    r = np.linalg.norm(posiciones, axis=1)
+    direcciones = np.cross(posiciones, rng.normal(size=(n, 3)))
+    direcciones /= np.linalg.norm(direcciones, axis=1)[:, None]
+    velocidades = direcciones * (np.sqrt(MU_SOL / r) * rng.uniform(0.3, 1.6, n))[:, None]
+    return posiciones, velocidades + rng.normal(size=(n, 3)) * 3e3
+
+def _energia_kepler(posiciones, velocidades):
+    return 0.5 * (velocidades ** 2).sum(axis=1) - MU_SOL / np.linalg.norm(posiciones, axis=1)
+
+def test_crear_integrador_wisdom_holman():
+    assert isinstance(crear_integrador("wisdom_holman"), WisdomHolman)
+
+def test_wisdom_holman_requiere_motor_numpy():
+    sim = Simulador(integrador=WisdomHolman())
+    sim.agregar_cuerpo("Sol", 1.989e30, Vector3D(0, 0, 0), Vector3D(0, 0, 0))
+    with pytest.raises(ValueError, match="requiere el motor 'numpy'"):
+        sim.integrador.paso(sim, 1.0)
+
+def test_deriva_kepler_orbita_circular():
+    r = 1.496e11
+    v = (MU_SOL / r) ** 0.5
+    periodo = 2 * np.pi * r / v
+    posiciones, velocidades = deriva_kepler(MU_SOL, np.array([[r, 0, 0]]), np.array([[0, v, 0]]), periodo / 4)
+    assert posiciones[0] == pytest.approx([0, r, 0], abs=1e-9 * r)
+    assert velocidades[0] == pytest.approx([-v, 0, 0], abs=1e-9 * v)
+
+@pytest.mark.parametrize("dias", [30, 3650, -3650, 36500])
+def test_deriva_kepler_conserva_y_es_reversible(dias):
+    posiciones, velocidades = _orbitas(1000)
+    nuevas, nuevas_v = deriva_kepler(MU_SOL, posiciones, velocidades, dias * DIA)
+    energia = _energia_kepler(posiciones, velocidades)
+    assert np.abs(_energia_kepler(nuevas, nuevas_v) / energia - 1).max() < 1e-11
+    momento = np.cross(posiciones, velocidades)
+    assert np.abs(np.cross(nuevas, nuevas_v) - momento).max() < 1e-12 * np.abs(momento).max()
+    vuelta, _ = deriva_kepler(MU_SOL, nuevas, nuevas_v, -dias * DIA)
+    r = np.linalg.norm(posiciones, axis=1)
+    assert (np.linalg.norm(vuelta - posiciones, axis=1) / r).max() < 1e-8
+
+def test_deriva_kepler_periodo_completo_y_composicion():
+    posiciones, velocidades = _orbitas(200, semilla=1)
+    # Tras un periodo cada órbita elíptica vuelve al punto de partida
+    alfa = 2 / np.linalg.norm(posiciones, axis=1) - (velocidades ** 2).sum(axis=1) / MU_SOL
+    elipticas = alfa > 0
+    periodos = 2 * np.pi / (np.sqrt(MU_SOL) * alfa[elipticas] ** 1.5)
+    vuelta, _ = deriva_kepler(MU_SOL, posiciones[elipticas], velocidades[elipticas], 0.0)
+    for i, periodo in enumerate(periodos):
+        fila = np.flatnonzero(elipticas)[i]
+        final, _ = deriva_kepler(MU_SOL, posiciones[fila:fila + 1], velocidades[fila:fila + 1], periodo)
+        assert np.linalg.norm(final[0] - posiciones[fila]) < 1e-10 * np.linalg.norm(posiciones[fila])
+    assert np.array_equal(vuelta, posiciones[elipticas])
+    # Dos derivas de dt/2 equivalen a una de dt
+    mitad = deriva_kepler(MU_SOL, *deriva_kepler(MU_SOL, posiciones, velocidades, 50 * DIA), 50 * DIA)[0]
+    completa = deriva_kepler(MU_SOL, posiciones, velocidades, 100 * DIA)[0]
+    assert np.abs(mitad - completa).max() < 1e-10 * np.abs(posiciones).max()
+
+def test_wisdom_holman_conserva_mejor_que_leapfrog_con_el_mismo_paso():
+    # Paso de 1/20 del periodo de Mercurio durante 20 años
+    dt = 88 * DIA / 20
+    errores = {}
+    for integrador in (WisdomHolman(), "leapfrog"):
+        sim = _sistema_planetario(integrador)
+        e0 = _energia(sim)
+        errores[sim.integrador.nombre] = 0.0
+        for _ in range(int(20 * 365.25 * DIA / dt)):
+            sim.integrador.paso(sim, dt)
+            errores[sim.integrador.nombre] = max(errores[sim.integrador.nombre], abs(_energia(sim) / e0 - 1))
+    assert errores["wisdom_holman"] < 1e-7
+    assert errores["wisdom_holman"] < errores["leapfrog"] / 50
+
+def test_wisdom_holman_converge_a_yoshida_con_paso_fino():
+    ref = _sistema_planetario("yoshida4")
+    for _ in range(800):
+        ref.integrador.paso(ref, DIA / 2)
+    errores = []
+    for dias in (8, 4):
+        sim = _sistema_planetario(WisdomHolman())
+        for _ in range(400 // dias):
+            sim.integrador.paso(sim, dias * DIA)
+        errores.append(max((sim.cuerpos[id].posicion - ref.cuerpos[id].posicion).magnitude()
+                           / ref.cuerpos[id].posicion.magnitude() for id in ("Mercurio", "Tierra", "Jupiter")))
+    # Segundo orden: el error se divide por ~4 al dividir el paso por 2
+    assert errores[1] < 3e-4
+    assert errores[0] / errores[1] > 3
+    # Las aceleraciones del almacén son las completas del final del paso
+    aceleraciones = sim._almacen.aceleraciones.copy()
+    sim.calcular_fuerzas()
+    assert np.allclose(sim._almacen.aceleraciones, aceleraciones, rtol=1e-12, atol=0)
+
+def test_wisdom_holman_reutiliza_interacciones_entre_pasos():
+    sim = _sistema_planetario(WisdomHolman())
+    sim.integrador.paso(sim, DIA)
+    # Inicialización + final del paso
+    assert sim.evaluaciones_fuerzas == 2
+    for _ in range(3):
+        sim.integrador.paso(sim, DIA)
+    assert sim.evaluaciones_fuerzas == 5
+    # Si el estado cambia fuera del integrador, se recalcula la interacción
+    sim.cuerpos["Marte"].velocidad = Vector3D(0, 2.4e4, 0)
+    sim.integrador.paso(sim, DIA)
+    assert sim.evaluaciones_fuerzas == 7
+
+def test_wisdom_holman_cuerpo_central_y_particulas():
+    sim = _sistema_planetario(WisdomHolman(central="Sol"))
+    sim._insertar_cuerpo("Sonda", 0.0, Vector3D(0, 3e11, 0), Vector3D(-2.1e4, 0, 0))
+    p0 = sim._calcular_momento_lineal_total()
+    e0 = _energia(sim)
+    for _ in range(200):
+        sim.integrador.paso(sim, 4 * DIA)
+    assert abs(_energia(sim) / e0 - 1) < 1e-7
+    assert (sim._calcular_momento_lineal_total() - p0).magnitude() < 1e-10 * 1.898e27 * 1.3e4
+    # La sonda sigue su órbita heliocéntrica perturbada
+    assert 1e11 < sim.cuerpos["Sonda"].posicion.magnitude() < 5e11
+
+def test_cli_wisdom_holman(tmp_path):
+    sim = Simulador(imprimir_pasos=False)
+    sim.agregar_cuerpo("Sol", 1.989e30, Vector3D(0, 0, 0), Vector3D(0, 0, 0))
+    sim.agregar_cuerpo("Tierra", 5.972e24, Vector3D(1.496e11, 0, 0), Vector3D(0, 2.978e4, 0))
+    sim.agregar_cuerpo("Luna", 7.348e22, Vector3D(1.496e11 + 3.844e8, 0, 0), Vector3D(0, 2.978e4 + 1.022e3, 0))
+    sim.guardar(str(tmp_path / "sistema.json"))
+    for integrador in ("wisdom_holman", "yoshida4"):
+        main([str(tmp_path / "sistema.json"), "--dt", "3600", "--tiempo-total", "864000", "--motor", "numpy",
+              "--integrador", integrador, "--salida", str(tmp_path / f"{integrador}.json")])
+    wh, ref = Simulador(imprimir_pasos=False), Simulador(imprimir_pasos=False)
+    wh.cargar(str(tmp_path / "wisdom_holman.json"))
+    ref.cargar(str(tmp_path / "yoshida4.json"))
+    for id in ("Tierra", "Luna"):
+        assert (wh.cuerpos[id].posicion - ref.cuerpos[id].posicion).magnitude() < 1e-3 * 3.844e8